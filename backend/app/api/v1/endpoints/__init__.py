@@ -1,5 +1,6 @@
 from .chat import router as chat_router
 from .system import router as system_router
 from .graph import router as graph_router
+from .analytics import router as analytics_router
 
-__all__ = ["chat_router", "system_router", "graph_router"]
+__all__ = ["chat_router", "system_router", "graph_router", "analytics_router"]
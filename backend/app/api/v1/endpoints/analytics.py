@@ -0,0 +1,98 @@
+"""
+지배구조 분석 API. Neo4j 를 매 요청 조회하지 않고 인-프로세스 지분 스냅샷에서 계산.
+"""
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from neo4j.exceptions import ServiceUnavailable, TransientError, ClientError
+
+from app.core.node_keys import is_node_key
+from app.services import graph_snapshot
+from app.services import ownership_service
+from app.services import stake_change_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+def _node_key(node_id: str) -> str:
+    key = (node_id or "").strip()
+    if not is_node_key(key):
+        raise HTTPException(400, "잘못된 node_id 형식입니다.")
+    return key
+
+
+def _run(fn, what: str):
+    """스냅샷 적재(Neo4j) 오류 → HTTP 상태 코드. 스냅샷 적재 중이면 503 + Retry-After."""
+    try:
+        return fn()
+    except graph_snapshot.SnapshotLoading as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"{what} 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"{what} 실패: {str(e)}") from e
+
+
+@router.get("/ownership")
+def get_ownership(
+    node_id: str = Query(..., description="회사 nodeKey (예: c_1234567890)"),
+    control_threshold: Optional[float] = Query(
+        None, gt=0, le=100, description="지배 판정 지분율(%). 기본 OWNERSHIP_CONTROL_THRESHOLD_PCT"
+    ),
+    min_ownership: float = Query(0.1, ge=0, le=100, description="결과에 포함할 최소 통합 지분율(%)"),
+    limit: int = Query(50, ge=1, le=500, description="최대 주주 수 (통합 지분율 내림차순)"),
+):
+    """
+    통합(간접 포함) 지분율 상위 주주와 지배 사슬 (회사 → 지배자 → … → 최종 지배자).
+    통합 지분율 = 모든 지분 경로의 지분율 곱의 합. 상호출자 순환 포함.
+    """
+    key = _node_key(node_id)
+    result = _run(
+        lambda: ownership_service.analyze(
+            key, control_threshold=control_threshold, min_ownership=min_ownership, limit=limit
+        ),
+        "지배구조 분석",
+    )
+    if result is None:
+        raise HTTPException(404, "지분 관계가 있는 노드를 찾을 수 없습니다.")
+    return result
+
+
+@router.get("/stake-changes")
+def get_stake_changes(
+    node_id: Optional[str] = Query(None, description="회사(→ 주주별) 또는 주주(→ 보유 회사별) nodeKey. 생략 시 전체"),
+    from_year: Optional[int] = Query(None, ge=1900, le=2100, description="비교 시작 연도 (기본: 첫 보고 연도)"),
+    to_year: Optional[int] = Query(None, ge=1900, le=2100, description="비교 끝 연도 (기본: 마지막 보고 연도)"),
+    min_change: float = Query(0.01, ge=0, le=100, description="최소 변동 폭(%p)"),
+    direction: str = Query("all", description="all(변동 폭 큰 순) | up(증가) | down(감소)"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    reportYear 기준 지분율 변동이 큰 (주주, 회사) 쌍과 연도별 시계열.
+    해당 연도에 회사 보고가 있는데 주주가 없으면 0% (지분 없음)로 비교.
+    """
+    if direction not in stake_change_service.DIRECTIONS:
+        raise HTTPException(400, f"direction 은 {', '.join(stake_change_service.DIRECTIONS)} 중 하나여야 합니다.")
+    if from_year is not None and to_year is not None and from_year > to_year:
+        raise HTTPException(400, "from_year 는 to_year 보다 클 수 없습니다.")
+    key = _node_key(node_id) if node_id else None
+    result = _run(
+        lambda: stake_change_service.stake_changes(
+            key, from_year=from_year, to_year=to_year, min_change=min_change, direction=direction, limit=limit
+        ),
+        "지분율 변동 조회",
+    )
+    if result is None:
+        raise HTTPException(404, "지분 관계가 있는 노드를 찾을 수 없습니다.")
+    return result
@@ -3,6 +3,7 @@ from fastapi import APIRouter, HTTPException
 from app.core.sanitize import sanitize_text, QUESTION_MAX_LENGTH
 from app.schemas import ChatRequest, ChatResponse
 from app.services import graph_service
+from app.services.llm_gateway import LLMOverloaded
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -13,11 +14,16 @@ def _sanitize_question(question: str) -> str:
 
 
 @router.post("", response_model=ChatResponse)
-def chat(req: ChatRequest) -> ChatResponse:
+async def chat(req: ChatRequest) -> ChatResponse:
     if not req.question.strip():
         raise HTTPException(400, "질문이 비어 있습니다.")
     sanitized_question = _sanitize_question(req.question)
-    return ChatResponse(**graph_service.ask_graph(sanitized_question))
+    try:
+        result = await graph_service.ask_graph_async(sanitized_question)
+    except LLMOverloaded as e:
+        # LLM 동시 호출 한도·대기열 초과: 대기열을 더 쌓지 않고 재시도 시점 안내
+        raise HTTPException(503, str(e), headers={"Retry-After": str(e.retry_after)})
+    return ChatResponse(**result)
 
 
 @router.delete("")
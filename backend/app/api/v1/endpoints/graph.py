@@ -2,19 +2,29 @@
 그래프 시각화용 API 엔드포인트.
 노드/엣지 조회, 노드 상세 정보 제공, NetworkX 기반 레이아웃.
 """
+import itertools
+import json
 import logging
 import re
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from neo4j.exceptions import ServiceUnavailable, TransientError, ClientError
 
-from app.core.sanitize import sanitize_text, SEARCH_MAX_LENGTH
+from app.core.cursor import decode_cursor, encode_cursor
+from app.core.neo4j_indexes import fulltext_index_available, mark_fulltext_unavailable
+from app.core.node_keys import internal_properties, is_node_key
+from app.core.sanitize import lucene_phrase, sanitize_text, SEARCH_MAX_LENGTH
+from app.core import wire
 from app.schemas.layout import LayoutRequest, LayoutResponse
 from app.services import graph_service
+from app.services import graph_snapshot
+from app.services import heatmap_service
 from app.services import layout_service
+from app.services import suggest_service
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +36,43 @@ NODE_DETAIL_CACHE_TTL_SEC = 60
 _node_detail_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="node_detail")
 
 
-_ID_RE = re.compile(r"(\d+)$")
+def invalidate_node_details(keys: Optional[frozenset]) -> None:
+    """데이터 버전 변경 키가 반영된 스냅샷 교체 후 (graph_snapshot.on_swap): 해당 노드·연결 노드가 바뀐 상세 캐시만 제거."""
+    if keys is None:
+        _NODE_DETAIL_CACHE.clear()
+        return
+    for cache_key, (_, payload) in list(_NODE_DETAIL_CACHE.items()):
+        if cache_key in keys or any(r.get("id") in keys for r in payload.get("related", ())):
+            _NODE_DETAIL_CACHE.pop(cache_key, None)
 
+HEATMAP_MAX_COMPANIES = 200
 
-def _neo4j_id(node_id: str) -> int:
+
+def _node_key(node_id: str) -> str:
     """
-    프론트에서 오는 node_id (예: n123, c123, p456)를 숫자 Neo4j internal id로 변환.
+    프론트에서 오는 node_id 검증. node_id = nodeKey (예: c_1234567890, p_P0001, h_…).
+    Neo4j 내부 id는 재적재 시 바뀌므로 사용하지 않음 (app.core.node_keys).
     """
-    m = _ID_RE.search(node_id)
-    if not m:
+    key = (node_id or "").strip()
+    if not is_node_key(key):
         raise HTTPException(400, "잘못된 node_id 형식입니다.")
-    return int(m.group(1))
+    return key
+
+
+def _node_keys(node_ids: str) -> list[str]:
+    """쉼표 구분 node_ids → nodeKey 목록."""
+    return [_node_key(x) for x in node_ids.split(",") if x.strip()]
+
+
+# nodeKey 목록 → 노드 n. 레이블별 유니크 제약 인덱스 seek (레이블 없는 MATCH (n) 전체 스캔 방지).
+# UNION 으로 Company:Stockholder(법인 주주) 중복 제거
+_NODES_BY_KEYS = """
+    CALL {
+        UNWIND $keys AS k MATCH (n:Company {nodeKey: k}) RETURN n
+        UNION
+        UNWIND $keys AS k MATCH (n:Stockholder {nodeKey: k}) RETURN n
+    }
+"""
 
 
 def _sanitize_search(search: Optional[str]) -> Optional[str]:
@@ -44,6 +80,38 @@ def _sanitize_search(search: Optional[str]) -> Optional[str]:
     return sanitize_text(search, max_length=SEARCH_MAX_LENGTH, allow_none=True)
 
 
+COMPANY_FULLTEXT_INDEX = "company_name_fulltext"
+STOCKHOLDER_FULLTEXT_INDEX = "stockholder_name_fulltext"
+# CJK bigram 분석기: 1글자 검색어는 bigram이 없어 전문 검색으로 찾을 수 없음 → CONTAINS 사용
+FULLTEXT_MIN_QUERY_LEN = 2
+# 구문 질의가 CONTAINS 와 같은 결과를 내는 검색어: 공백 없는 한글 음절만.
+# 영문·숫자는 단어 단위 토큰이라 부분 일치가 안 되고('Mirae' ↛ 'MiraeAsset'), 특수문자·공백은 분석기가 버리거나
+# 토큰 경계가 되어 결과가 달라짐 → CONTAINS (텍스트 인덱스) 경로
+_FULLTEXT_QUERY_RE = re.compile(r"^[가-힣]+$")
+
+
+def _use_fulltext(index_name: str, search: str) -> bool:
+    """검색 경로 선택. 인덱스 가용성은 기동 시 감지한 캐시값 (요청 안에서 재감지 없음)."""
+    return (
+        len(search) >= FULLTEXT_MIN_QUERY_LEN
+        and _FULLTEXT_QUERY_RE.match(search) is not None
+        and fulltext_index_available(index_name)
+    )
+
+
+def _negotiate(request: Request, payload: dict):
+    """
+    Accept: application/x-msgpack 이면 컬럼형 바이너리 (app.core.wire), 아니면 기존 JSON 그대로.
+    """
+    if wire.accepts_msgpack(request.headers.get("accept")):
+        return Response(
+            content=wire.pack(payload),
+            media_type=wire.MSGPACK_MEDIA_TYPE,
+            headers={"Vary": "Accept"},
+        )
+    return payload
+
+
 def _clamp_ratio(val) -> float:
     """지분율(%) 0~100 범위로 제한. 원시 데이터 오류(100% 초과 등)로 인한 표시 버그 방지."""
     if val is None:
@@ -55,194 +123,264 @@ def _clamp_ratio(val) -> float:
         return 0.0
 
 
+def _metric_fields(r: dict) -> dict:
+    """분석 배치(graph_metrics)가 기록한 지표 중 값이 있는 것만 (row 또는 props)."""
+    return {name: r[name] for name in graph_snapshot.METRIC_PROPS if r.get(name) is not None}
+
+
+def _company_node(r: dict) -> dict:
+    """목록 조회 row (id, label, bizno, active, 지표) → 시각화용 회사 노드."""
+    return {
+        "id": r["id"],
+        "type": "company",
+        "label": (r.get("label") or "Unknown").strip(),
+        "bizno": r.get("bizno"),
+        "active": r.get("active", True),
+        "sub": "회사",
+        **_metric_fields(r),
+    }
+
+
+def _stockholder_node(r: dict) -> dict:
+    """목록 조회 row (id, labels, label, shareholderType, 지표) → 시각화용 주주 노드."""
+    labels = r.get("labels") or []
+    shareholder_type = (r.get("shareholderType") or "PERSON").upper()
+    is_major = "MajorShareholder" in labels
+    node_t = "major" if is_major else ("institution" if shareholder_type != "PERSON" else "person")
+    return {
+        "id": r["id"],
+        "type": node_t,
+        "label": r.get("label") or "Unknown",
+        "shareholderType": shareholder_type,
+        "sub": "최대주주" if is_major else ("기관" if shareholder_type != "PERSON" else "개인주주"),
+        **_metric_fields(r),
+    }
+
+
+# 주주 유형 필터를 Cypher 로 내려서 LIMIT 이 필터 이후에 적용되도록 함 (페이지 크기 보장)
+_STOCKHOLDER_TYPE_FILTER = """
+    ($nt IS NULL
+     OR ($nt = 'major' AND s:MajorShareholder)
+     OR ($nt = 'institution' AND NOT s:MajorShareholder
+         AND toUpper(coalesce(s.shareholderType, 'PERSON')) <> 'PERSON')
+     OR ($nt = 'person' AND NOT s:MajorShareholder
+         AND toUpper(coalesce(s.shareholderType, 'PERSON')) = 'PERSON'))
+"""
+
+# 키셋 페이지: nodeKey 순 (유니크 제약 인덱스 순서 그대로, 정렬 비용 없음).
+# 첫 페이지·커서 이후를 따로 두어 커서 술어가 단순 범위(인덱스 seek)가 되게 함 ($after IS NULL OR … 는 seek 를 막음)
+_COMPANY_PAGE_RETURN = """
+    RETURN c.nodeKey AS id,
+           c.companyName AS label,
+           c.bizno AS bizno,
+           coalesce(c.isActive, true) AS active,
+           c.pagerank AS pagerank, c.betweenness AS betweenness, c.communityId AS communityId, c.sccId AS sccId
+    ORDER BY c.nodeKey
+"""
+_COMPANY_PAGE_QUERY = """
+    MATCH (c:Company)
+    WHERE c.nodeKey IS NOT NULL""" + _COMPANY_PAGE_RETURN
+_COMPANY_PAGE_AFTER_QUERY = """
+    MATCH (c:Company)
+    WHERE c.nodeKey > $after""" + _COMPANY_PAGE_RETURN
+_STOCKHOLDER_PAGE_RETURN = """
+    RETURN s.nodeKey AS id,
+           labels(s) AS labels,
+           coalesce(s.stockName, s.companyName, 'Unknown') AS label,
+           coalesce(s.shareholderType, 'PERSON') AS shareholderType,
+           s.pagerank AS pagerank, s.betweenness AS betweenness, s.communityId AS communityId, s.sccId AS sccId
+    ORDER BY s.nodeKey
+"""
+_STOCKHOLDER_PAGE_QUERY = """
+    MATCH (s:Stockholder)
+    WHERE s.nodeKey IS NOT NULL
+      AND """ + _STOCKHOLDER_TYPE_FILTER + _STOCKHOLDER_PAGE_RETURN
+_STOCKHOLDER_PAGE_AFTER_QUERY = """
+    MATCH (s:Stockholder)
+    WHERE s.nodeKey > $after
+      AND """ + _STOCKHOLDER_TYPE_FILTER + _STOCKHOLDER_PAGE_RETURN
+# (단계, 첫 페이지 쿼리, 커서 이후 쿼리, 행 → 노드)
+_NODE_PHASES = (
+    ("company", _COMPANY_PAGE_QUERY, _COMPANY_PAGE_AFTER_QUERY, _company_node),
+    ("stockholder", _STOCKHOLDER_PAGE_QUERY, _STOCKHOLDER_PAGE_AFTER_QUERY, _stockholder_node),
+)
+
+
+def _node_phases(nt: Optional[str]) -> list[tuple]:
+    """node_type 필터에 해당하는 조회 단계 (회사 → 주주 순)."""
+    return [
+        phase for phase in _NODE_PHASES
+        if nt is None or (phase[0] == "company") == (nt == "company")
+    ]
+
+
+def _decode_cursor_or_400(cursor: Optional[str]) -> Optional[dict]:
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(400, "잘못된 cursor 입니다.")
+
+
+def _page_nodes(graph, nt: Optional[str], limit: int, after: Optional[dict]) -> tuple[list[dict], Optional[str]]:
+    """
+    회사 → 주주 단계를 이어서 nodeKey 키셋 페이지 조회.
+    커서: {"p": 단계, "k": 마지막 nodeKey}. 한 단계가 limit 미만이면 다음 단계로 채움.
+    """
+    phases = _node_phases(nt)
+    names = [p[0] for p in phases]
+    start = 0
+    after_key = None
+    if after:
+        if after.get("p") not in names or not (after.get("k") is None or isinstance(after.get("k"), str)):
+            raise HTTPException(400, "잘못된 cursor 입니다.")
+        start = names.index(after["p"])
+        after_key = after.get("k")
+
+    nodes: list[dict] = []
+    for i in range(start, len(phases)):
+        name, first_query, after_query, to_node = phases[i]
+        remaining = limit - len(nodes)
+        resume = i == start and after_key is not None
+        # limit+1 로 다음 페이지 존재 여부 확인 (빈 마지막 페이지 방지)
+        rows = graph.query(
+            (after_query if resume else first_query) + "\n    LIMIT $limit",
+            params={"after": after_key if resume else None, "limit": remaining + 1, "nt": nt},
+        )
+        nodes.extend(to_node(r) for r in rows[:remaining])
+        if len(rows) > remaining:
+            return nodes, encode_cursor({"p": name, "k": nodes[-1]["id"]})
+        if len(nodes) >= limit:
+            return nodes, (encode_cursor({"p": names[i + 1], "k": None}) if i + 1 < len(phases) else None)
+    return nodes, None
+
+
 @router.get("/nodes")
 def get_nodes(
-    limit: int = Query(50, ge=1, le=500, description="최대 노드 수"),
+    request: Request,
+    limit: int = Query(50, ge=1, le=500, description="최대 노드 수 (페이지 크기)"),
     node_type: Optional[str] = Query(None, description="필터: company, person, major, institution"),
     search: Optional[str] = Query(None, description="검색어 (회사명/주주명)"),
     node_ids: Optional[str] = Query(None, description="특정 노드 ID들 (쉼표 구분, 엣지 기반 로드용)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (목록 조회 다음 페이지)"),
 ):
     """
     그래프 노드 목록 조회 (시각화용).
     
     성능: limit 기본 50, 최대 500. 초기 로드는 작은 샘플 권장.
+    목록 조회(search·node_ids 없음)는 nodeKey 키셋 페이지네이션: next_cursor 가 null 이 될 때까지 cursor 로 이어서 요청.
+    전체를 한 번에 받으려면 /graph/nodes/stream (NDJSON).
     """
-    graph = graph_service.get_graph()
-
     nt = (node_type or "").lower().strip() or None
     sanitized_search = _sanitize_search(search)
+    after = _decode_cursor_or_400(cursor)
     
     # node_ids 파라미터 파싱 (엣지 기반 로드용)
-    ids: Optional[list[int]] = None
+    ids: Optional[list[str]] = None
     if node_ids:
-        ids = [_neo4j_id(x.strip()) for x in node_ids.split(",") if x.strip()]
-    
-    params = {"limit": limit, "search": sanitized_search} if sanitized_search else {"limit": limit}
+        ids = _node_keys(node_ids)
+
+    graph = graph_service.get_graph()
     nodes: list[dict] = []
 
     try:
         # node_ids가 제공되면 레이블과 무관하게 모든 노드를 한 번에 조회
         if ids:
             # 모든 노드를 ID로 조회 (Company와 Stockholder 모두 포함)
-            q = """
-                MATCH (n)
-                WHERE id(n) IN $ids
-                RETURN id(n) AS id,
+            q = _NODES_BY_KEYS + """
+                RETURN n.nodeKey AS id,
                        labels(n) AS labels,
                        properties(n) AS props
             """
-            rows = graph.query(q, params={"ids": ids})
+            rows = graph.query(q, params={"keys": ids})
             
             for r in rows:
-                labels = r.get("labels") or []
-                props = r.get("props") or {}
-                
-                # Company 노드 처리
-                if "Company" in labels:
-                    if nt in (None, "company"):
-                        nodes.append({
-                            "id": f"n{r['id']}",
-                            "type": "company",
-                            "label": (props.get("companyName") or "Unknown").strip(),
-                            "bizno": props.get("bizno"),
-                            "active": props.get("isActive", True),
-                            "sub": "회사",
-                        })
-                
-                # Stockholder 노드 처리
-                elif "Stockholder" in labels:
-                    shareholder_type = (props.get("shareholderType") or "PERSON").upper()
-                    is_major = "MajorShareholder" in labels
-                    node_t = "major" if is_major else ("institution" if shareholder_type != "PERSON" else "person")
-                    
-                    if nt in (None, "person", "major", "institution"):
-                        if nt and node_t != nt:
-                            continue
-                        
-                        nodes.append({
-                            "id": f"n{r['id']}",
-                            "type": node_t,
-                            "label": (props.get("stockName") or props.get("companyName") or "Unknown").strip(),
-                            "shareholderType": shareholder_type,
-                            "sub": "최대주주" if is_major else ("기관" if shareholder_type != "PERSON" else "개인주주"),
-                        })
-        else:
-            # 기존 로직: node_ids가 없을 때는 레이블별로 조회
-            # 1) Company nodes
-            # 텍스트 인덱스(Neo4j 5.x+) 활용, 없으면 CONTAINS 폴백
-            if nt in (None, "company"):
-                if sanitized_search:
-                    # 텍스트 인덱스 사용 시도 (Neo4j 5.x+)
-                    q = """
-                        CALL db.index.fulltext.queryNodes('company_name_text', $search)
-                        YIELD node, score
-                        WHERE score > 0.5
-                        RETURN id(node) AS id,
-                               node.companyName AS label,
-                               node.bizno AS bizno,
-                               coalesce(node.isActive, true) AS active
-                        LIMIT $limit
-                    """
-                    try:
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                    except ClientError:
-                        # 텍스트 인덱스가 없으면 CONTAINS로 폴백
-                        logger.debug("Text index not available, falling back to CONTAINS")
-                        q = """
-                            MATCH (c:Company)
-                            WHERE c.companyName CONTAINS $search
-                            RETURN id(c) AS id,
-                                   c.companyName AS label,
-                                   c.bizno AS bizno,
-                                   coalesce(c.isActive, true) AS active
-                            LIMIT $limit
-                        """
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                else:
-                    q = """
-                        MATCH (c:Company)
-                        RETURN id(c) AS id,
-                               c.companyName AS label,
-                               c.bizno AS bizno,
-                               coalesce(c.isActive, true) AS active
-                        LIMIT $limit
-                    """
-                    rows = graph.query(q, params={"limit": limit})
-                nodes.extend(
-                    {
-                        "id": f"n{r['id']}",
-                        "type": "company",
-                        "label": (r.get("label") or r.get("companyName") or "Unknown").strip(),
-                        "bizno": r.get("bizno"),
-                        "active": r.get("active", True),
-                        "sub": "회사",
-                    }
-                    for r in rows
-                )
-
-            # 2) Stockholder nodes (Person/Company, plus MajorShareholder label if present)
-            # 텍스트 인덱스 활용, 없으면 CONTAINS 폴백
-            if nt in (None, "person", "major", "institution"):
-                if sanitized_search:
-                    # 텍스트 인덱스 사용 시도
-                    q = """
-                        CALL db.index.fulltext.queryNodes('stockholder_name_text', $search)
-                        YIELD node, score
-                        WHERE score > 0.5
-                        RETURN id(node) AS id,
-                               labels(node) AS labels,
-                               coalesce(node.stockName, node.companyName, 'Unknown') AS label,
-                               coalesce(node.shareholderType, 'PERSON') AS shareholderType
-                        LIMIT $limit
-                    """
-                    try:
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                    except ClientError:
-                        # 텍스트 인덱스가 없으면 CONTAINS로 폴백
-                        logger.debug("Text index not available, falling back to CONTAINS")
-                        q = """
-                            MATCH (s:Stockholder)
-                            WHERE coalesce(s.stockName, s.companyName, '') CONTAINS $search
-                            RETURN id(s) AS id,
-                                   labels(s) AS labels,
-                                   coalesce(s.stockName, s.companyName, 'Unknown') AS label,
-                                   coalesce(s.shareholderType, 'PERSON') AS shareholderType
-                            LIMIT $limit
-                        """
-                        rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
-                else:
-                    q = """
-                        MATCH (s:Stockholder)
-                        RETURN id(s) AS id,
-                               labels(s) AS labels,
-                               coalesce(s.stockName, s.companyName, 'Unknown') AS label,
-                               coalesce(s.shareholderType, 'PERSON') AS shareholderType
-                        LIMIT $limit
-                    """
-                    rows = graph.query(q, params={"limit": limit})
-                for r in rows:
-                    labels = r.get("labels") or []
-                    shareholder_type = (r.get("shareholderType") or "PERSON").upper()
-                    is_major = "MajorShareholder" in labels
-
-                    node_t = "major" if is_major else ("institution" if shareholder_type != "PERSON" else "person")
-                    if nt and node_t != nt:
-                        continue
-
-                    nodes.append(
-                        {
-                            "id": f"n{r['id']}",
-                            "type": node_t,
-                            "label": r.get("label") or "Unknown",
-                            "shareholderType": shareholder_type,
-                            "sub": "최대주주" if is_major else ("기관" if shareholder_type != "PERSON" else "개인주주"),
-                        }
-                    )
-
-        # node_ids가 제공된 경우 limit 제한 없이 모든 요청된 노드 반환
-        if ids:
-            return {"nodes": nodes, "total": len(nodes)}
-        return {"nodes": nodes[:limit], "total": len(nodes)}
+                node = _row_to_node(r)
+                if nt is None or node["type"] == nt:
+                    nodes.append(node)
+            # node_ids가 제공된 경우 limit 제한 없이 모든 요청된 노드 반환
+            return _negotiate(request, {"nodes": nodes, "total": len(nodes), "next_cursor": None})
+
+        if not sanitized_search:
+            nodes, next_cursor = _page_nodes(graph, nt, limit, after)
+            return _negotiate(request, {"nodes": nodes, "total": len(nodes), "next_cursor": next_cursor})
+
+        # 검색: 관련도/부분 일치 결과라 키셋 정렬 키가 없음 → 단일 페이지
+        # 1) Company nodes
+        # 전문 검색 인덱스(기동 시 감지) 활용, 없으면 CONTAINS 폴백
+        if nt in (None, "company"):
+            rows = None
+            if _use_fulltext(COMPANY_FULLTEXT_INDEX, sanitized_search):
+                q = f"""
+                    CALL db.index.fulltext.queryNodes('{COMPANY_FULLTEXT_INDEX}', $search)
+                    YIELD node
+                    RETURN node.nodeKey AS id,
+                           node.companyName AS label,
+                           node.bizno AS bizno,
+                           coalesce(node.isActive, true) AS active,
+                           node.pagerank AS pagerank, node.betweenness AS betweenness,
+                           node.communityId AS communityId, node.sccId AS sccId
+                    LIMIT $limit
+                """
+                try:
+                    rows = graph.query(q, params={"limit": limit, "search": lucene_phrase(sanitized_search)})
+                except ClientError as e:
+                    logger.warning(f"Fulltext query failed, falling back to CONTAINS: {e}")
+                    mark_fulltext_unavailable(COMPANY_FULLTEXT_INDEX)
+            if rows is None:
+                q = """
+                    MATCH (c:Company)
+                    WHERE c.companyName CONTAINS $search
+                    RETURN c.nodeKey AS id,
+                           c.companyName AS label,
+                           c.bizno AS bizno,
+                           coalesce(c.isActive, true) AS active,
+                           c.pagerank AS pagerank, c.betweenness AS betweenness,
+                           c.communityId AS communityId, c.sccId AS sccId
+                    LIMIT $limit
+                """
+                rows = graph.query(q, params={"limit": limit, "search": sanitized_search})
+            nodes.extend(_company_node(r) for r in rows)
+
+        # 2) Stockholder nodes (Person/Company, plus MajorShareholder label if present)
+        # 전문 검색 인덱스 활용, 없으면 CONTAINS 폴백
+        if nt in (None, "person", "major", "institution"):
+            rows = None
+            if _use_fulltext(STOCKHOLDER_FULLTEXT_INDEX, sanitized_search):
+                q = f"""
+                    CALL db.index.fulltext.queryNodes('{STOCKHOLDER_FULLTEXT_INDEX}', $search)
+                    YIELD node
+                    WITH node AS s
+                    WHERE {_STOCKHOLDER_TYPE_FILTER}
+                    RETURN s.nodeKey AS id,
+                           labels(s) AS labels,
+                           coalesce(s.stockName, s.companyName, 'Unknown') AS label,
+                           coalesce(s.shareholderType, 'PERSON') AS shareholderType,
+                           s.pagerank AS pagerank, s.betweenness AS betweenness,
+                           s.communityId AS communityId, s.sccId AS sccId
+                    LIMIT $limit
+                """
+                try:
+                    rows = graph.query(q, params={"limit": limit, "search": lucene_phrase(sanitized_search), "nt": nt})
+                except ClientError as e:
+                    logger.warning(f"Fulltext query failed, falling back to CONTAINS: {e}")
+                    mark_fulltext_unavailable(STOCKHOLDER_FULLTEXT_INDEX)
+            if rows is None:
+                q = f"""
+                    MATCH (s:Stockholder)
+                    WHERE coalesce(s.stockName, s.companyName, '') CONTAINS $search
+                      AND {_STOCKHOLDER_TYPE_FILTER}
+                    RETURN s.nodeKey AS id,
+                           labels(s) AS labels,
+                           coalesce(s.stockName, s.companyName, 'Unknown') AS label,
+                           coalesce(s.shareholderType, 'PERSON') AS shareholderType,
+                           s.pagerank AS pagerank, s.betweenness AS betweenness,
+                           s.communityId AS communityId, s.sccId AS sccId
+                    LIMIT $limit
+                """
+                rows = graph.query(q, params={"limit": limit, "search": sanitized_search, "nt": nt})
+            nodes.extend(_stockholder_node(r) for r in rows)
+
+        return _negotiate(request, {"nodes": nodes[:limit], "total": len(nodes), "next_cursor": None})
 
     except HTTPException:
         raise
@@ -263,6 +401,31 @@ def get_nodes(
         raise HTTPException(500, f"노드 조회 실패: {str(e)}") from e
 
 
+@router.get("/suggest")
+def suggest(
+    q: str = Query(..., min_length=1, description="입력 중인 검색어 (접두/중간/초성 매칭)"),
+    limit: int = Query(10, ge=1, le=50, description="최대 결과 수"),
+    node_type: Optional[str] = Query(None, description="필터: company, person, major, institution"),
+):
+    """
+    자동완성. 인-프로세스 인덱스에서 조회 (Neo4j 미사용, 키 입력마다 호출 가능).
+    인덱스 적재 전이면 503 → 클라이언트는 /graph/nodes?search= 로 폴백.
+    """
+    index = suggest_service.get_index()
+    if index is None:
+        raise HTTPException(503, "검색 인덱스를 준비 중입니다. 잠시 후 다시 시도해주세요.")
+    query = q.strip()[:SEARCH_MAX_LENGTH]
+    nt = (node_type or "").lower().strip() or None
+    t0 = time.perf_counter()
+    results = index.search(query, limit=limit, node_type=nt)
+    return {
+        "query": _sanitize_search(query),
+        "results": results,
+        "total": len(results),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 3),
+    }
+
+
 @router.get("/node-counts")
 def get_node_counts():
     """
@@ -325,53 +488,216 @@ def get_node_counts():
         raise HTTPException(500, f"노드 개수 조회 실패: {str(e)}") from e
 
 
+def _edges_query(keys: Optional[list[str]]) -> str:
+    """(주주, 회사) 쌍 단위 집계 엣지 쿼리 (정렬·LIMIT 제외). ratio=max(stockRatio), relCount=관계 건수."""
+    if keys:
+        # node_ids 지정 시: 주주 쪽·회사 쪽 각각 nodeKey 인덱스 seek 후 UNION (관계 중복 제거)
+        match = """
+        CALL {
+            UNWIND $keys AS k
+            MATCH (s:Stockholder {nodeKey: k})-[r:HOLDS_SHARES]->(c:Company)
+            RETURN s, r, c
+            UNION
+            UNWIND $keys AS k
+            MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company {nodeKey: k})
+            RETURN s, r, c
+        }
+        """
+    else:
+        match = "MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)"
+    return match + """
+        WITH s.nodeKey AS fromId,
+             c.nodeKey AS toId,
+             coalesce(max(r.stockRatio), 0.0) AS ratio,
+             count(r) AS relCount
+        WHERE ($min_ratio IS NULL OR ratio >= $min_ratio)
+    """
+
+
+def _row_to_edge(row: dict) -> dict:
+    r_val = _clamp_ratio(row.get("ratio"))
+    return {
+        "from": row["fromId"],
+        "to": row["toId"],
+        "type": "HOLDS_SHARES",
+        "ratio": round(r_val, 1),
+        "count": int(row.get("relCount") or 1),
+        "label": f"{r_val:.1f}%",
+    }
+
+
+def _edge_cursor_params(after: Optional[dict]) -> Optional[dict]:
+    """
+    엣지 커서 → 쿼리 파라미터. {"r": ratio, "f": fromId, "t": toId}, 지분율 없는 쌍 단계는 {"n": 1, "f", "t"}
+    (단계 시작이면 f·t 가 null). 커서가 없으면 None.
+    """
+    if not after:
+        return None
+    from_id, to_id = after.get("f"), after.get("t")
+    if after.get("n"):
+        if not all(v is None or isinstance(v, str) for v in (from_id, to_id)):
+            raise HTTPException(400, "잘못된 cursor 입니다.")
+        return {"after_null": True, "after_ratio": 0.0, "after_from": from_id, "after_to": to_id}
+    ratio = after.get("r")
+    if not isinstance(ratio, (int, float)) or not isinstance(from_id, str) or not isinstance(to_id, str):
+        raise HTTPException(400, "잘못된 cursor 입니다.")
+    return {"after_null": False, "after_ratio": ratio, "after_from": from_id, "after_to": to_id}
+
+
+def _edge_cursor(row: dict) -> str:
+    return encode_cursor({"r": row["ratio"], "f": row["fromId"], "t": row["toId"]})
+
+
+# 전체 엣지 키셋 페이지 (node_ids 없음): holds_shares_ratio 관계 인덱스를 지분율 내림차순으로 읽으면서
+# 쌍마다 최대 지분율 관계만 대표로 남김 → 쌍 전체를 집계·정렬하지 않고 LIMIT 에서 멈춤 (같은 지분율 안에서만 정렬).
+# 첫 페이지·커서 이후를 따로 두어 지분율 술어가 단순 범위(인덱스 seek)가 되게 함.
+_EDGE_PAGE_RETURN = """
+    WITH s, c, fromId, toId, ratio
+    ORDER BY ratio DESC, fromId, toId
+    LIMIT $limit
+    RETURN fromId, toId, ratio, COUNT { (s)-[:HOLDS_SHARES]->(c) } AS relCount
+"""
+_EDGE_PAGE_QUERY = """
+    MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+    WHERE r.stockRatio >= $min_ratio
+      AND NOT EXISTS { MATCH (s)-[x:HOLDS_SHARES]->(c) WHERE x.stockRatio > r.stockRatio }
+    WITH DISTINCT s, c, r.stockRatio AS ratio
+    WITH s, c, s.nodeKey AS fromId, c.nodeKey AS toId, ratio
+""" + _EDGE_PAGE_RETURN
+_EDGE_PAGE_AFTER_QUERY = """
+    MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+    WHERE r.stockRatio >= $min_ratio AND r.stockRatio <= $after_ratio
+      AND NOT EXISTS { MATCH (s)-[x:HOLDS_SHARES]->(c) WHERE x.stockRatio > r.stockRatio }
+    WITH DISTINCT s, c, r.stockRatio AS ratio
+    WITH s, c, s.nodeKey AS fromId, c.nodeKey AS toId, ratio
+    WHERE ratio < $after_ratio OR fromId > $after_from OR (fromId = $after_from AND toId > $after_to)
+""" + _EDGE_PAGE_RETURN
+# 지분율이 하나도 없는 쌍 (ratio 0 으로 표시, 지분율 있는 쌍 다음). 인덱스 밖이라 정렬하지만 보통 소수
+_EDGE_NULL_PAGE_MATCH = """
+    MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+    WHERE r.stockRatio IS NULL
+      AND NOT EXISTS { MATCH (s)-[x:HOLDS_SHARES]->(c) WHERE x.stockRatio IS NOT NULL }
+    WITH DISTINCT s, c
+    WITH s, c, s.nodeKey AS fromId, c.nodeKey AS toId, 0.0 AS ratio
+"""
+_EDGE_NULL_PAGE_QUERY = _EDGE_NULL_PAGE_MATCH + _EDGE_PAGE_RETURN
+_EDGE_NULL_PAGE_AFTER_QUERY = _EDGE_NULL_PAGE_MATCH + """
+    WHERE fromId > $after_from OR (fromId = $after_from AND toId > $after_to)
+""" + _EDGE_PAGE_RETURN
+
+
+def _page_edges(graph, limit: int, min_ratio: Optional[float], after: Optional[dict]) -> tuple[list[dict], Optional[str]]:
+    """
+    전체 엣지 키셋 페이지: 지분율 있는 쌍(ratio DESC, from, to) → 지분율 없는 쌍(from, to) 단계.
+    한 단계가 limit 미만이면 다음 단계로 채움 (_page_nodes 와 같은 방식).
+    """
+    rows: list[dict] = []
+    if not (after and after["after_null"]):
+        params = {"limit": limit + 1, "min_ratio": min_ratio if min_ratio is not None else float("-inf")}
+        if after:
+            rows = graph.query(_EDGE_PAGE_AFTER_QUERY, params={**params, **after})
+        else:
+            rows = graph.query(_EDGE_PAGE_QUERY, params=params)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, _edge_cursor(rows[-1])
+        after = None
+    if min_ratio is not None and min_ratio > 0:
+        return rows, None
+    if len(rows) >= limit:
+        return rows, encode_cursor({"n": 1, "f": None, "t": None})
+
+    remaining = limit - len(rows)
+    if after and after["after_from"] is not None:
+        tail = graph.query(_EDGE_NULL_PAGE_AFTER_QUERY, params={"limit": remaining + 1, **after})
+    else:
+        tail = graph.query(_EDGE_NULL_PAGE_QUERY, params={"limit": remaining + 1})
+    rows.extend(tail[:remaining])
+    if len(tail) > remaining:
+        return rows, encode_cursor({"n": 1, "f": rows[-1]["fromId"], "t": rows[-1]["toId"]})
+    return rows, None
+
+
+def _snapshot_edges(
+    snap, limit: int, ids: Optional[list[str]], min_ratio: Optional[float], after_params: Optional[dict]
+) -> dict:
+    """/graph/edges 를 인-프로세스 스냅샷에서 (Neo4j 쿼리와 같은 정렬·커서, 지분율 없는 쌍은 ratio 0 에 섞임)."""
+    after = None
+    if after_params is not None:
+        after = (after_params["after_ratio"], after_params["after_from"] or "", after_params["after_to"] or "")
+    nodes = [snap.index[k] for k in ids if k in snap.index] if ids else None
+    pairs, has_more = snap.top_pairs(limit, min_ratio=min_ratio, after=after, nodes=nodes)
+    rows = [
+        {
+            "fromId": snap.keys[snap.pair_src[p]],
+            "toId": snap.keys[snap.pair_dst[p]],
+            "ratio": float(snap.pair_ratio[p]),
+            "relCount": int(snap.rel_start[p + 1] - snap.rel_start[p]),
+        }
+        for p in pairs
+    ]
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = _edge_cursor(last)
+    edges = [_row_to_edge(row) for row in rows]
+    return {"edges": edges, "total": len(edges), "next_cursor": next_cursor}
+
+
 @router.get("/edges")
 def get_edges(
-    limit: int = Query(100, ge=1, le=1000, description="최대 엣지 수"),
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="최대 엣지 수 (페이지 크기)"),
     node_ids: Optional[str] = Query(None, description="특정 노드 ID들 (쉼표 구분)"),
     min_ratio: Optional[float] = Query(None, description="최소 지분율(%) — 미만 관계 제외, 시각화 노이즈 감소"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (다음 페이지)"),
 ):
     """
     그래프 엣지(관계) 목록 조회.
     
     node_ids 제공 시 해당 노드와 연결된 엣지만 반환 (성능 최적화).
     min_ratio 제공 시 해당 지분율 미만 관계는 제외 (초기 로딩 시 5 등 권장).
+    (ratio DESC, from, to) 키셋 페이지네이션: next_cursor 가 null 이 될 때까지 cursor 로 이어서 요청.
+    전체를 한 번에 받으려면 /graph/edges/stream (NDJSON).
     """
+    ids: Optional[list[str]] = None
+    if node_ids:
+        ids = _node_keys(node_ids)
+    after_params = _edge_cursor_params(_decode_cursor_or_400(cursor))
+
+    snap = graph_snapshot.get_snapshot()
+    if snap is not None:
+        return _negotiate(request, _snapshot_edges(snap, limit, ids, min_ratio, after_params))
+
     graph = graph_service.get_graph()
 
-    ids: Optional[list[int]] = None
-    if node_ids:
-        ids = [_neo4j_id(x.strip()) for x in node_ids.split(",") if x.strip()]
-
-    # (from,to) 단위 집계. ratio=max(stockRatio), count=관계 건수.
-    query = """
-        MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
-        WHERE ($ids IS NULL OR id(s) IN $ids OR id(c) IN $ids)
-        WITH id(s) AS fromId,
-             id(c) AS toId,
-             max(r.stockRatio) AS ratio,
-             count(r) AS relCount
-        WHERE ($min_ratio IS NULL OR ratio >= $min_ratio)
+    if ids and after_params and after_params["after_null"]:
+        raise HTTPException(400, "잘못된 cursor 입니다.")
+    try:
+        if ids:
+            # node_ids 지정: 해당 노드 주변만 집계 (nodeKey seek) → 커서 유무에 따라 술어만 다르게
+            query = _edges_query(ids)
+            if after_params:
+                query += """
+          AND (ratio < $after_ratio
+               OR (ratio = $after_ratio
+                   AND (fromId > $after_from OR (fromId = $after_from AND toId > $after_to))))
+                """
+            query += """
         RETURN fromId, toId, ratio, relCount
-        ORDER BY ratio DESC
+        ORDER BY ratio DESC, fromId, toId
         LIMIT $limit
-    """
-    params = {"limit": limit, "ids": ids, "min_ratio": min_ratio}
-
-    try:
-        rows = graph.query(query, params=params)
-        edges = []
-        for row in rows:
-            r_val = _clamp_ratio(row.get("ratio"))
-            edges.append({
-                "from": f"n{row['fromId']}",
-                "to": f"n{row['toId']}",
-                "type": "HOLDS_SHARES",
-                "ratio": round(r_val, 1),
-                "count": int(row.get("relCount") or 1),
-                "label": f"{r_val:.1f}%",
-            })
-        return {"edges": edges, "total": len(edges)}
+            """
+            # limit+1 로 다음 페이지 존재 여부 확인
+            rows = graph.query(query, params={"limit": limit + 1, "keys": ids, "min_ratio": min_ratio, **(after_params or {})})
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = _edge_cursor(rows[-1])
+        else:
+            rows, next_cursor = _page_edges(graph, limit, min_ratio, after_params)
+        edges = [_row_to_edge(row) for row in rows]
+        return _negotiate(request, {"edges": edges, "total": len(edges), "next_cursor": next_cursor})
 
     except ServiceUnavailable:
         logger.error("Neo4j 서비스 사용 불가", exc_info=True)
@@ -387,20 +713,107 @@ def get_edges(
         raise HTTPException(500, f"엣지 조회 실패: {str(e)}") from e
 
 
+def _ndjson(item: dict) -> bytes:
+    return (json.dumps(item, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def _ndjson_response(rows: Iterator[dict], to_item: Callable[[dict], Optional[dict]]) -> StreamingResponse:
+    """
+    Neo4j 결과 커서를 받는 대로 한 줄씩 전송 (서버 메모리 ≈ fetch_size, 전체 목록을 만들지 않음).
+    첫 레코드는 응답 시작 전에 받아서 연결 오류를 503 등 상태 코드로 돌려줌.
+    마지막 줄 {"type": "end", "total": n} 가 없으면 클라이언트는 중단된 스트림으로 판단.
+    """
+    try:
+        first = next(rows, None)
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"스트리밍 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"스트리밍 조회 실패: {str(e)}") from e
+
+    def body() -> Iterator[bytes]:
+        total = 0
+        try:
+            for row in itertools.chain(() if first is None else (first,), rows):
+                item = to_item(row)
+                if item is None:
+                    continue
+                total += 1
+                yield _ndjson(item)
+        except Exception as e:
+            # 상태 코드는 이미 전송됨 → 오류를 마지막 줄로 알림
+            logger.error(f"스트리밍 중단: {str(e)}", exc_info=True)
+            yield _ndjson({"type": "error", "detail": "스트리밍 중 오류가 발생했습니다.", "total": total})
+            return
+        yield _ndjson({"type": "end", "total": total})
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/nodes/stream")
+def stream_nodes(
+    node_type: Optional[str] = Query(None, description="필터: company, person, major, institution"),
+):
+    """
+    전체 노드 NDJSON 스트리밍 (한 줄 = /graph/nodes 의 노드 1개, nodeKey 순).
+    클라이언트는 줄 단위로 받아 점진적으로 그래프에 추가.
+    """
+    nt = (node_type or "").lower().strip() or None
+
+    def rows() -> Iterator[dict]:
+        for name, query, _, to_node in _node_phases(nt):
+            for r in graph_service.stream_query(query, {"nt": nt}):
+                r["_phase"] = name
+                yield r
+
+    def to_item(r: dict) -> dict:
+        return (_company_node if r.pop("_phase") == "company" else _stockholder_node)(r)
+
+    return _ndjson_response(rows(), to_item)
+
+
+@router.get("/edges/stream")
+def stream_edges(
+    node_ids: Optional[str] = Query(None, description="특정 노드 ID들 (쉼표 구분)"),
+    min_ratio: Optional[float] = Query(None, description="최소 지분율(%)"),
+):
+    """
+    엣지 NDJSON 스트리밍 (한 줄 = /graph/edges 의 엣지 1개, 지분율 내림차순).
+    지분율 큰 관계부터 도착하므로 받는 즉시 그려도 주요 구조가 먼저 보임.
+    """
+    ids = _node_keys(node_ids) if node_ids else None
+    query = _edges_query(ids) + """
+        RETURN fromId, toId, ratio, relCount
+        ORDER BY ratio DESC, fromId, toId
+    """
+    rows = graph_service.stream_query(query, {"keys": ids, "min_ratio": min_ratio})
+    return _ndjson_response(rows, _row_to_edge)
+
+
 @router.post("/layout", response_model=LayoutResponse)
-def post_layout(body: LayoutRequest):
+def post_layout(body: LayoutRequest, request: Request):
     """
     그래프 레이아웃 계산 (협업: ratio → 시각적 거리 1/√ratio 규칙).
 
     엔진:
     - networkx: Kamada-Kawai → Spring 2단계 (기본, 항상 사용 가능)
-    - pygraphviz: Graphviz 기반 고품질 레이아웃 (overlap=scale로 라벨 겹침 방지, Graphviz 시스템 라이브러리 필요)
+    - pygraphviz: Graphviz neato 고품질 레이아웃 (overlap=false, Graphviz 시스템 라이브러리 필요)
+    - sfdp: Graphviz 멀티레벨 레이아웃 (대형 그래프)
+      Graphviz 엔진은 별도 프로세스 풀에서 실행 (타임아웃·메모리 상한 초과 시 NetworkX 폴백)
+    - hierarchical: 지분 방향(주주 → 회사) 계층 배치, 상호출자 순환 처리 + 교차 감소 (지배구조 맵용)
 
     요청: nodes, edges (프론트와 동일 스키마). 반환 좌표는 0~1 정규화.
     프론트는 (x * (viewportWidth - 2*pad) + pad, y * (viewportHeight - 2*pad) + pad) 로 스케일.
     """
     try:
-        engine = body.engine if body.engine in ("networkx", "pygraphviz") else "networkx"
+        engine = body.engine if body.engine in layout_service.LAYOUT_ENGINES else "networkx"
         result = layout_service.compute_layout(
             body.nodes,
             body.edges,
@@ -410,21 +823,40 @@ def post_layout(body: LayoutRequest):
             use_components=body.use_components,
             engine=engine,
         )
-        return LayoutResponse(positions=result["positions"], components=result["components"])
+        return _negotiate(
+            request,
+            LayoutResponse(positions=result["positions"], components=result["components"]).model_dump(),
+        )
     except Exception as e:
         logger.error(f"레이아웃 계산 실패: {str(e)}", exc_info=True)
         raise HTTPException(500, f"레이아웃 계산 실패: {str(e)}") from e
 
 
+def _snapshot_related(snap, i: int, node_type: str) -> tuple[list[dict], list[dict]]:
+    """노드 상세의 관련 노드(상위 20) + 통계 row 를 스냅샷에서 (Neo4j 쿼리 결과와 같은 모양)."""
+    related_rows = []
+    for j, ratio in snap.neighbours(i, 20):
+        row = snap.row(j)
+        row["ratio"] = ratio
+        related_rows.append(row)
+    if node_type == "company":
+        max_ratio, holder_count = snap.holder_stats(i)
+        stat_rows = [{"maxRatio": max_ratio, "holderCount": holder_count}]
+    else:
+        holdings, avg_ratio = snap.holding_stats(i)
+        stat_rows = [{"holdings": holdings, "avgRatio": avg_ratio}]
+    return related_rows, stat_rows
+
+
 @router.get("/nodes/{node_id}")
 def get_node_detail(node_id: str):
     """
     특정 노드의 상세 정보 + 연결된 노드 목록.
     성능: 캐시(TTL 60초) + 관련/통계 쿼리 병렬 실행으로 체감 지연 감소.
     """
+    key = _node_key(node_id)
     graph = graph_service.get_graph()
-    neo4j_id = _neo4j_id(node_id)
-    cache_key = node_id
+    cache_key = key
 
     # 캐시 적중 시 즉시 반환 (동일 노드 재클릭 체감 개선)
     now = time.monotonic()
@@ -434,33 +866,28 @@ def get_node_detail(node_id: str):
             return payload
         del _NODE_DETAIL_CACHE[cache_key]
 
-    node_query = """
-        MATCH (n)
-        WHERE id(n) = $id
+    node_query = _NODES_BY_KEYS + """
         RETURN labels(n) AS labels, properties(n) AS props
     """
-    related_query = """
+    related_query = _NODES_BY_KEYS + """
         MATCH (n)-[r:HOLDS_SHARES]-(m)
-        WHERE id(n) = $id
         WITH m, labels(m) AS labels, properties(m) AS props, max(r.stockRatio) AS ratio
-        RETURN id(m) AS id, labels, props, ratio
+        RETURN m.nodeKey AS id, labels, props, ratio
         ORDER BY ratio DESC
         LIMIT 20
     """
     max_ratio_query = """
-        MATCH (n:Company)<-[r:HOLDS_SHARES]-(s)
-        WHERE id(n) = $id
+        MATCH (n:Company {nodeKey: $key})<-[r:HOLDS_SHARES]-(s)
         WITH DISTINCT s, max(r.stockRatio) AS maxRatio
         RETURN max(maxRatio) AS maxRatio, count(s) AS holderCount
     """
     holdings_query = """
-        MATCH (n)-[r:HOLDS_SHARES]->(c:Company)
-        WHERE id(n) = $id
+        MATCH (n:Stockholder {nodeKey: $key})-[r:HOLDS_SHARES]->(c:Company)
         RETURN count(c) AS holdings, avg(r.stockRatio) AS avgRatio
     """
 
     try:
-        node_rows = graph.query(node_query, params={"id": neo4j_id})
+        node_rows = graph.query(node_query, params={"keys": [key]})
         if not node_rows:
             raise HTTPException(404, "노드를 찾을 수 없습니다.")
 
@@ -477,21 +904,26 @@ def get_node_detail(node_id: str):
         else:
             node_type = "institution" if shareholder_type != "PERSON" else "person"
 
-        # 관련 노드 + 통계 쿼리 병렬 실행 (체감 지연 감소)
-        params_id = {"id": neo4j_id}
-        stat_query = max_ratio_query if node_type == "company" else holdings_query
-        future_related = _node_detail_executor.submit(
-            lambda: graph.query(related_query, params=params_id)
-        )
-        future_stats = _node_detail_executor.submit(
-            lambda: graph.query(stat_query, params=params_id)
-        )
-        related_rows = future_related.result()
-        stat_rows = future_stats.result()
+        snap = graph_snapshot.get_snapshot()
+        if snap is not None and key in snap.index:
+            # 이웃·통계는 인-프로세스 스냅샷에서 (속성만 Neo4j)
+            related_rows, stat_rows = _snapshot_related(snap, snap.index[key], node_type)
+        else:
+            # 관련 노드 + 통계 쿼리 병렬 실행 (체감 지연 감소)
+            params_id = {"key": key, "keys": [key]}
+            stat_query = max_ratio_query if node_type == "company" else holdings_query
+            future_related = _node_detail_executor.submit(
+                lambda: graph.query(related_query, params=params_id)
+            )
+            future_stats = _node_detail_executor.submit(
+                lambda: graph.query(stat_query, params=params_id)
+            )
+            related_rows = future_related.result()
+            stat_rows = future_stats.result()
 
         related = [
             {
-                "id": f"n{r['id']}",
+                "id": r["id"],
                 "label": r.get("props", {}).get("companyName")
                 or r.get("props", {}).get("stockName", "Unknown"),
                 "type": "company"
@@ -518,14 +950,14 @@ def get_node_detail(node_id: str):
             ]
 
         result = {
-            "id": f"n{neo4j_id}",
+            "id": key,
             "type": node_type,
             "label": props.get("companyName") or props.get("stockName", "Unknown"),
             "sub": "회사"
             if node_type == "company"
             else ("최대주주" if node_type == "major" else ("기관" if node_type == "institution" else "개인주주")),
             "stats": stats,
-            "props": {k: v for k, v in props.items() if k not in ["nameEmbedding"]},
+            "props": {k: v for k, v in props.items() if k not in internal_properties()},
             "related": related,
         }
         _NODE_DETAIL_CACHE[cache_key] = (now + NODE_DETAIL_CACHE_TTL_SEC, result)
@@ -554,7 +986,7 @@ def _row_to_node(r: dict) -> dict:
     """Neo4j row (id, labels, props) → 시각화용 노드 딕셔너리 (공통)."""
     labels = r.get("labels") or []
     props = r.get("props") or {}
-    nid = f"n{r['id']}"
+    nid = r["id"]
     if "Company" in labels:
         return {
             "id": nid,
@@ -563,6 +995,7 @@ def _row_to_node(r: dict) -> dict:
             "bizno": props.get("bizno"),
             "active": props.get("isActive", True),
             "sub": "회사",
+            **_metric_fields(props),
         }
     if "Stockholder" in labels:
         shareholder_type = (props.get("shareholderType") or "PERSON").upper()
@@ -574,33 +1007,30 @@ def _row_to_node(r: dict) -> dict:
             "label": (props.get("stockName") or props.get("companyName") or "Unknown").strip(),
             "shareholderType": shareholder_type,
             "sub": "최대주주" if is_major else ("기관" if shareholder_type != "PERSON" else "개인주주"),
+            **_metric_fields(props),
         }
     return {"id": nid, "type": "company", "label": "Unknown", "sub": ""}
 
 
-@router.get("/ego")
-def get_ego_graph(
-    node_id: str = Query(..., description="중심 노드 ID (예: n123)"),
-    max_hops: int = Query(2, ge=1, le=3, description="확장 홉 수"),
-    max_nodes: int = Query(120, ge=10, le=300, description="최대 노드 수"),
-):
-    """
-    Ego-Graph: 중심 노드 기준 N홉 이내 노드·엣지만 반환 (지배구조 맵용).
-    Neo4j에서 (Stockholder)-[:HOLDS_SHARES]->(Company) 방향으로 확장.
-    """
-    graph = graph_service.get_graph()
-    neo4j_id = _neo4j_id(node_id)
+# 노드 집합 내부 HOLDS_SHARES 엣지 (주주 쪽 nodeKey seek, 회사 쪽은 목록 필터)
+_EDGES_AMONG_KEYS = """
+    UNWIND $keys AS k
+    MATCH (a:Stockholder {nodeKey: k})-[r:HOLDS_SHARES]->(b:Company)
+    WHERE b.nodeKey IN $keys
+    RETURN a.nodeKey AS fromId, b.nodeKey AS toId, r.stockRatio AS ratio
+"""
 
-    # 1) Ego + 양방향 1..max_hops 이내 노드 수집 (중복 제거)
+
+def _ego_nodes(graph, key: str, max_hops: int, max_nodes: int) -> list[dict]:
+    """중심 노드 + 양방향 1..max_hops 이내 노드 (중복 제거, 시각화용 dict). 없으면 404."""
     # CTO: Neo4j는 관계 패턴 길이를 파라미터로 직접 지원하지 않음
     # 해결: max_hops 값에 따라 쿼리를 동적으로 생성 (1~3 홉만 허용)
     max_hops_clamped = max(1, min(3, max_hops))
     
     # 관계 패턴 길이는 리터럴만 허용, 동적 쿼리 생성
     # 보안: max_hops_clamped는 이미 1~3 범위로 제한되어 있음
-    nodes_query = f"""
-        MATCH (ego)
-        WHERE id(ego) = $id
+    nodes_query = _NODES_BY_KEYS + f"""
+        WITH n AS ego
         OPTIONAL MATCH (ego)-[r1:HOLDS_SHARES*1..{max_hops_clamped}]->(n1)
         OPTIONAL MATCH (ego)<-[r2:HOLDS_SHARES*1..{max_hops_clamped}]-(n2)
         WITH ego, n1, n2
@@ -608,12 +1038,12 @@ def get_ego_graph(
         WITH n WHERE n IS NOT NULL
         WITH DISTINCT n
         LIMIT $max_nodes
-        RETURN id(n) AS id, labels(n) AS labels, properties(n) AS props
+        RETURN n.nodeKey AS id, labels(n) AS labels, properties(n) AS props
     """
     try:
         rows = graph.query(
             nodes_query, 
-            params={"id": neo4j_id, "max_nodes": max_nodes}
+            params={"keys": [key], "max_nodes": max_nodes}
         )
     except Exception as e:
         logger.error(f"Ego 노드 조회 실패: {str(e)}", exc_info=True)
@@ -630,17 +1060,60 @@ def get_ego_graph(
 
     if not nodes:
         raise HTTPException(404, "해당 노드를 찾을 수 없거나 연결된 노드가 없습니다.")
+    return nodes
 
-    node_ids = [int(x["id"].lstrip("n")) for x in nodes]
 
-    # 2) 위 노드들 사이의 HOLDS_SHARES 엣지만 조회
-    edges_query = """
-        MATCH (a)-[r:HOLDS_SHARES]->(b)
-        WHERE id(a) IN $ids AND id(b) IN $ids
-        RETURN id(a) AS fromId, id(b) AS toId, r.stockRatio AS ratio
+def _ego_edges(edge_rows: list[dict]) -> list[dict]:
+    edges = []
+    for row in edge_rows:
+        r_val = _clamp_ratio(row.get("ratio"))
+        edges.append({
+            "from": row["fromId"],
+            "to": row["toId"],
+            "type": "HOLDS_SHARES",
+            "ratio": round(r_val, 1),
+            "label": f"{r_val:.1f}%",
+        })
+    return edges
+
+
+def _snapshot_ego(snap, key: str, max_hops: int, max_nodes: int) -> tuple[list[dict], list[dict]]:
+    """_ego_nodes + _EDGES_AMONG_KEYS 를 인-프로세스 스냅샷에서. (노드, 엣지 row {fromId, toId, ratio})."""
+    members = snap.ego(snap.index[key], max_hops, max_nodes)
+    nodes = [_row_to_node(snap.row(i)) for i in members]
+    edge_rows = [
+        {"fromId": snap.keys[u], "toId": snap.keys[v], "ratio": ratio}
+        for u, v, ratio in snap.relationships_among(members)
+    ]
+    return nodes, edge_rows
+
+
+@router.get("/ego")
+def get_ego_graph(
+    request: Request,
+    node_id: str = Query(..., description="중심 노드 ID (nodeKey, 예: c_1234567890)"),
+    max_hops: int = Query(2, ge=1, le=3, description="확장 홉 수"),
+    max_nodes: int = Query(120, ge=10, le=300, description="최대 노드 수"),
+):
     """
+    Ego-Graph: 중심 노드 기준 N홉 이내 노드·엣지만 반환 (지배구조 맵용).
+    (Stockholder)-[:HOLDS_SHARES]->(Company) 방향으로 확장. 인-프로세스 스냅샷이 있으면 메모리에서, 없으면 Neo4j.
+    """
+    key = _node_key(node_id)
+    snap = graph_snapshot.get_snapshot()
+    if snap is not None and key in snap.index:
+        nodes, edge_rows = _snapshot_ego(snap, key, max_hops, max_nodes)
+        return _negotiate(request, {"nodes": nodes, "edges": _ego_edges(edge_rows), "ego_id": key})
+
+    graph = graph_service.get_graph()
+
+    # 1) Ego + 양방향 1..max_hops 이내 노드 수집 (중복 제거)
+    nodes = _ego_nodes(graph, key, max_hops, max_nodes)
+    node_keys = [x["id"] for x in nodes]
+
+    # 2) 위 노드들 사이의 HOLDS_SHARES 엣지만 조회 (주주 쪽 nodeKey seek, 회사 쪽은 목록 필터)
     try:
-        edge_rows = graph.query(edges_query, params={"ids": node_ids})
+        edge_rows = graph.query(_EDGES_AMONG_KEYS, params={"keys": node_keys})
     except ServiceUnavailable:
         logger.error("Neo4j 서비스 사용 불가", exc_info=True)
         raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
@@ -654,19 +1127,164 @@ def get_ego_graph(
         logger.error(f"Ego 엣지 조회 실패: {str(e)}", exc_info=True)
         raise HTTPException(500, f"Ego 그래프 조회 실패: {str(e)}") from e
 
-    edges = []
-    for row in edge_rows:
-        r_val = _clamp_ratio(row.get("ratio"))
-        edges.append({
-            "from": f"n{row['fromId']}",
-            "to": f"n{row['toId']}",
-            "type": "HOLDS_SHARES",
-            "ratio": round(r_val, 1),
-            "label": f"{r_val:.1f}%",
-        })
-
-    return {
+    return _negotiate(request, {
         "nodes": nodes,
-        "edges": edges,
-        "ego_id": f"n{neo4j_id}",
-    }
+        "edges": _ego_edges(edge_rows),
+        "ego_id": key,
+    })
+
+
+@router.get("/heatmap")
+def get_heatmap(
+    request: Request,
+    node_id: Optional[str] = Query(None, description="중심 노드 ID — ego 집합(N홉 이내) 히트맵"),
+    company_ids: Optional[str] = Query(None, description="회사 nodeKey 목록(쉼표 구분) — 해당 회사들의 주주 × 회사"),
+    max_hops: int = Query(2, ge=1, le=3, description="ego 확장 홉 수"),
+    max_nodes: int = Query(120, ge=10, le=300, description="ego 최대 노드 수"),
+    min_ratio: Optional[float] = Query(None, ge=0, le=100, description="최소 지분율(%)"),
+    ordering: str = Query("rcm", description="행·열 순서: rcm(블록 정렬) | label(이름순)"),
+    max_rows: int = Query(300, ge=1, le=2000, description="최대 행(주주) 수"),
+    max_cols: int = Query(300, ge=1, le=2000, description="최대 열(회사) 수"),
+):
+    """
+    지배구조 히트맵: 주주(행) × 회사(열) 지분율 희소 행렬 (CSR: indptr, indices, data).
+    node_id 또는 company_ids 중 하나 필수. 행·열은 RCM 으로 블록 정렬. 결과 TTL 캐시.
+    """
+    if bool(node_id) == bool(company_ids):
+        raise HTTPException(400, "node_id 또는 company_ids 중 하나를 지정해주세요.")
+    if ordering not in heatmap_service.ORDERINGS:
+        raise HTTPException(400, f"ordering 은 {', '.join(heatmap_service.ORDERINGS)} 중 하나여야 합니다.")
+    if node_id:
+        scope: tuple = ("ego", _node_key(node_id), max_hops, max_nodes)
+    else:
+        keys = sorted(set(_node_keys(company_ids)))
+        if len(keys) > HEATMAP_MAX_COMPANIES:
+            raise HTTPException(400, f"company_ids 는 최대 {HEATMAP_MAX_COMPANIES}개까지 지정할 수 있습니다.")
+        scope = ("companies", tuple(keys))
+    cache_key = scope + (min_ratio, ordering, max_rows, max_cols)
+    cached = heatmap_service.cache_get(cache_key)
+    if cached is not None:
+        return _negotiate(request, cached)
+
+    snap = graph_snapshot.get_snapshot()
+    from_snapshot = snap is not None and scope[0] == "ego" and scope[1] in snap.index
+    graph = None if from_snapshot else graph_service.get_graph()
+    try:
+        if from_snapshot:
+            nodes, rows = _snapshot_ego(snap, scope[1], max_hops, max_nodes)
+            labels = {n["id"]: n["label"] for n in nodes}
+        elif scope[0] == "ego":
+            nodes = _ego_nodes(graph, scope[1], max_hops, max_nodes)
+            labels = {n["id"]: n["label"] for n in nodes}
+            rows = graph.query(_EDGES_AMONG_KEYS, params={"keys": list(labels)})
+        else:
+            rows = graph.query(
+                """
+                UNWIND $keys AS k
+                MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company {nodeKey: k})
+                RETURN s.nodeKey AS fromId, c.nodeKey AS toId, r.stockRatio AS ratio,
+                       coalesce(s.stockName, s.companyName, 'Unknown') AS fromLabel,
+                       coalesce(c.companyName, 'Unknown') AS toLabel
+                """,
+                params={"keys": list(scope[1])},
+            )
+            labels = {}
+            for r in rows:
+                labels[r["fromId"]] = r["fromLabel"]
+                labels[r["toId"]] = r["toLabel"]
+    except HTTPException:
+        raise
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"히트맵 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"히트맵 조회 실패: {str(e)}") from e
+
+    edges = [
+        {"from": r["fromId"], "to": r["toId"], "ratio": r.get("ratio")}
+        for r in rows
+        if min_ratio is None or (r.get("ratio") or 0) >= min_ratio
+    ]
+    result = heatmap_service.build_heatmap(
+        edges, labels, ordering=ordering, max_rows=max_rows, max_cols=max_cols
+    )
+    if scope[0] == "ego":
+        result["ego_id"] = scope[1]
+    heatmap_service.cache_put(cache_key, result)
+    return _negotiate(request, result)
+
+
+RANKING_METRICS = ("pagerank", "betweenness")
+
+# 분석 배치가 기록한 지표 순 노드 (레이블별 UNION 으로 법인 주주 중복 제거, 노드 유형 필터는 _row_to_node 기준)
+_RANKINGS_QUERY = """
+    CALL {{
+        MATCH (n:Company) WHERE n.{metric} IS NOT NULL RETURN n
+        UNION
+        MATCH (n:Stockholder) WHERE n.{metric} IS NOT NULL RETURN n
+    }}
+    WITH n AS s
+    WHERE ($community IS NULL OR s.communityId = $community)
+      AND ($scc IS NULL OR s.sccId = $scc)
+      AND ($nt IS NULL OR ($nt = 'company' AND s:Company)
+           OR ($nt <> 'company' AND NOT s:Company AND """ + _STOCKHOLDER_TYPE_FILTER + """))
+    RETURN s.nodeKey AS id, labels(s) AS labels, properties(s) AS props
+    ORDER BY s.{metric} DESC, s.nodeKey
+    LIMIT $limit
+"""
+
+
+@router.get("/rankings")
+def get_rankings(
+    request: Request,
+    metric: str = Query("pagerank", description="정렬 지표: pagerank | betweenness"),
+    node_type: Optional[str] = Query(None, description="필터: company, person, major, institution"),
+    community_id: Optional[int] = Query(None, ge=0, description="커뮤니티(계열 후보) 번호"),
+    scc_id: Optional[int] = Query(None, ge=0, description="상호출자 고리(강연결요소) 번호"),
+    limit: int = Query(50, ge=1, le=500),
+):
+    """
+    분석 배치(app.services.graph_metrics)가 미리 기록한 중요도 순 노드. 요청 시 계산 없음.
+    community_id·scc_id 로 계열·고리 구성원만 조회. 배치 실행 전이면 빈 목록.
+    인-프로세스 스냅샷이 있으면 메모리에서, 없으면 Neo4j.
+    """
+    if metric not in RANKING_METRICS:
+        raise HTTPException(400, f"metric 은 {', '.join(RANKING_METRICS)} 중 하나여야 합니다.")
+    nt = (node_type or "").lower().strip() or None
+    snap = graph_snapshot.get_snapshot()
+    if snap is not None:
+        nodes = []
+        for i in snap.ranked(metric, community=community_id, scc=scc_id).tolist():
+            node = _row_to_node(snap.row(i))
+            if nt is None or node["type"] == nt:
+                nodes.append(node)
+                if len(nodes) >= limit:
+                    break
+        return _negotiate(request, {"metric": metric, "nodes": nodes, "total": len(nodes)})
+
+    try:
+        rows = graph_service.get_graph().query(
+            _RANKINGS_QUERY.format(metric=metric),
+            params={"community": community_id, "scc": scc_id, "nt": nt, "limit": limit},
+        )
+    except ServiceUnavailable:
+        logger.error("Neo4j 서비스 사용 불가", exc_info=True)
+        raise HTTPException(503, "데이터베이스 서비스 사용 불가. 잠시 후 다시 시도해주세요.")
+    except TransientError:
+        logger.error("Neo4j 일시적 오류", exc_info=True)
+        raise HTTPException(503, "일시적 오류가 발생했습니다. 잠시 후 다시 시도해주세요.")
+    except ClientError as e:
+        logger.error(f"Neo4j 클라이언트 오류: {e}", exc_info=True)
+        raise HTTPException(400, f"쿼리 오류: {str(e)[:200]}")
+    except Exception as e:
+        logger.error(f"순위 조회 실패: {str(e)}", exc_info=True)
+        raise HTTPException(500, f"순위 조회 실패: {str(e)}") from e
+    nodes = [_row_to_node(r) for r in rows]
+    return _negotiate(request, {"metric": metric, "nodes": nodes, "total": len(nodes)})
@@ -1,6 +1,11 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
 
+from app.core import metrics
+
+from app.services import data_version, schema_snapshot
 from app.services import graph_service
+from app.services import health_service
 
 router = APIRouter(tags=["system"])
 
@@ -19,11 +24,47 @@ def ping():
     return {"status": "ok", "ping": "pong"}
 
 
+@router.get("/live")
+def live():
+    """라이브니스. I/O 없음 — 프로세스가 요청을 받을 수 있는지만 확인."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    """
+    레디니스. 백그라운드 프로브가 캐시한 Neo4j 연결 상태만 읽음 (DB 쿼리 없음).
+    Docker/오케스트레이터의 빈번한 폴링용. 준비되지 않았으면 503.
+    """
+    state = health_service.readiness()
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    인-프로세스 카운터·히스토그램을 Prometheus 텍스트 형식으로 (요청 지연·구간·LLM·Cypher 등).
+    값은 워커 프로세스별 — 워커가 여럿이면 스크레이프마다 다른 워커가 응답할 수 있음.
+    """
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.get("/health/deep")
+def health_deep():
+    """
+    의존성별(Neo4j, 임베딩, LLM) 진단 + 지연 시간(ms). 실제 호출을 수행하므로 가끔만 사용.
+    하나라도 실패하면 503.
+    """
+    result = health_service.deep_check()
+    return JSONResponse(result, status_code=200 if result["status"] == "healthy" else 503)
+
+
 @router.get("/health")
 def health():
     """
     상세한 헬스 체크 (Neo4j 연결 상태 포함).
     CTO: 백엔드 및 데이터베이스 상태를 종합적으로 확인.
+    주의: 연결 확인 + 레이블 집계 스캔을 수행. 주기적 폴링은 /ready 사용.
     """
     from datetime import datetime
     
@@ -39,6 +80,8 @@ def health():
         # 간단한 쿼리로 연결 확인
         graph.query("RETURN 1 AS test LIMIT 1")
         health_status["neo4j"] = "connected"
+        health_status["data_version"] = data_version.current()
+        health_status["schema_snapshot"] = schema_snapshot.current()
         
         # 노드 통계 (선택적)
         try:
@@ -16,17 +16,134 @@ class Settings(BaseSettings):
 
     # OpenAI
     OPENAI_API_KEY: str = ""
+    OPENAI_BASE_URL: str = ""  # OpenAI 호환 서버(로컬 모의 서버 등). 비우면 api.openai.com
 
     # 모델
     LLM_MODEL: str = "gpt-4o-mini"
     EMBED_MODEL: str = "text-embedding-3-small"
     EMBED_DIM: int = 1536
 
+    # 모델 제공자(app.services.model_provider): 생성·임베딩 각각 openai | local,
+    # 로컬 OpenAI 호환 생성 서버 URL·모델, 로컬 sentence-transformers 임베딩 모델,
+    # 단건 임베딩 묶음 크기·묶기 대기(ms), 기동 시 워밍업, 회사명 임베딩 속성·벡터 인덱스 이름
+    # (제공자를 바꾸면 차원이 달라짐 → EMBED_DIM 과 함께 속성·인덱스도 따로 두고 embed-names 로 채움)
+    LLM_PROVIDER: str = "openai"
+    EMBED_PROVIDER: str = "openai"
+    LOCAL_LLM_BASE_URL: str = "http://localhost:8080/v1"
+    LOCAL_LLM_MODEL: str = "qwen2.5-1.5b-instruct"
+    LOCAL_EMBED_MODEL: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    EMBED_BATCH_SIZE: int = 32
+    EMBED_BATCH_WAIT_MS: float = 5.0
+    MODEL_WARMUP: bool = True
+    EMBED_PROPERTY: str = "nameEmbedding"
+    EMBED_INDEX: str = "company_name_vector"
+
     # 앱
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     CORS_ORIGINS: str = "*"  # 쉼표 구분 화이트리스트, 예: http://localhost:3000,https://app.example.com
 
+    # 헬스 체크: 백그라운드 프로브 주기, /ready 가 신뢰하는 최대 프로브 경과 시간
+    HEALTH_PROBE_INTERVAL_SEC: float = 10.0
+    HEALTH_READY_MAX_AGE_SEC: float = 30.0
+    HEALTH_DEEP_TIMEOUT_SEC: float = 5.0
+
+    # 자동완성 인덱스: 스트리밍 적재 페이지 크기, 전체 재적재 주기
+    # (버전 있는 쓰기는 바뀐 키만 즉시 반영 — 주기 재적재는 버전 없이 쓰는 CSV 임포트 대비)
+    SUGGEST_FETCH_SIZE: int = 5000
+    SUGGEST_REFRESH_SEC: float = 900.0
+
+    # Graphviz 레이아웃 프로세스 풀: 워커 수, 작업당 타임아웃, 워커 메모리 상한(RLIMIT_AS)
+    GRAPHVIZ_POOL_WORKERS: int = 2
+    GRAPHVIZ_TIMEOUT_SEC: float = 10.0
+    GRAPHVIZ_MEMORY_LIMIT_MB: int = 1024
+
+    # 인-프로세스 지분 그래프 스냅샷: 사용 여부(끄면 모든 조회가 Neo4j), 전체 재적재 주기
+    # (데이터 버전이 바뀌면 주기와 무관하게 재적재 — 주기 재적재는 버전 없이 쓰는 CSV 임포트 대비)
+    GRAPH_SNAPSHOT_ENABLED: bool = True
+    GRAPH_SNAPSHOT_REFRESH_SEC: float = 900.0
+
+    # 지배구조 분석(통합 지분율): 지배 판정 지분율(%), 반복 계산 상한·수렴 허용오차
+    OWNERSHIP_CONTROL_THRESHOLD_PCT: float = 50.0
+    OWNERSHIP_MAX_ITER: int = 200
+    OWNERSHIP_TOLERANCE: float = 1e-9
+
+    # 그래프 분석 배치(app.services.graph_metrics): PageRank 감쇠, betweenness 표본 수,
+    # 커뮤니티 알고리즘(louvain | leiden)·해상도, 난수 시드, UNWIND 기록 배치 크기
+    GRAPH_METRICS_PAGERANK_DAMPING: float = 0.85
+    GRAPH_METRICS_BETWEENNESS_SAMPLES: int = 256
+    GRAPH_METRICS_COMMUNITY_ALGORITHM: str = "louvain"
+    GRAPH_METRICS_COMMUNITY_RESOLUTION: float = 1.0
+    GRAPH_METRICS_SEED: int = 42
+    GRAPH_METRICS_WRITE_BATCH: int = 5000
+
+    # 공공데이터포털 금융회사지배구조정보 API 적재(app.ingest): 인증키, 서비스 URL, 페이지 크기,
+    # 동시 요청 수, 초당 요청 상한(명세 30 tps), 트랜잭션당 레코드 수, 재시도·타임아웃, 체크포인트 파일
+    DATA_GO_KR_SERVICE_KEY: str = ""
+    INGEST_API_BASE_URL: str = "http://apis.data.go.kr/1160100/service/GetFnCoGoveInfoService"
+    INGEST_PAGE_SIZE: int = 1000
+    INGEST_CONCURRENCY: int = 4
+    INGEST_RATE_PER_SEC: float = 25.0
+    INGEST_BATCH_SIZE: int = 2000
+    INGEST_MAX_RETRIES: int = 3
+    INGEST_TIMEOUT_SEC: float = 30.0
+    INGEST_CHECKPOINT_PATH: str = ".ingest_checkpoint.json"
+
+    # 데이터 버전·변경 집합(:DataVersion / :ChangeSet): 보존할 공개 변경 집합 버전 수, 백엔드 폴링 주기,
+    # 한 번에 선택 무효화할 최대 키 수(넘거나 버전 구간이 비면 전체 무효화)
+    INGEST_CHANGESET_RETENTION: int = 500
+    DATA_VERSION_POLL_SEC: float = 30.0
+    DATA_VERSION_MAX_KEYS: int = 20000
+
+    # 채팅 의도 분류(app.services.intent_router): 템플릿 경로 사용 여부, 임베딩 최근접 템플릿 채택 최소 코사인 유사도
+    INTENT_ROUTER_ENABLED: bool = True
+    INTENT_EMBED_MIN_SCORE: float = 0.80
+    # Cypher 생성 프롬프트 스키마 스냅샷(app.services.schema_snapshot): 파일 경로,
+    # 도메인 규칙에 나오는 라벨·관계·속성만 남긴 축약본 사용 여부
+    SCHEMA_SNAPSHOT_PATH: str = ".schema_snapshot.json"
+    SCHEMA_COMPACT: bool = True
+
+    # LLM 프롬프트 토큰 예산(app.services.token_budget): Cypher 생성 프롬프트 전체·그중 대화 이력 몫,
+    # 답변 문장화(QA) 프롬프트 전체 (결과 행은 예산 안에 드는 만큼만)
+    LLM_CYPHER_PROMPT_BUDGET: int = 6000
+    CHAT_HISTORY_TOKEN_BUDGET: int = 600
+    LLM_QA_PROMPT_BUDGET: int = 3000
+
+    # LLM 게이트웨이(app.services.llm_gateway): 공유 HTTP 연결 수·keep-alive(초), 호출 타임아웃,
+    # 동시 호출 수·대기 호출 상한·자리 대기 상한(넘으면 /chat 503 + Retry-After), 재시도 횟수·백오프 기준·상한(초)
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_SEC: float = 30.0
+    LLM_TIMEOUT_SEC: float = 30.0
+    LLM_MAX_CONCURRENT: int = 8
+    LLM_MAX_QUEUE: int = 32
+    LLM_QUEUE_TIMEOUT_SEC: float = 10.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SEC: float = 0.5
+    LLM_RETRY_MAX_SEC: float = 8.0
+
+    # 채팅 파이프라인: 회사명이 그대로 들어 있는 질문은 힌트를 기다리지 않고 원 질문으로 Cypher 생성을 먼저 시작할지
+    # (힌트가 질문 밖 이름이거나 라우팅되면 그 생성 1회는 버려져도 취소되지 않고 과금됨 — LLM 비용과 지연의 교환)
+    CHAT_SPECULATIVE_CYPHER: bool = True
+
+    # LLM 생성 Cypher 실행 한도(app.services.cypher_governor): 프로세스당 동시 실행 수·자리 대기 상한,
+    # 트랜잭션 타임아웃, 결과 행·바이트 상한, EXPLAIN 추정 행 상한, 가변 길이 경로 최대 hop
+    CYPHER_MAX_CONCURRENT: int = 4
+    CYPHER_QUEUE_TIMEOUT_SEC: float = 2.0
+    CYPHER_TIMEOUT_SEC: float = 10.0
+    CYPHER_MAX_ROWS: int = 100
+    CYPHER_MAX_BYTES: int = 256_000
+    CYPHER_MAX_ESTIMATED_ROWS: float = 5_000_000
+    CYPHER_MAX_VAR_LENGTH: int = 6
+
+    # 요청 추적(app.core.tracing): 요청 ID·구간 계측 사용 여부(끄면 미들웨어·구간 측정 없음),
+    # 느린 Neo4j 쿼리 로그 기준(ms, Cypher·파라미터 포함, 0 = 끔), 느린 요청 로그 기준(ms, 0 = 끔)
+    TRACING_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 1000.0
+    SLOW_REQUEST_MS: float = 3000.0
+
+    # 응답 압축(gzip/brotli) 최소 크기. 작은 응답은 압축 오버헤드가 더 큼
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+
     # 어디서 실행하든(project-root에서든 backend/에서든) root의 .env를 찾도록 절대경로 지정
     _ROOT_ENV = Path(__file__).resolve().parents[3] / ".env"  # .../stock-graph/.env
     model_config = {"env_file": str(_ROOT_ENV), "extra": "ignore"}
@@ -0,0 +1,35 @@
+"""
+키셋(keyset) 페이지네이션 커서.
+마지막 행의 정렬 키를 불투명 문자열(base64url JSON)로 돌려주고, 다음 요청에서 그 이후부터 조회.
+OFFSET(SKIP) 과 달리 뒤 페이지로 갈수록 느려지지 않고, 페이지 사이 데이터 변경에도 중복·누락이 적음.
+"""
+import base64
+import json
+from typing import Optional
+
+CURSOR_MAX_LENGTH = 512
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[dict]:
+    """
+    커서 문자열 → dict. 없으면 None.
+    Raises:
+        ValueError: 형식이 잘못된 커서 (엔드포인트에서 400 으로 변환)
+    """
+    if not cursor:
+        return None
+    if len(cursor) > CURSOR_MAX_LENGTH:
+        raise ValueError("cursor too long")
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("malformed cursor") from e
+    if not isinstance(payload, dict):
+        raise ValueError("malformed cursor")
+    return payload
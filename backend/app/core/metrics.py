@@ -0,0 +1,120 @@
+"""
+프로세스 내 계측: 카운터 + 누적 히스토그램 (외부 의존성 없음, 스레드 안전).
+
+    from app.core import metrics
+    metrics.inc("cypher_rejected_total", reason="cartesian_product")
+    with metrics.timer("cypher_execute_seconds", outcome="ok"):
+        ...
+
+이름·레이블 규칙은 Prometheus 와 같게 (snake_case, 카운터는 _total, 시간은 _seconds).
+snapshot() 은 현재 값을 dict 로, render_prometheus() 는 Prometheus 텍스트 노출 형식으로 반환 (/metrics).
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelKey = tuple[str, tuple[tuple[str, str], ...]]
+
+_lock = threading.Lock()
+_counters: dict[LabelKey, float] = {}
+_histograms: dict[LabelKey, list] = {}  # [버킷별 개수(마지막 = +Inf), 합계, 개수]
+_buckets: dict[str, tuple[float, ...]] = {}
+
+
+def _key(name: str, labels: dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def observe(name: str, value: float, *, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        bounds = _buckets.setdefault(name, buckets)
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * (len(bounds) + 1), 0.0, 0]
+        for i, bound in enumerate(bounds):
+            if value <= bound:
+                hist[0][i] += 1
+                break
+        else:
+            hist[0][-1] += 1
+        hist[1] += value
+        hist[2] += 1
+
+
+@contextmanager
+def timer(name: str, **labels) -> Iterator[dict]:
+    """
+    블록 소요 시간(초)을 히스토그램에 기록. yield 한 dict 에 레이블을 추가·변경할 수 있음
+    (예: 결과에 따라 outcome 결정).
+    """
+    t0 = time.perf_counter()
+    try:
+        yield labels
+    finally:
+        observe(name, time.perf_counter() - t0, **labels)
+
+
+def snapshot() -> dict:
+    """{"counters": [...], "histograms": [...]} — 히스토그램 buckets 는 누적 개수 (le 기준)."""
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        histograms = []
+        for (name, labels), (counts, total, count) in sorted(_histograms.items()):
+            cumulative, running = {}, 0
+            for bound, n in zip(_buckets[name] + (float("inf"),), counts):
+                running += n
+                cumulative[bound] = running
+            histograms.append(
+                {"name": name, "labels": dict(labels), "count": count, "sum": total, "buckets": cumulative}
+            )
+    return {"counters": counters, "histograms": histograms}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(labels: dict, le: Optional[str] = None) -> str:
+    pairs = [(k, _escape(str(v))) for k, v in labels.items()]
+    if le is not None:
+        pairs.append(("le", le))
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def render_prometheus() -> str:
+    """Prometheus 텍스트 노출 형식 0.0.4 (카운터·히스토그램)."""
+    snap = snapshot()
+    lines: list[str] = []
+    typed: set[str] = set()
+    for c in snap["counters"]:
+        if c["name"] not in typed:
+            typed.add(c["name"])
+            lines.append(f"# TYPE {c['name']} counter")
+        lines.append(f"{c['name']}{_label_text(c['labels'])} {_number(c['value'])}")
+    for h in snap["histograms"]:
+        name = h["name"]
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        for bound, count in h["buckets"].items():
+            lines.append(f"{name}_bucket{_label_text(h['labels'], _number(bound))} {count}")
+        lines.append(f"{name}_sum{_label_text(h['labels'])} {_number(h['sum'])}")
+        lines.append(f"{name}_count{_label_text(h['labels'])} {h['count']}")
+    return "\n".join(lines) + "\n"
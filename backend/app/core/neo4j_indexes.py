@@ -3,10 +3,13 @@ Neo4j 인덱스 및 제약 조건 관리.
 앱 기동 시 또는 수동 호출로 인덱스 생성/확인.
 """
 import logging
-from typing import List, Tuple
+import threading
+import time
+from typing import List, Optional, Tuple
 
 from neo4j.exceptions import ClientError
 
+from app.core.node_keys import homonym_key, synthetic_key
 from app.services import graph_service
 
 logger = logging.getLogger(__name__)
@@ -16,7 +19,19 @@ logger = logging.getLogger(__name__)
 
 # P0 - Critical: 성능에 직접적인 영향
 CRITICAL_INDEXES: List[Tuple[str, str]] = [
-    # 텍스트 검색 인덱스 (Neo4j 5.x+)
+    # 전문 검색(FULLTEXT) 인덱스: db.index.fulltext.queryNodes 전용.
+    # 'cjk' 분석기 = Lucene CJKAnalyzer (한글 bigram) → 부분 문자열 검색을 구문(phrase) 질의로 처리
+    (
+        "company_name_fulltext",
+        "CREATE FULLTEXT INDEX company_name_fulltext IF NOT EXISTS FOR (c:Company) ON EACH [c.companyName] "
+        "OPTIONS { indexConfig: { `fulltext.analyzer`: 'cjk' } }",
+    ),
+    (
+        "stockholder_name_fulltext",
+        "CREATE FULLTEXT INDEX stockholder_name_fulltext IF NOT EXISTS FOR (s:Stockholder) ON EACH [s.stockName, s.companyName] "
+        "OPTIONS { indexConfig: { `fulltext.analyzer`: 'cjk' } }",
+    ),
+    # 텍스트 인덱스 (Neo4j 5.x+): CONTAINS 폴백 경로 가속
     (
         "company_name_text",
         "CREATE TEXT INDEX company_name_text IF NOT EXISTS FOR (c:Company) ON (c.companyName)",
@@ -33,11 +48,24 @@ CRITICAL_INDEXES: List[Tuple[str, str]] = [
 ]
 
 # P1 - High: 데이터 무결성 및 고유성
+# nodeKey: API·캐시용 안정 키 (app.core.node_keys). 유니크 제약 = 인덱스 seek 조회
 UNIQUE_CONSTRAINTS: List[Tuple[str, str]] = [
     (
         "bizno_unique",
         "CREATE CONSTRAINT bizno_unique IF NOT EXISTS FOR (c:Company) REQUIRE c.bizno IS UNIQUE",
     ),
+    (
+        "person_id_unique",
+        "CREATE CONSTRAINT person_id_unique IF NOT EXISTS FOR (p:Person) REQUIRE p.personId IS UNIQUE",
+    ),
+    (
+        "company_node_key_unique",
+        "CREATE CONSTRAINT company_node_key_unique IF NOT EXISTS FOR (c:Company) REQUIRE c.nodeKey IS UNIQUE",
+    ),
+    (
+        "stockholder_node_key_unique",
+        "CREATE CONSTRAINT stockholder_node_key_unique IF NOT EXISTS FOR (s:Stockholder) REQUIRE s.nodeKey IS UNIQUE",
+    ),
 ]
 
 # P2 - Medium: 존재 제약 조건 및 복합 인덱스
@@ -55,6 +83,23 @@ COMPOSITE_INDEXES: List[Tuple[str, str]] = [
     ),
 ]
 
+# 분석 배치(app.services.graph_metrics) 지표: /graph/rankings 정렬·커뮤니티·고리 필터
+METRIC_INDEXES: List[Tuple[str, str]] = [
+    (f"{prefix}_{prop.lower()}", f"CREATE INDEX {prefix}_{prop.lower()} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})")
+    for label, prefix in (("Company", "company"), ("Stockholder", "stockholder"))
+    for prop in ("pagerank", "betweenness", "communityId", "sccId")
+]
+
+# 적재 데이터 버전(app.ingest.loader): 버전 노드 단일성, 대기·공개 변경 집합 조회
+VERSION_INDEXES: List[Tuple[str, str]] = [
+    (
+        "data_version_name_unique",
+        "CREATE CONSTRAINT data_version_name_unique IF NOT EXISTS FOR (v:DataVersion) REQUIRE v.name IS UNIQUE",
+    ),
+    ("changeset_status", "CREATE INDEX changeset_status IF NOT EXISTS FOR (cs:ChangeSet) ON (cs.status)"),
+    ("changeset_version", "CREATE INDEX changeset_version IF NOT EXISTS FOR (cs:ChangeSet) ON (cs.version)"),
+]
+
 
 def ensure_indexes() -> dict:
     """
@@ -77,6 +122,8 @@ def ensure_indexes() -> dict:
         + [(name, query) for name, query in UNIQUE_CONSTRAINTS]
         + [(name, query) for name, query in EXISTENCE_CONSTRAINTS]
         + [(name, query) for name, query in COMPOSITE_INDEXES]
+        + METRIC_INDEXES
+        + VERSION_INDEXES
     )
     
     for name, query in all_indexes:
@@ -135,12 +182,198 @@ def verify_indexes() -> dict:
         return {
             "indexes": [dict(row) for row in indexes_result],
             "constraints": [dict(row) for row in constraints_result],
+            "fulltext": detect_fulltext_indexes(),
         }
     except Exception as e:
         logger.error(f"Failed to verify indexes: {e}", exc_info=True)
         return {"indexes": [], "constraints": [], "error": str(e)}
 
 
+# ── nodeKey 백필 (제약 생성 전에 실행) ───────────────────────────────────────
+
+NODE_KEY_BATCH_SIZE = 5000
+
+# 자연 키가 있는 노드: Cypher 안에서 배치 단위로 설정 (반복 실행해도 안전)
+_NATURAL_KEY_BACKFILL = [
+    (
+        "company_bizno",
+        """
+        MATCH (c:Company) WHERE c.nodeKey IS NULL AND c.bizno IS NOT NULL
+        WITH c LIMIT $batch
+        SET c.nodeKey = 'c_' + replace(trim(toString(c.bizno)), '-', '')
+        RETURN count(c) AS n
+        """,
+    ),
+    (
+        "person_id",
+        """
+        MATCH (p:Stockholder) WHERE p.nodeKey IS NULL AND p.personId IS NOT NULL AND NOT p:Company
+        WITH p LIMIT $batch
+        SET p.nodeKey = 'p_' + trim(toString(p.personId))
+        RETURN count(p) AS n
+        """,
+    ),
+]
+
+# 동명 구분용 안정 데이터(crno, 보유 회사·주주)를 같이 읽음 — elementId 는 재적재마다 바뀌므로 순서·키에 쓰지 않음
+_MISSING_KEY_QUERY = """
+    MATCH (n) WHERE (n:Company OR n:Stockholder) AND n.nodeKey IS NULL
+    WITH n,
+         CASE WHEN n:Company THEN 'company' ELSE 'stockholder' END AS kind,
+         coalesce(n.companyName, n.stockName, '') AS name
+    ORDER BY kind, name
+    LIMIT $batch
+    RETURN elementId(n) AS eid, kind, name,
+           n.shareholderType AS shareholderType,
+           toString(n.crno) AS crno,
+           [(n)-[:HOLDS_SHARES]->(c:Company) | coalesce(c.bizno, c.crno, c.companyName)] AS held,
+           [(h:Stockholder)-[:HOLDS_SHARES]->(n) | coalesce(h.personId, h.stockName, h.companyName)] AS holders
+"""
+
+_EXISTING_KEYS_QUERY = """
+    UNWIND $keys AS k
+    OPTIONAL MATCH (c:Company {nodeKey: k})
+    OPTIONAL MATCH (s:Stockholder {nodeKey: k})
+    WITH k WHERE c IS NOT NULL OR s IS NOT NULL
+    RETURN collect(k) AS taken
+"""
+
+
+def _homonym_discriminator(row: dict) -> str:
+    """동명 노드 구분 값: crno + 보유 회사 + 주주 (정렬된 안정 데이터)."""
+    held = sorted(str(v) for v in row.get("held") or [] if v is not None)
+    holders = sorted(str(v) for v in row.get("holders") or [] if v is not None)
+    return "|".join((row.get("crno") or "", ",".join(held), ",".join(holders)))
+
+
+def ensure_node_keys() -> dict:
+    """
+    nodeKey 가 없는 Company/Stockholder 노드에 안정 키를 부여합니다.
+    자연 키(bizno, personId) 우선, 없으면 이름 기반 합성 키. 동명이면 구분 값이 가장 작은 노드가 합성 키,
+    나머지는 구분 값 해시 접미사 (homonym_key) — 처리 순서·elementId 와 무관하게 같은 데이터면 같은 키.
+
+    Returns:
+        { 단계명: 설정된 노드 수 }
+    """
+    graph = graph_service.get_graph()
+    counts: dict[str, int] = {}
+    for name, query in _NATURAL_KEY_BACKFILL:
+        total = 0
+        while True:
+            rows = graph.query(query, params={"batch": NODE_KEY_BATCH_SIZE})
+            n = rows[0]["n"] if rows else 0
+            total += n
+            if n < NODE_KEY_BATCH_SIZE:
+                break
+        counts[name] = total
+
+    total = 0
+    while True:
+        rows = graph.query(_MISSING_KEY_QUERY, params={"batch": NODE_KEY_BATCH_SIZE})
+        if not rows:
+            break
+        base_keys = [synthetic_key(r["kind"], r["name"], r.get("shareholderType")) for r in rows]
+        groups: dict[str, list[dict]] = {}
+        for row, base in zip(rows, base_keys):
+            groups.setdefault(base, []).append(row)
+        if len(rows) == NODE_KEY_BATCH_SIZE and len(groups) > 1:
+            # 배치 끝에서 잘렸을 수 있는 동명 그룹은 키를 주지 않고 다음 배치에서 통째로 처리
+            # (잘린 채 주면 어느 노드가 합성 키를 받는지가 배치 경계에 따라 달라짐)
+            groups.pop(base_keys[-1])
+        candidates = set(groups)
+        for base, members in groups.items():
+            candidates.update(homonym_key(base, _homonym_discriminator(r)) for r in members)
+        taken_rows = graph.query(_EXISTING_KEYS_QUERY, params={"keys": sorted(candidates)})
+        taken = set(taken_rows[0]["taken"]) if taken_rows else set()
+        assignments = []
+        for base, members in groups.items():
+            for row in sorted(members, key=_homonym_discriminator):
+                discriminator = _homonym_discriminator(row)
+                key, n = base, 1
+                if key in taken:
+                    key = homonym_key(base, discriminator)
+                # 구분 값까지 같은 노드(이름·보유 관계가 모두 같음)만 번호로 구분
+                while key in taken:
+                    n += 1
+                    key = homonym_key(base, f"{discriminator}#{n}")
+                taken.add(key)
+                assignments.append({"eid": row["eid"], "key": key})
+        graph.query(
+            "UNWIND $rows AS row MATCH (n) WHERE elementId(n) = row.eid SET n.nodeKey = row.key",
+            params={"rows": assignments},
+        )
+        total += len(assignments)
+    counts["synthetic"] = total
+
+    logger.info(f"nodeKey backfill: {counts}")
+    return counts
+
+
+# ── 전문 검색 인덱스 사용 가능 여부 (기동 시 감지, 이후 백그라운드 재확인) ─────────
+
+FULLTEXT_INDEX_NAMES = ("company_name_fulltext", "stockholder_name_fulltext")
+# 미사용 상태(생성 직후 POPULATING, 질의 실패 등)면 백그라운드 스레드가 이 주기로 재확인 — 요청 경로는 캐시만 읽음
+FULLTEXT_RECHECK_SEC = 60.0
+
+_fulltext_online: dict[str, bool] = {}
+_recheck_lock = threading.Lock()
+_recheck_thread: Optional[threading.Thread] = None
+
+
+def detect_fulltext_indexes() -> dict[str, bool]:
+    """
+    SHOW FULLTEXT INDEXES 로 인덱스가 ONLINE 인지 확인하고 결과를 캐시합니다.
+    ONLINE 이 아닌 인덱스가 있으면 백그라운드 재확인을 시작합니다.
+
+    Returns:
+        { 인덱스명: ONLINE 여부 }
+    """
+    global _fulltext_online
+    online = {name: False for name in FULLTEXT_INDEX_NAMES}
+    try:
+        graph = graph_service.get_graph()
+        rows = graph.query(
+            "SHOW FULLTEXT INDEXES YIELD name, state WHERE name IN $names RETURN name, state",
+            params={"names": list(FULLTEXT_INDEX_NAMES)},
+        )
+        for row in rows:
+            online[row["name"]] = row.get("state") == "ONLINE"
+    except Exception as e:
+        logger.warning(f"Failed to detect fulltext indexes: {e}")
+    _fulltext_online = online
+    logger.info(f"Fulltext index availability: {online}")
+    if not all(online.values()):
+        _start_recheck()
+    return online
+
+
+def _recheck_loop() -> None:
+    # 스레드 자신이 살아 있는 동안 detect_fulltext_indexes 의 _start_recheck 는 아무것도 하지 않음
+    while not all(_fulltext_online.values()):
+        time.sleep(FULLTEXT_RECHECK_SEC)
+        detect_fulltext_indexes()
+
+
+def _start_recheck() -> None:
+    global _recheck_thread
+    with _recheck_lock:
+        if _recheck_thread is not None and _recheck_thread.is_alive():
+            return
+        _recheck_thread = threading.Thread(target=_recheck_loop, name="fulltext_recheck", daemon=True)
+        _recheck_thread.start()
+
+
+def fulltext_index_available(name: str) -> bool:
+    """검색 경로 선택용. 캐시된 감지 결과만 반환 (요청 안에서 Neo4j 재감지 없음)."""
+    return _fulltext_online.get(name, False)
+
+
+def mark_fulltext_unavailable(name: str) -> None:
+    """질의 실패 시 호출. 백그라운드 재확인이 ONLINE 을 확인할 때까지 폴백 경로 사용."""
+    _fulltext_online[name] = False
+    _start_recheck()
+
+
 # ── 앱 기동 시 자동 실행 (선택적) ────────────────────────────────────────────
 
 def init_indexes_on_startup():
@@ -149,12 +382,15 @@ def init_indexes_on_startup():
     main.py에서 호출하거나 별도 스크립트로 실행.
     """
     try:
+        node_keys = ensure_node_keys()
         result = ensure_indexes()
+        result["node_keys"] = node_keys
         if result["errors"]:
             logger.warning(
                 f"Some indexes failed to create: {result['errors']}. "
                 "The app will continue, but performance may be degraded."
             )
+        result["fulltext"] = detect_fulltext_indexes()
         return result
     except Exception as e:
         logger.error(f"Failed to initialize indexes on startup: {e}", exc_info=True)
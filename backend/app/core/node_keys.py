@@ -0,0 +1,61 @@
+"""
+노드 안정 키(nodeKey) 규칙.
+
+Neo4j 내부 id(id(n), elementId)는 데이터 재적재 시 바뀌므로 API·캐시 키로 쓰지 않는다.
+모든 Company/Stockholder 노드는 nodeKey 속성을 가지며, 레이블별 유니크 제약(인덱스)으로 조회한다.
+
+- c_<bizno>     회사 (법인 주주 Company:Stockholder 포함)
+- c_<crno>      API 적재(app.ingest)로 처음 생긴 회사 — 기존 회사와 같으면 기존 키 재사용
+- p_<personId>  개인 주주
+- h_<해시16>    자연 키가 없는 주주/회사: 레이블 종류 + 정규화 이름 + 주주유형의 SHA-1
+- h_<해시16>~<해시8>  위 키가 이미 있는 동명 노드: 안정 데이터(crno, 보유 회사·주주 목록)의 SHA-1
+"""
+import hashlib
+import re
+from typing import Optional
+
+from app.core.config import get_settings
+
+NODE_KEY_PROPERTY = "nodeKey"
+
+# 쉼표(node_ids 구분자)·공백 제외
+_KEY_RE = re.compile(r"^[cph]_[^,\s]{1,64}$")
+# 회사명 비교에서 무시하는 법인 표기·공백
+_NAME_NOISE_RE = re.compile(r"\(주\)|㈜|주식회사|\s+")
+
+
+def company_key(bizno: str) -> str:
+    return f"c_{str(bizno).replace('-', '').strip()}"
+
+
+def person_key(person_id: str) -> str:
+    return f"p_{str(person_id).strip()}"
+
+
+def synthetic_key(kind: str, name: str, shareholder_type: Optional[str] = None) -> str:
+    """자연 키 없는 노드용. 같은 (종류, 이름, 유형) 이면 재적재해도 같은 키."""
+    norm = " ".join((name or "").split()).lower()
+    raw = f"{kind}|{norm}|{(shareholder_type or '').upper()}"
+    return "h_" + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def name_key(name: str) -> str:
+    """회사명 비교용 (법인 표기·공백 제거). 적재 시 회사 매칭과 채팅 힌트 매칭이 같은 규칙을 씀."""
+    return _NAME_NOISE_RE.sub("", name or "").lower()
+
+
+def homonym_key(base: str, discriminator: str) -> str:
+    """동명 노드용. 구분 값이 같으면 재적재·처리 순서와 무관하게 같은 키."""
+    return f"{base}~" + hashlib.sha1(discriminator.encode("utf-8")).hexdigest()[:8]
+
+
+def internal_properties() -> frozenset[str]:
+    """
+    적재·임베딩 부산물 속성 (LLM 프롬프트·답변에 쓰일 일 없음). 임베딩 속성은 설정(EMBED_PROPERTY)을 따르고,
+    제공자 전환 전의 기본 속성 nameEmbedding 도 함께 숨김.
+    """
+    return frozenset(("srcId", "srcHash", "nameEmbedding", NODE_KEY_PROPERTY, get_settings().EMBED_PROPERTY))
+
+
+def is_node_key(value: str) -> bool:
+    return bool(_KEY_RE.match(value or ""))
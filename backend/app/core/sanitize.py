@@ -3,8 +3,12 @@
 엔드포인트에서 일관된 정제 정책 적용.
 """
 import html
+import re
 from typing import Optional
 
+# Lucene 질의 문법 특수문자 (fulltext 인덱스 질의 시 이스케이프)
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-!(){}\[\]^"~*?:\\/]|&&|\|\|)')
+
 
 def sanitize_text(
     value: Optional[str],
@@ -26,6 +30,15 @@ def sanitize_text(
     return sanitized
 
 
+def lucene_phrase(value: str) -> str:
+    """
+    검색어를 Lucene 구문(phrase) 질의로 변환. 특수문자 이스케이프 후 큰따옴표로 감쌈.
+    CJK bigram 분석기에서 구문 질의 = 연속 bigram 일치 → 2글자 이상 한글 음절열일 때만 CONTAINS 와 같은
+    부분 문자열 의미 (영문·숫자는 단어 단위, 공백·특수문자는 토큰 경계라 다름).
+    """
+    return '"' + _LUCENE_SPECIAL_RE.sub(r"\\\1", value) + '"'
+
+
 # 엔드포인트별 권장 길이 (일관성)
 SEARCH_MAX_LENGTH = 100
 QUESTION_MAX_LENGTH = 500
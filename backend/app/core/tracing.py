@@ -0,0 +1,223 @@
+"""
+요청 추적: 요청 ID + 구간(span) 계측 + 느린 쿼리 로그.
+
+- TracingMiddleware: 요청마다 ID(들어온 X-Request-ID, 없으면 생성) → 응답 헤더 X-Request-ID,
+  구간별 합계 Server-Timing (neo4j;dur=…, llm;dur=…). http_request_seconds{method,route,status}
+- span(name): Neo4j 쿼리·레이아웃 엔진·임베딩·LLM 호출을 감싸 span_seconds{span} 에 기록하고 현재 요청에 합산.
+  요청 문맥(contextvars)은 asyncio.to_thread·스레드풀 엔드포인트로 이어짐 (직접 만든 스레드·풀은 제외)
+- query_span(query, params): span("neo4j") + SLOW_QUERY_MS 이상이면 Cypher·파라미터를 WARNING 로그
+
+TRACING_ENABLED=false 면 미들웨어를 붙이지 않고 span 은 공용 no-op 컨텍스트 (설정 조회 1회).
+느린 쿼리 로그는 SLOW_QUERY_MS 로 따로 켜고 끔.
+
+    from app.core import tracing
+    with tracing.span("layout"):
+        ...
+"""
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from app.core import get_settings, metrics
+
+logger = logging.getLogger(__name__)
+
+_NOOP = nullcontext()
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+_MAX_QUERY_CHARS = 2000
+_MAX_PARAMS_CHARS = 2000
+_MAX_PARAM_ITEMS = 10
+
+
+class _RequestTrace:
+    """요청 하나의 구간 합계 {이름: [횟수, 초]} (여러 스레드에서 합산)."""
+
+    __slots__ = ("request_id", "spans", "_lock")
+
+    def __init__(self, request_id: str) -> None:
+        self.request_id = request_id
+        self.spans: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            total = self.spans.setdefault(name, [0, 0.0])
+            total[0] += 1
+            total[1] += seconds
+
+    def server_timing(self, elapsed: float) -> str:
+        with self._lock:
+            parts = [f'{name};desc="{n} calls";dur={s * 1000:.1f}' for name, (n, s) in sorted(self.spans.items())]
+        parts.append(f"total;dur={elapsed * 1000:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[_RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def enabled() -> bool:
+    return get_settings().TRACING_ENABLED
+
+
+def request_id() -> Optional[str]:
+    """현재 요청 ID (요청 밖이면 None)."""
+    trace = _current.get()
+    return trace.request_id if trace is not None else None
+
+
+class _Span:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Span":
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._finish(time.perf_counter() - self.t0)
+
+    def _finish(self, elapsed: float) -> None:
+        metrics.observe("span_seconds", elapsed, span=self.name)
+        trace = _current.get()
+        if trace is not None:
+            trace.add(self.name, elapsed)
+
+
+class _QuerySpan(_Span):
+    __slots__ = ("query", "params", "traced", "slow_sec")
+
+    def __init__(self, query: str, params: Optional[dict], traced: bool, slow_sec: float) -> None:
+        super().__init__("neo4j")
+        self.query = query
+        self.params = params
+        self.traced = traced
+        self.slow_sec = slow_sec
+
+    def _finish(self, elapsed: float) -> None:
+        if self.traced:
+            super()._finish(elapsed)
+        if self.slow_sec and elapsed >= self.slow_sec:
+            metrics.inc("neo4j_slow_queries_total")
+            logger.warning(
+                f"Slow Neo4j query {elapsed * 1000:.0f}ms [request {request_id() or '-'}]: "
+                f"{_compact_query(self.query)} | params={_summarize_params(self.params)}"
+            )
+
+
+def span(name: str):
+    """구간 계측 컨텍스트 (span_seconds{span=name}). 추적이 꺼져 있으면 no-op."""
+    if not get_settings().TRACING_ENABLED:
+        return _NOOP
+    return _Span(name)
+
+
+def query_span(query: str, params: Optional[dict] = None):
+    """Neo4j 쿼리 구간 + 느린 쿼리 로그 (SLOW_QUERY_MS, 0 = 끔). 둘 다 꺼져 있으면 no-op."""
+    s = get_settings()
+    if not s.TRACING_ENABLED and not s.SLOW_QUERY_MS:
+        return _NOOP
+    return _QuerySpan(query, params, s.TRACING_ENABLED, s.SLOW_QUERY_MS / 1000)
+
+
+def _compact_query(query: str) -> str:
+    text = " ".join(query.split())
+    return text if len(text) <= _MAX_QUERY_CHARS else text[:_MAX_QUERY_CHARS] + "…"
+
+
+def _summarize(value: Any) -> Any:
+    """긴 목록(임베딩 벡터·키 배치)·문자열은 요약."""
+    if isinstance(value, dict):
+        return {k: _summarize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        if len(value) > _MAX_PARAM_ITEMS:
+            return [_summarize(v) for v in value[:3]] + [f"… {len(value)} items"]
+        return [_summarize(v) for v in value]
+    if isinstance(value, str) and len(value) > 200:
+        return value[:200] + "…"
+    return value
+
+
+def _summarize_params(params: Optional[dict]) -> str:
+    text = json.dumps(_summarize(params or {}), ensure_ascii=False, default=str)
+    return text if len(text) <= _MAX_PARAMS_CHARS else text[:_MAX_PARAMS_CHARS] + "…"
+
+
+def _incoming_request_id(scope: dict) -> str:
+    for name, value in scope.get("headers") or ():
+        if name == b"x-request-id":
+            candidate = value.decode("latin-1").strip()
+            if _REQUEST_ID_RE.match(candidate):
+                return candidate
+            break
+    return uuid.uuid4().hex
+
+
+def _route_label(scope: dict) -> str:
+    """
+    경로 템플릿. 같은 라우터를 접두사 없이·/api/v1 로 두 번 붙이면 scope["route"] 는 같은 라우트 객체라
+    템플릿에 접두사가 없음 → 실제 경로에서 모자란 앞 구간(정적 접두사)만큼 붙임.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return "unmatched"
+    path = scope.get("path", "")
+    extra = path.rstrip("/").count("/") - template.rstrip("/").count("/")
+    if extra > 0 and ":path}" not in template:
+        template = "/".join(path.split("/")[: extra + 1]) + template
+    return template
+
+
+class TracingMiddleware:
+    """
+    순수 ASGI 미들웨어 (BaseHTTPMiddleware 와 달리 스트리밍 응답을 버퍼링하지 않음).
+    route 레이블은 경로 템플릿(/graph/nodes/{node_id}) — 실제 경로를 쓰면 시계열이 끝없이 늘어남.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = _RequestTrace(_incoming_request_id(scope))
+        token = _current.set(trace)
+        t0 = time.perf_counter()
+        status = 500
+
+        async def send_with_headers(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers") or [])
+                headers.append((b"x-request-id", trace.request_id.encode("latin-1")))
+                headers.append((b"server-timing", trace.server_timing(time.perf_counter() - t0).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            elapsed = time.perf_counter() - t0
+            metrics.observe(
+                "http_request_seconds",
+                elapsed,
+                method=scope.get("method", ""),
+                route=_route_label(scope),
+                status=str(status),
+            )
+            slow_ms = get_settings().SLOW_REQUEST_MS
+            if slow_ms and elapsed * 1000 >= slow_ms:
+                logger.warning(
+                    f"Slow request {scope.get('method')} {scope.get('path')} {status} {elapsed * 1000:.0f}ms "
+                    f"[request {trace.request_id}]: {trace.server_timing(elapsed)}"
+                )
+            _current.reset(token)
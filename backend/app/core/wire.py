@@ -0,0 +1,189 @@
+"""
+그래프 응답용 컬럼형 바이너리 포맷 (선택, Accept: application/x-msgpack).
+
+JSON 은 엣지마다 "type": "HOLDS_SHARES", ratio 를 다시 적은 label, 노드 id 문자열을 반복한다.
+컬럼형은 표(노드/엣지 목록) 단위로 필드를 열로 묶고:
+  - 문자열은 응답 전체 공용 문자열 테이블(strings)의 uint32 인덱스 (노드 id·라벨 중복 제거)
+  - 숫자는 float32 / int32, 불리언은 uint8 배열 (리틀 엔디언 bytes)
+  - 모든 행이 같은 값이면 상수 1개 ("c")
+  - 엣지 label 은 ratio 로 복원 가능하므로 생략 (클라이언트: ratio.toFixed(1) + "%")
+
+구조:
+    {"format": "graph-columnar", "v": 1, "strings": [...],
+     "tables": {이름: {"n": 행 수, "cols": {필드: {"t": 타입, "d": 데이터}}}},
+     "meta": {표가 아닌 최상위 값}}
+
+컬럼 타입: s=uint32 문자열 인덱스(0xFFFFFFFF=null), f=float32(NaN=null), i=int32,
+b=uint8(0/1, 2=null), c=상수, j=원본 값 리스트 (혼합/중첩).
+dict(id → dict) 형태 표(레이아웃 positions 등)는 키를 "_key" 열로 담는다.
+"""
+import math
+import sys
+from array import array
+from typing import Any, Optional
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    HAS_MSGPACK = False
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+FORMAT_NAME = "graph-columnar"
+FORMAT_VERSION = 1
+
+_NULL_INDEX = 0xFFFFFFFF
+_INT32_MIN, _INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+# 값에서 복원 가능한 열: 표 이름 → 생략할 필드
+DERIVED_COLUMNS = {"edges": ("label",)}
+KEY_COLUMN = "_key"
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """Accept 헤더에 컬럼형 msgpack 이 명시되었는지 (q=0 제외). msgpack 미설치면 항상 False."""
+    if not HAS_MSGPACK or not accept:
+        return False
+    for part in accept.split(","):
+        media, *params = [p.strip() for p in part.split(";")]
+        if media.lower() != MSGPACK_MEDIA_TYPE:
+            continue
+        q = next((p[2:] for p in params if p.startswith("q=")), "1")
+        try:
+            return float(q) > 0
+        except ValueError:
+            return True
+    return False
+
+
+def _le_bytes(arr: array) -> bytes:
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+class _Strings:
+    def __init__(self):
+        self.items: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def ref(self, value: str) -> int:
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.items)
+            self.items.append(value)
+        return idx
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _encode_column(values: list, strings: _Strings) -> dict:
+    present = [v for v in values if v is not None]
+    if present and len(present) == len(values) and all(v == present[0] and type(v) is type(present[0]) for v in present):
+        if not isinstance(present[0], (dict, list)):
+            return {"t": "c", "d": present[0]}
+    if all(isinstance(v, str) for v in present):
+        return {"t": "s", "d": _le_bytes(array("I", (_NULL_INDEX if v is None else strings.ref(v) for v in values)))}
+    if all(isinstance(v, bool) for v in present):
+        return {"t": "b", "d": bytes(2 if v is None else int(v) for v in values)}
+    if all(_is_number(v) for v in present):
+        if len(present) == len(values) and all(
+            isinstance(v, int) and _INT32_MIN <= v <= _INT32_MAX for v in present
+        ):
+            return {"t": "i", "d": _le_bytes(array("i", values))}
+        return {"t": "f", "d": _le_bytes(array("f", (math.nan if v is None else float(v) for v in values)))}
+    return {"t": "j", "d": values}
+
+
+def _encode_table(name: str, rows: list[dict], strings: _Strings) -> dict:
+    skip = DERIVED_COLUMNS.get(name, ())
+    fields: dict[str, None] = {}
+    for row in rows:
+        for k in row:
+            if k not in skip:
+                fields.setdefault(k, None)
+    return {
+        "n": len(rows),
+        "cols": {f: _encode_column([row.get(f) for row in rows], strings) for f in fields},
+    }
+
+
+def _is_table(value: Any) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(v, dict) for v in value)
+
+
+def _is_keyed_table(value: Any) -> bool:
+    return isinstance(value, dict) and bool(value) and all(isinstance(v, dict) for v in value.values())
+
+
+def encode_columnar(payload: dict) -> dict:
+    """응답 dict → 컬럼형 dict (msgpack 직렬화 전). 표가 아닌 값은 meta 로 그대로."""
+    strings = _Strings()
+    tables: dict[str, dict] = {}
+    meta: dict[str, Any] = {}
+    for name, value in payload.items():
+        if _is_table(value):
+            tables[name] = _encode_table(name, value, strings)
+        elif _is_keyed_table(value):
+            rows = [{KEY_COLUMN: k, **v} for k, v in value.items()]
+            tables[name] = _encode_table(name, rows, strings)
+            tables[name]["keyed"] = True
+        else:
+            meta[name] = value
+    return {
+        "format": FORMAT_NAME,
+        "v": FORMAT_VERSION,
+        "strings": strings.items,
+        "tables": tables,
+        "meta": meta,
+    }
+
+
+def _decode_column(col: dict, n: int, strings: list[str]) -> list:
+    t, d = col["t"], col["d"]
+    if t == "c":
+        return [d] * n
+    if t == "s":
+        return [None if i == _NULL_INDEX else strings[i] for i in _from_le("I", d)]
+    if t == "b":
+        return [None if b == 2 else bool(b) for b in d]
+    if t == "i":
+        return list(_from_le("i", d))
+    if t == "f":
+        return [None if math.isnan(v) else v for v in _from_le("f", d)]
+    return list(d)
+
+
+def decode_columnar(obj: dict) -> dict:
+    """encode_columnar 의 역변환 (벤치마크·테스트용). 생략된 파생 열은 복원하지 않음."""
+    strings = obj["strings"]
+    out: dict[str, Any] = dict(obj.get("meta") or {})
+    for name, table in obj["tables"].items():
+        n = table["n"]
+        columns = {f: _decode_column(c, n, strings) for f, c in table["cols"].items()}
+        rows = [{f: columns[f][i] for f in columns} for i in range(n)]
+        if table.get("keyed"):
+            out[name] = {row.pop(KEY_COLUMN): row for row in rows}
+        else:
+            out[name] = rows
+    return out
+
+
+def pack(payload: dict) -> bytes:
+    """응답 dict → msgpack 컬럼형 bytes. HAS_MSGPACK 확인 후 호출."""
+    return msgpack.packb(encode_columnar(payload), use_bin_type=True)
+
+
+def unpack(data: bytes) -> dict:
+    return decode_columnar(msgpack.unpackb(data, raw=False))
@@ -0,0 +1,33 @@
+"""
+금융위원회_금융회사지배구조정보 OpenAPI (data.go.kr GetFnCoGoveInfoService) → Neo4j 적재.
+
+    cd backend && PYTHONPATH=. python -m app.ingest --bas-dt 20231231
+    cd backend && PYTHONPATH=. python -m app.ingest --fixtures ../data/fixtures --dry-run
+    cd backend && PYTHONPATH=. python -m app.ingest --bas-dt 20231231 --delta
+
+- sources: API 페이지 조회(동시 요청 + 초당 요청 제한 + 재시도) 또는 로컬 JSON/CSV 픽스처 재생
+- normalize: API item → Company / Stockholder / HOLDS_SHARES / HAS_COMPENSATION 레코드
+- loader: 배치별 UNWIND … MERGE 쓰기 트랜잭션 (배치 크기 INGEST_BATCH_SIZE)
+- checkpoint: 완료 페이지 기록 → 중단 후 같은 조건으로 재실행하면 이어서 적재
+- pipeline: 단계별 실행·처리량(rows/s) 보고, 끝나면 데이터 버전 증가 + 변경 집합 공개
+- delta: 지문(srcHash) 비교로 삽입·수정·삭제만 기록하는 증분 적재 (--delta)
+"""
+from .checkpoint import Checkpoint, CheckpointMismatch
+from .delta import DeltaLoader
+from .loader import Neo4jLoader
+from .pipeline import OPERATIONS, STAGES, Pipeline, run_pipeline
+from .sources import ApiSource, FixtureSource, IngestError
+
+__all__ = [
+    "ApiSource",
+    "Checkpoint",
+    "CheckpointMismatch",
+    "DeltaLoader",
+    "FixtureSource",
+    "IngestError",
+    "Neo4jLoader",
+    "OPERATIONS",
+    "Pipeline",
+    "STAGES",
+    "run_pipeline",
+]
@@ -0,0 +1,110 @@
+"""
+적재 CLI. 중단 후 같은 옵션으로 다시 실행하면 체크포인트에서 이어서 적재 (--restart 로 처음부터).
+--delta: 마지막 적재와 비교해 바뀐 레코드만 기록·없어진 관계 삭제 (체크포인트 미사용).
+
+    cd backend && PYTHONPATH=. python -m app.ingest --bas-dt 20231231
+    cd backend && PYTHONPATH=. python -m app.ingest --bas-dt 20231231 --delta
+    cd backend && PYTHONPATH=. python -m app.ingest --fixtures ../data/fixtures --stages holdings --dry-run
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.core import get_settings
+from app.ingest import (
+    STAGES,
+    ApiSource,
+    Checkpoint,
+    CheckpointMismatch,
+    DeltaLoader,
+    FixtureSource,
+    IngestError,
+    Neo4jLoader,
+    run_pipeline,
+)
+
+
+def main() -> None:
+    s = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="API 대신 로컬 픽스처 디렉터리 (<operation>*.json|csv)")
+    parser.add_argument("--bas-dt", help="기준일자 YYYYMMDD (API basDt)")
+    parser.add_argument("--crno", help="법인등록번호 (특정 회사만)")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"쉼표 구분 ({', '.join(STAGES)})")
+    parser.add_argument("--page-size", type=int, default=s.INGEST_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=s.INGEST_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=s.INGEST_RATE_PER_SEC, help="API 초당 최대 요청 수")
+    parser.add_argument("--batch-size", type=int, default=s.INGEST_BATCH_SIZE, help="트랜잭션당 레코드 수")
+    parser.add_argument("--checkpoint", default=s.INGEST_CHECKPOINT_PATH, help="체크포인트 파일 ('' = 사용 안 함)")
+    parser.add_argument("--restart", action="store_true", help="기존 체크포인트 무시하고 처음부터")
+    parser.add_argument("--dry-run", action="store_true", help="Neo4j 에 쓰지 않고 조회·정규화만 (--delta 면 비교까지)")
+    parser.add_argument("--delta", action="store_true", help="증분 적재: 바뀐 것만 쓰고 없어진 관계 삭제")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    stages = tuple(x.strip() for x in args.stages.split(",") if x.strip())
+    unknown = [x for x in stages if x not in STAGES]
+    if unknown:
+        parser.error(f"알 수 없는 단계: {', '.join(unknown)}")
+    params = {"basDt": args.bas_dt or "", "crno": args.crno or ""}
+    try:
+        checkpoint = Checkpoint.open(
+            None if args.delta else args.checkpoint or None,
+            {**params, "source": f"fixtures:{args.fixtures}" if args.fixtures else "api", "page_size": args.page_size},
+            restart=args.restart,
+        )
+        if args.fixtures:
+            source = FixtureSource(args.fixtures, params)
+        else:
+            source = ApiSource(
+                s.INGEST_API_BASE_URL,
+                s.DATA_GO_KR_SERVICE_KEY,
+                params=params,
+                rate=args.rate,
+                max_retries=s.INGEST_MAX_RETRIES,
+                timeout=s.INGEST_TIMEOUT_SEC,
+            )
+        if args.delta:
+            loader = DeltaLoader(
+                args.batch_size, params, write=not args.dry_run, changeset_retention=s.INGEST_CHANGESET_RETENTION
+            )
+        else:
+            loader = None if args.dry_run else Neo4jLoader(
+                args.batch_size, changeset_retention=s.INGEST_CHANGESET_RETENTION
+            )
+        summaries = asyncio.run(run_pipeline(
+            source,
+            loader,
+            checkpoint,
+            stages=stages,
+            page_size=args.page_size,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+        ))
+    except (CheckpointMismatch, IngestError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for summary in summaries:
+        if summary["stage"] == "publish":
+            if summary["version"] is None:
+                print("publish       변경 없음 (데이터 버전 유지)" if not args.dry_run else "publish       (dry-run)")
+            else:
+                print(f"publish       dataVersion={summary['version']} changeSets={summary['changeSets']:,} keys={summary['keys']:,}")
+            continue
+        if summary.get("skipped_stage"):
+            print(f"{summary['stage']:<13} (체크포인트상 완료) rows={summary['rows']:,}")
+            continue
+        rates = summary["rows_per_sec"]
+        print(
+            f"{summary['stage']:<13} pages={summary['pages']:,} rows={summary['rows']:,} "
+            f"records={summary['records']:,} skipped={summary['skipped']:,} {summary['elapsed_sec']}s | rows/s "
+            + " ".join(f"{k}={v if v is not None else '-'}" for k, v in rates.items())
+        )
+        if "changes" in summary:
+            print(" " * 14 + " ".join(f"{k}={v:,}" for k, v in summary["changes"].items()))
+
+
+if __name__ == "__main__":
+    main()
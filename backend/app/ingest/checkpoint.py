@@ -0,0 +1,71 @@
+"""
+재개용 체크포인트 (JSON 파일). 단계별 적재 완료 페이지 번호·전체 페이지 수·누적 건수.
+
+페이지는 그 페이지의 레코드가 모두 커밋된 뒤에만 완료로 기록 → 중단 후 재실행 시 미완료 페이지만 다시 읽음
+(적재는 MERGE 라서 마지막 배치가 중복 적재돼도 결과가 같음). 파일은 임시 파일 + os.replace 로 원자적 교체.
+"""
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class CheckpointMismatch(ValueError):
+    """기존 체크포인트의 조회 조건(소스·basDt·crno·페이지 크기)이 이번 실행과 다름."""
+
+
+class Checkpoint:
+    VERSION = 1
+
+    def __init__(self, path: Optional[str], params: dict) -> None:
+        """path=None 이면 메모리에만 유지 (재개 불가)."""
+        self.path = Path(path) if path else None
+        self.params = params
+        self.data: dict = {"version": self.VERSION, "params": params, "stages": {}, "updated_at": None}
+
+    @classmethod
+    def open(cls, path: Optional[str], params: dict, *, restart: bool = False) -> "Checkpoint":
+        cp = cls(path, params)
+        if cp.path is None or restart or not cp.path.exists():
+            return cp
+        saved = json.loads(cp.path.read_text(encoding="utf-8"))
+        if saved.get("version") != cls.VERSION or saved.get("params") != params:
+            raise CheckpointMismatch(
+                f"체크포인트 {cp.path} 의 조건 {saved.get('params')} 이 이번 실행 {params} 과 다릅니다. "
+                "--restart 로 처음부터 실행하세요."
+            )
+        cp.data = saved
+        return cp
+
+    def stage(self, name: str) -> dict:
+        return self.data["stages"].setdefault(
+            name, {"done_pages": [], "total_pages": None, "rows": 0, "records": 0, "completed": False}
+        )
+
+    def done_pages(self, name: str) -> set[int]:
+        return set(self.stage(name)["done_pages"])
+
+    def mark_pages(self, name: str, pages: list[int], rows: int, records: int) -> None:
+        st = self.stage(name)
+        st["done_pages"] = sorted(set(st["done_pages"]).union(pages))
+        st["rows"] += rows
+        st["records"] += records
+        self.save()
+
+    def set_total_pages(self, name: str, total_pages: int) -> None:
+        self.stage(name)["total_pages"] = total_pages
+        self.save()
+
+    def complete(self, name: str) -> None:
+        self.stage(name)["completed"] = True
+        self.save()
+
+    def save(self) -> None:
+        self.data["updated_at"] = time.time()
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps(self.data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,156 @@
+"""
+증분 적재: 원천 레코드 지문(srcId·srcHash)을 마지막 적재 결과와 비교해 바뀐 것만 기록.
+
+- 기존 지문: 단계 시작 시 조회 범위(basDt·crno)의 srcId → srcHash 를 Neo4j 에서 스트리밍으로 읽음
+- 삽입(srcId 없음)·수정(srcHash 다름)만 기존 로더 배치(UNWIND … MERGE)로 기록, 같으면 건너뜀
+- 삭제: 단계 끝까지 원천에 나오지 않은 srcId 의 관계(HOLDS_SHARES·HAS_COMPENSATION)를 배치 삭제
+  → 주주 maxStockRatio·MajorShareholder 재계산. 회사 노드는 다른 관계가 참조하므로 삭제하지 않음
+- srcHash 가 있는 관계(이 적재기로 들어온 데이터)만 비교·삭제 대상 — CSV 임포트 데이터는 건드리지 않음
+- 삭제 판정에 단계 전체의 원천 목록이 필요하므로 체크포인트 재개 없이 항상 단계 처음부터 조회
+  (바뀐 것만 쓰므로 재실행 비용은 조회 시간 수준)
+"""
+import logging
+from collections import Counter
+from typing import Optional
+
+from app.ingest.loader import Neo4jLoader, record_keys
+from app.ingest.normalize import MAJOR_SHAREHOLDER_RATIO, parse_date
+
+logger = logging.getLogger(__name__)
+
+_EXISTING_QUERIES = {
+    "companies": """
+        MATCH (c:Company)
+        WHERE c.srcHash IS NOT NULL AND ($crno IS NULL OR c.crno = $crno)
+        RETURN c.nodeKey AS srcId, c.srcHash AS srcHash, c.nodeKey AS companyKey, null AS holderKey
+    """,
+    "holdings": """
+        MATCH (s)-[r:HOLDS_SHARES]->(c:Company)
+        WHERE r.srcHash IS NOT NULL
+          AND ($crno IS NULL OR c.crno = $crno)
+          AND ($baseDate IS NULL OR r.baseDate = date($baseDate))
+        RETURN r.srcId AS srcId, r.srcHash AS srcHash, c.nodeKey AS companyKey, s.nodeKey AS holderKey
+    """,
+    "compensation": """
+        MATCH (c:Company)-[r:HAS_COMPENSATION]->(c)
+        WHERE r.srcHash IS NOT NULL
+          AND ($crno IS NULL OR c.crno = $crno)
+          AND ($baseDate IS NULL OR r.baseDate = date($baseDate))
+        RETURN r.srcId AS srcId, r.srcHash AS srcHash, c.nodeKey AS companyKey, null AS holderKey
+    """,
+}
+
+_DELETE_QUERIES = {
+    "holdings": """
+        UNWIND $rows AS row
+        MATCH (c:Company {nodeKey: row.companyKey})<-[r:HOLDS_SHARES {srcId: row.srcId}]-()
+        DELETE r
+    """,
+    "compensation": """
+        UNWIND $rows AS row
+        MATCH (c:Company {nodeKey: row.companyKey})-[r:HAS_COMPENSATION {srcId: row.srcId}]->(c)
+        DELETE r
+    """,
+}
+
+# 수정·삭제로 지분율이 내려갈 수 있으므로 남은 관계 기준으로 다시 계산
+_RECOMPUTE_HOLDERS_QUERY = """
+    UNWIND $keys AS k
+    MATCH (s:Stockholder {nodeKey: k})
+    OPTIONAL MATCH (s)-[r:HOLDS_SHARES]->()
+    WITH s, max(r.stockRatio) AS maxRatio
+    SET s.maxStockRatio = maxRatio
+    FOREACH (_ IN CASE WHEN coalesce(maxRatio, 0.0) >= $major THEN [1] ELSE [] END | SET s:MajorShareholder)
+    FOREACH (_ IN CASE WHEN coalesce(maxRatio, 0.0) < $major THEN [1] ELSE [] END | REMOVE s:MajorShareholder)
+"""
+
+
+class DeltaLoader(Neo4jLoader):
+    """
+    Neo4jLoader 와 같은 인터페이스 (Pipeline 에 그대로 전달). write=False 면 비교만 (dry-run).
+    단계별 건수: inserted / updated / unchanged / deleted.
+    """
+
+    mode = "delta"
+
+    def __init__(self, batch_size: int, params: dict, *, write: bool = True, changeset_retention: int = 500) -> None:
+        super().__init__(batch_size, changeset_retention=changeset_retention)
+        self.scope = {
+            "baseDate": parse_date(params.get("basDt")),
+            "crno": (params.get("crno") or "").replace("-", "") or None,
+        }
+        self.write = write
+        self.counts: dict[str, Counter] = {}
+        self._existing: dict[str, dict[str, tuple]] = {}
+        self._seen: dict[str, set[str]] = {}
+        self._touched_holders: set[str] = set()
+
+    def _existing_for(self, stage: str) -> dict[str, tuple]:
+        if stage not in self._existing:
+            from app.services.graph_service import stream_query
+
+            self._existing[stage] = {
+                r["srcId"]: (r["srcHash"], r["companyKey"], r["holderKey"])
+                for r in stream_query(_EXISTING_QUERIES[stage], self.scope, fetch_size=10000)
+            }
+            self._seen[stage] = set()
+            self.counts[stage] = Counter()
+            logger.info(f"{stage}: 기존 지문 {len(self._existing[stage]):,}건")
+        return self._existing[stage]
+
+    def load(self, stage: str, records: list[dict]) -> int:
+        """바뀐 레코드만 기록. Returns: 기록(예정) 레코드 수."""
+        existing = self._existing_for(stage)
+        seen, counts = self._seen[stage], self.counts[stage]
+        changed = []
+        for r in records:
+            seen.add(r["srcId"])
+            old = existing.get(r["srcId"])
+            if old is None:
+                counts["inserted"] += 1
+            elif old[0] != r["srcHash"]:
+                counts["updated"] += 1
+                if old[2]:
+                    self._touched_holders.add(old[2])
+            else:
+                counts["unchanged"] += 1
+                continue
+            changed.append(r)
+        if self.write and changed:
+            super().load(stage, changed)
+        return len(changed)
+
+    def finish_stage(self, stage: str) -> Optional[dict]:
+        """원천에 없어진 관계 삭제 + 주주 지분 최대값 재계산. Returns: 단계 변경 건수."""
+        from app.services.graph_service import execute_write
+
+        existing = self._existing_for(stage)
+        seen, counts = self._seen[stage], self.counts[stage]
+        gone = [
+            {"srcId": rid, "companyKey": company, "holderKey": holder}
+            for rid, (_, company, holder) in existing.items()
+            if rid not in seen
+        ] if stage in _DELETE_QUERIES else []
+        counts["deleted"] += len(gone)
+        self._touched_holders.update(g["holderKey"] for g in gone if g["holderKey"])
+        if self.write:
+            for lo in range(0, len(gone), self.batch_size):
+                batch = gone[lo:lo + self.batch_size]
+                execute_write([
+                    (_DELETE_QUERIES[stage], {"rows": batch}),
+                    self._changeset(stage, record_keys(stage, batch), 0, len(batch)),
+                ])
+            if stage == "holdings" and self._touched_holders:
+                holders = sorted(self._touched_holders)
+                for lo in range(0, len(holders), self.batch_size):
+                    execute_write([(
+                        _RECOMPUTE_HOLDERS_QUERY,
+                        {"keys": holders[lo:lo + self.batch_size], "major": MAJOR_SHAREHOLDER_RATIO},
+                    )])
+        # 이 단계 지문은 더 필요 없음 (큰 범위에서 메모리 반환)
+        self._existing.pop(stage, None)
+        self._seen.pop(stage, None)
+        return {k: counts[k] for k in ("inserted", "updated", "unchanged", "deleted")}
+
+    def publish(self) -> Optional[dict]:
+        return super().publish() if self.write else None
@@ -0,0 +1,184 @@
+"""
+정규화 레코드 → Neo4j. 배치(batch_size 레코드)마다 UNWIND … MERGE 쓰기 트랜잭션 1개.
+
+MERGE 키: 노드 nodeKey (레이블별 유니크 제약 인덱스 seek), HOLDS_SHARES (baseDate, stockType),
+HAS_COMPENSATION fiscalYear → 같은 페이지를 다시 적재해도(체크포인트 재개) 결과가 같음.
+쓰기는 한 스레드에서 순서대로 (같은 노드를 MERGE 하는 배치끼리 교착 방지).
+
+데이터 버전: 배치 트랜잭션마다 건드린 nodeKey 를 (:ChangeSet {status: 'pending'}) 로 같이 기록하고,
+실행 끝(publish)에 대기 중인 변경 집합 전체에 (:DataVersion {name: 'graph'}).version + 1 을 부여.
+중단된 실행의 pending 변경 집합도 다음 publish 때 함께 공개되므로 적용된 변경이 누락되지 않음.
+백엔드는 버전을 폴링해 해당 키의 캐시만 무효화 (app.services.data_version).
+"""
+import logging
+import uuid
+from collections import defaultdict
+from typing import Optional
+
+from app.ingest.normalize import MAJOR_SHAREHOLDER_RATIO
+
+logger = logging.getLogger(__name__)
+
+_COMPANIES_QUERY = """
+    UNWIND $rows AS row
+    MERGE (c:Company {nodeKey: row.key})
+      ON CREATE SET c.isActive = true
+    SET c:LegalEntity, c.crno = row.crno, c.companyName = row.companyName, c.srcHash = row.srcHash
+"""
+
+# 회사가 회사 적재 단계에 없었으면 crno 를 임시 이름으로 생성 (companyName 존재 제약)
+_MERGE_COMPANY = """
+    MERGE (c:Company {nodeKey: row.companyKey})
+      ON CREATE SET c:LegalEntity, c.crno = row.crno, c.companyName = row.crno, c.isActive = true
+"""
+
+_MERGE_HOLDER = {
+    "company": """
+    MERGE (s:Company {nodeKey: row.holderKey})
+      ON CREATE SET s:LegalEntity, s.companyName = row.holderName, s.isActive = true
+    SET s:Stockholder, s.shareholderType = row.shareholderType
+""",
+    "person": """
+    MERGE (s:Stockholder {nodeKey: row.holderKey})
+      ON CREATE SET s:Person, s.stockName = row.holderName, s.shareholderType = row.shareholderType
+""",
+    "other": """
+    MERGE (s:Stockholder {nodeKey: row.holderKey})
+      ON CREATE SET s.stockName = row.holderName, s.shareholderType = row.shareholderType
+""",
+}
+
+_MERGE_HOLDING = """
+    MERGE (s)-[r:HOLDS_SHARES {baseDate: date(row.baseDate), stockType: row.stockType}]->(c)
+    SET r.stockRatio = row.stockRatio,
+        r.stockCount = row.stockCount,
+        r.reportYear = row.reportYear,
+        r.relationToMax = row.relationToMax,
+        r.holderSeq = row.holderSeq,
+        r.srcId = row.srcId,
+        r.srcHash = row.srcHash,
+        s.maxStockRatio = CASE
+            WHEN coalesce(s.maxStockRatio, 0.0) < coalesce(row.stockRatio, 0.0) THEN row.stockRatio
+            ELSE s.maxStockRatio END
+    FOREACH (_ IN CASE WHEN coalesce(row.stockRatio, 0.0) >= $major THEN [1] ELSE [] END | SET s:MajorShareholder)
+"""
+
+_HOLDINGS_QUERIES = {
+    kind: "UNWIND $rows AS row" + _MERGE_COMPANY + merge_holder + "WITH row, c, s" + _MERGE_HOLDING
+    for kind, merge_holder in _MERGE_HOLDER.items()
+}
+
+_COMPENSATION_QUERY = """
+    UNWIND $rows AS row""" + _MERGE_COMPANY + """
+    MERGE (c)-[r:HAS_COMPENSATION {fiscalYear: row.fiscalYear}]->(c)
+    SET r += row.props, r.baseDate = date(row.props.baseDate), r.srcId = row.srcId, r.srcHash = row.srcHash
+"""
+
+_EXISTING_COMPANIES_QUERY = """
+    MATCH (c:Company)
+    WHERE c.nodeKey IS NOT NULL
+    RETURN c.nodeKey AS key, c.companyName AS name, c.crno AS crno, c.bizno AS bizno
+"""
+
+
+_CHANGESET_QUERY = """
+    CREATE (:ChangeSet {runId: $runId, mode: $mode, stage: $stage, status: 'pending', createdAt: datetime(),
+                        writes: $writes, deletes: $deletes, keys: $keys})
+"""
+
+# 오래된 공개 변경 집합 정리 → 대기 중 변경 집합 전체에 새 버전 부여 (대기 없으면 버전 유지, 결과 없음)
+_PRUNE_QUERY = """
+    MATCH (v:DataVersion {name: 'graph'})
+    MATCH (cs:ChangeSet {status: 'applied'})
+    WHERE cs.version <= v.version - $retain
+    DETACH DELETE cs
+"""
+_PUBLISH_QUERY = """
+    MATCH (cs:ChangeSet {status: 'pending'})
+    WITH collect(cs) AS pending
+    WHERE size(pending) > 0
+    MERGE (v:DataVersion {name: 'graph'})
+      ON CREATE SET v.version = 0
+    SET v.version = v.version + 1, v.updatedAt = datetime()
+    WITH v, pending
+    UNWIND pending AS cs
+    SET cs.status = 'applied', cs.version = v.version
+    RETURN v.version AS version, count(cs) AS changeSets, sum(size(cs.keys)) AS keys
+"""
+
+
+def record_keys(stage: str, records: list[dict]) -> list[str]:
+    """레코드가 건드리는 노드 키 (회사·주주). 캐시 선택 무효화 단위."""
+    keys: set[str] = set()
+    for r in records:
+        if stage == "companies":
+            keys.add(r["key"])
+        else:
+            keys.add(r["companyKey"])
+            if r.get("holderKey"):
+                keys.add(r["holderKey"])
+    return sorted(keys)
+
+
+def _statements(stage: str, rows: list[dict]) -> list[tuple[str, dict]]:
+    if stage == "companies":
+        return [(_COMPANIES_QUERY, {"rows": rows})]
+    if stage == "holdings":
+        by_kind: dict[str, list[dict]] = defaultdict(list)
+        for row in rows:
+            by_kind[row["holderKind"]].append(row)
+        return [
+            (_HOLDINGS_QUERIES[kind], {"rows": kind_rows, "major": MAJOR_SHAREHOLDER_RATIO})
+            for kind, kind_rows in by_kind.items()
+        ]
+    if stage == "compensation":
+        return [(_COMPENSATION_QUERY, {"rows": rows})]
+    raise ValueError(f"알 수 없는 적재 단계: {stage}")
+
+
+class Neo4jLoader:
+    """단계별 레코드를 batch_size 단위 트랜잭션으로 기록 (트랜잭션마다 변경 집합 1개)."""
+
+    mode = "full"
+
+    def __init__(self, batch_size: int, *, changeset_retention: int = 500) -> None:
+        self.batch_size = max(1, batch_size)
+        self.changeset_retention = changeset_retention
+        self.run_id = uuid.uuid4().hex
+
+    def _changeset(self, stage: str, keys: list[str], writes: int, deletes: int) -> tuple[str, dict]:
+        return _CHANGESET_QUERY, {
+            "runId": self.run_id, "mode": self.mode, "stage": stage,
+            "writes": writes, "deletes": deletes, "keys": keys,
+        }
+
+    def load(self, stage: str, records: list[dict]) -> int:
+        """Returns: 기록한 레코드 수."""
+        from app.services.graph_service import execute_write
+
+        for lo in range(0, len(records), self.batch_size):
+            batch = records[lo:lo + self.batch_size]
+            execute_write(
+                _statements(stage, batch) + [self._changeset(stage, record_keys(stage, batch), len(batch), 0)]
+            )
+        return len(records)
+
+    def finish_stage(self, stage: str) -> Optional[dict]:
+        """단계 종료 처리. 전체 적재는 삭제가 없으므로 없음 (DeltaLoader 가 재정의)."""
+        return None
+
+    def publish(self) -> Optional[dict]:
+        """대기 중 변경 집합 공개 + 데이터 버전 증가. Returns: {version, changeSets, keys} (변경 없으면 None)."""
+        from app.services.graph_service import execute_write
+
+        rows = execute_write([
+            (_PRUNE_QUERY, {"retain": self.changeset_retention}),
+            (_PUBLISH_QUERY, {}),
+        ])
+        return rows[0] if rows else None
+
+    def existing_companies(self) -> list[dict]:
+        """기존 Company {key, name, crno, bizno} — 원천 회사를 기존 노드에 맞추고(CompanyKeys) 법인 주주 매칭에 사용."""
+        from app.services.graph_service import stream_query
+
+        return list(stream_query(_EXISTING_COMPANIES_QUERY, fetch_size=10000))
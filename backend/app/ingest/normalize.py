@@ -0,0 +1,223 @@
+"""
+API item → 그래프 적재 레코드 (Company / Stockholder / HOLDS_SHARES / HAS_COMPENSATION).
+
+- 회사: API 는 사업자번호 대신 법인등록번호(crno)만 제공. 기존 Company 노드(CSV 적재분은 c_<bizno>)와
+  crno → 사업자번호(bzno, 픽스처에 있을 때) → 정규화 회사명 순으로 맞춰 그 nodeKey 를 재사용하고,
+  못 찾은 회사만 새 키 c_<crno> (CompanyKeys). 속성 crno 를 기록해 다음 실행은 crno 로 바로 매칭
+- 주주: 이름이 적재 대상 회사명과 같으면 그 회사 노드(Company:Stockholder, 법인 주주),
+  아니면 이름·유형 기반 합성 키 (app.core.node_keys.synthetic_key, ensure_node_keys 와 같은 규칙)
+- 주주 유형: 이름 패턴으로 CORPORATION / INSTITUTION / PERSON 분류
+- 날짜: basDt(YYYYMMDD) → baseDate "YYYY-MM-DD", reportYear/fiscalYear = 연도
+- 숫자: "1,234", "21.96%", "-", "" 등 → float/int 또는 None
+- 지문: srcId(MERGE 키와 같은 식별자) + srcHash(내용 해시) → 증분 적재(app.ingest.delta)의 비교 기준
+"""
+import hashlib
+import json
+import re
+from typing import Any, Optional
+
+from app.core.node_keys import company_key, name_key, synthetic_key
+
+MAJOR_SHAREHOLDER_RATIO = 5.0
+
+_INSTITUTION_RE = re.compile(r"연금|공단|기금|공사|조합|재단|협회|중앙회|정부|은행$|국가|자산운용|투자신탁|펀드")
+_CORPORATION_RE = re.compile(
+    r"\(주\)|㈜|주식회사|\(유\)|유한회사|\(합\)|합자회사|Co\.?,?\s*Ltd|Inc\.?$|Corp|LLC|L\.?P\.?$|Limited|홀딩스|캐피탈|증권|보험|생명|화재|카드|저축은행",
+    re.IGNORECASE,
+)
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    s = str(value).strip()
+    return s if s and s not in ("-", "NULL", "null") else None
+
+
+def parse_float(value: Any) -> Optional[float]:
+    s = _text(value)
+    if s is None:
+        return None
+    try:
+        return float(s.replace(",", "").rstrip("%"))
+    except ValueError:
+        return None
+
+
+def parse_int(value: Any) -> Optional[int]:
+    f = parse_float(value)
+    return None if f is None else int(f)
+
+
+def parse_date(value: Any) -> Optional[str]:
+    s = _text(value)
+    if s is None:
+        return None
+    digits = re.sub(r"\D", "", s)
+    if len(digits) != 8:
+        return None
+    return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+
+
+def classify_holder(name: str) -> str:
+    if _INSTITUTION_RE.search(name):
+        return "INSTITUTION"
+    if _CORPORATION_RE.search(name):
+        return "CORPORATION"
+    return "PERSON"
+
+
+def _digits(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return value.replace("-", "").strip() or None
+
+
+class CompanyKeys:
+    """
+    원천 회사(crno) → Company nodeKey. 기존 노드를 먼저 등록(add_existing)하고 원천 회사는 resolve 로 추가 —
+    같은 이름·번호면 기존 키가 이김. 이름이 같은 기존 회사가 여럿이면 이름으로는 매칭하지 않음 (새 키).
+    """
+
+    def __init__(self) -> None:
+        self.by_crno: dict[str, str] = {}
+        self.by_bizno: dict[str, str] = {}
+        self.by_name: dict[str, Optional[str]] = {}
+        self._crno_of: dict[str, str] = {}
+
+    def add_existing(self, key: str, name: Optional[str], crno: Optional[str] = None, bizno: Optional[str] = None) -> None:
+        crno, bizno = _digits(crno), _digits(bizno)
+        if crno:
+            self.by_crno.setdefault(crno, key)
+            self._crno_of.setdefault(key, crno)
+        if bizno:
+            self.by_bizno.setdefault(bizno, key)
+        if name:
+            nk = name_key(name)
+            if nk in self.by_name and self.by_name[nk] != key:
+                self.by_name[nk] = None  # 동명 회사 — 이름으로는 구분 불가
+            else:
+                self.by_name[nk] = key
+
+    def resolve(self, crno: str, name: Optional[str] = None, bizno: Optional[str] = None) -> str:
+        """crno → 사업자번호 → 이름 순 매칭 (이름 매칭은 기존 노드에 다른 crno 가 없을 때만). 없으면 c_<crno>."""
+        crno, bizno = _digits(crno), _digits(bizno)
+        key = self.by_crno.get(crno)
+        if key is None and bizno:
+            key = self.by_bizno.get(bizno)
+        if key is None and name:
+            candidate = self.by_name.get(name_key(name))
+            if candidate is not None and self._crno_of.get(candidate, crno) == crno:
+                key = candidate
+        if key is None:
+            key = company_key(crno)
+        self.add_existing(key, name, crno, bizno)
+        return key
+
+    def key_for(self, crno: str) -> str:
+        """주주·보수 레코드의 대상 회사 (회사 단계에 없던 crno 면 c_<crno>)."""
+        crno = _digits(crno)
+        return self.by_crno.get(crno) or company_key(crno)
+
+    def holder(self, name: str) -> Optional[str]:
+        """주주명과 같은 이름의 회사 nodeKey (법인 주주)."""
+        return self.by_name.get(name_key(name))
+
+
+def company_record(item: dict, companies: CompanyKeys) -> Optional[dict]:
+    """대표이사정보(getFnCoReprDireInfo) item → 회사. 대표이사 여러 명이면 같은 회사가 반복됨 (MERGE)."""
+    crno = _text(item.get("crno"))
+    if crno is None:
+        return None
+    name = _text(item.get("fncoNm"))
+    return {
+        "key": companies.resolve(crno, name, _text(item.get("bzno"))),
+        "crno": crno.replace("-", ""),
+        "companyName": name or crno,
+    }
+
+
+def holding_record(item: dict, companies: CompanyKeys) -> Optional[dict]:
+    """
+    주주정보(getFnCoStocHoldInfo) item → 주주 + HOLDS_SHARES.
+    holderKind: company(적재 대상 회사와 같은 이름) | person | other(기관·법인)
+    """
+    crno = _text(item.get("crno"))
+    name = _text(item.get("sthdFnm"))
+    base_date = parse_date(item.get("basDt"))
+    # baseDate 는 관계 MERGE 키 (null 이면 MERGE 불가)
+    if crno is None or name is None or base_date is None:
+        return None
+    holder_type = classify_holder(name)
+    holder_company = companies.holder(name)
+    if holder_company is not None:
+        holder_type = "CORPORATION" if holder_type == "PERSON" else holder_type
+        kind, holder_key = "company", holder_company
+    else:
+        kind = "person" if holder_type == "PERSON" else "other"
+        holder_key = synthetic_key("stockholder", name, holder_type)
+    return {
+        "holderKind": kind,
+        "holderKey": holder_key,
+        "holderName": name,
+        "shareholderType": holder_type,
+        "companyKey": companies.key_for(crno),
+        "crno": crno.replace("-", ""),
+        "stockRatio": parse_float(item.get("fncoEoteShrRatCtt")),
+        "stockCount": parse_int(item.get("fncoEoteStckCnt")),
+        "stockType": _text(item.get("stckCsfNm")) or "보통주",
+        "baseDate": base_date,
+        "reportYear": int(base_date[:4]),
+        "relationToMax": _text(item.get("maxSthdRltNm")),
+        "holderSeq": parse_int(item.get("sthdSqno")),
+    }
+
+
+_COMPENSATION_FIELDS = {
+    "registeredExecCount": ("rgstDrtrCnt", parse_int),
+    "registeredExecTotalComp": ("rgstDrtrTrmrAmt", parse_float),
+    "registeredExecAvgComp": ("rgstDrtrAvgRmrAmt", parse_float),
+    "outsideDirectorCount": ("otdrCnt", parse_int),
+    "outsideDirectorTotalComp": ("otdrTrmrAmt", parse_float),
+    "outsideDirectorAvgComp": ("otdrAvgRmrAmt", parse_float),
+    "auditorCount": ("audpnCnt", parse_int),
+    "auditorTotalComp": ("audpnTrmrAmt", parse_float),
+    "auditorAvgComp": ("audpnAvgRmrAmt", parse_float),
+}
+
+
+def compensation_record(item: dict, companies: CompanyKeys) -> Optional[dict]:
+    """임원보수현황(getFnCoExecRemuStat) item → HAS_COMPENSATION (회사·회계연도당 1건)."""
+    crno = _text(item.get("crno"))
+    base_date = parse_date(item.get("basDt"))
+    if crno is None or base_date is None:
+        return None
+    props = {name: parse(item.get(field)) for name, (field, parse) in _COMPENSATION_FIELDS.items()}
+    props["baseDate"] = base_date
+    return {
+        "companyKey": companies.key_for(crno),
+        "crno": crno.replace("-", ""),
+        "fiscalYear": int(base_date[:4]),
+        "props": props,
+    }
+
+
+def source_id(stage: str, record: dict) -> str:
+    """적재 단위 식별자. 로더의 MERGE 키와 같아서 같은 srcId = 같은 노드·관계."""
+    if stage == "companies":
+        return record["key"]
+    if stage == "holdings":
+        return f"{record['holderKey']}|{record['companyKey']}|{record['baseDate']}|{record['stockType']}"
+    if stage == "compensation":
+        return f"{record['companyKey']}|{record['fiscalYear']}"
+    raise ValueError(f"알 수 없는 적재 단계: {stage}")
+
+
+def fingerprint(stage: str, record: Optional[dict]) -> Optional[dict]:
+    """레코드에 srcId·srcHash 추가 (정규화 결과 그대로 직렬화한 blake2b 96-bit)."""
+    if record is None:
+        return None
+    payload = json.dumps(record, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    record["srcId"] = source_id(stage, record)
+    record["srcHash"] = hashlib.blake2b(payload.encode("utf-8"), digest_size=12).hexdigest()
+    return record
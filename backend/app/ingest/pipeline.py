@@ -0,0 +1,220 @@
+"""
+단계별 적재 파이프라인: 페이지 동시 조회 → 정규화 → 배치 적재 → 체크포인트.
+
+단계 순서: companies(회사명) → holdings(주주·지분) → compensation(임원보수).
+holdings 의 법인 주주 매칭에 회사명이 필요하므로 companies 가 먼저.
+첫 단계 전에 기존 Company 노드를 읽어 원천 회사(crno)를 기존 nodeKey 에 맞춤 (normalize.CompanyKeys).
+- 조회: 첫 페이지로 totalCount 확인 후 나머지 페이지를 concurrency 개씩 동시 요청 (소스 쪽 RateLimiter 로 tps 제한)
+- 적재: 단일 소비자가 페이지 순서와 무관하게 받아 batch_size 이상 모이면 적재 (큐 크기 제한 = 역압)
+- 단계별 처리량(rows/s): fetch(조회 구간 벽시계), normalize·load(누적 소요), total(단계 전체)
+- 단계 끝에 loader.finish_stage (증분 적재의 삭제 반영), 실행 끝에 loader.publish (데이터 버전 증가)
+"""
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Optional
+
+from app.ingest.checkpoint import Checkpoint
+from app.ingest.loader import Neo4jLoader
+from app.ingest.normalize import CompanyKeys, company_record, compensation_record, fingerprint, holding_record
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("companies", "holdings", "compensation")
+OPERATIONS = {
+    "companies": "getFnCoReprDireInfo",
+    "holdings": "getFnCoStocHoldInfo",
+    "compensation": "getFnCoExecRemuStat",
+}
+
+
+def _rate(count: int, seconds: float) -> Optional[float]:
+    return round(count / seconds, 1) if seconds > 0 else None
+
+
+class StageStats:
+    def __init__(self, stage: str) -> None:
+        self.stage = stage
+        self.pages = 0
+        self.rows = 0
+        self.records = 0
+        self.normalize_sec = 0.0
+        self.load_sec = 0.0
+        self.started = time.perf_counter()
+        self.fetched_at: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def summary(self) -> dict:
+        end = self.finished or time.perf_counter()
+        fetch_end = self.fetched_at or end
+        return {
+            "stage": self.stage,
+            "pages": self.pages,
+            "rows": self.rows,
+            "records": self.records,
+            "skipped": self.rows - self.records,
+            "elapsed_sec": round(end - self.started, 2),
+            "rows_per_sec": {
+                "fetch": _rate(self.rows, fetch_end - self.started),
+                "normalize": _rate(self.rows, self.normalize_sec),
+                "load": _rate(self.records, self.load_sec),
+                "total": _rate(self.rows, end - self.started),
+            },
+        }
+
+
+class Pipeline:
+    def __init__(
+        self,
+        source,
+        loader: Optional[Neo4jLoader],
+        checkpoint: Checkpoint,
+        *,
+        page_size: int,
+        concurrency: int,
+        batch_size: int,
+    ) -> None:
+        """loader=None 이면 적재 없이 조회·정규화만 (dry-run)."""
+        self.source = source
+        self.loader = loader
+        self.checkpoint = checkpoint
+        self.page_size = page_size
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.companies = CompanyKeys()
+
+    def _normalizer(self, stage: str) -> Callable[[dict], Optional[dict]]:
+        if stage == "companies":
+            return lambda item: fingerprint(stage, company_record(item, self.companies))
+        if stage == "holdings":
+            return lambda item: fingerprint(stage, holding_record(item, self.companies))
+        return lambda item: fingerprint(stage, compensation_record(item, self.companies))
+
+    async def run(self, stages: tuple[str, ...] = STAGES) -> list[dict]:
+        if self.loader is not None:
+            # 기존 키 먼저 — 원천 회사가 같은 crno·이름이면 기존 노드를 재사용 (중복 Company 방지)
+            for r in await asyncio.to_thread(self.loader.existing_companies):
+                self.companies.add_existing(r["key"], r["name"], r["crno"], r["bizno"])
+        summaries = []
+        for stage in stages:
+            summaries.append(await self._run_stage(stage))
+        return summaries
+
+    async def _run_stage(self, stage: str) -> dict:
+        state = self.checkpoint.stage(stage)
+        if state["completed"]:
+            logger.info(f"{stage}: 체크포인트상 완료 — 건너뜀")
+            return {"stage": stage, "skipped_stage": True, "rows": state["rows"], "records": state["records"]}
+
+        operation = OPERATIONS[stage]
+        stats = StageStats(stage)
+        done = self.checkpoint.done_pages(stage)
+        first: Optional[tuple[int, list[dict]]] = None
+        total_pages = state["total_pages"]
+        if total_pages is None:
+            items, total = await self.source.fetch_page(operation, 1, self.page_size)
+            total_pages = max(1, math.ceil(total / self.page_size))
+            self.checkpoint.set_total_pages(stage, total_pages)
+            first = (1, items)
+        pending = [p for p in range(1, total_pages + 1) if p not in done and not (first and p == 1)]
+        logger.info(f"{stage}: {total_pages} 페이지 중 {len(pending) + (1 if first and 1 not in done else 0)} 페이지 적재")
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def fetch(page_no: int, sem: asyncio.Semaphore) -> None:
+            async with sem:
+                items, _ = await self.source.fetch_page(operation, page_no, self.page_size)
+            await queue.put((page_no, items))
+
+        async def produce() -> None:
+            if first is not None and 1 not in done:
+                await queue.put(first)
+            sem = asyncio.Semaphore(self.concurrency)
+            async with asyncio.TaskGroup() as tg:
+                for page_no in pending:
+                    tg.create_task(fetch(page_no, sem))
+            stats.fetched_at = time.perf_counter()
+            await queue.put(None)
+
+        async def consume() -> None:
+            normalize = self._normalizer(stage)
+            records: list[dict] = []
+            pages: list[int] = []
+            rows = 0
+            while True:
+                item = await queue.get()
+                if item is None:
+                    if pages:
+                        await self._flush(stage, stats, records, pages, rows)
+                    return
+                page_no, items = item
+                t0 = time.perf_counter()
+                records.extend(r for r in map(normalize, items) if r is not None)
+                stats.normalize_sec += time.perf_counter() - t0
+                pages.append(page_no)
+                rows += len(items)
+                if len(records) >= self.batch_size:
+                    await self._flush(stage, stats, records, pages, rows)
+                    records, pages, rows = [], [], 0
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(produce())
+                tg.create_task(consume())
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+
+        changes = None
+        if self.loader is not None:
+            t0 = time.perf_counter()
+            changes = await asyncio.to_thread(self.loader.finish_stage, stage)
+            stats.load_sec += time.perf_counter() - t0
+        stats.finished = time.perf_counter()
+        self.checkpoint.complete(stage)
+        summary = stats.summary()
+        if changes is not None:
+            summary["changes"] = changes
+        logger.info(f"{stage}: 완료 {summary}")
+        return summary
+
+    async def _flush(self, stage: str, stats: StageStats, records: list[dict], pages: list[int], rows: int) -> None:
+        if self.loader is not None and records:
+            t0 = time.perf_counter()
+            await asyncio.to_thread(self.loader.load, stage, records)
+            stats.load_sec += time.perf_counter() - t0
+        stats.pages += len(pages)
+        stats.rows += rows
+        stats.records += len(records)
+        self.checkpoint.mark_pages(stage, pages, rows, len(records))
+        logger.info(
+            f"{stage}: {stats.pages} 페이지 / {stats.rows} rows "
+            f"({_rate(stats.rows, time.perf_counter() - stats.started)} rows/s)"
+        )
+
+
+async def run_pipeline(
+    source,
+    loader: Optional[Neo4jLoader],
+    checkpoint: Checkpoint,
+    *,
+    stages: tuple[str, ...] = STAGES,
+    page_size: int,
+    concurrency: int,
+    batch_size: int,
+) -> list[dict]:
+    """
+    단계 순서대로 실행 후 단계별 요약(처리량 포함) 반환. 소스는 끝나면 닫음.
+    적재했으면 마지막 항목으로 {"stage": "publish", "version": …} (변경이 없으면 version None).
+    """
+    pipeline = Pipeline(
+        source, loader, checkpoint, page_size=page_size, concurrency=concurrency, batch_size=batch_size
+    )
+    try:
+        summaries = await pipeline.run(stages)
+    finally:
+        await source.aclose()
+    if loader is not None:
+        published = await asyncio.to_thread(loader.publish)
+        summaries.append({"stage": "publish", **(published or {"version": None})})
+    return summaries
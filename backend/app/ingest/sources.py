@@ -0,0 +1,172 @@
+"""
+원천 데이터 페이지 읽기: data.go.kr OpenAPI 또는 로컬 픽스처(JSON/CSV) 재생.
+
+두 소스 모두 fetch_page(operation, page_no, page_size) → (items, totalCount) 로 같은 페이지 단위를 제공해
+체크포인트(완료 페이지 번호)가 소스와 무관하게 재개됨.
+"""
+import asyncio
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_RETRY_STATUS = frozenset((429, 500, 502, 503, 504))
+
+
+class IngestError(RuntimeError):
+    """API 오류 응답(resultCode ≠ 00)·재시도 소진·잘못된 픽스처."""
+
+
+class RateLimiter:
+    """토큰 버킷 (초당 rate 회, 최대 burst 회 연속). 동시 요청 전체에 공유."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+def _items_of(body: dict) -> list[dict]:
+    """API body.items.item: 결과가 1건이면 dict, 없으면 "" 로 오는 경우 정규화."""
+    items = body.get("items")
+    if not items:
+        return []
+    item = items.get("item") if isinstance(items, dict) else items
+    if not item:
+        return []
+    return [item] if isinstance(item, dict) else list(item)
+
+
+def parse_response(payload: dict) -> tuple[list[dict], int]:
+    """resultType=json 응답 → (items, totalCount)."""
+    response = payload.get("response", payload)
+    header = response.get("header") or {}
+    code = str(header.get("resultCode", "00"))
+    if code != "00":
+        raise IngestError(f"API 오류 {code}: {header.get('resultMsg')}")
+    body = response.get("body") or {}
+    return _items_of(body), int(body.get("totalCount") or 0)
+
+
+class ApiSource:
+    """
+    GetFnCoGoveInfoService 페이지 조회. 동시 요청은 호출 측 세마포어, 호출 빈도는 RateLimiter 로 제한.
+    네트워크 오류·429·5xx 는 지수 백오프로 max_retries 회 재시도.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        service_key: str,
+        *,
+        params: Optional[dict[str, str]] = None,
+        rate: float = 25.0,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+    ) -> None:
+        if not service_key:
+            raise IngestError("DATA_GO_KR_SERVICE_KEY 를 .env 에 설정해 주세요.")
+        self.base_url = base_url.rstrip("/")
+        self.service_key = service_key
+        self.params = {k: v for k, v in (params or {}).items() if v}
+        self.limiter = RateLimiter(rate)
+        self.max_retries = max_retries
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def fetch_page(self, operation: str, page_no: int, page_size: int) -> tuple[list[dict], int]:
+        query = {
+            "serviceKey": self.service_key,
+            "pageNo": page_no,
+            "numOfRows": page_size,
+            "resultType": "json",
+            **self.params,
+        }
+        url = f"{self.base_url}/{operation}"
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            try:
+                res = await self._client.get(url, params=query)
+                if res.status_code in _RETRY_STATUS:
+                    raise httpx.HTTPStatusError(f"HTTP {res.status_code}", request=res.request, response=res)
+                res.raise_for_status()
+                return parse_response(res.json())
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                retryable = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code in _RETRY_STATUS
+                if not retryable or attempt == self.max_retries:
+                    raise IngestError(f"{operation} page {page_no} 조회 실패: {e}") from e
+                delay = 2 ** attempt
+                logger.warning(f"{operation} page {page_no} 재시도 {attempt + 1}/{self.max_retries} ({e}), {delay}s 후")
+                await asyncio.sleep(delay)
+        raise IngestError(f"{operation} page {page_no} 조회 실패")
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _read_fixture(path: Path) -> list[dict]:
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            return [{k: v for k, v in row.items() if k} for row in csv.DictReader(f)]
+    payload: Any = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(payload, list):
+        return payload
+    if "response" in payload or "body" in payload:
+        return parse_response(payload)[0]
+    if isinstance(payload.get("items"), list):
+        return payload["items"]
+    raise IngestError(f"픽스처 형식을 알 수 없습니다: {path}")
+
+
+class FixtureSource:
+    """
+    로컬 픽스처 재생: <dir>/<operation>*.json|csv (API 응답 JSON, item 리스트, 또는 API 필드명 헤더 CSV).
+    파일명 순으로 이어 붙여 API 와 같은 크기의 페이지로 잘라서 반환.
+    """
+
+    def __init__(self, directory: str, params: Optional[dict[str, str]] = None) -> None:
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise IngestError(f"픽스처 디렉터리가 없습니다: {directory}")
+        # basDt·crno 필터는 API 와 같은 의미로 적용
+        self.params = {k: v for k, v in (params or {}).items() if v}
+        self._items: dict[str, list[dict]] = {}
+
+    def _load(self, operation: str) -> list[dict]:
+        items = self._items.get(operation)
+        if items is None:
+            items = []
+            for path in sorted(self.directory.glob(f"{operation}*")):
+                if path.suffix.lower() in (".json", ".csv"):
+                    items.extend(_read_fixture(path))
+            items = [it for it in items if all(str(it.get(k, "")) == v for k, v in self.params.items())]
+            self._items[operation] = items
+        return items
+
+    async def fetch_page(self, operation: str, page_no: int, page_size: int) -> tuple[list[dict], int]:
+        items = self._load(operation)
+        start = (page_no - 1) * page_size
+        return items[start:start + page_size], len(items)
+
+    async def aclose(self) -> None:
+        self._items.clear()
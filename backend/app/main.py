@@ -1,11 +1,26 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.api.v1 import api_router
+from app.core import tracing
 from app.core.config import get_settings
 from app.core.neo4j_indexes import init_indexes_on_startup
+from app.api.v1.endpoints.graph import invalidate_node_details
+from app.services import data_version, schema_snapshot
+from app.services import graph_snapshot
+from app.services import heatmap_service
+from app.services import graphviz_pool
+from app.services import health_service
+from app.services import llm_gateway, model_provider
+from app.services import suggest_service
 
+try:
+    from brotli_asgi import BrotliMiddleware
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
 
 
 def _cors_origins_list() -> list[str]:
@@ -34,6 +49,15 @@ api.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 응답 압축: brotli-asgi 설치 시 br (Accept-Encoding 에 없으면 gzip 폴백), 아니면 gzip
+_min_size = get_settings().RESPONSE_COMPRESSION_MIN_BYTES
+if HAS_BROTLI:
+    api.add_middleware(BrotliMiddleware, minimum_size=_min_size, gzip_fallback=True)
+else:
+    api.add_middleware(GZipMiddleware, minimum_size=_min_size)
+# 요청 추적: 가장 바깥(마지막 등록) — 압축·CORS 까지 포함한 전체 시간, 모든 응답에 X-Request-ID·Server-Timing
+if get_settings().TRACING_ENABLED:
+    api.add_middleware(tracing.TracingMiddleware)
 # unversioned (Streamlit 기존 경로 호환)
 api.include_router(api_router)
 # versioned (HTML 그래프 UI 및 향후 확장)
@@ -42,7 +66,9 @@ api.include_router(api_router, prefix="/api/v1")
 
 @api.on_event("startup")
 async def startup_event():
-    """앱 기동 시 Neo4j 인덱스 자동 생성."""
+    """앱 기동 시 헬스 프로브·자동완성 인덱스·그래프 스냅샷 적재·데이터 버전 폴링 시작 + Neo4j 인덱스 자동 생성."""
+    health_service.start_background_probe()
+    graphviz_pool.start_pool()
     try:
         init_indexes_on_startup()
     except Exception as e:
@@ -50,3 +76,31 @@ async def startup_event():
         import logging
         logger = logging.getLogger(__name__)
         logger.warning(f"Failed to initialize Neo4j indexes on startup: {e}")
+    # nodeKey 백필(init_indexes_on_startup) 이후 적재해야 모든 노드가 키를 가짐
+    suggest_service.start_background_loader()
+    graph_snapshot.start_background_loader()
+    # 적재(app.ingest)가 데이터 버전을 올리면 바뀐 키의 캐시만 무효화
+    for listener in (
+        graph_snapshot.invalidate,
+        suggest_service.invalidate,
+        schema_snapshot.invalidate,
+    ):
+        data_version.subscribe(listener)
+    # 스냅샷에서 계산하는 캐시는 새 스냅샷으로 교체된 뒤에 비움 (재적재 중 이전 스냅샷으로 다시 채워지지 않게)
+    for listener in (heatmap_service.invalidate, invalidate_node_details):
+        graph_snapshot.on_swap(listener)
+    data_version.start_background_poller()
+    # 꺼져 있던 동안 적재가 있었으면 Cypher 프롬프트 스키마 스냅샷 재생성 (요청은 기존 스냅샷으로 처리)
+    schema_snapshot.check_in_background()
+    # 임베딩 모델 적재·의도 분류 예시 임베딩 (로컬 모델이면 첫 질문이 적재 시간을 떠안지 않게)
+    model_provider.start_warm_up()
+
+
+@api.on_event("shutdown")
+async def shutdown_event():
+    health_service.stop_background_probe()
+    suggest_service.stop_background_loader()
+    graph_snapshot.stop_background_loader()
+    data_version.stop_background_poller()
+    graphviz_pool.stop_pool()
+    llm_gateway.close()
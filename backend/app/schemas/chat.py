@@ -13,3 +13,6 @@ class ChatResponse(BaseModel):
     source: str  # DB | DB_EMPTY | LLM
     confidence: str  # HIGH | MEDIUM | LOW
     elapsed: float
+    route: str = "llm"  # stake_change | template:<템플릿> | llm
+    timings: dict[str, float] = {}  # 단계별 소요(초): embed, schema, hints, route, cypher_generate, cypher_execute, phrase …
+    tokens: dict[str, dict] = {}  # LLM 단계별 프롬프트 토큰: {"cypher": {"prompt", "saved", "history_turns"}, "qa": {"prompt", "saved", "rows"}}
@@ -13,7 +13,10 @@ class LayoutRequest(BaseModel):
     height: float = Field(1.0, ge=0.1, le=2.0, description="정규화 캔버스 높이")
     padding: float = Field(0.05, ge=0, le=0.2)
     use_components: bool = Field(True, description="연결 요소별 그리드 배치 여부")
-    engine: str = Field("networkx", description="레이아웃 엔진: networkx(기본) 또는 pygraphviz(고품질, Graphviz 필요)")
+    engine: str = Field(
+        "networkx",
+        description="레이아웃 엔진: networkx(기본), pygraphviz(neato, Graphviz 필요), sfdp(대형 그래프, Graphviz 필요), hierarchical(지분 방향 계층, 지배구조 맵용)",
+    )
 
 
 class LayoutResponse(BaseModel):
@@ -0,0 +1,152 @@
+"""
+Cypher 결과 → 답변 문장 (규칙 기반). QA_PROMPT 의 기계적인 규칙을 그대로 코드로 옮김.
+
+- 금액(만원): "X억 X,XXX만원" (1억 = 10000만원)
+- 시계열(years·ratios 목록): "2020년 15%, 2021년 16%"
+- 지분율: "21.96%", 연도: "2023년", 건수: 천 단위 쉼표
+- 핵심 수치 먼저: 단일 집계값이면 그 값만, 목록이면 건수 → 행별 한 줄 (이름 굵게)
+
+형태를 알 수 없는 결과(노드·맵 값, 열이 너무 많음, 빈 결과)는 None → 호출 측이 QA LLM 으로 문장화.
+"""
+import math
+import re
+from typing import Any, Optional
+
+MAX_COLUMNS = 8
+
+_RATIO_COL = re.compile(r"ratio|지분율|비율|율$", re.IGNORECASE)
+# 개수 열 ('지분보유회사수', 'holderCount'): 이름에 지분·comp 등이 있어도 비율·금액이 아닌 정수 ('보수'는 금액)
+_COUNT_COL = re.compile(r"(?:(?<!보)수|개수|count|cnt)$", re.IGNORECASE)
+_MONEY_COL = re.compile(r"comp|보수|금액|amount|연봉|급여|만원", re.IGNORECASE)
+_YEAR_COL = re.compile(r"year|연도|년도", re.IGNORECASE)
+_YEARS_COL = re.compile(r"^(?:years|연도들|연도목록)$", re.IGNORECASE)
+_RATIOS_COL = re.compile(r"^(?:ratios|지분율들|지분율목록)$", re.IGNORECASE)
+# 결과 표시에서 숨기는 보조 열 (템플릿의 단위 표기 등)
+_HIDDEN_COLS = {"단위", "unit"}
+
+
+def format_money(manwon: float) -> str:
+    """만원 단위 금액 → "3억 8,812만원" / "8,812만원" / "3억원"."""
+    sign = "-" if manwon < 0 else ""
+    total = int(round(abs(manwon)))
+    eok, rest = divmod(total, 10000)
+    if eok and rest:
+        return f"{sign}{eok:,}억 {rest:,}만원"
+    if eok:
+        return f"{sign}{eok:,}억원"
+    return f"{sign}{rest:,}만원"
+
+
+def _number(value: float) -> str:
+    if float(value).is_integer():
+        return f"{int(value):,}"
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
+
+
+def _ratio(value: float) -> str:
+    return f"{value:.2f}".rstrip("0").rstrip(".") + "%"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not (
+        isinstance(value, float) and math.isnan(value)
+    )
+
+
+def _label(column: str) -> str:
+    """'c.companyName' → 'companyName', 'count(s)' → 'count(s)'."""
+    return column.rsplit(".", 1)[-1] if re.fullmatch(r"\w+\.\w+", column) else column
+
+
+def _series(row: dict) -> Optional[str]:
+    years = next((v for k, v in row.items() if _YEARS_COL.match(k) and isinstance(v, list)), None)
+    ratios = next((v for k, v in row.items() if _RATIOS_COL.match(k) and isinstance(v, list)), None)
+    if years is None or ratios is None or len(years) != len(ratios):
+        return None
+    points = sorted(
+        (int(y), r) for y, r in zip(years, ratios) if _is_number(y) and _is_number(r)
+    )
+    return ", ".join(f"{y}년 {_ratio(r)}" for y, r in points)
+
+
+def _value(column: str, value: Any, money_unit: bool) -> Optional[str]:
+    """열 하나 → 표시 문자열. 표시할 수 없는 값이면 None."""
+    if value is None:
+        return "-"
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "예" if value else "아니오"
+    if _is_number(value):
+        if _YEAR_COL.search(column) and float(value).is_integer():
+            return f"{int(value)}년"
+        if _COUNT_COL.search(column):
+            return _number(value)
+        if _RATIO_COL.search(column):
+            return _ratio(value)
+        if money_unit or _MONEY_COL.search(column):
+            return format_money(value)
+        return _number(value)
+    if isinstance(value, list) and all(isinstance(v, (str, int, float)) for v in value):
+        return ", ".join(str(v) for v in value) if value else "-"
+    return None
+
+
+def _row_line(row: dict) -> Optional[str]:
+    """'**주주** · **회사** — 지분율 21.96%, 연도 2023년' 형태. 표시할 수 없으면 None."""
+    money_unit = row.get("단위") == "만원" or row.get("unit") == "만원"
+    names, facts = [], []
+    series = _series(row)
+    # 템플릿의 (항목, 값) 쌍 → "등기임원 평균보수 3억 8,812만원"
+    item = row.get("항목") if isinstance(row.get("항목"), str) and "값" in row else None
+    for column, value in row.items():
+        if column in _HIDDEN_COLS or (item is not None and column == "항목"):
+            continue
+        if item is not None and column == "값":
+            text = _value(column, value, money_unit)
+            if text is None:
+                return None
+            facts.append(f"{item} {text}")
+            continue
+        if series is not None and (_YEARS_COL.match(column) or _RATIOS_COL.match(column)):
+            continue
+        text = _value(column, value, False)
+        if text is None:
+            return None
+        if isinstance(value, str) and not _YEAR_COL.search(column):
+            names.append(f"**{text}**")
+        else:
+            facts.append(f"{_label(column)} {text}")
+    if series is not None:
+        facts.insert(0, series)
+    head = " · ".join(names)
+    if head and facts:
+        return f"{head} — {', '.join(facts)}"
+    return head or ", ".join(facts)
+
+
+def format_answer(rows: list[dict]) -> Optional[str]:
+    """
+    Cypher 결과 행 → 답변. 규칙으로 만들 수 없으면 None.
+    """
+    if not rows or not all(isinstance(r, dict) and r for r in rows):
+        return None
+    columns = list(rows[0])
+    if len(columns) > MAX_COLUMNS:
+        return None
+
+    # 단일 집계값 (예: count(*) AS 회사수)
+    if len(rows) == 1 and len(columns) == 1:
+        column, value = columns[0], rows[0][columns[0]]
+        text = _value(column, value, False)
+        return None if text is None else f"**{_label(column)}**: {text}"
+
+    lines = []
+    for row in rows:
+        line = _row_line(row)
+        if line is None:
+            return None
+        lines.append(f"- {line}")
+    if len(rows) == 1:
+        return lines[0][2:]
+    return "\n".join([f"조회 결과 **{len(rows):,}건**"] + lines)
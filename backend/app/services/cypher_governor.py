@@ -0,0 +1,294 @@
+"""
+LLM 생성 Cypher 실행 통제 (GraphCypherQAChain 의 graph.query 를 대신함).
+
+실행 전:
+- 정적 검사: 한 문장만, 가변 길이 경로는 상한 필수(*, *.., *2.. 거부)이고 상한 ≤ CYPHER_MAX_VAR_LENGTH.
+  관계 괄호 -[…*…]- 만 보고(리스트 식 [x IN xs | x * 100] 은 대상 아님), Cypher 5 수량 경로
+  ((a)-[:R]->(b)){1,3} · -[:R]->{1,} · + · * 도 같은 기준 (반복 상한 × 반복 안 관계 수 = hop)
+- EXPLAIN: 쿼리 유형이 읽기('r')가 아니면 거부, 계획에 CartesianProduct 가 있으면 거부,
+  VarLengthExpand·Repeat 연산자의 길이 상한이 없거나 허용 hop 초과면 거부 (정적 검사를 빠져나간 경우),
+  연산자 추정 행 수 최대값이 CYPHER_MAX_ESTIMATED_ROWS 초과면 거부
+실행:
+- 프로세스당 동시 실행 CYPHER_MAX_CONCURRENT 개 (CYPHER_QUEUE_TIMEOUT_SEC 안에 자리가 안 나면 거부)
+- 읽기 전용 관리 트랜잭션 + 서버 측 트랜잭션 타임아웃 CYPHER_TIMEOUT_SEC
+- 결과는 CYPHER_MAX_ROWS 행·CYPHER_MAX_BYTES(JSON 직렬화 기준)까지만 읽고 나머지 버림
+계측(app.core.metrics): cypher_rejected_total{reason}, cypher_truncated_total{limit},
+cypher_plan_seconds, cypher_execute_seconds{outcome}, cypher_rows.
+"""
+import json
+import logging
+import re
+import threading
+from typing import Any, Optional
+
+from neo4j import unit_of_work
+from neo4j.exceptions import ClientError
+
+from app.core import get_settings, metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+# 관계 괄호 -[…]- / <-[…]- (리스트 리터럴·리스트 식은 앞에 '-' 가 없음)
+_REL_BRACKET_RE = re.compile(r"-\s*\[([^\[\]]*)\]\s*-")
+# 괄호 안 길이 지정 (속성 맵 앞): [r:TYPE*], [*1..3], [*..5], [*2..] 등
+_REL_LENGTH_RE = re.compile(r"^[^{*]*\*\s*(\d+)?\s*(\.\.)?\s*(\d+)?")
+# Cypher 5 수량자: {m,n} {m,} {,n} {n} + *
+_QUANTIFIER_RE = re.compile(r"\s*(\{\s*(\d*)\s*(,)?\s*(\d*)\s*\}|\+|\*)")
+# 관계 패턴 (수량 경로 괄호 안 hop 수 세기·괄호가 경로인지 판단)
+_REL_PATTERN_RE = re.compile(r"<?-\s*\[[^\[\]]*\]\s*->?|<?-->?")
+# 수량 관계: 관계 바로 뒤 수량자 -[:R]->{1,3}, -[:R]-+
+_QUANTIFIED_REL_RE = re.compile(r"(?:\]\s*-\s*>?|-->?)(?=\s*(?:\{\s*\d*\s*,?\s*\d*\s*\}|\+|\*))")
+# 계획 Details 의 길이: *1..3 / *2.. (VarLengthExpand), {1, 3} / {1, *} (Repeat)
+_PLAN_VAR_LENGTH_RE = re.compile(r"\*\s*(\d*)\s*\.\.\s*(\d*)|\{\s*(\d+)\s*,\s*(\*|\d+)\s*\}")
+# 문자열 리터럴 안의 '*' '[' 등 오탐 방지용
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+_ROW_BYTES_PAD = 2  # 행 구분자 몫 (", ")
+
+
+class CypherRejected(ValueError):
+    """실행 한도를 넘는 생성 Cypher. reason 은 계측 레이블·응답 안내에 사용."""
+
+    MESSAGES = {
+        "multiple_statements": "여러 문장으로 된 쿼리",
+        "unbounded_var_length": "길이 제한이 없는 가변 길이 경로",
+        "var_length_too_long": "허용 hop 수를 넘는 가변 길이 경로",
+        "not_read_only": "데이터를 변경하는 쿼리",
+        "cartesian_product": "조건 없이 결합되는 패턴(Cartesian product)",
+        "estimated_rows": "예상 처리 행 수 초과",
+        "busy": "동시 실행 중인 질의가 많음",
+        "timeout": "실행 시간 초과",
+        "invalid": "문법 오류",
+    }
+
+    def __init__(self, reason: str, query: str, detail: str = "") -> None:
+        self.reason = reason
+        self.query = query
+        self.detail = detail
+        super().__init__(f"{self.MESSAGES.get(reason, reason)}{f' ({detail})' if detail else ''}")
+
+
+def _strip_literals(query: str) -> str:
+    return _STRING_RE.sub("''", _COMMENT_RE.sub(" ", query))
+
+
+def check_static(query: str) -> None:
+    """EXPLAIN 전에 문자열만으로 거를 수 있는 것. Raises: CypherRejected."""
+    s = get_settings()
+    body = _strip_literals(query).strip().rstrip(";")
+    if ";" in body:
+        raise CypherRejected("multiple_statements", query)
+    for m in _REL_BRACKET_RE.finditer(body):
+        length = _REL_LENGTH_RE.match(m.group(1))
+        if length is None:
+            continue
+        low, dots, high = length.groups()
+        if dots is None:
+            # [*] 는 무제한, [*3] 은 정확히 3 hop
+            if low is None:
+                raise CypherRejected("unbounded_var_length", query, m.group(0))
+            high = low
+        elif high is None:
+            raise CypherRejected("unbounded_var_length", query, m.group(0))
+        _check_hops(query, m.group(0), int(high), s.CYPHER_MAX_VAR_LENGTH)
+    for m in _QUANTIFIED_REL_RE.finditer(body):
+        _check_quantifier(query, body, m.end(), 1, s.CYPHER_MAX_VAR_LENGTH)
+    for start, end in _path_groups(body):
+        hops = len(_REL_PATTERN_RE.findall(body[start + 1:end]))
+        _check_quantifier(query, body, end + 1, hops, s.CYPHER_MAX_VAR_LENGTH)
+
+
+def _check_hops(query: str, text: str, hops: int, limit: int) -> None:
+    if hops > limit:
+        raise CypherRejected("var_length_too_long", query, f"{text} > {limit}")
+
+
+def _check_quantifier(query: str, body: str, pos: int, hops: int, limit: int) -> None:
+    """pos 위치 수량자 검사: 상한 없음(+ * {m,}) 거부, 반복 상한 × hops > limit 거부."""
+    m = _QUANTIFIER_RE.match(body, pos)
+    if m is None:
+        return
+    text = body[max(0, pos - 40):m.end()].strip()
+    if m.group(1) in ("+", "*"):
+        raise CypherRejected("unbounded_var_length", query, text)
+    low, comma, high = m.group(2), m.group(3), m.group(4)
+    if comma is None:
+        high = low
+    if not high:
+        raise CypherRejected("unbounded_var_length", query, text)
+    _check_hops(query, text, int(high) * max(1, hops), limit)
+
+
+def _path_groups(body: str):
+    """
+    수량자(+ * {…})가 바로 뒤에 붙은 괄호 중 안에 관계 패턴이 있는 것 = 수량 경로 ((a)-[:R]->(b))+.
+    count(x) * 2 같은 산술 괄호는 안에 관계 패턴이 없어 제외. Yields: (여는 괄호, 닫는 괄호) 위치.
+    """
+    stack: list[int] = []
+    for i, ch in enumerate(body):
+        if ch == "(":
+            stack.append(i)
+        elif ch == ")" and stack:
+            start = stack.pop()
+            inner = body[start + 1:i]
+            if (
+                inner.lstrip().startswith("(")
+                and _QUANTIFIER_RE.match(body, i + 1)
+                and _REL_PATTERN_RE.search(inner)
+            ):
+                yield start, i
+
+
+def _walk_plan(plan: Optional[dict]):
+    stack = [plan] if plan else []
+    while stack:
+        op = stack.pop()
+        yield op
+        stack.extend(op.get("children") or ())
+
+
+def check_plan(query: str, query_type: Optional[str], plan: Optional[dict]) -> float:
+    """
+    EXPLAIN 결과 검사. Returns: 연산자 추정 행 수 최대값.
+    Raises: CypherRejected
+    """
+    if query_type not in (None, "r"):
+        raise CypherRejected("not_read_only", query, f"type={query_type}")
+    max_rows = 0.0
+    for op in _walk_plan(plan):
+        operator = (op.get("operatorType") or "").split("@", 1)[0]
+        if operator == "CartesianProduct":
+            raise CypherRejected("cartesian_product", query)
+        args = op.get("args") or {}
+        if operator.startswith(("VarLengthExpand", "Repeat")):
+            _check_plan_length(query, operator, str(args.get("Details") or ""))
+        max_rows = max(max_rows, float(args.get("EstimatedRows") or 0.0))
+    limit = get_settings().CYPHER_MAX_ESTIMATED_ROWS
+    if max_rows > limit:
+        raise CypherRejected("estimated_rows", query, f"{max_rows:,.0f} > {limit:,.0f}")
+    return max_rows
+
+
+def _check_plan_length(query: str, operator: str, details: str) -> None:
+    """정적 검사를 빠져나간 가변 길이 확장 (계획의 실제 길이 범위)."""
+    limit = get_settings().CYPHER_MAX_VAR_LENGTH
+    for m in _PLAN_VAR_LENGTH_RE.finditer(details):
+        high = m.group(2) if m.group(1) is not None or m.group(2) is not None else m.group(4)
+        if high in ("", "*", None):
+            raise CypherRejected("unbounded_var_length", query, f"{operator} {details[:120]}")
+        if operator.startswith("VarLengthExpand"):
+            _check_hops(query, f"{operator} {details[:120]}", int(high), limit)
+
+
+def _json_size(record: dict) -> int:
+    return len(json.dumps(record, ensure_ascii=False, default=str)) + _ROW_BYTES_PAD
+
+
+class CypherGovernor:
+    """Neo4jGraph 의 드라이버로 생성 Cypher 를 검사·제한 실행."""
+
+    def __init__(self, graph) -> None:
+        s = get_settings()
+        self.graph = graph
+        self._slots = threading.BoundedSemaphore(max(1, s.CYPHER_MAX_CONCURRENT))
+
+    def _reject(self, err: CypherRejected) -> CypherRejected:
+        metrics.inc("cypher_rejected_total", reason=err.reason)
+        logger.warning(f"Generated Cypher rejected ({err.reason}): {err.detail or ''} | {err.query[:300]}")
+        return err
+
+    def execute(self, query: str, params: Optional[dict] = None) -> list[dict]:
+        s = get_settings()
+        params = params or {}
+        try:
+            check_static(query)
+        except CypherRejected as e:
+            raise self._reject(e)
+
+        if not self._slots.acquire(timeout=s.CYPHER_QUEUE_TIMEOUT_SEC):
+            raise self._reject(CypherRejected("busy", query, f"max {s.CYPHER_MAX_CONCURRENT}"))
+        try:
+            with (
+                tracing.query_span(query, params),
+                self.graph._driver.session(database=self.graph._database, fetch_size=s.CYPHER_MAX_ROWS) as session,
+            ):
+                with metrics.timer("cypher_plan_seconds"):
+                    estimated = session.execute_read(self._explain, query, params)
+                with metrics.timer("cypher_execute_seconds", outcome="error") as labels:
+                    try:
+                        rows, truncated = session.execute_read(
+                            unit_of_work(timeout=s.CYPHER_TIMEOUT_SEC)(self._fetch), query, params
+                        )
+                    except ClientError as e:
+                        # Neo.ClientError.Transaction.TransactionTimedOut(ClientConfiguration)
+                        if "TimedOut" not in (e.code or ""):
+                            raise
+                        labels["outcome"] = "timeout"
+                        raise self._reject(CypherRejected("timeout", query, f"{s.CYPHER_TIMEOUT_SEC}s")) from e
+                    labels["outcome"] = "ok"
+        finally:
+            self._slots.release()
+
+        metrics.observe("cypher_rows", len(rows), buckets=(0, 1, 10, 50, 100, 500, 1000))
+        if truncated:
+            metrics.inc("cypher_truncated_total", limit=truncated)
+            logger.info(f"Generated Cypher result truncated at {len(rows)} rows ({truncated})")
+        logger.debug(f"Generated Cypher ok: ~{estimated:,.0f} est. rows, {len(rows)} rows returned")
+        return rows
+
+    def _explain(self, tx, query: str, params: dict) -> float:
+        try:
+            summary = tx.run("EXPLAIN " + query, params).consume()
+        except ClientError as e:
+            if (e.code or "").startswith("Neo.ClientError.Statement"):
+                raise self._reject(CypherRejected("invalid", query, (e.message or "")[:200])) from e
+            raise
+        try:
+            return check_plan(query, summary.query_type, summary.plan)
+        except CypherRejected as e:
+            raise self._reject(e)
+
+    def _fetch(self, tx, query: str, params: dict) -> tuple[list[dict], Optional[str]]:
+        """Returns: (행, 잘린 경우 한도 이름 'rows' | 'bytes')."""
+        s = get_settings()
+        rows: list[dict] = []
+        size = 0
+        result = tx.run(query, params)
+        for record in result:
+            if len(rows) >= s.CYPHER_MAX_ROWS:
+                return rows, "rows"
+            row = record.data()
+            size += _json_size(row)
+            if size > s.CYPHER_MAX_BYTES and rows:
+                return rows, "bytes"
+            rows.append(row)
+        return rows, None
+
+
+class GovernedGraph:
+    """
+    GraphCypherQAChain 에 넘기는 GraphStore. 스키마는 원래 Neo4jGraph 그대로,
+    query 만 CypherGovernor 를 거침 (체인이 생성한 Cypher 만 여기로 옴).
+    """
+
+    def __init__(self, graph) -> None:
+        self._graph = graph
+        self.governor = CypherGovernor(graph)
+
+    @property
+    def get_schema(self) -> str:
+        return self._graph.get_schema
+
+    @property
+    def get_structured_schema(self) -> dict[str, Any]:
+        return self._graph.get_structured_schema
+
+    def query(self, query: str, params: dict = {}) -> list[dict[str, Any]]:
+        return self.governor.execute(query, params)
+
+    def refresh_schema(self) -> None:
+        self._graph.refresh_schema()
+
+    def add_graph_documents(self, graph_documents, include_source: bool = False) -> None:
+        raise NotImplementedError("생성 Cypher 경로는 읽기 전용입니다.")
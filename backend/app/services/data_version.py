@@ -0,0 +1,119 @@
+"""
+데이터 버전 폴링 → 캐시 선택 무효화.
+
+적재(app.ingest)가 실행 끝에 (:DataVersion {name: 'graph'}).version 을 올리고 버전별 (:ChangeSet {keys})
+를 남김. 백그라운드 스레드가 DATA_VERSION_POLL_SEC 마다 버전만 확인(인덱스 seek 1회)하고, 바뀌었으면
+마지막으로 본 버전 이후의 변경 키를 모아 구독자에게 전달.
+- 구독자 콜백: fn(keys) — keys=None 이면 전체 무효화 (키가 DATA_VERSION_MAX_KEYS 초과, 정리돼서 빠진 버전 구간)
+- 첫 폴링은 기준 버전만 기록 (기동 직후 캐시는 비어 있음)
+"""
+import logging
+import threading
+from typing import Callable, Optional
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[Optional[frozenset]], None]
+
+_VERSION_QUERY = """
+    OPTIONAL MATCH (v:DataVersion {name: 'graph'})
+    RETURN v.version AS version, toString(v.updatedAt) AS updatedAt
+"""
+_CHANGES_QUERY = """
+    MATCH (cs:ChangeSet {status: 'applied'})
+    WHERE cs.version > $since AND cs.version <= $until
+    RETURN cs.version AS version, cs.keys AS keys
+"""
+
+_listeners: list[Listener] = []
+_version: Optional[int] = None
+_updated_at: Optional[str] = None
+_lock = threading.Lock()
+_stop_event = threading.Event()
+_poller_thread: Optional[threading.Thread] = None
+
+
+def subscribe(listener: Listener) -> None:
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _collect_keys(since: int, until: int) -> Optional[frozenset]:
+    """(since, until] 구간 변경 키. 전체 무효화가 필요하면 None."""
+    from app.services.graph_service import stream_query
+
+    limit = get_settings().DATA_VERSION_MAX_KEYS
+    versions: set[int] = set()
+    keys: set[str] = set()
+    for row in stream_query(_CHANGES_QUERY, {"since": since, "until": until}):
+        versions.add(row["version"])
+        keys.update(row["keys"] or ())
+        if len(keys) > limit:
+            return None
+    if len(versions) < until - since:
+        return None
+    return frozenset(keys)
+
+
+def _notify(keys: Optional[frozenset]) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(keys)
+        except Exception as e:
+            logger.warning(f"Data version listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+
+
+def poll_once() -> Optional[int]:
+    """버전 확인 후 바뀌었으면 구독자 호출. Returns: 현재 버전 (아직 적재 이력이 없으면 None)."""
+    global _version, _updated_at
+    from app.services.graph_service import stream_query
+
+    with _lock:
+        row = next(stream_query(_VERSION_QUERY), {})
+        version, updated_at = row.get("version"), row.get("updatedAt")
+        if version is None or version == _version:
+            return version
+        previous = _version
+        _version, _updated_at = version, updated_at
+        if previous is None:
+            logger.info(f"Data version baseline: {version}")
+            return version
+        keys = _collect_keys(previous, version) if version > previous else None
+        logger.info(
+            f"Data version {previous} → {version}: "
+            + ("전체 무효화" if keys is None else f"{len(keys)}개 키 무효화")
+        )
+        _notify(keys)
+        return version
+
+
+def current() -> dict:
+    """마지막으로 확인한 데이터 버전 (응답 헤더·상태 조회용)."""
+    return {"version": _version, "updatedAt": _updated_at}
+
+
+def _poller_loop(interval: float) -> None:
+    while not _stop_event.is_set():
+        try:
+            poll_once()
+        except Exception as e:
+            logger.warning(f"Data version poll failed: {e}")
+        _stop_event.wait(interval)
+
+
+def start_background_poller() -> None:
+    """앱 기동 시 호출."""
+    global _poller_thread
+    if _poller_thread is not None and _poller_thread.is_alive():
+        return
+    _stop_event.clear()
+    _poller_thread = threading.Thread(
+        target=_poller_loop, args=(get_settings().DATA_VERSION_POLL_SEC,), name="data_version_poller", daemon=True
+    )
+    _poller_thread.start()
+
+
+def stop_background_poller() -> None:
+    _stop_event.set()
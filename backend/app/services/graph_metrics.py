@@ -0,0 +1,294 @@
+"""
+지분 그래프 전체 분석 배치 작업: 중요도·그룹(계열)·상호출자 고리를 미리 계산해 노드 속성으로 기록.
+
+요청 시점 계산 없이 /graph/rankings 정렬·필터, 노드 크기(graph.js calculateNodeSize)에 사용.
+입력은 인-프로세스 그래프 스냅샷(graph_snapshot)과 같은 (주주, 회사) 쌍 배열. 가중치 = 최신 지분율(%)/100
+(지분율 null 쌍은 MIN_WEIGHT_PCT 로 약하게 연결).
+- pagerank: 지배 방향(회사 → 주주, 지분율 비례) 가중 PageRank. 중요한 회사를 많이·크게 보유할수록 높음 (합 1)
+- betweenness: 보유 방향(주주 → 회사) 홉 기준 매개 중심성. 표본 k 개 출발점 근사 (k ≥ 노드 수면 정확값)
+- communityId: 무방향 가중 그래프 Louvain(기본) 또는 Leiden(leidenalg 설치 시) 커뮤니티 = 계열 후보.
+  크기 내림차순 번호(0 = 최대), 단독 노드는 null
+- sccId: 보유 방향 강연결요소 중 크기 2 이상 = 상호·순환출자 고리. 크기 내림차순 번호, 그 외 null
+기록: UNWIND 배치로 nodeKey seek 후 SET (레이블별 유니크 제약 인덱스). 값이 없으면 null 로 덮어써 이전 결과 제거.
+
+    cd backend && PYTHONPATH=. python -m app.services.graph_metrics            # 계산 + 기록
+    cd backend && PYTHONPATH=. python -m app.services.graph_metrics --dry-run  # 계산·요약 출력만
+"""
+import argparse
+import logging
+import time
+from typing import Any, Optional
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from app.core import get_settings
+from app.services import graph_snapshot
+from app.services.graph_snapshot import FLAG_COMPANY, GraphSnapshot
+
+try:
+    import igraph
+    import leidenalg
+    HAS_LEIDEN = True
+except ImportError:
+    igraph = leidenalg = None
+    HAS_LEIDEN = False
+
+logger = logging.getLogger(__name__)
+
+COMMUNITY_ALGORITHMS = ("louvain", "leiden")
+MIN_WEIGHT_PCT = 0.01
+
+# graph_snapshot.METRIC_PROPS 와 같은 이름 (스냅샷 적재 → 노드 dict 로 노출)
+_WRITE_QUERY = """
+    UNWIND $rows AS row
+    MATCH (n:{label} {{nodeKey: row.key}})
+    SET n.pagerank = row.pagerank,
+        n.betweenness = row.betweenness,
+        n.communityId = row.communityId,
+        n.sccId = row.sccId
+"""
+
+
+def _edges(graph: GraphSnapshot) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(주주, 회사, 가중치 0~1) — 자기 주식 쌍 제외."""
+    mask = graph.pair_src != graph.pair_dst
+    weight = np.maximum(graph.pair_latest[mask].astype(np.float64), MIN_WEIGHT_PCT) / 100.0
+    return graph.pair_src[mask], graph.pair_dst[mask], weight
+
+
+def weighted_pagerank(
+    graph: GraphSnapshot, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 200
+) -> np.ndarray:
+    """
+    지배 방향(회사 → 주주) 가중 PageRank, 거듭제곱 반복 (scipy 희소 행렬).
+    나가는 간선이 없는 노드(주주 없는 회사, 개인)의 점수는 전체에 균등 분배.
+    """
+    n = len(graph)
+    if n == 0:
+        return np.zeros(0)
+    src, dst, weight = _edges(graph)
+    W = csr_matrix((weight, (dst, src)), shape=(n, n))  # 행: 회사, 열: 그 회사의 주주
+    out = np.asarray(W.sum(axis=1)).ravel()
+    dangling = out == 0
+    inv = np.zeros(n)
+    inv[~dangling] = 1.0 / out[~dangling]
+    PT = csr_matrix(W.multiply(inv[:, np.newaxis])).T.tocsr()
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        nxt = damping * (PT @ x + x[dangling].sum() / n) + (1.0 - damping) / n
+        delta = float(np.abs(nxt - x).sum())
+        x = nxt
+        if delta < n * tol:
+            break
+    return x / x.sum()
+
+
+def sampled_betweenness(graph: GraphSnapshot, samples: int, seed: int) -> np.ndarray:
+    """보유 방향 홉 기준 매개 중심성 (정규화). samples 개 출발점 표본 근사."""
+    n = len(graph)
+    if n == 0:
+        return np.zeros(0)
+    src, dst, _ = _edges(graph)
+    G = nx.DiGraph()
+    G.add_nodes_from(range(n))
+    G.add_edges_from(zip(src.tolist(), dst.tolist()))
+    k = samples if 0 < samples < n else None
+    scores = nx.betweenness_centrality(G, k=k, normalized=True, seed=seed)
+    return np.fromiter((scores[i] for i in range(n)), dtype=np.float64, count=n)
+
+
+def _undirected_weights(graph: GraphSnapshot) -> csr_matrix:
+    """무방향 가중 인접 행렬 (상호 보유면 두 방향 가중치 합), 상삼각."""
+    n = len(graph)
+    src, dst, weight = _edges(graph)
+    W = csr_matrix((weight, (src, dst)), shape=(n, n))
+    sym = (W + W.T).tocoo()
+    upper = sym.row < sym.col
+    return csr_matrix((sym.data[upper], (sym.row[upper], sym.col[upper])), shape=(n, n))
+
+
+def _numbered_groups(membership: np.ndarray) -> np.ndarray:
+    """그룹 라벨 → 크기 내림차순 번호 (0 = 최대), 크기 1 그룹은 -1."""
+    if not len(membership):
+        return membership.astype(np.int64)
+    _, inverse, sizes = np.unique(membership, return_inverse=True, return_counts=True)
+    order = np.lexsort((np.arange(len(sizes)), -sizes))
+    number = np.empty(len(sizes), dtype=np.int64)
+    number[order] = np.arange(len(sizes))
+    number[sizes < 2] = -1
+    return number[inverse]
+
+
+def communities(graph: GraphSnapshot, algorithm: str, resolution: float, seed: int) -> np.ndarray:
+    """노드별 커뮤니티 번호 (크기 내림차순, 단독 노드 -1)."""
+    if algorithm not in COMMUNITY_ALGORITHMS:
+        raise ValueError(f"algorithm 은 {', '.join(COMMUNITY_ALGORITHMS)} 중 하나여야 합니다.")
+    n = len(graph)
+    upper = _undirected_weights(graph).tocoo()
+    membership = np.arange(n)
+    if algorithm == "leiden":
+        if not HAS_LEIDEN:
+            raise RuntimeError("Leiden 은 python-igraph, leidenalg 설치가 필요합니다.")
+        g = igraph.Graph(n=n, edges=list(zip(upper.row.tolist(), upper.col.tolist())))
+        g.es["weight"] = upper.data.tolist()
+        partition = leidenalg.find_partition(
+            g, leidenalg.RBConfigurationVertexPartition,
+            weights="weight", resolution_parameter=resolution, seed=seed,
+        )
+        membership = np.asarray(partition.membership)
+    else:
+        G = nx.Graph()
+        G.add_nodes_from(range(n))
+        G.add_weighted_edges_from(zip(upper.row.tolist(), upper.col.tolist(), upper.data.tolist()))
+        for c, members in enumerate(nx.community.louvain_communities(G, weight="weight", resolution=resolution, seed=seed)):
+            membership[list(members)] = c
+    return _numbered_groups(membership)
+
+
+def cross_holding_rings(graph: GraphSnapshot) -> np.ndarray:
+    """보유 방향 강연결요소 번호 (크기 2 이상만, 크기 내림차순), 그 외 -1."""
+    n = len(graph)
+    src, dst, weight = _edges(graph)
+    A = csr_matrix((np.ones_like(weight), (src, dst)), shape=(n, n))
+    _, labels = connected_components(A, directed=True, connection="strong")
+    return _numbered_groups(labels)
+
+
+def compute(
+    graph: GraphSnapshot,
+    *,
+    betweenness_samples: Optional[int] = None,
+    algorithm: Optional[str] = None,
+    resolution: Optional[float] = None,
+    seed: Optional[int] = None,
+) -> dict[str, np.ndarray]:
+    """전체 지표 (노드 인덱스 = 스냅샷 인덱스). 생략한 인자는 GRAPH_METRICS_* 설정값."""
+    s = get_settings()
+    seed = s.GRAPH_METRICS_SEED if seed is None else seed
+    timings = {}
+    t0 = time.perf_counter()
+    pagerank = weighted_pagerank(graph, damping=s.GRAPH_METRICS_PAGERANK_DAMPING)
+    timings["pagerank"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    betweenness = sampled_betweenness(
+        graph, s.GRAPH_METRICS_BETWEENNESS_SAMPLES if betweenness_samples is None else betweenness_samples, seed
+    )
+    timings["betweenness"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    community = communities(
+        graph,
+        algorithm or s.GRAPH_METRICS_COMMUNITY_ALGORITHM,
+        s.GRAPH_METRICS_COMMUNITY_RESOLUTION if resolution is None else resolution,
+        seed,
+    )
+    timings["communities"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    scc = cross_holding_rings(graph)
+    timings["scc"] = time.perf_counter() - t0
+    logger.info("Graph metrics computed: %s", {k: f"{v:.2f}s" for k, v in timings.items()})
+    return {"pagerank": pagerank, "betweenness": betweenness, "communityId": community, "sccId": scc}
+
+
+def _rows(graph: GraphSnapshot, metrics: dict[str, np.ndarray], nodes: np.ndarray) -> list[dict]:
+    pagerank, betweenness = metrics["pagerank"], metrics["betweenness"]
+    community, scc = metrics["communityId"], metrics["sccId"]
+    return [
+        {
+            "key": graph.keys[i],
+            "pagerank": float(pagerank[i]),
+            "betweenness": float(betweenness[i]),
+            "communityId": int(community[i]) if community[i] >= 0 else None,
+            "sccId": int(scc[i]) if scc[i] >= 0 else None,
+        }
+        for i in nodes.tolist()
+    ]
+
+
+def write_back(graph: GraphSnapshot, metrics: dict[str, np.ndarray], batch_size: Optional[int] = None) -> int:
+    """
+    UNWIND 배치 SET. Company 레이블 노드(법인 주주 포함)는 Company 로, 나머지는 Stockholder 로 seek.
+    Returns: 기록한 노드 수
+    """
+    from app.services import graph_service
+
+    batch_size = batch_size or get_settings().GRAPH_METRICS_WRITE_BATCH
+    db = graph_service.get_graph()
+    is_company = (graph.flags & FLAG_COMPANY) != 0
+    written = 0
+    for label, nodes in (("Company", np.flatnonzero(is_company)), ("Stockholder", np.flatnonzero(~is_company))):
+        query = _WRITE_QUERY.format(label=label)
+        for lo in range(0, len(nodes), batch_size):
+            db.query(query, params={"rows": _rows(graph, metrics, nodes[lo:lo + batch_size])})
+            written += min(batch_size, len(nodes) - lo)
+        logger.info("Graph metrics written: %s %d", label, len(nodes))
+    return written
+
+
+def summarize(graph: GraphSnapshot, metrics: dict[str, np.ndarray], top: int = 10) -> dict[str, Any]:
+    """작업 로그·dry-run 출력용 요약 (상위 노드, 커뮤니티·고리 수)."""
+    def label(i: int) -> dict:
+        return {"id": graph.keys[i], "label": graph.labels[i]}
+
+    pagerank, betweenness = metrics["pagerank"], metrics["betweenness"]
+    community, scc = metrics["communityId"], metrics["sccId"]
+    ring_sizes = np.bincount(scc[scc >= 0]) if (scc >= 0).any() else np.zeros(0, dtype=np.int64)
+    return {
+        "nodes": len(graph),
+        "pairs": graph.n_pairs,
+        "top_pagerank": [{**label(i), "pagerank": float(pagerank[i])} for i in np.argsort(-pagerank)[:top].tolist()],
+        "top_betweenness": [
+            {**label(i), "betweenness": float(betweenness[i])} for i in np.argsort(-betweenness)[:top].tolist()
+        ],
+        "communities": int(community.max() + 1) if len(community) and community.max() >= 0 else 0,
+        "largest_communities": np.bincount(community[community >= 0])[:top].tolist() if (community >= 0).any() else [],
+        "rings": len(ring_sizes),
+        "largest_rings": [
+            [graph.labels[i] for i in np.flatnonzero(scc == r).tolist()] for r in range(min(top, len(ring_sizes)))
+        ],
+    }
+
+
+def run(*, write: bool = True, **options) -> dict[str, Any]:
+    """Neo4j 에서 스냅샷 새로 적재 → 계산 → (write 면) 기록. 요약 dict 반환."""
+    t0 = time.perf_counter()
+    graph = graph_snapshot.rebuild()
+    metrics = compute(graph, **options)
+    summary = summarize(graph, metrics)
+    if write:
+        summary["written"] = write_back(graph, metrics)
+    summary["elapsed_sec"] = round(time.perf_counter() - t0, 2)
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="기록하지 않고 요약만 출력")
+    parser.add_argument("--samples", type=int, default=None, help="betweenness 표본 출발점 수 (0 = 정확값)")
+    parser.add_argument("--algorithm", choices=COMMUNITY_ALGORITHMS, default=None, help="커뮤니티 알고리즘")
+    parser.add_argument("--resolution", type=float, default=None, help="커뮤니티 해상도 (클수록 작은 그룹)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    summary = run(
+        write=not args.dry_run,
+        betweenness_samples=args.samples,
+        algorithm=args.algorithm,
+        resolution=args.resolution,
+        seed=args.seed,
+    )
+    print(f"nodes={summary['nodes']:,} pairs={summary['pairs']:,} "
+          f"communities={summary['communities']:,} rings={summary['rings']:,} ({summary['elapsed_sec']}s)")
+    for row in summary["top_pagerank"]:
+        print(f"  pagerank {row['pagerank']:.6f}  {row['label']} ({row['id']})")
+    for ring in summary["largest_rings"]:
+        print(f"  ring ({len(ring)}): {', '.join(ring[:8])}{' …' if len(ring) > 8 else ''}")
+    if "written" in summary:
+        print(f"written: {summary['written']:,} nodes")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,133 @@
 """
 Neo4j 연결, Vector Index, GraphCypherQAChain, ask_graph 통합.
 """
+import asyncio
 import logging
 import time
-from typing import Any
+from typing import Any, Iterator
 
+from langchain_core.embeddings import Embeddings
 from langchain_core.messages import AIMessage, HumanMessage
 from langchain_neo4j import GraphCypherQAChain, Neo4jGraph
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_neo4j.chains.graph_qa.cypher import extract_cypher
 from langchain_core.prompts import PromptTemplate
 from neo4j.exceptions import ClientError
 
-from app.core import get_settings
+from app.core import get_settings, metrics, tracing
+from app.services import (
+    answer_formatter,
+    intent_router,
+    llm_gateway,
+    model_provider,
+    schema_snapshot,
+    stake_change_service,
+    suggest_service,
+    token_budget,
+)
+from app.services.cypher_governor import CypherRejected, GovernedGraph
 
 logger = logging.getLogger(__name__)
 
 # ── Lazy 싱글톤 (앱 기동 시 1회 초기화) ─────────────────────────────────────
 _graph: Neo4jGraph | None = None
-_embed_model: OpenAIEmbeddings | None = None
+_embed_model: Embeddings | None = None
 _qa_chain: Any = None
 _chat_history: list = []
 
+_NO_HISTORY = "(없음)"
+_TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000)
+
+
+class TracedNeo4jGraph(Neo4jGraph):
+    """query 마다 neo4j 구간 계측 + 느린 쿼리 로그 (app.core.tracing)."""
+
+    def query(self, query: str, params: dict | None = None, session_params: dict | None = None) -> list[dict]:
+        with tracing.query_span(query, params):
+            return super().query(query, params or {}, session_params=session_params)
+
 
 def _get_graph() -> Neo4jGraph:
     global _graph
     if _graph is None:
         s = get_settings()
-        _graph = Neo4jGraph(
+        _graph = TracedNeo4jGraph(
             url=s.NEO4J_URI,
             username=s.NEO4J_USER,
             password=s.NEO4J_PASSWORD,
             # enhanced_schema=True 시 스키마 토큰 급증·컨텍스트 초과 가능. 도메인 규칙은 프롬프트에 명시하므로 기본 스키마 사용.
             enhanced_schema=False,
+            # 스키마 인트로스펙션은 요청 경로에서 돌리지 않음 — 스냅샷 적용, 갱신은 데이터 버전 변경 시 백그라운드
+            refresh_schema=False,
         )
-        _graph.refresh_schema()
+        schema_snapshot.attach(_graph)
     return _graph
 
 
-def _get_embed_model() -> OpenAIEmbeddings:
+def probe_connection() -> None:
+    """
+    Neo4j 연결 확인 (RETURN 1). 실패 시 싱글톤을 비워 다음 호출에서 재연결.
+    요청 경로가 아닌 백그라운드 헬스 프로브에서 사용.
+    """
+    global _graph
+    try:
+        _get_graph().query("RETURN 1 AS ok")
+    except Exception:
+        _graph = None
+        raise
+
+
+def stream_query(query: str, params: dict | None = None, fetch_size: int = 1000) -> Iterator[dict]:
+    """
+    결과를 리스트로 모으지 않고 레코드 단위로 yield (드라이버가 fetch_size 단위로 페이지 수신).
+    Neo4jGraph.query 는 전체 결과를 메모리에 적재하므로 전체 노드/엣지 같은 대량 조회에 사용.
+    neo4j 구간·느린 쿼리 로그는 마지막 레코드까지(소비 측 대기 포함) 잼.
+    """
+    graph = _get_graph()
+    with tracing.query_span(query, params), graph._driver.session(
+        database=graph._database, fetch_size=fetch_size
+    ) as session:
+        for record in session.run(query, params or {}):
+            yield record.data()
+
+
+def execute_write(statements: list[tuple[str, dict]]) -> list[dict]:
+    """
+    (Cypher, params) 들을 하나의 쓰기 트랜잭션으로 실행 (대량 적재 배치 단위).
+    일시적 오류(교착·리더 변경 등)는 드라이버 관리 트랜잭션이 재시도.
+    문장마다 neo4j 구간·느린 쿼리 로그 (커밋 대기는 제외).
+    Returns: 마지막 문장의 결과 레코드 (RETURN 없는 문장이면 빈 리스트).
+    """
+    graph = _get_graph()
+
+    def work(tx) -> list[dict]:
+        rows: list[dict] = []
+        for query, params in statements:
+            with tracing.query_span(query, params):
+                rows = tx.run(query, params).data()
+        return rows
+
+    with graph._driver.session(database=graph._database) as session:
+        return session.execute_write(work)
+
+
+def _get_embed_model() -> Embeddings:
     global _embed_model
     if _embed_model is None:
-        s = get_settings()
-        _embed_model = OpenAIEmbeddings(model=s.EMBED_MODEL, api_key=s.OPENAI_API_KEY)
+        # EMBED_PROVIDER (openai | local)
+        _embed_model = model_provider.embeddings_model()
     return _embed_model
 
 
 def _get_qa_chain():
     global _qa_chain
     if _qa_chain is None:
-        s = get_settings()
-        llm = ChatOpenAI(model=s.LLM_MODEL, temperature=0, max_tokens=1024, api_key=s.OPENAI_API_KEY)
+        # LLM_PROVIDER (openai | local). 공유 연결 풀·동시 호출 한도·재시도는 llm_gateway
+        llm = model_provider.chat_model(temperature=0, max_tokens=1024)
         graph = _get_graph()
 
         CYPHER_PROMPT = PromptTemplate(
             input_variables=["schema", "question"],
+            partial_variables={"history": _NO_HISTORY},
             template="""당신은 Neo4j Cypher 작성자입니다.
 아래 스키마와 도메인 지식을 참고하여 사용자 질문에 맞는 Cypher를 작성하세요.
 
@@ -62,10 +136,12 @@ def _get_qa_chain():
 
 ## 도메인 지식 (반드시 준수)
 [노드]
-- (c:Company:LegalEntity)  bizno, companyName, isActive(bool), closedDate(Date)
+- (c:Company:LegalEntity)  bizno, crno(법인등록번호), companyName, isActive(bool), closedDate(Date)
 - (p:Person:Stockholder)   personId, stockName(주주명), shareholderType='PERSON'
 - (x:Company:Stockholder)  법인 주주  shareholderType='CORPORATION'|'INSTITUTION'
 - (:MajorShareholder)      maxStockRatio >= 5% 인 주주
+- Company·Stockholder 분석 지표  pagerank(Float, 지분 영향력), betweenness(Float, 중개 중심성),
+    communityId(Int, 지분 커뮤니티 번호), sccId(Int, 상호출자 순환 묶음 번호)
 
 [관계]
 - (s:Stockholder)-[:HOLDS_SHARES]->(c:Company)
@@ -79,6 +155,8 @@ def _get_qa_chain():
 3. 지분율 비교 → Float  예) r.stockRatio >= 50.0
 4. 금액 단위 만원, 1억=10000, LIMIT 기본 10
 5. Cypher 코드만 반환 — 설명·마크다운 금지
+6. 가변 길이 경로는 상한 필수  예) -[:HOLDS_SHARES*1..3]->  ([*], [*2..] 는 실행 거부)
+7. 읽기 전용 — CREATE/MERGE/SET/DELETE 금지, 연결 없는 패턴 나열(MATCH (a), (b)) 금지
 
 [지분율 변동 쿼리 예시]
 - 시간에 따른 지분율 변동 찾기 (baseDate/reportYear 사용):
@@ -115,6 +193,9 @@ def _get_qa_chain():
   ORDER BY abs(maxRatio - minRatio) DESC
   LIMIT 10
 
+## 이전 대화 (후속 질문의 생략된 회사명·주주명 해석용)
+{history}
+
 질문: {question}
 
 Cypher:""".strip(),
@@ -162,14 +243,18 @@ DB 결과:
 답변:""".strip(),
         )
 
+        # 생성 Cypher 는 읽기 전용·EXPLAIN 검사·타임아웃·행/바이트 상한·동시 실행 제한을 거쳐 실행.
+        # ask_graph 는 체인의 생성(_generate_cypher)·실행(_execute_cypher) 단계를 나눠 호출하고 문장화는 _phrase
+        # (규칙 포맷터 → 안 되면 qa_chain). return_direct 는 체인을 통째로 invoke 할 때도 같은 동작이 되도록.
         _qa_chain = GraphCypherQAChain.from_llm(
             llm=llm,
-            graph=graph,
+            graph=GovernedGraph(graph),
             cypher_prompt=CYPHER_PROMPT,
             qa_prompt=QA_PROMPT,
             verbose=False,
             return_intermediate_steps=True,
-            allow_dangerous_requests=True,
+            return_direct=True,
+            allow_dangerous_requests=True,  # 체인 필수 옵트인 — 실제 통제는 GovernedGraph
             top_k=10,
         )
     return _qa_chain
@@ -181,8 +266,8 @@ def ensure_vector_index() -> None:
     graph = _get_graph()
     try:
         graph.query(f"""
-            CREATE VECTOR INDEX company_name_vector IF NOT EXISTS
-            FOR (c:Company) ON (c.nameEmbedding)
+            CREATE VECTOR INDEX `{s.EMBED_INDEX}` IF NOT EXISTS
+            FOR (c:Company) ON (c.`{s.EMBED_PROPERTY}`)
             OPTIONS {{
                 indexConfig: {{
                     `vector.dimensions`: {s.EMBED_DIM},
@@ -194,69 +279,318 @@ def ensure_vector_index() -> None:
         pass
 
 
-def find_similar_companies(text: str, top_k: int = 3) -> list[str]:
-    embed = _get_embed_model()
+def find_similar_companies(text: str, top_k: int = 3, vec: list[float] | None = None) -> list[str]:
+    """vec: 이미 계산한 text 임베딩 (ask_graph 가 의도 분류와 같이 사용)."""
     graph = _get_graph()
-    vec = embed.embed_query(text)
+    if vec is None:
+        vec = _get_embed_model().embed_query(text)
     rows = graph.query("""
-        CALL db.index.vector.queryNodes('company_name_vector', $k, $vec)
+        CALL db.index.vector.queryNodes($index, $k, $vec)
         YIELD node, score
         WHERE score > 0.75
         RETURN node.companyName AS name, score
         ORDER BY score DESC
-    """, params={"k": top_k, "vec": vec})
+    """, params={"index": get_settings().EMBED_INDEX, "k": top_k, "vec": vec})
     return [r["name"] for r in rows]
 
 
+def _record_tokens(usage: dict | None, stage: str, prompt_tokens: int, saved: int, **extra) -> None:
+    """프롬프트 토큰 계측 (llm_prompt_tokens{stage}, llm_prompt_tokens_saved_total{stage}) + 응답 tokens 필드."""
+    metrics.observe("llm_prompt_tokens", prompt_tokens, buckets=_TOKEN_BUCKETS, stage=stage)
+    metrics.inc("llm_prompt_tokens_saved_total", saved, stage=stage)
+    if usage is not None:
+        usage[stage] = {"prompt": prompt_tokens, "saved": saved, **extra}
+
+
+def _phrase(question: str, rows: list[dict], cypher: str = "", usage: dict | None = None) -> str:
+    """
+    결과 행 → 답변. 표 형태면 규칙 포맷터(LLM 호출 없음), 아니면 QA LLM. chat_answer_total{method} 로 계측.
+    QA 프롬프트에는 Cypher 가 참조한 속성만 남긴 행을 LLM_QA_PROMPT_BUDGET 안에 드는 만큼만 넣음.
+    """
+    answer = answer_formatter.format_answer(rows)
+    if answer is not None:
+        metrics.inc("chat_answer_total", method="formatter")
+        return answer
+    metrics.inc("chat_answer_total", method="llm")
+    budget = get_settings().LLM_QA_PROMPT_BUDGET
+    qa_chain = _get_qa_chain().qa_chain
+    prompt = qa_chain.first
+    context = rows[:10]
+    verbatim = token_budget.count(prompt.format(question=question, context=context))
+    base = token_budget.count(prompt.format(question=question, context=[]))
+    context = token_budget.fit_rows(token_budget.project_rows(context, cypher), budget, base)
+    tokens = token_budget.count(prompt.format(question=question, context=context))
+    if tokens > budget:
+        metrics.inc("llm_prompt_over_budget_total", stage="qa")
+    _record_tokens(usage, "qa", tokens, max(0, verbatim - tokens), rows=len(context))
+    return qa_chain.invoke({"question": question, "context": context})
+
+
+def _generate_cypher(
+    chain: GraphCypherQAChain, question: str, history: list, usage: dict | None = None, stage: str = "cypher"
+) -> str:
+    """
+    Cypher 생성 (LLM 1회). GraphCypherQAChain._call 의 생성 단계와 같되 스키마는 현재 스냅샷
+    (체인 생성 시점에 고정된 graph_schema 대신 — 백그라운드 갱신·축약본 반영).
+    대화 이력은 LLM_CYPHER_PROMPT_BUDGET 의 남는 몫(최대 CHAT_HISTORY_TOKEN_BUDGET)에 맞춰 압축.
+    stage: 토큰 계측 키 — 추측 생성과 힌트 재생성이 한 질문에서 둘 다 돌면 따로 기록 (cypher / cypher_regenerate).
+    """
+    budget = get_settings().LLM_CYPHER_PROMPT_BUDGET
+    prompt = chain.cypher_generation_chain.first
+    schema = schema_snapshot.prompt_schema() or chain.graph_schema
+    base = token_budget.count(prompt.format(question=question, schema=schema))
+    history_text, turns, history_saved = token_budget.compact_history(history, token_budget.history_budget(base))
+    tokens = base + (token_budget.count(history_text) - token_budget.count(_NO_HISTORY) if history_text else 0)
+    if tokens > budget:
+        metrics.inc("llm_prompt_over_budget_total", stage=stage)
+    full_schema = schema_snapshot.full_schema() or schema
+    saved = token_budget.count_cached(full_schema) - token_budget.count_cached(schema) + history_saved
+    _record_tokens(usage, stage, tokens, max(0, saved), history_turns=turns)
+    generated = extract_cypher(chain.cypher_generation_chain.invoke(
+        {"question": question, "schema": schema, "history": history_text or _NO_HISTORY}
+    ))
+    if chain.cypher_query_corrector:
+        generated = chain.cypher_query_corrector(generated)
+    return generated
+
+
+def _execute_cypher(chain: GraphCypherQAChain, cypher: str) -> list[dict]:
+    """생성 Cypher 실행 (GovernedGraph → CypherRejected 가능). 체인과 같이 top_k 행까지."""
+    return chain.graph.query(cypher)[: chain.top_k] if cypher else []
+
+
+async def _timed(timings: dict[str, float], stage: str, fn, *args):
+    """블로킹 단계를 스레드에서 실행하고 소요 시간 기록 (timings[stage], chat_stage_seconds{stage})."""
+    t0 = time.perf_counter()
+    try:
+        return await asyncio.to_thread(fn, *args)
+    finally:
+        elapsed = time.perf_counter() - t0
+        timings[stage] = round(elapsed, 3)
+        metrics.observe("chat_stage_seconds", elapsed, stage=stage)
+
+
+def _should_speculate(question: str) -> bool:
+    """
+    추측 생성을 걸지 판단. 버려진 추측도 이미 보낸 LLM 호출이라 과금되므로(to_thread 취소로 멈추지 않음)
+    결과가 채택될 질문에만: 라우팅 문법에 걸리지 않고, 자동완성 인덱스의 회사명이 질문에 그대로 들어 있어
+    힌트가 질문 속 이름으로 나올 것으로 보이는 경우. 회사명이 없는 질문(후속 질문·약칭)은 힌트가 질문 밖의
+    이름이 되기 쉬워 힌트를 기다림. 인덱스가 아직 없으면 추측하지 않음.
+    """
+    if not get_settings().CHAT_SPECULATIVE_CYPHER:
+        return False
+    if stake_change_service.is_stake_change_question(question) or intent_router.matches_grammar(question):
+        return False
+    index = suggest_service.get_index()
+    return index is not None and bool(index.contained_in(question, node_type="company", limit=1))
+
+
+async def _speculate(
+    schema: "asyncio.Task", question: str, history: list, timings: dict[str, float], usage: dict
+) -> str:
+    """힌트를 기다리지 않고 원 질문으로 Cypher 생성 (체인 준비만 기다림)."""
+    chain = await schema
+    return await _timed(timings, "cypher_generate", _generate_cypher, chain, question, history, usage)
+
+
+async def _merge_hints(
+    speculative: "asyncio.Task", chain: GraphCypherQAChain, enhanced: str, hints: list[str], history: list,
+    timings: dict[str, float], usage: dict,
+) -> str:
+    """
+    질문에 없는 힌트 회사명이 나왔을 때: 힌트를 넣은 재생성을 바로 시작하고, 추측 결과가 먼저 끝나
+    힌트 회사명을 이미 쓰고 있으면 그것을 채택 (재생성 취소). 아니면 재생성 결과 사용.
+    """
+    regenerate = asyncio.create_task(
+        _timed(timings, "cypher_regenerate", _generate_cypher, chain, enhanced, history, usage, "cypher_regenerate")
+    )
+    try:
+        done, _ = await asyncio.wait({speculative, regenerate}, return_when=asyncio.FIRST_COMPLETED)
+        if speculative in done and not speculative.exception():
+            cypher = speculative.result()
+            if any(h in cypher for h in hints):
+                metrics.inc("chat_speculation_total", outcome="hit")
+                return cypher
+        metrics.inc("chat_speculation_total", outcome="miss")
+        return await regenerate
+    finally:
+        _discard(regenerate)
+
+
+def _discard(task: "asyncio.Task | None") -> None:
+    """결과를 쓰지 않는 태스크 정리 (진행 중이면 취소, 끝났으면 예외 회수)."""
+    if task is None:
+        return
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
+def _remember_turn(question: str, answer: str) -> None:
+    _chat_history.append(HumanMessage(content=question))
+    _chat_history.append(AIMessage(content=answer))
+    # 대화 이력 최대 6턴 유지 (토큰 수 제한)
+    while len(_chat_history) > 12:  # 6턴 = 12개 메시지
+        _chat_history.pop(0)
+        _chat_history.pop(0)
+
+
 # ── 공개 API ───────────────────────────────────────────────────────────────
 class GraphService:
     """ask_graph, reset_chat, graph/stats 검색 등."""
 
     @staticmethod
     def ask_graph(question: str) -> dict:
-        t0 = time.time()
-        hints = find_similar_companies(question, top_k=3)
-        enhanced = question
-        if hints:
-            enhanced = f"{question}\n[DB 내 유사 회사명: {', '.join(hints)}]"
+        """동기 호출용 (스크립트·벤치). 이벤트 루프 안에서는 ask_graph_async."""
+        return asyncio.run(GraphService.ask_graph_async(question))
 
-        chain = _get_qa_chain()
-        graph = _get_graph()
-        cypher, raw = "", []
+    @staticmethod
+    async def ask_graph_async(question: str) -> dict:
+        """
+        응답 경로(route): stake_change | template:<템플릿> | llm. 경로별 지연은 chat_seconds{route} 로 계측.
+        """
+        result = await GraphService._ask_graph(question)
+        metrics.observe("chat_seconds", result["elapsed"], route=result["route"].split(":", 1)[0])
+        return result
+
+    @staticmethod
+    def _answer_from_template(question: str, matched: "intent_router.Route", usage: dict) -> dict | None:
+        """템플릿 Cypher 실행 + 답변 문장화. 실패하면 None → LLM Cypher 경로."""
         try:
-            # 대화 이력 제한: 최근 3턴만 (토큰 수 제한)
-            result = chain.invoke({
-                "query": enhanced,
-                "chat_history": _chat_history[-6:],  # 최근 3턴 (Human+AIMessage 쌍)
-            })
-            answer = result.get("result", "답변을 생성하지 못했습니다.")
-            for step in result.get("intermediate_steps", []):
-                if isinstance(step, dict):
-                    cypher = cypher or step.get("query", "")
-                    ctx = step.get("context")
-                    if ctx is not None and not raw:
-                        raw = ctx if isinstance(ctx, list) else [{"result": ctx}]
+            rows = intent_router.run(matched)
+            answer = _phrase(question, rows, matched.template.cypher, usage)
+        except llm_gateway.LLMOverloaded:
+            raise
         except Exception as e:
-            error_msg = str(e)
-            # Context length exceeded 등 LLM 에러는 명확히 구분
-            if "context_length" in error_msg.lower() or "token" in error_msg.lower():
-                answer = f"⚠️ 질문이 너무 길거나 대화 이력이 너무 깁니다. 질문을 짧게 하거나 대화를 초기화해 주세요.\n\n오류: {error_msg[:200]}"
-            else:
-                answer = f"⚠️ 오류 발생: {error_msg[:200]}"
-            cypher, raw = "", []
-            source, confidence = "LLM", "LOW"
-            
-            # 에러 발생 시 대화 이력에 추가하지 않고 즉시 반환
+            logger.warning(f"Template {matched.name} failed, falling back to LLM Cypher: {e}")
+            return None
+        return {"answer": answer, "cypher": matched.template.cypher.strip(), "raw": rows}
+
+    @staticmethod
+    def _answer_routed(question: str, hints: list[str], vec: list[float], usage: dict) -> dict | None:
+        """지분율 변동 / Cypher 템플릿으로 답할 수 있으면 응답 필드, 아니면 None (LLM Cypher 경로)."""
+        # 지분율 변동 질문은 LLM Cypher 대신 인-프로세스 시계열에서 바로 답변 (스냅샷 없으면 기존 경로)
+        try:
+            routed = stake_change_service.answer_question(question, hints)
+        except Exception as e:
+            logger.warning(f"Stake change routing failed, falling back to LLM Cypher: {e}")
+            routed = None
+        if routed is not None:
             return {
-                "answer": answer,
-                "cypher": cypher,
-                "raw": raw,
-                "hints": hints,
-                "source": source,
-                "confidence": confidence,
-                "elapsed": round(time.time() - t0, 2),
+                "answer": routed["answer"],
+                "cypher": "",
+                "raw": routed["raw"],
+                "source": "DB_EMPTY" if routed["empty"] else "DB",
+                "confidence": "MEDIUM" if routed["empty"] else "HIGH",
+                "route": "stake_change",
             }
 
+        # 자주 묻는 유형은 검증된 Cypher 템플릿으로 (LLM Cypher 생성 생략)
+        try:
+            matched = intent_router.route(question, hints, vec)
+        except Exception as e:
+            logger.warning(f"Intent routing failed, falling back to LLM Cypher: {e}")
+            matched = None
+        templated = GraphService._answer_from_template(question, matched, usage) if matched is not None else None
+        if templated is None:
+            return None
+        logger.info(f"Chat served by template {matched.name} ({matched.method}, score={matched.score:.2f})")
+        return {
+            **templated,
+            "source": "DB" if templated["raw"] else "DB_EMPTY",
+            "confidence": "HIGH" if templated["raw"] else "MEDIUM",
+            "route": f"template:{matched.name}",
+        }
+
+    @staticmethod
+    async def _ask_graph(question: str) -> dict:
+        """
+        단계 DAG (블로킹 호출은 asyncio.to_thread 로 겹쳐 실행):
+
+            embed ──────┐
+            schema ─────┴─► hints ─► 라우팅(stake_change / template) ─► 답변
+            schema ─► cypher 추측 생성(힌트 없는 질문) ─┐
+                                          hints ──────┴─► 채택 | 힌트 넣어 재생성 ─► execute ─► phrase
+
+        - schema: 체인·그래프 싱글톤 준비(스키마 문자열 포함). hints 는 그 뒤에 실행해 싱글톤 동시 초기화를 피함
+        - 대화 이력(최근 3턴)은 시작 시점에 잘라 둔 사본을 사용
+        - 추측 생성은 회사명이 질문에 그대로 있고 라우팅 문법(지분율 변동·템플릿)에 걸리지 않는 질문만
+          (_should_speculate, CHAT_SPECULATIVE_CYPHER 로 끔). 힌트가 없거나 힌트 회사명이 질문·생성 Cypher 에
+          이미 있으면 그대로 채택, 아니면 힌트를 넣은 재생성 결과 (재생성은 힌트가 나오는 즉시 시작 — 지연은 순차
+          실행과 같음). 비용: miss·discarded 는 Cypher 생성 LLM 호출 1회가 그대로 더 과금됨 (태스크를 취소해도
+          스레드에서 나간 요청은 끝까지 실행). 결과는 chat_speculation_total{outcome=hit|miss|discarded}
+        timings: 단계별 소요(초, chat_stage_seconds{stage}). 단계가 겹치므로 합은 elapsed 보다 클 수 있음.
+        tokens: LLM 호출 단계(cypher·cypher_regenerate·qa)별 프롬프트 토큰·예산으로 줄인 토큰 (token_budget).
+        """
+        t0 = time.time()
+        timings: dict[str, float] = {}
+        hints: list[str] = []
+        usage: dict[str, dict] = {}
+        # 대화 이력(최대 6턴) 사본 — 프롬프트에는 토큰 예산 안에서 최근 턴부터 압축해 넣음
+        history = list(_chat_history)
+
+        def respond(**fields) -> dict:
+            return {**fields, "hints": hints, "elapsed": round(time.time() - t0, 2), "timings": timings, "tokens": usage}
+
+        schema = asyncio.create_task(_timed(timings, "schema", _get_qa_chain))
+        embed = asyncio.create_task(_timed(timings, "embed", lambda: _get_embed_model().embed_query(question)))
+        speculative = None
+        if _should_speculate(question):
+            speculative = asyncio.create_task(_speculate(schema, question, history, timings, usage))
+        try:
+            await schema
+            vec = await embed
+            hints = await _timed(timings, "hints", find_similar_companies, question, 3, vec)
+            enhanced = question
+            if hints:
+                enhanced = f"{question}\n[DB 내 유사 회사명: {', '.join(hints)}]"
+
+            routed = await _timed(timings, "route", GraphService._answer_routed, question, hints, vec, usage)
+            if routed is not None:
+                if speculative is not None:
+                    metrics.inc("chat_speculation_total", outcome="discarded")
+                _remember_turn(question, routed["answer"])
+                return respond(**routed)
+
+            chain = schema.result()
+            cypher, raw = "", []
+            try:
+                if speculative is None:
+                    cypher = await _timed(timings, "cypher_generate", _generate_cypher, chain, enhanced, history, usage)
+                elif not hints or any(h in question for h in hints):
+                    cypher = await speculative
+                    metrics.inc("chat_speculation_total", outcome="hit")
+                else:
+                    cypher = await _merge_hints(speculative, chain, enhanced, hints, history, timings, usage)
+                raw = await _timed(timings, "cypher_execute", _execute_cypher, chain, cypher)
+                answer = await _timed(timings, "phrase", _phrase, enhanced, raw, cypher, usage) or "답변을 생성하지 못했습니다."
+            except CypherRejected as e:
+                # 실행 한도 초과로 거부된 생성 Cypher: 쿼리는 보여주고 범위를 좁히도록 안내
+                return respond(
+                    answer=f"⚠️ 생성된 쿼리를 실행하지 않았습니다: {e}. 회사명·기간 등으로 범위를 좁혀 다시 질문해 주세요.",
+                    cypher=e.query,
+                    raw=[],
+                    source="LLM",
+                    confidence="LOW",
+                    route="llm",
+                )
+            except llm_gateway.LLMOverloaded:
+                # 과부하는 답변으로 감싸지 않음 → /chat 이 503 + Retry-After
+                raise
+            except Exception as e:
+                error_msg = str(e)
+                # Context length exceeded 등 LLM 에러는 명확히 구분
+                if "context_length" in error_msg.lower() or "token" in error_msg.lower():
+                    answer = f"⚠️ 질문이 너무 길거나 대화 이력이 너무 깁니다. 질문을 짧게 하거나 대화를 초기화해 주세요.\n\n오류: {error_msg[:200]}"
+                else:
+                    answer = f"⚠️ 오류 발생: {error_msg[:200]}"
+                # 에러 발생 시 대화 이력에 추가하지 않고 즉시 반환
+                return respond(answer=answer, cypher=cypher, raw=[], source="LLM", confidence="LOW", route="llm")
+        finally:
+            _discard(speculative)
+            _discard(embed)
+
         if cypher and raw:
             source, confidence = "DB", "HIGH"
         elif cypher and not raw:
@@ -268,22 +602,9 @@ class GraphService:
                 answer = f"⚠️ DB 조회에 실패하여 LLM 추론으로 답변합니다. 실제 데이터와 다를 수 있습니다.\n\n{answer}"
 
         # 성공한 경우에만 대화 이력 추가 (에러는 이미 return됨)
-        _chat_history.append(HumanMessage(content=question))
-        _chat_history.append(AIMessage(content=answer))
-        # 대화 이력 최대 6턴 유지 (토큰 수 제한)
-        while len(_chat_history) > 12:  # 6턴 = 12개 메시지
-            _chat_history.pop(0)
-            _chat_history.pop(0)
+        _remember_turn(question, answer)
 
-        return {
-            "answer": answer,
-            "cypher": cypher,
-            "raw": raw,
-            "hints": hints,
-            "source": source,
-            "confidence": confidence,
-            "elapsed": round(time.time() - t0, 2),
-        }
+        return respond(answer=answer, cypher=cypher, raw=raw, source=source, confidence=confidence, route="llm")
 
     @staticmethod
     def reset_chat() -> None:
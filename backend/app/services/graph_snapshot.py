@@ -0,0 +1,543 @@
+"""
+HOLDS_SHARES 그래프 인-프로세스 스냅샷 (읽기 전용 조회·분석용).
+
+지분 데이터는 공시 재적재 때만 바뀌므로 ego 그래프·엣지 top-N·노드 상세 이웃은 메모리에서 응답하고
+Neo4j 는 원본(source of truth)으로만 사용.
+- 노드: nodeKey 정렬 순서 = 정수 인덱스 (인덱스 비교 = nodeKey 문자열 비교). 키·이름은 sys.intern
+- 관계(보고서 단위): ratio float32(NaN=null), reportYear int16(0=null) — (주주, 회사, 연도) 순
+- (주주, 회사) 쌍: 주주별 CSR (indptr int64, 회사 int32), 쌍별 최대·최신 지분율 float32,
+  쌍 → 관계 구간(int32), 회사별 역방향 CSR (쌍 인덱스 int32), (지분율 DESC, from, to) 순열
+- 노드 분석 지표(graph_metrics 배치가 기록한 METRIC_PROPS): (노드, 지표) float32 (NaN=없음)
+- 적재: 기동 시 스트리밍 읽기(fetch_size 페이지) 후 원자적 교체, 이후 주기적으로·데이터 버전 변경 시 전체 재적재
+스냅샷이 없으면(적재 전·실패) 호출 측이 Neo4j 쿼리로 폴백.
+스냅샷에서 파생한 응답 캐시(히트맵·노드 상세)는 on_swap 으로 구독 — 데이터 버전 변경 키를 새 스냅샷으로
+교체한 뒤에 받으므로, 재적재 중 들어온 요청이 이전 스냅샷으로 다시 채운 캐시도 함께 비워짐.
+"""
+import bisect
+import logging
+import math
+import sys
+import threading
+import time
+from array import array
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+FLAG_COMPANY, FLAG_STOCKHOLDER, FLAG_MAJOR, FLAG_INACTIVE = 1, 2, 4, 8
+_NO_TYPE = 255
+_YEAR_MIN, _YEAR_MAX = -(2 ** 15), 2 ** 15 - 1
+# graph_metrics 배치가 기록하는 노드 속성 (정수형은 커뮤니티·고리 번호)
+METRIC_PROPS = ("pagerank", "betweenness", "communityId", "sccId")
+_INT_METRICS = frozenset(("communityId", "sccId"))
+
+
+class GraphSnapshot:
+    """
+    읽기 전용. 요청 스레드는 락 없이 참조하고, 갱신은 새 객체를 만들어 모듈 변수를 통째로 교체.
+    """
+
+    def __init__(
+        self,
+        keys: list[str],
+        labels: list[str],
+        flags: np.ndarray,
+        stype_codes: np.ndarray,
+        stype_names: list[str],
+        bizno: dict[int, str],
+        src: np.ndarray,
+        dst: np.ndarray,
+        ratio: np.ndarray,
+        year: np.ndarray,
+        metrics: Optional[np.ndarray] = None,
+    ) -> None:
+        n = len(keys)
+        self.keys = keys
+        self.labels = labels
+        self.index = {k: i for i, k in enumerate(keys)}
+        self.flags = flags
+        self.stype_codes = stype_codes
+        self.stype_names = stype_names
+        self.bizno = bizno
+        self.metrics = metrics if metrics is not None else np.full((n, len(METRIC_PROPS)), np.nan, dtype=np.float32)
+
+        # 관계: (주주, 회사, 연도, 지분율) 순 → 쌍별 마지막 = 최신 연도의 최대 지분율
+        order = np.lexsort((np.nan_to_num(ratio, nan=-1.0), year, dst, src))
+        src, dst = src[order], dst[order]
+        self.ratio = ratio[order]
+        self.year = year[order]
+        m = len(order)
+
+        if m:
+            starts = np.flatnonzero(np.r_[True, (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])])
+            self.pair_ratio = np.nan_to_num(np.fmax.reduceat(self.ratio, starts), nan=0.0).astype(np.float32)
+            self.pair_latest = np.nan_to_num(self.ratio[np.r_[starts[1:], m] - 1], nan=0.0).astype(np.float32)
+        else:
+            starts = np.zeros(0, dtype=np.int64)
+            self.pair_ratio = self.pair_latest = np.zeros(0, dtype=np.float32)
+        self.pair_src = src[starts].astype(np.int32)
+        self.pair_dst = dst[starts].astype(np.int32)
+        self.rel_start = np.r_[starts, m].astype(np.int32)
+
+        nodes = np.arange(n + 1)
+        self.out_indptr = np.searchsorted(self.pair_src, nodes).astype(np.int64)
+        self.in_order = np.argsort(self.pair_dst, kind="stable").astype(np.int32)
+        self.in_indptr = np.searchsorted(self.pair_dst[self.in_order], nodes).astype(np.int64)
+        # 인덱스 순서 = nodeKey 순서이므로 (ratio DESC, fromId, toId) 정렬이 정수 비교로 끝남
+        self.rank = np.lexsort((self.pair_dst, self.pair_src, -self.pair_ratio)).astype(np.int32)
+        self.loaded_at = time.time()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def n_pairs(self) -> int:
+        return len(self.pair_src)
+
+    @property
+    def n_relationships(self) -> int:
+        return len(self.ratio)
+
+    # ── 노드 ─────────────────────────────────────────────────────────────
+    def row(self, i: int) -> dict:
+        """Neo4j 조회 row 와 같은 모양 {"id", "labels", "props"} (graph 엔드포인트 변환 함수 재사용)."""
+        f = int(self.flags[i])
+        labels = []
+        props: dict = {}
+        if f & FLAG_COMPANY:
+            labels.append("Company")
+            props["companyName"] = self.labels[i]
+            props["bizno"] = self.bizno.get(i)
+            props["isActive"] = not f & FLAG_INACTIVE
+        else:
+            props["stockName"] = self.labels[i]
+        if f & FLAG_STOCKHOLDER:
+            labels.append("Stockholder")
+        if f & FLAG_MAJOR:
+            labels.append("MajorShareholder")
+        code = int(self.stype_codes[i])
+        if code != _NO_TYPE:
+            props["shareholderType"] = self.stype_names[code]
+        for name, v in zip(METRIC_PROPS, self.metrics[i].tolist()):
+            if v == v:
+                props[name] = int(v) if name in _INT_METRICS else v
+        return {"id": self.keys[i], "labels": labels, "props": props}
+
+    def out_pairs(self, i: int) -> range:
+        """i 가 주주인 쌍 인덱스."""
+        return range(int(self.out_indptr[i]), int(self.out_indptr[i + 1]))
+
+    def in_pairs(self, i: int) -> np.ndarray:
+        """i 가 회사인 쌍 인덱스 (i 의 주주들)."""
+        return self.in_order[self.in_indptr[i]:self.in_indptr[i + 1]]
+
+    # ── 조회 ─────────────────────────────────────────────────────────────
+    def ego(self, i: int, max_hops: int, max_nodes: int) -> list[int]:
+        """
+        i + 지분 방향 1..max_hops 이내 하위(보유 회사) + 상위(주주) 노드 (/graph/ego Cypher 와 같은 범위).
+        가까운 홉부터 채워서 max_nodes 에서 자름.
+        """
+        result = [i]
+        seen = {i}
+        down, up = [i], [i]
+        for _ in range(max_hops):
+            next_down = [int(self.pair_dst[p]) for u in down for p in self.out_pairs(u)]
+            next_up = [int(self.pair_src[p]) for u in up for p in self.in_pairs(u)]
+            down, up = [], []
+            for frontier, level in ((down, next_down), (up, next_up)):
+                for v in level:
+                    if v not in seen:
+                        seen.add(v)
+                        frontier.append(v)
+                        result.append(v)
+                        if len(result) >= max_nodes:
+                            return result
+            if not down and not up:
+                break
+        return result
+
+    def relationships_among(self, nodes: Iterable[int]) -> list[tuple[int, int, Optional[float]]]:
+        """노드 집합 내부 관계 (보고서 단위, 지분율 null 은 None)."""
+        members = set(nodes)
+        out = []
+        for u in members:
+            for p in self.out_pairs(u):
+                v = int(self.pair_dst[p])
+                if v in members:
+                    for r in self.ratio[self.rel_start[p]:self.rel_start[p + 1]]:
+                        out.append((u, v, None if np.isnan(r) else float(r)))
+        return out
+
+    def _pair_sort_key(self, p: int) -> tuple:
+        return (-float(self.pair_ratio[p]), self.keys[self.pair_src[p]], self.keys[self.pair_dst[p]])
+
+    def top_pairs(
+        self,
+        limit: int,
+        min_ratio: Optional[float] = None,
+        after: Optional[tuple[float, str, str]] = None,
+        nodes: Optional[list[int]] = None,
+    ) -> tuple[list[int], bool]:
+        """
+        (ratio DESC, fromId, toId) 순 쌍 인덱스 limit 개와 다음 페이지 존재 여부.
+        nodes 지정 시 그 노드가 주주 또는 회사인 쌍만. after = 이전 페이지 마지막 (ratio, fromId, toId).
+        """
+        if nodes is None:
+            ordered = self.rank
+        else:
+            subset = set()
+            for u in nodes:
+                subset.update(self.out_pairs(u))
+                subset.update(int(p) for p in self.in_pairs(u))
+            ordered = sorted(subset, key=self._pair_sort_key)
+        start = 0
+        if after is not None:
+            # 저장값이 float32 이므로 커서 지분율도 float32 로 맞춰 비교
+            target = (-float(np.float32(after[0])), after[1], after[2])
+            start = bisect.bisect_right(ordered, target, key=self._pair_sort_key)
+        page = [int(p) for p in ordered[start:start + limit + 1]]
+        if min_ratio is not None:
+            page = [p for p in page if self.pair_ratio[p] >= min_ratio]
+        return page[:limit], len(page) > limit
+
+    def neighbours(self, i: int, limit: int) -> list[tuple[int, float]]:
+        """양방향 이웃 (이웃별 최대 지분율) 지분율 내림차순 상위 limit."""
+        best: dict[int, float] = {}
+        for p in self.out_pairs(i):
+            v = int(self.pair_dst[p])
+            best[v] = max(best.get(v, 0.0), float(self.pair_ratio[p]))
+        for p in self.in_pairs(i):
+            v = int(self.pair_src[p])
+            best[v] = max(best.get(v, 0.0), float(self.pair_ratio[p]))
+        return sorted(best.items(), key=lambda kv: -kv[1])[:limit]
+
+    def ranked(self, metric: str, community: Optional[int] = None, scc: Optional[int] = None) -> np.ndarray:
+        """지표 값이 있는 노드 인덱스 (지표 DESC, nodeKey 순). community/scc 지정 시 해당 번호만."""
+        values = self.metrics[:, METRIC_PROPS.index(metric)]
+        mask = ~np.isnan(values)
+        if community is not None:
+            mask &= self.metrics[:, METRIC_PROPS.index("communityId")] == community
+        if scc is not None:
+            mask &= self.metrics[:, METRIC_PROPS.index("sccId")] == scc
+        hit = np.flatnonzero(mask)
+        return hit[np.argsort(-values[hit], kind="stable")]
+
+    def holder_stats(self, i: int) -> tuple[float, int]:
+        """회사 i: (최대 주주 지분율, 고유 주주 수)."""
+        pairs = self.in_pairs(i)
+        return (float(self.pair_ratio[pairs].max()) if len(pairs) else 0.0), len(pairs)
+
+    def holding_stats(self, i: int) -> tuple[int, float]:
+        """주주 i: (보유 관계 수, 평균 지분율)."""
+        lo, hi = self.out_indptr[i], self.out_indptr[i + 1]
+        if lo == hi:
+            return 0, 0.0
+        ratios = self.ratio[self.rel_start[lo]:self.rel_start[hi]]
+        valid = ratios[~np.isnan(ratios)]
+        return len(ratios), (float(valid.mean()) if len(valid) else 0.0)
+
+    def memory_stats(self) -> dict:
+        arrays = (
+            self.flags, self.stype_codes, self.ratio, self.year, self.pair_ratio, self.pair_latest,
+            self.pair_src, self.pair_dst, self.rel_start, self.out_indptr, self.in_order, self.in_indptr,
+            self.rank, self.metrics,
+        )
+        edge_bytes = sum(a.nbytes for a in arrays[2:9]) + self.in_order.nbytes + self.rank.nbytes
+        strings = {id(s): s for s in (*self.keys, *self.labels)}
+        string_bytes = sum(sys.getsizeof(s) for s in strings.values())
+        return {
+            "nodes": len(self.keys),
+            "relationships": self.n_relationships,
+            "pairs": self.n_pairs,
+            "array_bytes": sum(a.nbytes for a in arrays),
+            "edge_bytes_per_million": round(edge_bytes / max(1, self.n_relationships) * 1_000_000),
+            "string_bytes": string_bytes,
+            "index_bytes": sys.getsizeof(self.index) + sys.getsizeof(self.keys) + sys.getsizeof(self.labels),
+        }
+
+
+def build_snapshot(node_rows: Iterable[dict], rel_rows: Iterable[dict]) -> GraphSnapshot:
+    """
+    Args:
+        node_rows: {"key", "labels", "label", "shareholderType", "bizno", "active", *METRIC_PROPS}
+        rel_rows: {"src", "dst", "ratio", "year"} (nodeKey)
+    """
+    by_key: dict[str, dict] = {}
+    for row in node_rows:
+        if row.get("key"):
+            by_key[row["key"]] = row
+    keys = sorted(by_key)
+    n = len(keys)
+    labels: list[str] = []
+    flags = np.zeros(n, dtype=np.uint8)
+    stype_codes = np.full(n, _NO_TYPE, dtype=np.uint8)
+    stype_names: list[str] = []
+    stype_index: dict[str, int] = {}
+    bizno: dict[int, str] = {}
+    metrics = np.full((n, len(METRIC_PROPS)), np.nan, dtype=np.float32)
+    for i, key in enumerate(keys):
+        row = by_key[key]
+        node_labels = row.get("labels") or []
+        f = 0
+        if "Company" in node_labels:
+            f |= FLAG_COMPANY
+            if row.get("bizno"):
+                bizno[i] = sys.intern(str(row["bizno"]))
+            if row.get("active") is False:
+                f |= FLAG_INACTIVE
+        if "Stockholder" in node_labels:
+            f |= FLAG_STOCKHOLDER
+        if "MajorShareholder" in node_labels:
+            f |= FLAG_MAJOR
+        flags[i] = f
+        stype = row.get("shareholderType")
+        if stype:
+            code = stype_index.get(stype)
+            if code is None and len(stype_names) < _NO_TYPE:
+                code = stype_index[stype] = len(stype_names)
+                stype_names.append(stype)
+            if code is not None:
+                stype_codes[i] = code
+        labels.append(sys.intern(row.get("label") or "Unknown"))
+        for j, name in enumerate(METRIC_PROPS):
+            v = row.get(name)
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                metrics[i, j] = v
+    keys = [sys.intern(k) for k in keys]
+    index = {k: i for i, k in enumerate(keys)}
+    del by_key
+
+    src, dst = array("i"), array("i")
+    ratio, year = array("f"), array("h")
+    for row in rel_rows:
+        s, d = index.get(row["src"]), index.get(row["dst"])
+        if s is None or d is None:
+            continue
+        r = row.get("ratio")
+        y = row.get("year")
+        src.append(s)
+        dst.append(d)
+        ratio.append(float("nan") if r is None else float(r))
+        year.append(int(y) if isinstance(y, int) and _YEAR_MIN <= y <= _YEAR_MAX else 0)
+
+    return GraphSnapshot(
+        keys, labels, flags, stype_codes, stype_names, bizno,
+        np.frombuffer(src, dtype=np.int32).copy(),
+        np.frombuffer(dst, dtype=np.int32).copy(),
+        np.frombuffer(ratio, dtype=np.float32).copy(),
+        np.frombuffer(year, dtype=np.int16).copy(),
+        metrics,
+    )
+
+
+# ── 적재 (Neo4j) ───────────────────────────────────────────────────────────
+_snapshot: Optional[GraphSnapshot] = None
+_loader_lock = threading.Lock()
+_stop_event = threading.Event()
+_wake_event = threading.Event()
+_loader_thread: Optional[threading.Thread] = None
+# 다음 교체 때 구독자에게 알릴 변경 키 (None = 전체, 빈 집합 = 없음)
+_pending_keys: Optional[frozenset] = frozenset()
+_pending_lock = threading.Lock()
+_swap_listeners: list = []
+# 적재 진행 상태 (require_snapshot 의 Retry-After 추정·재시도 간격): 진행 중 적재 시작 시각, 마지막 시도 시각,
+# 마지막 성공 적재 소요(초). 로더가 없을 때(GRAPH_SNAPSHOT_ENABLED=false) 쓰는 1회 적재 스레드
+_build_started: Optional[float] = None
+_last_attempt: float = float("-inf")
+_last_build_sec: Optional[float] = None
+_oneshot_lock = threading.Lock()
+_oneshot_thread: Optional[threading.Thread] = None
+# 적재 실패 후 요청이 다시 적재를 당기는 최소 간격(초), 소요 기록이 없을 때 권하는 재시도 대기(초)
+_MIN_RETRY_SEC = 5.0
+_DEFAULT_RETRY_AFTER_SEC = 5
+
+
+class SnapshotLoading(RuntimeError):
+    """스냅샷이 아직 없음 (기동 직후 적재 중 등). retry_after: 클라이언트에 권할 재시도 대기(초)."""
+
+    def __init__(self, retry_after: int) -> None:
+        self.retry_after = retry_after
+        super().__init__(f"지분 그래프를 적재하는 중입니다. {retry_after}초 후 다시 시도해 주세요.")
+
+_SNAPSHOT_NODES_QUERY = """
+    MATCH (n)
+    WHERE (n:Company OR n:Stockholder) AND n.nodeKey IS NOT NULL
+    RETURN n.nodeKey AS key,
+           labels(n) AS labels,
+           CASE WHEN n:Company THEN n.companyName ELSE coalesce(n.stockName, n.companyName) END AS label,
+           n.shareholderType AS shareholderType,
+           n.bizno AS bizno,
+           n.isActive AS active,
+           n.pagerank AS pagerank,
+           n.betweenness AS betweenness,
+           n.communityId AS communityId,
+           n.sccId AS sccId
+"""
+_SNAPSHOT_RELS_QUERY = """
+    MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+    WHERE s.nodeKey IS NOT NULL AND c.nodeKey IS NOT NULL
+    RETURN s.nodeKey AS src, c.nodeKey AS dst, r.stockRatio AS ratio, r.reportYear AS year
+"""
+
+
+def _take_pending() -> Optional[frozenset]:
+    global _pending_keys
+    with _pending_lock:
+        keys, _pending_keys = _pending_keys, frozenset()
+        return keys
+
+
+def _add_pending(keys: Optional[frozenset]) -> None:
+    global _pending_keys
+    with _pending_lock:
+        _pending_keys = None if keys is None or _pending_keys is None else _pending_keys | keys
+
+
+def _notify_swap(keys: Optional[frozenset]) -> None:
+    if keys is not None and not keys:
+        return
+    for listener in list(_swap_listeners):
+        try:
+            listener(keys)
+        except Exception as e:
+            logger.warning(f"Graph snapshot listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+
+
+def _build_locked() -> GraphSnapshot:
+    global _snapshot, _build_started, _last_attempt, _last_build_sec
+    from app.services.graph_service import stream_query
+
+    # 적재 시작 전까지 들어온 변경은 이번 적재에 반영됨 → 교체 후 알림. 적재 중 들어온 변경은 다음 적재 몫
+    keys = _take_pending()
+    t0 = time.perf_counter()
+    _build_started = _last_attempt = time.monotonic()
+    page = get_settings().SUGGEST_FETCH_SIZE
+    try:
+        fresh = build_snapshot(
+            stream_query(_SNAPSHOT_NODES_QUERY, fetch_size=page),
+            stream_query(_SNAPSHOT_RELS_QUERY, fetch_size=page),
+        )
+    except BaseException:
+        _add_pending(keys)
+        raise
+    finally:
+        _build_started = None
+    _snapshot = fresh
+    _last_build_sec = time.perf_counter() - t0
+    logger.info("Graph snapshot built: %s (%.0f ms)", fresh.memory_stats(), _last_build_sec * 1000)
+    _notify_swap(keys)
+    return fresh
+
+
+def rebuild() -> GraphSnapshot:
+    """전체 재적재 후 원자적 교체. 적재 중에는 기존 스냅샷으로 계속 응답."""
+    with _loader_lock:
+        return _build_locked()
+
+
+def _loader_loop(interval: float) -> None:
+    while not _stop_event.is_set():
+        try:
+            rebuild()
+        except Exception as e:
+            logger.warning(f"Graph snapshot refresh failed: {e}")
+        _wake_event.wait(interval if _snapshot is not None else min(interval, 30.0))
+        _wake_event.clear()
+
+
+def on_swap(listener) -> None:
+    """
+    스냅샷 파생 캐시 무효화 구독: listener(keys) 를 데이터 버전 변경 키가 반영된 새 스냅샷 교체 직후 호출
+    (keys=None 이면 전체). 로더가 돌지 않으면(스냅샷 비활성) invalidate 시점에 바로 호출.
+    """
+    if listener not in _swap_listeners:
+        _swap_listeners.append(listener)
+
+
+def invalidate(keys: Optional[frozenset]) -> None:
+    """
+    데이터 버전 변경 시 (app.services.data_version). 로더 스레드를 깨워 바로 재적재 —
+    적재 중에도 기존 스냅샷으로 응답하고, 스냅샷별 분석 캐시(ownership)는 교체와 함께 폐기됨.
+    on_swap 구독자는 교체 후에 keys 를 받음.
+    """
+    if keys is not None and not keys:
+        return
+    if _loader_thread is None or not _loader_thread.is_alive():
+        # 스냅샷을 쓰지 않음 → 파생 캐시는 Neo4j 에서 다시 계산되므로 바로 비움
+        _notify_swap(keys)
+        return
+    _add_pending(keys)
+    _wake_event.set()
+
+
+def start_background_loader() -> None:
+    """앱 기동 시 호출. 기동을 막지 않도록 별도 스레드에서 적재."""
+    global _loader_thread
+    s = get_settings()
+    if not s.GRAPH_SNAPSHOT_ENABLED:
+        return
+    if _loader_thread is not None and _loader_thread.is_alive():
+        return
+    _stop_event.clear()
+    _wake_event.clear()
+    _loader_thread = threading.Thread(
+        target=_loader_loop, args=(s.GRAPH_SNAPSHOT_REFRESH_SEC,), name="graph_snapshot_loader", daemon=True
+    )
+    _loader_thread.start()
+
+
+def stop_background_loader() -> None:
+    _stop_event.set()
+    _wake_event.set()
+
+
+def get_snapshot() -> Optional[GraphSnapshot]:
+    """현재 스냅샷 (없으면 None → 호출 측 Neo4j 폴백)."""
+    return _snapshot
+
+
+def _retry_after() -> int:
+    """진행 중 적재의 남은 시간 추정 (마지막 성공 적재 소요 기준, 최소 1초)."""
+    if _last_build_sec is None:
+        return _DEFAULT_RETRY_AFTER_SEC
+    started = _build_started
+    remaining = _last_build_sec - (time.monotonic() - started) if started is not None else _last_build_sec
+    return max(1, math.ceil(remaining))
+
+
+def _build_once() -> None:
+    try:
+        rebuild()
+    except Exception as e:
+        logger.warning(f"Graph snapshot build failed: {e}")
+
+
+def _ensure_loading() -> None:
+    """스냅샷이 없을 때: 로더가 실패 후 대기 중이면 깨우고, 로더가 없으면 1회 적재 스레드 시작 (실패 직후 반복은 간격 제한)."""
+    global _oneshot_thread
+    if _build_started is not None or time.monotonic() - _last_attempt < _MIN_RETRY_SEC:
+        return
+    if _loader_thread is not None and _loader_thread.is_alive():
+        _wake_event.set()
+        return
+    with _oneshot_lock:
+        if _oneshot_thread is not None and _oneshot_thread.is_alive():
+            return
+        _oneshot_thread = threading.Thread(target=_build_once, name="graph_snapshot_build", daemon=True)
+        _oneshot_thread.start()
+
+
+def require_snapshot() -> GraphSnapshot:
+    """
+    스냅샷이 반드시 필요한 분석용. 아직 없으면 요청 스레드에서 적재하지 않고 백그라운드 적재를 보장한 뒤
+    SnapshotLoading (→ 503 + Retry-After). 기동 시 로더가 바로 적재를 시작하므로 보통 기동 직후에만 발생.
+    """
+    snap = _snapshot
+    if snap is not None:
+        return snap
+    _ensure_loading()
+    raise SnapshotLoading(_retry_after())
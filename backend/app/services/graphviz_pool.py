@@ -0,0 +1,237 @@
+"""
+Graphviz(neato/sfdp) 레이아웃 전용 프로세스 풀.
+
+요청 스레드에서 Graphviz 를 직접 돌리면 큰 그래프·폭주 레이아웃이 API 워커를 붙잡는다.
+- 별도 프로세스(spawn)에서 실행: 작업별 타임아웃 초과 시 워커 프로세스를 종료하고 풀을 재생성
+- 워커 기동 시 pygraphviz 미리 import (워밍업), RLIMIT_AS 로 메모리 상한
+- 노드 이름을 0..n-1 정수로 바꿔 DOT 생성 → 출력(format="plain")의 node 줄만 한 번에 파싱
+- 연결 요소 여러 개는 병렬 제출
+
+pygraphviz 가 없거나 풀이 실패하면 None 을 돌려주고, 호출 측(layout_service)이 NetworkX 로 폴백.
+"""
+import importlib.util
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import networkx as nx
+
+from app.core.config import get_settings
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+logger = logging.getLogger(__name__)
+
+# 부모 프로세스에는 pygraphviz 를 로드하지 않음 (설치 여부만 확인)
+HAS_PYGRAPHVIZ = importlib.util.find_spec("pygraphviz") is not None
+
+GRAPHVIZ_PROGS = ("neato", "sfdp")
+# neato: overlap=false 결정론적 배치, sep=+20 라벨 겹침 방지. splines 는 좌표에 불필요 → 계산 생략
+_GRAPH_ATTRS = 'overlap=false, splines=false, sep="+20", start=42'
+
+_pool: Optional[ProcessPoolExecutor] = None
+_ready = False
+_pool_lock = threading.Lock()
+_disabled_reason: Optional[str] = None
+
+
+# ── 워커 프로세스 ─────────────────────────────────────────────────────────────
+_pgv = None
+
+
+def _worker_init(memory_limit_mb: int) -> None:
+    global _pgv
+    if HAS_RESOURCE and memory_limit_mb > 0:
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    try:
+        import pygraphviz
+        _pgv = pygraphviz
+    except ImportError:
+        _pgv = None
+
+
+def _worker_ready() -> bool:
+    return _pgv is not None
+
+
+def _parse_plain(out: bytes, n: int) -> tuple[list[float], list[float]]:
+    """Graphviz plain 출력의 'node <idx> <x> <y> ...' 줄만 파싱. 이름이 정수라 따옴표 처리 불필요."""
+    xs = [0.0] * n
+    ys = [0.0] * n
+    for line in out.decode("utf-8", "replace").splitlines():
+        if line.startswith("node "):
+            _, name, x, y, _rest = line.split(" ", 4)
+            i = int(name)
+            xs[i] = float(x)
+            ys[i] = float(y)
+    return xs, ys
+
+
+def _worker_layout(dot: str, prog: str, n: int) -> tuple[list[float], list[float]]:
+    if _pgv is None:
+        raise RuntimeError("pygraphviz unavailable in worker")
+    graph = _pgv.AGraph(string=dot)
+    return _parse_plain(graph.draw(format="plain", prog=prog), n)
+
+
+# ── 부모 프로세스 ─────────────────────────────────────────────────────────────
+def to_dot(G: nx.Graph) -> tuple[str, list]:
+    """무방향 그래프 → DOT 문자열 (노드 이름 = 입력 순서 인덱스). weight = 엣지 weight(ratio)."""
+    order = list(G.nodes())
+    index = {nid: i for i, nid in enumerate(order)}
+    lines = [f"graph G {{ graph [{_GRAPH_ATTRS}]; node [shape=point];"]
+    lines.extend(f"{i};" for i in range(len(order)))
+    for u, v, data in G.edges(data=True):
+        w = max(1, int(round(float(data.get("weight") or 1))))
+        lines.append(f"{index[u]} -- {index[v]} [weight={w}];")
+    lines.append("}")
+    return "\n".join(lines), order
+
+
+def _new_pool() -> ProcessPoolExecutor:
+    s = get_settings()
+    return ProcessPoolExecutor(
+        max_workers=max(1, s.GRAPHVIZ_POOL_WORKERS),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_worker_init,
+        initargs=(s.GRAPHVIZ_MEMORY_LIMIT_MB,),
+    )
+
+
+def _warm(pool: ProcessPoolExecutor) -> None:
+    """워커 전부 기동 + pygraphviz import 확인 후 준비 완료 표시. 워커에 import 실패 시 풀 비활성화."""
+    global _disabled_reason, _ready
+    try:
+        futures = [pool.submit(_worker_ready) for _ in range(max(1, get_settings().GRAPHVIZ_POOL_WORKERS))]
+        ok = all(f.result(timeout=120) for f in futures)
+    except Exception as e:
+        if _pool is pool:
+            logger.warning(f"Graphviz pool warm-up failed: {e}")
+        return
+    if not ok:
+        _disabled_reason = "pygraphviz import failed in worker"
+        logger.warning(f"Graphviz pool disabled: {_disabled_reason}")
+        stop_pool()
+        return
+    with _pool_lock:
+        if _pool is pool:
+            _ready = True
+
+
+def start_pool() -> None:
+    """
+    워커를 미리 띄우고 pygraphviz import 를 끝내 둠 (백그라운드, 블로킹 없음).
+    준비 전 요청은 풀을 기다리지 않고 NetworkX 로 폴백 → 콜드 스타트가 요청 지연·타임아웃이 되지 않음.
+    """
+    global _pool, _ready
+    if not HAS_PYGRAPHVIZ or _disabled_reason:
+        return
+    with _pool_lock:
+        if _pool is not None:
+            return
+        _pool = pool = _new_pool()
+        _ready = False
+    threading.Thread(target=_warm, args=(pool,), name="graphviz-warmup", daemon=True).start()
+
+
+def _ready_pool() -> Optional[ProcessPoolExecutor]:
+    with _pool_lock:
+        pool, ready = _pool, _ready
+    if pool is None:
+        start_pool()
+        return None
+    return pool if ready else None
+
+
+def _kill(pool: ProcessPoolExecutor) -> None:
+    # 실행 중 작업은 취소할 수 없으므로 워커 프로세스를 강제 종료
+    processes = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proc in processes:
+        if proc.is_alive():
+            proc.kill()
+
+
+def _discard_pool(pool: ProcessPoolExecutor, reason: str) -> None:
+    """타임아웃·크래시 난 풀 폐기 후 새 풀을 백그라운드에서 워밍업."""
+    global _pool, _ready
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _ready = None, False
+    logger.warning(f"Graphviz pool discarded ({reason}); warming up a fresh pool")
+    _kill(pool)
+    start_pool()
+
+
+def stop_pool() -> None:
+    global _pool, _ready
+    with _pool_lock:
+        pool, _pool, _ready = _pool, None, False
+    if pool is not None:
+        _kill(pool)
+
+
+def layout_many(graphs: list[nx.Graph], prog: str = "neato") -> list[Optional[dict]]:
+    """
+    그래프 목록을 병렬로 Graphviz 레이아웃.
+
+    Returns:
+        그래프별 {노드: (x, y)} 또는 None (풀 없음·타임아웃·오류 → 호출 측 폴백)
+    """
+    if prog not in GRAPHVIZ_PROGS:
+        raise ValueError(f"unsupported Graphviz prog: {prog}")
+    results: list[Optional[dict]] = [None] * len(graphs)
+    pool = _ready_pool()
+    if pool is None or not graphs:
+        return results
+
+    s = get_settings()
+    jobs = []
+    try:
+        for i, G in enumerate(graphs):
+            dot, order = to_dot(G)
+            jobs.append((i, order, pool.submit(_worker_layout, dot, prog, len(order))))
+    except (BrokenProcessPool, RuntimeError) as e:
+        _discard_pool(pool, f"submit failed: {e}")
+        return results
+
+    # 작업당 타임아웃. 워커 수보다 작업이 많으면 대기 몫만큼 전체 기한 연장
+    waves = math.ceil(len(jobs) / max(1, s.GRAPHVIZ_POOL_WORKERS))
+    deadline = time.monotonic() + s.GRAPHVIZ_TIMEOUT_SEC * waves
+    failure: Optional[str] = None
+    for i, order, future in jobs:
+        try:
+            xs, ys = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            results[i] = {nid: (xs[j], ys[j]) for j, nid in enumerate(order)}
+        except FuturesTimeout:
+            failure = failure or f"timeout after {s.GRAPHVIZ_TIMEOUT_SEC}s ({prog}, {len(order)} nodes)"
+        except BrokenProcessPool as e:
+            failure = failure or f"worker crashed (memory limit?): {e}"
+        except Exception as e:
+            logger.warning(f"Graphviz {prog} layout failed: {e}")
+    if failure:
+        _discard_pool(pool, failure)
+    return results
+
+
+def pool_status() -> dict:
+    """헬스·진단용."""
+    return {
+        "available": HAS_PYGRAPHVIZ and not _disabled_reason,
+        "running": _pool is not None,
+        "ready": _ready,
+        "disabled_reason": _disabled_reason,
+    }
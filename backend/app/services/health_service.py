@@ -0,0 +1,162 @@
+"""
+헬스 체크 계층화 (live / ready / deep).
+
+- live: I/O 없음. 프로세스가 응답하는지만 확인.
+- ready: 백그라운드 프로브가 주기적으로 갱신한 Neo4j 연결 상태를 읽기만 함 (폴링 부하 ≈ 0).
+- deep: 의존성별(Neo4j, 임베딩, LLM) 지연 시간 측정. 가끔 수동 진단용.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable
+
+import httpx
+
+from app.core import get_settings
+from app.services import model_provider
+
+logger = logging.getLogger(__name__)
+
+
+# ── 백그라운드 프로브 상태 (단일 writer: 프로브 스레드) ─────────────────────
+_state: dict[str, Any] = {
+    "neo4j": "unknown",
+    "checked_at": None,  # time.monotonic() 기준
+    "checked_at_iso": None,
+    "latency_ms": None,
+    "error": None,
+}
+_stop_event = threading.Event()
+_probe_thread: threading.Thread | None = None
+_deep_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="health_deep")
+
+
+def _probe_once() -> None:
+    from app.services.graph_service import probe_connection
+
+    t0 = time.perf_counter()
+    try:
+        probe_connection()
+        status, error = "connected", None
+    except Exception as e:
+        status, error = "disconnected", str(e)[:200]
+    _state.update(
+        neo4j=status,
+        checked_at=time.monotonic(),
+        checked_at_iso=datetime.now().isoformat(),
+        latency_ms=round((time.perf_counter() - t0) * 1000, 1),
+        error=error,
+    )
+
+
+def _probe_loop(interval: float) -> None:
+    while not _stop_event.is_set():
+        _probe_once()
+        _stop_event.wait(interval)
+
+
+def start_background_probe() -> None:
+    """앱 기동 시 1회 호출. 프로브 스레드를 시작 (이미 실행 중이면 무시)."""
+    global _probe_thread
+    if _probe_thread is not None and _probe_thread.is_alive():
+        return
+    _stop_event.clear()
+    interval = get_settings().HEALTH_PROBE_INTERVAL_SEC
+    _probe_thread = threading.Thread(
+        target=_probe_loop, args=(interval,), name="health_probe", daemon=True
+    )
+    _probe_thread.start()
+
+
+def stop_background_probe() -> None:
+    _stop_event.set()
+
+
+def readiness() -> dict:
+    """캐시된 프로브 결과 기반 readiness. I/O 없음."""
+    checked_at = _state["checked_at"]
+    age = None if checked_at is None else round(time.monotonic() - checked_at, 1)
+    max_age = get_settings().HEALTH_READY_MAX_AGE_SEC
+    ready = _state["neo4j"] == "connected" and age is not None and age <= max_age
+    return {
+        "ready": ready,
+        "neo4j": _state["neo4j"],
+        "checked_at": _state["checked_at_iso"],
+        "probe_age_sec": age,
+        "probe_latency_ms": _state["latency_ms"],
+        "error": _state["error"],
+    }
+
+
+# ── Deep 진단 ─────────────────────────────────────────────────────────────
+
+def _check_neo4j() -> dict:
+    from app.services.graph_service import _get_graph
+
+    graph = _get_graph()
+    graph.query("RETURN 1 AS ok")
+    counts = graph.query(
+        "MATCH (n) RETURN labels(n)[0] AS label, count(n) AS cnt ORDER BY cnt DESC LIMIT 10"
+    )
+    return {"node_stats": counts}
+
+
+def _check_embeddings() -> dict:
+    from app.services.graph_service import _get_embed_model
+
+    vec = _get_embed_model().embed_query("health")
+    return {"dimensions": len(vec)}
+
+
+def _check_llm() -> dict:
+    # 토큰 비용 없이 엔드포인트 도달성·인증만 확인 (모델 조회). LLM_PROVIDER 가 실제로 쓰는 서버·모델 기준
+    # 로컬 서버(llama.cpp·vLLM 등)는 /models/{id} 가 없을 수 있어 목록 조회로 도달성만 봄
+    s = get_settings()
+    base_url, model, api_key = model_provider.chat_endpoint()
+    r = httpx.get(
+        f"{base_url}/models" if s.LLM_PROVIDER == "local" else f"{base_url}/models/{model}",
+        headers={"Authorization": f"Bearer {api_key}"},
+        timeout=s.HEALTH_DEEP_TIMEOUT_SEC,
+    )
+    r.raise_for_status()
+    return {"model": model, "provider": s.LLM_PROVIDER}
+
+
+def _timed(check: Callable[[], dict]) -> dict:
+    t0 = time.perf_counter()
+    try:
+        detail = check()
+        return {"status": "ok", "latency_ms": round((time.perf_counter() - t0) * 1000, 1), **detail}
+    except Exception as e:
+        return {
+            "status": "error",
+            "latency_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "error": str(e)[:200],
+        }
+
+
+DEEP_CHECKS: dict[str, Callable[[], dict]] = {
+    "neo4j": _check_neo4j,
+    "embeddings": _check_embeddings,
+    "llm": _check_llm,
+}
+
+
+def deep_check() -> dict:
+    """의존성별 진단을 병렬 실행하고 지연 시간(ms)과 함께 반환."""
+    timeout = get_settings().HEALTH_DEEP_TIMEOUT_SEC
+    futures = {name: _deep_executor.submit(_timed, fn) for name, fn in DEEP_CHECKS.items()}
+    deps = {}
+    for name, fut in futures.items():
+        try:
+            deps[name] = fut.result(timeout=timeout)
+        except Exception:
+            deps[name] = {"status": "timeout", "latency_ms": timeout * 1000}
+    healthy = all(d["status"] == "ok" for d in deps.values())
+    return {
+        "status": "healthy" if healthy else "degraded",
+        "timestamp": datetime.now().isoformat(),
+        "dependencies": deps,
+    }
@@ -0,0 +1,153 @@
+"""
+지배구조 히트맵: 주주(행) × 회사(열) 지분율 희소 행렬 (CSR).
+
+- (주주, 회사, 지분율) 목록 → NumPy 벡터 연산으로 정수 인덱스화, 쌍 중복은 max 로 집계
+- 행·열 순서: 이분 그래프 인접행렬 [[0, A], [Aᵀ, 0]] 에 Reverse Cuthill-McKee (SciPy)
+  → 서로 지분으로 얽힌 주주·회사가 대각선 근처 블록으로 모임
+- 결과는 키 목록 기준 TTL 캐시 (같은 ego/회사 집합 재요청 시 재계산 없음), 데이터 버전 변경 시 관련 항목만 제거
+
+응답 CSR: row i 의 값 = data[indptr[i]:indptr[i+1]], 열 = indices[같은 범위].
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import numpy as np
+from scipy.sparse import bmat, csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+HEATMAP_CACHE_TTL_SEC = 120
+HEATMAP_CACHE_MAX_ENTRIES = 128
+ORDERINGS = ("rcm", "label")
+
+_cache: "OrderedDict[Hashable, tuple[float, dict]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def cache_get(key: Hashable) -> Optional[dict]:
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is None:
+            return None
+        expiry, payload = hit
+        if now >= expiry:
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return payload
+
+
+def cache_put(key: Hashable, payload: dict) -> None:
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + HEATMAP_CACHE_TTL_SEC, payload)
+        _cache.move_to_end(key)
+        while len(_cache) > HEATMAP_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+
+def invalidate(keys: Optional[frozenset]) -> int:
+    """
+    데이터 버전 변경 키가 반영된 스냅샷 교체 후 (graph_snapshot.on_swap). keys 가 범위(ego 중심·회사 목록) 또는
+    행·열에 걸린 항목만 제거, keys=None 이면 전체. Returns: 제거한 항목 수.
+    """
+    with _cache_lock:
+        if keys is None:
+            dropped = len(_cache)
+            _cache.clear()
+            return dropped
+        stale = []
+        for cache_key, (_, payload) in _cache.items():
+            scope = {cache_key[1]} if cache_key[0] == "ego" else set(cache_key[1])
+            if (
+                not keys.isdisjoint(scope)
+                or not keys.isdisjoint(payload["rows"]["keys"])
+                or not keys.isdisjoint(payload["cols"]["keys"])
+            ):
+                stale.append(cache_key)
+        for cache_key in stale:
+            del _cache[cache_key]
+        return len(stale)
+
+
+def _rcm_order(A: csr_matrix) -> tuple[np.ndarray, np.ndarray]:
+    """이분 행렬 A(행×열) → RCM 순서로 정렬한 (행 순열, 열 순열)."""
+    n_rows, n_cols = A.shape
+    pattern = csr_matrix((np.ones_like(A.data, dtype=np.int8), A.indices, A.indptr), shape=A.shape)
+    sym = bmat([[None, pattern], [pattern.T, None]], format="csr")
+    perm = reverse_cuthill_mckee(sym, symmetric_mode=True)
+    return perm[perm < n_rows], perm[perm >= n_rows] - n_rows
+
+
+def build_heatmap(
+    edges: list[dict],
+    labels: dict[str, str],
+    *,
+    ordering: str = "rcm",
+    max_rows: int = 300,
+    max_cols: int = 300,
+) -> dict[str, Any]:
+    """
+    Args:
+        edges: [{"from": 주주 nodeKey, "to": 회사 nodeKey, "ratio": 지분율}, ...] (쌍 중복 가능)
+        labels: nodeKey → 표시 이름
+        ordering: rcm(블록 정렬) | label(이름순)
+        max_rows/max_cols: 초과 시 최대 지분율이 큰 행/열부터 유지
+
+    Returns:
+        {"shape", "nnz", "ordering", "rows": {"keys", "labels"}, "cols": {...},
+         "indptr", "indices", "data"}
+    """
+    if not edges:
+        return {
+            "shape": [0, 0], "nnz": 0, "ordering": ordering,
+            "rows": {"keys": [], "labels": []}, "cols": {"keys": [], "labels": []},
+            "indptr": [0], "indices": [], "data": [],
+        }
+
+    src = np.array([e["from"] for e in edges], dtype=object)
+    dst = np.array([e["to"] for e in edges], dtype=object)
+    ratio = np.clip(np.array([e.get("ratio") or 0.0 for e in edges], dtype=np.float64), 0.0, 100.0)
+    row_keys, ri = np.unique(src, return_inverse=True)
+    col_keys, ci = np.unique(dst, return_inverse=True)
+
+    # 쌍 (ri, ci) 중복 → max 집계: 정렬 후 구간별 maximum.reduceat
+    pair = ri.astype(np.int64) * len(col_keys) + ci
+    order = np.argsort(pair, kind="stable")
+    pair, ratio = pair[order], ratio[order]
+    starts = np.flatnonzero(np.r_[True, pair[1:] != pair[:-1]])
+    ratio = np.maximum.reduceat(ratio, starts)
+    pair = pair[starts]
+    ri, ci = pair // len(col_keys), pair % len(col_keys)
+
+    A = csr_matrix((ratio, (ri, ci)), shape=(len(row_keys), len(col_keys)))
+
+    # 크기 제한: 행/열별 최대 지분율 상위만 유지
+    if A.shape[0] > max_rows:
+        keep = np.sort(np.argsort(-A.max(axis=1).toarray().ravel(), kind="stable")[:max_rows])
+        A, row_keys = A[keep], row_keys[keep]
+    if A.shape[1] > max_cols:
+        keep = np.sort(np.argsort(-A.max(axis=0).toarray().ravel(), kind="stable")[:max_cols])
+        A, col_keys = A[:, keep].tocsr(), col_keys[keep]
+
+    row_labels = np.array([labels.get(k) or k for k in row_keys], dtype=object)
+    col_labels = np.array([labels.get(k) or k for k in col_keys], dtype=object)
+    if ordering == "rcm" and A.nnz:
+        row_perm, col_perm = _rcm_order(A)
+    else:
+        row_perm = np.argsort(row_labels.astype(str), kind="stable")
+        col_perm = np.argsort(col_labels.astype(str), kind="stable")
+    A = A[row_perm][:, col_perm].tocsr()
+    A.sort_indices()
+
+    return {
+        "shape": [int(A.shape[0]), int(A.shape[1])],
+        "nnz": int(A.nnz),
+        "ordering": ordering,
+        "rows": {"keys": row_keys[row_perm].tolist(), "labels": row_labels[row_perm].tolist()},
+        "cols": {"keys": col_keys[col_perm].tolist(), "labels": col_labels[col_perm].tolist()},
+        "indptr": A.indptr.astype(np.int32).tolist(),
+        "indices": A.indices.astype(np.int32).tolist(),
+        "data": np.round(A.data, 1).tolist(),
+    }
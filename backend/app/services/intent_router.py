@@ -0,0 +1,391 @@
+"""
+채팅 의도 분류기: 자주 묻는 질문을 검증된 Cypher 템플릿으로 바로 실행 (LLM Cypher 생성 생략).
+
+1) 문법: 템플릿별 정규식 (키워드·어순) — 맞으면 바로 채택
+2) 임베딩: 문법이 안 맞으면 질문 벡터(ask_graph 가 힌트 검색에 쓰는 것과 같은 벡터)와
+   템플릿 예시 문장 벡터의 코사인 유사도 최댓값 ≥ INTENT_EMBED_MIN_SCORE 인 템플릿
+3) 슬롯 채우기: 회사명·주주명·지분율(%)·연도·상위 N·개수 — 필수 슬롯이 비면 None (LLM 경로)
+
+템플릿은 단일 시점 목록만 답함 → 변동(바뀐·줄어든…)·비교·대화 이력 지시어(그 회사…) 질문은
+어느 템플릿도 받지 않고, 주주 템플릿은 집계(평균·합계·몇 명…) 질문도 받지 않음 (문법·임베딩 모두).
+
+템플릿 Cypher 는 모두 파라미터화 + LIMIT 포함 (생성 Cypher 통제기를 거치지 않음).
+"""
+import logging
+import re
+import threading
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.core import get_settings
+from app.core.node_keys import name_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_RATIO_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})\s*년?(?!\d)")
+_TOP_RE = re.compile(r"(?:top|상위|TOP)\s*(\d+)|(\d+)\s*(?:위|개사|곳|명)\s*(?:까지|만)?", re.IGNORECASE)
+_MIN_COUNT_RE = re.compile(r"(\d+)\s*(?:개|곳)\s*이상")
+# "X의 …", "X 최대주주" 처럼 질문 앞머리에 오는 회사명 (일반 명사는 제외)
+_LEADING_NAME_RE = re.compile(r"^\s*([^\s\d%]{2,30}?)(?:의\s|\s+(?:최대\s*주주|대주주|주주|지분))")
+_HOLDER_RE = re.compile(
+    r"^\s*(?P<holder>[^\s\d%]{2,30}?)(?:이|가|은|는)\s+(?:(?:\d+(?:\.\d+)?)\s*%\s*이상\s*)?"
+    r"(?:보유|투자|출자)"
+)
+# 템플릿이 답할 수 없는 질문: 시점 간 변동·비교, 이전 대화를 가리키는 지시어 (템플릿은 이력을 보지 않음)
+_UNROUTABLE_RE = re.compile(
+    r"바뀌|바뀐|변경|변동|변화|늘어|늘었|줄어|줄었|증가|감소|달라|비교|대비|차이|보다|추이|각각"
+    r"|그\s*(?:회사|기업|법인|주주|사람|중|곳|들)|해당\s*(?:회사|기업|법인|주주)|거기|이\s*회사|위\s*회사"
+)
+# 주주 목록 템플릿이 답할 수 없는 집계 질문
+_AGGREGATE_RE = re.compile(r"평균|합계|총합|합산|총\s*지분|중앙값|몇\s*(?:명|개|곳|사)|(?:주주|회사)\s*수|개수|얼마")
+# 회사 없이 전체 목록을 달라는 표현 (없으면 최대주주 질문은 대상 회사가 필수)
+_LIST_RE = re.compile(r"목록|리스트|명단|전체|모든|상위|순위|top|\d+\s*%", re.IGNORECASE)
+_GENERIC_WORDS = {"지분율", "지분", "최대주주", "대주주", "주주", "회사", "법인", "기업", "전체", "모든", "상위"}
+
+_COMP_GROUPS = (
+    ("outsideDirector", re.compile(r"사외\s*이사"), "사외이사"),
+    ("auditor", re.compile(r"감사"), "감사"),
+    ("registeredExec", re.compile(r""), "등기임원"),
+)
+
+
+class Template:
+    """
+    검증된 Cypher 템플릿 1개. extract(question, hints) → Cypher 파라미터 (필수 슬롯이 없으면 None).
+    exclude: 문법이 맞아도 이 템플릿으로 답하면 안 되는 질문 (임베딩 매칭에도 적용).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        examples: list[str],
+        cypher: str,
+        extract: Callable[[str, list[str]], Optional[dict]],
+        exclude: Optional[re.Pattern] = None,
+    ) -> None:
+        self.name = name
+        self.pattern = re.compile(pattern)
+        self.examples = examples
+        self.cypher = cypher
+        self.extract = extract
+        self.exclude = exclude
+
+    def accepts(self, question: str) -> bool:
+        return self.exclude is None or not self.exclude.search(question)
+
+
+class Route:
+    """분류 결과: 템플릿 + 채운 파라미터 + 방법(grammar | embedding) + 점수."""
+
+    def __init__(self, template: Template, params: dict, method: str, score: float = 1.0) -> None:
+        self.template = template
+        self.params = params
+        self.method = method
+        self.score = score
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+
+# ── 슬롯 ────────────────────────────────────────────────────────────────────
+def _ratio(question: str) -> Optional[float]:
+    m = _RATIO_RE.search(question)
+    return float(m.group(1)) if m else None
+
+
+def _year(question: str) -> Optional[int]:
+    m = _YEAR_RE.search(question)
+    return int(m.group(1)) if m else None
+
+
+def _limit(question: str) -> int:
+    m = _TOP_RE.search(question)
+    if not m:
+        return DEFAULT_LIMIT
+    return max(1, min(MAX_LIMIT, int(m.group(1) or m.group(2))))
+
+
+_AMBIGUOUS = object()
+
+
+def _company(question: str, hints: list[str]):
+    """
+    질문에 이름이 그대로 들어 있는 벡터 힌트 회사 → 없으면 앞머리 명사구.
+    서로 다른 회사 힌트가 둘 이상 들어 있으면 _AMBIGUOUS (한 회사만 받는 템플릿은 LLM 경로로).
+    """
+    q = name_key(question)
+    found = [hint for hint in hints if hint and name_key(hint) and name_key(hint) in q]
+    keys = {name_key(h) for h in found}
+    # 다른 힌트 이름에 포함된 이름(삼성생명 ⊂ 삼성생명보험)은 같은 회사로 봄
+    if len([k for k in keys if not any(k != other and k in other for other in keys)]) > 1:
+        return _AMBIGUOUS
+    if found:
+        return found[0]
+    m = _LEADING_NAME_RE.match(question)
+    if m and m.group(1) not in _GENERIC_WORDS:
+        return m.group(1)
+    return None
+
+
+def _major_holders_params(question: str, hints: list[str]) -> Optional[dict]:
+    company = _company(question, hints)
+    ratio = _ratio(question)
+    if company is _AMBIGUOUS:
+        return None
+    # 대상 회사도 목록 조건도 없으면("최대주주는 누구야?") 전체 목록으로 답하지 않음
+    if company is None and not _LIST_RE.search(question):
+        return None
+    return {
+        "company": company,
+        "ratio": ratio if ratio is not None else (0.0 if company else 5.0),
+        "year": _year(question),
+        "limit": _limit(question),
+    }
+
+
+def _company_holders_params(question: str, hints: list[str]) -> Optional[dict]:
+    params = _major_holders_params(question, hints)
+    if params is None or params["company"] is None:
+        return None
+    if _ratio(question) is None:
+        params["ratio"] = 0.0
+    return params
+
+
+def _holder_portfolio_params(question: str, hints: list[str]) -> Optional[dict]:
+    m = _HOLDER_RE.match(question)
+    if not m or m.group("holder") in _GENERIC_WORDS:
+        return None
+    return {
+        "holder": m.group("holder"),
+        "ratio": _ratio(question) or 0.0,
+        "year": _year(question),
+        "limit": _limit(question),
+    }
+
+
+def _multi_company_params(question: str, hints: list[str]) -> Optional[dict]:
+    m = _MIN_COUNT_RE.search(question)
+    return {"min": int(m.group(1)) if m else 2, "limit": _limit(question)}
+
+
+def _corporate_holders_params(question: str, hints: list[str]) -> Optional[dict]:
+    return {"limit": _limit(question)}
+
+
+def _compensation_params(question: str, hints: list[str]) -> Optional[dict]:
+    group, label = next((g, lbl) for g, rx, lbl in _COMP_GROUPS if rx.search(question))
+    if re.search(r"인원|몇\s*명|(?:임원|이사|감사)\s*수", question):
+        measure, label = "count", f"{label} 수"
+    elif re.search(r"총|전체|합계", question):
+        measure, label = "total", f"{label} 보수총액"
+    else:
+        measure, label = "avg", f"{label} 평균보수"
+    return {
+        "group": group,
+        "measure": measure,
+        "label": label,
+        "unit": "명" if measure == "count" else "만원",
+        "year": _year(question),
+        "asc": bool(re.search(r"하위|낮은|적은", question)),
+        "limit": _limit(question),
+    }
+
+
+# ── 템플릿 ──────────────────────────────────────────────────────────────────
+_HOLDER_NAME = "coalesce(s.stockName, s.companyName)"
+
+TEMPLATES: tuple[Template, ...] = (
+    Template(
+        "executive_compensation",
+        r"(?:임원|이사|감사)\s*(?:수\b|.*(?:보수|연봉|급여|인원))",
+        ["2022년 등기임원 평균보수 TOP 5", "사외이사 보수가 가장 높은 회사", "임원 연봉 상위 10개 회사"],
+        """
+        MATCH ()-[x:HAS_COMPENSATION]->()
+        WITH coalesce($year, max(x.fiscalYear)) AS year
+        MATCH (c:Company)-[r:HAS_COMPENSATION]->(c)
+        WHERE r.fiscalYear = year
+        WITH c, year, CASE $measure
+            WHEN 'count' THEN toFloat(r[$group + 'Count'])
+            WHEN 'total' THEN toFloat(r[$group + 'TotalComp'])
+            ELSE coalesce(
+                toFloat(r[$group + 'AvgComp']),
+                toFloat(r[$group + 'TotalComp']) / CASE WHEN r[$group + 'Count'] > 0 THEN r[$group + 'Count'] END)
+            END AS value
+        WHERE value IS NOT NULL
+        RETURN c.companyName AS 회사명, year AS 회계연도, $label AS 항목, round(value, 1) AS 값, $unit AS 단위
+        ORDER BY CASE WHEN $asc THEN value ELSE -value END
+        LIMIT $limit
+        """,
+        _compensation_params,
+    ),
+    Template(
+        "holder_portfolio",
+        r"^\s*\S+?(?:이|가|은|는)\s+(?:\d+(?:\.\d+)?\s*%\s*이상\s*)?(?:보유|투자|출자)한?\s*(?:회사|기업|법인|종목)",
+        ["국민연금이 5% 이상 보유한 회사", "삼성생명이 투자한 회사 목록", "미래에셋이 지분을 가진 기업"],
+        f"""
+        MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+        WHERE {_HOLDER_NAME} CONTAINS $holder
+          AND r.stockRatio >= $ratio
+          AND ($year IS NULL OR r.reportYear = $year)
+        WITH s, c, max(r.stockRatio) AS ratio, max(r.reportYear) AS year
+        RETURN {_HOLDER_NAME} AS 주주명, c.companyName AS 회사명, ratio AS 지분율, year AS 연도
+        ORDER BY ratio DESC, 회사명
+        LIMIT $limit
+        """,
+        _holder_portfolio_params,
+        exclude=_AGGREGATE_RE,
+    ),
+    Template(
+        "multi_company_investors",
+        r"\d+\s*(?:개|곳)\s*이상\s*(?:의\s*)?(?:회사|법인|기업|종목)에?\s*(?:투자|지분|보유|출자)",
+        ["3개 이상 법인에 투자한 주주", "여러 회사에 투자한 주주", "가장 많은 회사에 지분을 가진 주주"],
+        f"""
+        MATCH (s:Stockholder)-[:HOLDS_SHARES]->(c:Company)
+        WITH s, count(DISTINCT c) AS companies
+        WHERE companies >= $min
+        RETURN {_HOLDER_NAME} AS 주주명, companies AS 투자회사수
+        ORDER BY companies DESC, 주주명
+        LIMIT $limit
+        """,
+        _multi_company_params,
+        exclude=_AGGREGATE_RE,
+    ),
+    Template(
+        "corporate_holders",
+        r"법인\s*주주.*(?:회사|기업)",
+        ["법인 주주가 있는 회사 목록", "법인이 주주로 있는 회사", "회사가 주주인 회사"],
+        f"""
+        MATCH (s:Stockholder)-[:HOLDS_SHARES]->(c:Company)
+        WHERE s:Company OR s.shareholderType = 'CORPORATION'
+        WITH c, collect(DISTINCT {_HOLDER_NAME}) AS holders
+        RETURN c.companyName AS 회사명, size(holders) AS 법인주주수, holders[..5] AS 법인주주
+        ORDER BY 법인주주수 DESC, 회사명
+        LIMIT $limit
+        """,
+        _corporate_holders_params,
+        exclude=_AGGREGATE_RE,
+    ),
+    Template(
+        "company_shareholders",
+        r"\S+\s*의?\s*(?:(?<!최대)(?<!대)주주\s*(?:목록|구성|현황|명단|리스트)|지분\s*구조)",
+        ["삼성생명의 주주 목록", "한화생명 지분 구조", "KB금융 주주 현황"],
+        f"""
+        MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+        WHERE c.companyName CONTAINS $company
+          AND r.stockRatio >= $ratio
+          AND ($year IS NULL OR r.reportYear = $year)
+        WITH s, c, max(r.stockRatio) AS ratio, max(r.reportYear) AS year
+        RETURN {_HOLDER_NAME} AS 주주명, c.companyName AS 회사명, ratio AS 지분율, year AS 연도
+        ORDER BY ratio DESC, 주주명
+        LIMIT $limit
+        """,
+        _company_holders_params,
+        exclude=_AGGREGATE_RE,
+    ),
+    Template(
+        "major_shareholders",
+        r"최대\s*주주|대주주|주요\s*주주",
+        ["지분율 50% 이상인 최대주주 목록", "삼성생명 최대주주", "5% 이상 대주주"],
+        f"""
+        MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+        WHERE r.stockRatio >= $ratio
+          AND ($company IS NULL OR c.companyName CONTAINS $company)
+          AND ($year IS NULL OR r.reportYear = $year)
+        WITH s, c, max(r.stockRatio) AS ratio, max(r.reportYear) AS year
+        RETURN {_HOLDER_NAME} AS 주주명, c.companyName AS 회사명, ratio AS 지분율, year AS 연도
+        ORDER BY ratio DESC, 회사명
+        LIMIT $limit
+        """,
+        _major_holders_params,
+        exclude=_AGGREGATE_RE,
+    ),
+)
+
+
+# ── 임베딩 최근접 템플릿 ────────────────────────────────────────────────────
+_example_vectors: Optional[np.ndarray] = None  # (예시 수, 차원) L2 정규화
+_example_owner: list[int] = []  # 예시 → TEMPLATES 인덱스
+_embed_lock = threading.Lock()
+
+
+def _examples_matrix() -> Optional[np.ndarray]:
+    """템플릿 예시 문장 임베딩 (최초 1회, 실패하면 None → 임베딩 매칭 생략)."""
+    global _example_vectors, _example_owner
+    if _example_vectors is not None:
+        return _example_vectors
+    with _embed_lock:
+        if _example_vectors is None:
+            from app.services.graph_service import _get_embed_model
+
+            owner = [i for i, t in enumerate(TEMPLATES) for _ in t.examples]
+            texts = [ex for t in TEMPLATES for ex in t.examples]
+            try:
+                mat = np.asarray(_get_embed_model().embed_documents(texts), dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Intent template embedding failed: {e}")
+                return None
+            mat /= np.linalg.norm(mat, axis=1, keepdims=True) + 1e-12
+            _example_owner = owner
+            _example_vectors = mat
+    return _example_vectors
+
+
+def _nearest(vector: list[float]) -> Optional[tuple[Template, float]]:
+    mat = _examples_matrix()
+    if mat is None or vector is None:
+        return None
+    v = np.asarray(vector, dtype=np.float32)
+    v /= np.linalg.norm(v) + 1e-12
+    scores = mat @ v
+    best = int(np.argmax(scores))
+    return TEMPLATES[_example_owner[best]], float(scores[best])
+
+
+# ── 공개 API ────────────────────────────────────────────────────────────────
+def matches_grammar(question: str) -> bool:
+    """슬롯 없이 문법만 확인 (ask_graph 가 LLM Cypher 추측 생성을 건너뛸지 판단)."""
+    question = question or ""
+    return (
+        get_settings().INTENT_ROUTER_ENABLED
+        and not _UNROUTABLE_RE.search(question)
+        and any(t.pattern.search(question) and t.accepts(question) for t in TEMPLATES)
+    )
+
+
+def route(question: str, hints: list[str], vector: Optional[list[float]] = None) -> Optional[Route]:
+    """템플릿으로 답할 수 있는 질문이면 Route, 아니면 None (LLM 경로)."""
+    s = get_settings()
+    if not s.INTENT_ROUTER_ENABLED or not question or _UNROUTABLE_RE.search(question):
+        return None
+    for template in TEMPLATES:
+        if template.pattern.search(question) and template.accepts(question):
+            params = template.extract(question, hints)
+            if params is not None:
+                return Route(template, params, "grammar")
+    if vector is None:
+        return None
+    nearest = _nearest(vector)
+    if nearest is None:
+        return None
+    template, score = nearest
+    if score < s.INTENT_EMBED_MIN_SCORE or not template.accepts(question):
+        return None
+    params = template.extract(question, hints)
+    if params is None:
+        return None
+    return Route(template, params, "embedding", score)
+
+
+def run(route_: Route) -> list[dict[str, Any]]:
+    """템플릿 Cypher 실행 (파라미터 바인딩)."""
+    from app.services.graph_service import _get_graph
+
+    return _get_graph().query(route_.template.cypher, params=route_.params)
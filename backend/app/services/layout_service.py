@@ -3,7 +3,9 @@
 
 지원 엔진:
 - NetworkX: Kamada-Kawai → Spring 2단계 (기본, Graphviz 불필요)
-- PyGraphviz: Graphviz 기반 고품질 레이아웃 (선택, Graphviz 시스템 라이브러리 필요)
+- PyGraphviz: Graphviz neato/sfdp 고품질 레이아웃 (선택, Graphviz 시스템 라이브러리 필요).
+  요청 스레드가 아닌 프로세스 풀에서 실행 (graphviz_pool: 타임아웃·메모리 상한, 실패 시 NetworkX)
+- Hierarchical: 지분 방향(주주 → 회사) 계층 배치 (지배구조 맵/ego 용, O(V+E) 레이어 + 바리센터 교차 감소)
 
 진단: "털뭉치" 방지
 - MultiDiGraph 함정: 동일 (u,v) 다중 엣지를 그대로 쓰면 스프링이 N배로 강해져 노드가 착 달라붙음.
@@ -15,23 +17,33 @@
 """
 import math
 import logging
-from typing import Any, Literal
+from typing import Any, Literal, Optional
 
 import networkx as nx
 
+from app.core import tracing
+from app.services import graphviz_pool
+
 logger = logging.getLogger(__name__)
 
-try:
-    import pygraphviz as pgv
-    from networkx.drawing.nx_agraph import to_agraph
-    HAS_PYGRAPHVIZ = True
-except ImportError:
-    HAS_PYGRAPHVIZ = False
+HAS_PYGRAPHVIZ = graphviz_pool.HAS_PYGRAPHVIZ
+if not HAS_PYGRAPHVIZ:
     logger.info("PyGraphviz not available, using NetworkX only")
 
 # 협업: 동일 데이터면 항상 같은 모양. 시드 고정.
 LAYOUT_SEED = 42
 
+LayoutEngine = Literal["networkx", "pygraphviz", "sfdp", "hierarchical"]
+LAYOUT_ENGINES = ("networkx", "pygraphviz", "sfdp", "hierarchical")
+# Graphviz 엔진 → prog. pygraphviz = neato (기존 이름 유지), sfdp = 멀티레벨 (대형 그래프)
+GRAPHVIZ_ENGINES = {"pygraphviz": "neato", "sfdp": "sfdp"}
+
+# 계층 레이아웃: 교차 감소 스윕 횟수(하향+상향 1쌍 = 2), 한 행 최대 노드 수 (초과 시 레이어 내 줄바꿈)
+HIERARCHY_SWEEPS = 8
+HIERARCHY_MAX_PER_ROW = 16
+# 레이어 사이 간격 (레이어 내 줄바꿈 행 간격 = 1 기준)
+HIERARCHY_LAYER_GAP = 1.6
+
 
 def _build_layout_graph(nodes: list[dict], edges: list[dict]) -> nx.Graph:
     """
@@ -57,6 +69,95 @@ def _build_layout_graph(nodes: list[dict], edges: list[dict]) -> nx.Graph:
     return G
 
 
+def _build_hierarchy_graph(nodes: list[dict], edges: list[dict]) -> nx.DiGraph:
+    """계층 레이아웃용 단순 방향 그래프 (주주 → 회사, 쌍당 엣지 1개, 입력 노드 순서 유지)."""
+    G = nx.DiGraph()
+    for i, n in enumerate(nodes):
+        G.add_node(n.get("id") or f"n{i}")
+    for e in edges:
+        u, v = e.get("from"), e.get("to")
+        if u and v and u != v and u in G and v in G:
+            G.add_edge(u, v)
+    return G
+
+
+def _layout_hierarchical(G: nx.DiGraph) -> dict[str, tuple[float, float]]:
+    """
+    지분 방향 계층 배치 (Sugiyama 축약판).
+
+    1) 순환 처리: 상호출자 등 강연결요소(SCC)를 한 덩어리로 축약 → DAG. 같은 SCC 는 같은 레이어.
+    2) 레이어: DAG 위상 순서로 최장 경로 (layer[v] = max(layer[u]) + 1), 인접 리스트 1회 순회 O(V+E).
+       최상위 = 지분을 보유하기만 하는 주주, 아래로 갈수록 피보유 회사.
+    3) 교차 감소: 레이어별 순서를 이웃 평균 순위(바리센터)로 하향·상향 반복 정렬.
+    4) 좌표: 레이어 내 순서 → x, 레이어(넓으면 여러 행) → y. 정규화는 호출 측.
+    """
+    n = G.number_of_nodes()
+    if n == 0:
+        return {}
+    order_in = {nid: i for i, nid in enumerate(G.nodes())}
+    if n == 1:
+        return {next(iter(G.nodes())): (0.0, 0.0)}
+
+    # 1) SCC 축약 (networkx: Tarjan 계열, O(V+E))
+    cond = nx.condensation(G)
+    members = cond.graph["mapping"]  # node -> scc id
+
+    # 2) 최장 경로 레이어
+    scc_layer: dict[int, int] = {}
+    for c in nx.topological_sort(cond):
+        scc_layer[c] = max((scc_layer[p] + 1 for p in cond.predecessors(c)), default=0)
+    layer = {nid: scc_layer[members[nid]] for nid in G.nodes()}
+    n_layers = max(layer.values()) + 1
+
+    # 인접 리스트 (무방향, 같은 레이어 제외) — 바리센터 계산용
+    up: dict[str, list[str]] = {nid: [] for nid in G.nodes()}
+    down: dict[str, list[str]] = {nid: [] for nid in G.nodes()}
+    for u, v in G.edges():
+        if layer[u] < layer[v]:
+            down[u].append(v)
+            up[v].append(u)
+        elif layer[v] < layer[u]:
+            down[v].append(u)
+            up[u].append(v)
+
+    layers: list[list[str]] = [[] for _ in range(n_layers)]
+    for nid in sorted(G.nodes(), key=order_in.__getitem__):
+        layers[layer[nid]].append(nid)
+    rank = {nid: i for row in layers for i, nid in enumerate(row)}
+
+    # 3) 바리센터 스윕. 이웃 없는 노드는 현재 순위 유지 (안정 정렬)
+    def _reorder(row: list[str], neighbors: dict[str, list[str]]) -> None:
+        keys = {}
+        for nid in row:
+            nbrs = neighbors[nid]
+            keys[nid] = sum(rank[m] for m in nbrs) / len(nbrs) if nbrs else rank[nid]
+        row.sort(key=lambda nid: (keys[nid], rank[nid]))
+        for i, nid in enumerate(row):
+            rank[nid] = i
+
+    for sweep in range(HIERARCHY_SWEEPS):
+        if sweep % 2 == 0:
+            for row in layers[1:]:
+                _reorder(row, up)
+        else:
+            for row in reversed(layers[:-1]):
+                _reorder(row, down)
+
+    # 4) 좌표. 넓은 레이어는 HIERARCHY_MAX_PER_ROW 단위로 줄바꿈
+    pos: dict[str, tuple[float, float]] = {}
+    width = min(HIERARCHY_MAX_PER_ROW, max(len(row) for row in layers))
+    y = 0.0
+    for row in layers:
+        for start in range(0, len(row), HIERARCHY_MAX_PER_ROW):
+            chunk = row[start:start + HIERARCHY_MAX_PER_ROW]
+            offset = (width - len(chunk)) / 2
+            for i, nid in enumerate(chunk):
+                pos[nid] = (offset + i, y)
+            y += 1.0
+        y += HIERARCHY_LAYER_GAP - 1.0
+    return pos
+
+
 def _normalize_positions(
     pos: dict[str, tuple[float, float]],
     padding: float,
@@ -80,59 +181,12 @@ def _normalize_positions(
     return out
 
 
-def _layout_with_pygraphviz(
-    G: nx.Graph,
-    scale: float = 1.0,
-) -> dict[str, tuple[float, float]]:
-    """
-    PyGraphviz 기반 레이아웃 (고품질, overlap=scale로 라벨 겹침 방지).
-    Graphviz 시스템 라이브러리 필요. 없으면 NetworkX로 폴백.
-    """
-    if not HAS_PYGRAPHVIZ:
-        raise ImportError("PyGraphviz not available")
-    n = G.number_of_nodes()
-    if n == 0:
-        return {}
-    if n == 1:
-        return {list(G.nodes())[0]: (0.0, 0.0)}
-    try:
-        A = to_agraph(G)
-        # neato + overlap=false (결정론적) + sep=+20 (라벨 겹침 방지)
-        A.graph_attr.update(overlap="false", splines="true", sep="+20")
-        A.layout(prog="neato")
-        pos = {}
-        for node in A.nodes():
-            nid = node.get_name()
-            pos_str = node.attr.get("pos", "0,0")
-            parts = pos_str.split(",")
-            if len(parts) >= 2:
-                x, y = float(parts[0]), float(parts[1])
-                pos[nid] = (x, y)
-            else:
-                pos[nid] = (0.0, 0.0)
-        return pos
-    except Exception as ex:
-        logger.warning("PyGraphviz layout failed: %s, falling back to NetworkX", ex)
-        raise
-
-
 def _layout_one_graph(
     G: nx.Graph,
     scale: float = 1.0,
     seed: int = LAYOUT_SEED,
-    engine: Literal["networkx", "pygraphviz"] = "networkx",
 ) -> dict[str, tuple[float, float]]:
-    """
-    레이아웃 엔진 선택:
-    - pygraphviz: Graphviz 기반 (고품질, overlap=scale)
-    - networkx: Kamada-Kawai → Spring 2단계 (기본, 폴백)
-    """
-    if engine == "pygraphviz" and HAS_PYGRAPHVIZ:
-        try:
-            return _layout_with_pygraphviz(G, scale=scale)
-        except Exception:
-            logger.info("PyGraphviz failed, using NetworkX")
-            engine = "networkx"
+    """NetworkX: Kamada-Kawai → Spring 2단계 (기본, Graphviz 실패 시 폴백)."""
     n = G.number_of_nodes()
     if n == 0:
         return {}
@@ -151,6 +205,32 @@ def _layout_one_graph(
     return pos
 
 
+def _layout_parts(
+    parts: list[nx.Graph],
+    engine: LayoutEngine,
+    nodes: list[dict],
+    edges: list[dict],
+) -> list[dict[str, tuple[float, float]]]:
+    """
+    연결 요소(또는 전체 그래프)별 원시 좌표.
+    Graphviz 엔진은 3노드 이상 요소를 프로세스 풀에 한꺼번에 제출(병렬), 실패한 요소만 NetworkX.
+    """
+    if engine == "hierarchical":
+        G_dir = _build_hierarchy_graph(nodes, edges)
+        return [_layout_hierarchical(G_dir.subgraph(g.nodes())) for g in parts]
+
+    results: list[Optional[dict]] = [None] * len(parts)
+    prog = GRAPHVIZ_ENGINES.get(engine)
+    if prog:
+        todo = [i for i, g in enumerate(parts) if g.number_of_nodes() > 2]
+        for i, pos in zip(todo, graphviz_pool.layout_many([parts[i] for i in todo], prog=prog)):
+            results[i] = pos
+    return [
+        pos if pos is not None else _layout_one_graph(g, scale=1.0, seed=LAYOUT_SEED)
+        for g, pos in zip(parts, results)
+    ]
+
+
 def compute_layout(
     nodes: list[dict[str, Any]],
     edges: list[dict[str, Any]],
@@ -159,7 +239,7 @@ def compute_layout(
     height: float = 1.0,
     padding: float = 0.05,
     use_components: bool = True,
-    engine: Literal["networkx", "pygraphviz"] = "networkx",
+    engine: LayoutEngine = "networkx",
 ) -> dict[str, Any]:
     """
     노드/엣지 리스트 → 단순 그래프 → Kamada-Kawai → Spring → 0~1 정규화.
@@ -169,6 +249,7 @@ def compute_layout(
         edges: [ {"from": "n1", "to": "n2", "ratio": 50.0}, ... ] (동일 쌍 다중 가능)
         padding: 여백 비율. 반환 좌표는 [padding, 1-padding].
         use_components: True면 연결 요소별로 레이아웃 후 그리드 배치.
+        engine: networkx | pygraphviz(neato) | sfdp | hierarchical (지분 방향 계층, y=레이어)
 
     Returns:
         { "positions": { "n1": {"x": 0.2, "y": 0.5}, ... }, "components": [ ["n1","n2"], ... ] }
@@ -194,17 +275,20 @@ def compute_layout(
     components = list(nx.connected_components(G_layout))
     components = [list(c) for c in sorted(components, key=len, reverse=True)]
 
+    split = use_components and len(components) > 1
+    parts = [G_layout.subgraph(comp).copy() for comp in components] if split else [G_layout]
+    with tracing.span("layout"):
+        raw_positions = _layout_parts(parts, engine, nodes, edges)
+
     positions: dict[str, dict[str, float]] = {}
 
-    if use_components and len(components) > 1:
+    if split:
         n_comp = len(components)
         n_cols = math.ceil(math.sqrt(n_comp))
         n_rows = math.ceil(n_comp / n_cols)
         cell_w = (1.0 - 2 * padding) / n_cols
         cell_h = (1.0 - 2 * padding) / n_rows
-        for idx, comp in enumerate(components):
-            sub = G_layout.subgraph(comp).copy()
-            pos_sub = _layout_one_graph(sub, scale=1.0, seed=LAYOUT_SEED, engine=engine)
+        for idx, pos_sub in enumerate(raw_positions):
             pos_norm = _normalize_positions(pos_sub, padding=0.0)
             row, col = idx // n_cols, idx % n_cols
             ox = padding + col * cell_w
@@ -215,7 +299,7 @@ def compute_layout(
                     "y": oy + p["y"] * cell_h,
                 }
     else:
-        pos_raw = _layout_one_graph(G_layout, scale=1.0, seed=LAYOUT_SEED, engine=engine)
+        pos_raw = raw_positions[0]
         pos_norm = _normalize_positions(pos_raw, padding=padding)
         positions.update(pos_norm)
 
@@ -0,0 +1,234 @@
+"""
+OpenAI(호환) API 호출 게이트웨이. ChatOpenAI·OpenAIEmbeddings 는 모두 여기서 만듦 (chat_model, embeddings_model).
+
+- 공유 keep-alive httpx.Client 1개 (채팅·임베딩 공용, LLM_MAX_CONNECTIONS·LLM_KEEPALIVE_SEC)
+- 동시 호출 LLM_MAX_CONCURRENT 개. 대기 중인 호출이 LLM_MAX_QUEUE 개 이상이거나 LLM_QUEUE_TIMEOUT_SEC 안에
+  자리가 안 나면 LLMOverloaded(retry_after) → /chat 은 503 + Retry-After (대기열이 끝없이 쌓이지 않게)
+- 429·5xx·연결 오류·타임아웃은 지수 백오프 + full jitter 로 LLM_MAX_RETRIES 회까지 재시도
+  (응답에 Retry-After 가 있으면 그 값, 상한 LLM_RETRY_MAX_SEC). SDK 자체 재시도는 끄고(max_retries=0) 여기서만
+- OPENAI_BASE_URL: OpenAI 호환 서버(로컬 모의 서버 등). 비우면 api.openai.com
+계측(app.core.metrics): llm_request_seconds{kind,model,outcome=ok|retry|error}, llm_tokens_total{model,type},
+llm_retries_total{model,reason}, llm_rejected_total{reason=queue_full|queue_timeout}.
+"""
+import logging
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+import httpx
+import openai
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+from app.core import get_settings, metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+OPENAI_API_BASE = "https://api.openai.com/v1"
+
+# APITimeoutError 는 APIConnectionError 의 하위 클래스
+_RETRYABLE = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+class LLMOverloaded(RuntimeError):
+    """동시 호출 한도·대기열 초과. retry_after: 클라이언트에 권할 재시도 대기(초)."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"질문이 몰려 처리하지 못했습니다. {retry_after}초 후 다시 시도해 주세요.")
+
+
+class _Gate:
+    """동시 호출 세마포어 + 대기 수 상한. 평균 호출 시간(EWMA)으로 Retry-After 추정."""
+
+    def __init__(self, max_concurrent: int, max_queue: int) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max_queue
+        self.waiting = 0
+        self.avg_seconds = 1.0
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil((self.waiting + 1) / self.max_concurrent * self.avg_seconds))
+
+    def _reject(self, reason: str) -> LLMOverloaded:
+        metrics.inc("llm_rejected_total", reason=reason)
+        logger.warning(f"LLM call rejected ({reason}): {self.waiting} waiting, {self.max_concurrent} slots")
+        return LLMOverloaded(reason, self.retry_after())
+
+    @contextmanager
+    def slot(self, timeout: float) -> Iterator[None]:
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                raise self._reject("queue_full")
+            self.waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=timeout)
+        finally:
+            with self._lock:
+                self.waiting -= 1
+        if not acquired:
+            raise self._reject("queue_timeout")
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._slots.release()
+            with self._lock:
+                self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.perf_counter() - t0)
+
+
+_gate: Optional[_Gate] = None
+_http_client: Optional[httpx.Client] = None
+_init_lock = threading.Lock()
+
+
+def _get_gate() -> _Gate:
+    global _gate
+    if _gate is None:
+        with _init_lock:
+            if _gate is None:
+                s = get_settings()
+                _gate = _Gate(s.LLM_MAX_CONCURRENT, s.LLM_MAX_QUEUE)
+    return _gate
+
+
+def http_client() -> httpx.Client:
+    """채팅·임베딩이 같이 쓰는 keep-alive 연결 풀."""
+    global _http_client
+    if _http_client is None:
+        with _init_lock:
+            if _http_client is None:
+                s = get_settings()
+                _http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=s.LLM_MAX_CONNECTIONS,
+                        max_keepalive_connections=s.LLM_MAX_CONNECTIONS,
+                        keepalive_expiry=s.LLM_KEEPALIVE_SEC,
+                    ),
+                    timeout=httpx.Timeout(s.LLM_TIMEOUT_SEC, connect=5.0),
+                )
+    return _http_client
+
+
+def close() -> None:
+    """앱 종료 시 호출."""
+    global _http_client
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
+def base_url() -> str:
+    return get_settings().OPENAI_BASE_URL.rstrip("/") or OPENAI_API_BASE
+
+
+def _retry_reason(err: Exception) -> str:
+    if isinstance(err, openai.APITimeoutError):
+        return "timeout"
+    if isinstance(err, openai.APIStatusError):
+        return str(err.status_code)
+    return "connection"
+
+
+def _backoff(attempt: int, err: Exception) -> float:
+    s = get_settings()
+    response = getattr(err, "response", None)
+    header = response.headers.get("retry-after") if response is not None else None
+    if header:
+        try:
+            return min(s.LLM_RETRY_MAX_SEC, max(0.0, float(header)))
+        except ValueError:
+            pass  # HTTP-date 형식은 무시하고 백오프
+    return random.uniform(0, min(s.LLM_RETRY_MAX_SEC, s.LLM_RETRY_BASE_SEC * 2 ** attempt))
+
+
+def call(kind: str, model: str, fn: Callable[[], T]) -> T:
+    """
+    동시 호출 자리를 잡고 fn 실행, 일시적 오류는 재시도. 자리는 재시도 사이에도 유지
+    (429 가 나는 동안 같은 프로세스의 호출이 더 몰리지 않게).
+    Raises: LLMOverloaded, 재시도 후에도 실패한 openai 예외
+    """
+    s = get_settings()
+    # 구간은 자리 대기·재시도 백오프 포함 (요청 입장에서 LLM 에 쓴 시간)
+    with tracing.span("llm" if kind == "chat" else kind), _get_gate().slot(s.LLM_QUEUE_TIMEOUT_SEC):
+        attempt = 0
+        while True:
+            with metrics.timer("llm_request_seconds", kind=kind, model=model, outcome="error") as labels:
+                try:
+                    result = fn()
+                    labels["outcome"] = "ok"
+                    return result
+                except _RETRYABLE as e:
+                    if attempt >= s.LLM_MAX_RETRIES:
+                        raise
+                    labels["outcome"] = "retry"
+                    reason = _retry_reason(e)
+                    delay = _backoff(attempt, e)
+            metrics.inc("llm_retries_total", model=model, reason=reason)
+            logger.info(f"LLM {kind} call to {model} failed ({reason}), retry {attempt + 1} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+def _record_usage(model: str, result: Any) -> None:
+    for generation in result.generations:
+        usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+        if usage.get("input_tokens"):
+            metrics.inc("llm_tokens_total", usage["input_tokens"], model=model, type="prompt")
+        if usage.get("output_tokens"):
+            metrics.inc("llm_tokens_total", usage["output_tokens"], model=model, type="completion")
+
+
+class GatewayChatOpenAI(ChatOpenAI):
+    """_generate 를 게이트웨이로 감싼 ChatOpenAI — 체인 안의 모든 호출이 한도·재시도·계측을 거침."""
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        parent = super()._generate
+        result = call("chat", self.model_name, lambda: parent(messages, stop=stop, run_manager=run_manager, **kwargs))
+        _record_usage(self.model_name, result)
+        return result
+
+
+class GatewayOpenAIEmbeddings(OpenAIEmbeddings):
+    """embed_documents(embed_query 포함)를 게이트웨이로 감싼 OpenAIEmbeddings."""
+
+    def embed_documents(self, texts: list[str], chunk_size: Optional[int] = None, **kwargs) -> list[list[float]]:
+        parent = super().embed_documents
+        return call("embedding", self.model, lambda: parent(texts, chunk_size, **kwargs))
+
+
+def chat_model(
+    *, model: Optional[str] = None, base_url: Optional[str] = None, api_key: Optional[str] = None, **kwargs
+) -> ChatOpenAI:
+    """기본은 LLM_MODEL @ OPENAI_BASE_URL. model·base_url·api_key 는 다른 OpenAI 호환 서버용 (model_provider)."""
+    s = get_settings()
+    return GatewayChatOpenAI(
+        model=model or s.LLM_MODEL,
+        api_key=api_key or s.OPENAI_API_KEY,
+        base_url=base_url or s.OPENAI_BASE_URL or None,
+        http_client=http_client(),
+        timeout=s.LLM_TIMEOUT_SEC,
+        max_retries=0,
+        **kwargs,
+    )
+
+
+def embeddings_model() -> OpenAIEmbeddings:
+    s = get_settings()
+    return GatewayOpenAIEmbeddings(
+        model=s.EMBED_MODEL,
+        api_key=s.OPENAI_API_KEY,
+        base_url=s.OPENAI_BASE_URL or None,
+        http_client=http_client(),
+        timeout=s.LLM_TIMEOUT_SEC,
+        max_retries=0,
+        # OpenAI 호환 서버는 tiktoken 토큰 분할을 쓰지 않음 (모델별 토크나이저가 다름)
+        check_embedding_ctx_length=not s.OPENAI_BASE_URL,
+    )
@@ -0,0 +1,251 @@
+"""
+모델 제공자 선택 (Settings.LLM_PROVIDER / EMBED_PROVIDER). graph_service 는 채팅·임베딩 모델을 여기서 받음.
+
+- LLM_PROVIDER
+  - openai: OpenAI (또는 OPENAI_BASE_URL 의 호환 서버)
+  - local:  로컬 OpenAI 호환 서버(llama.cpp server, vLLM, Ollama 등) LOCAL_LLM_BASE_URL · LOCAL_LLM_MODEL
+  둘 다 llm_gateway 를 거침. 생성 요청 배치는 서버의 연속 배칭이 담당 → LLM_MAX_CONCURRENT 를 서버 슬롯 수에 맞춤
+- EMBED_PROVIDER
+  - openai: OpenAIEmbeddings (llm_gateway)
+  - local:  sentence-transformers CPU 모델 LOCAL_EMBED_MODEL (requirements-local-models.txt).
+    여러 요청의 단건 임베딩(embed_query)을 EMBED_BATCH_WAIT_MS 동안 모아 한 번에 encode (EMBED_BATCH_SIZE 까지)
+- warm_up(): 앱 기동 시 백그라운드에서 모델 적재·1회 호출 + 의도 분류 예시 임베딩 (첫 질문이 적재 시간을 떠안지 않게)
+
+임베딩 제공자를 바꾸면 벡터 공간·차원이 달라지므로 회사명 임베딩을 다시 기록해야 함. 제공자별로
+EMBED_PROPERTY·EMBED_INDEX·EMBED_DIM 을 따로 두면 기존 임베딩을 지우지 않고 전환 가능:
+
+    cd backend && PYTHONPATH=. python -m app.services.model_provider embed-names            # 없는 것만
+    cd backend && PYTHONPATH=. python -m app.services.model_provider embed-names --all      # 전체 다시
+"""
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_openai import ChatOpenAI
+
+from app.core import get_settings, metrics, tracing
+from app.services import llm_gateway
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    HAS_SENTENCE_TRANSFORMERS = True
+except ImportError:
+    SentenceTransformer = None
+    HAS_SENTENCE_TRANSFORMERS = False
+
+PROVIDERS = ("openai", "local")
+
+_COMPANY_NAMES_QUERY = """
+    MATCH (c:Company)
+    WHERE c.companyName IS NOT NULL AND c.nodeKey IS NOT NULL {missing}
+    RETURN c.nodeKey AS key, c.companyName AS name
+"""
+_WRITE_EMBEDDINGS_QUERY = """
+    UNWIND $rows AS row
+    MATCH (c:Company {{nodeKey: row.key}})
+    SET c.`{prop}` = row.vec
+"""
+
+
+def _provider(name: str, value: str) -> str:
+    if value not in PROVIDERS:
+        raise ValueError(f"{name} 은 {', '.join(PROVIDERS)} 중 하나여야 합니다.")
+    return value
+
+
+class _Batcher:
+    """여러 스레드의 단건 요청을 모아 fn(목록) 한 번으로 처리 (최대 max_size 개, 첫 요청 후 wait_sec 까지 대기)."""
+
+    def __init__(self, fn: Callable[[list], list], max_size: int, wait_sec: float) -> None:
+        self._fn = fn
+        self._max_size = max(1, max_size)
+        self._wait_sec = wait_sec
+        self._pending: list[tuple[object, Future]] = []
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, item):
+        future: Future = Future()
+        with self._cond:
+            self._pending.append((item, future))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="embed_batcher", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return future.result()
+
+    def _next_batch(self) -> list[tuple[object, Future]]:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self._wait_sec
+            while len(self._pending) < self._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch, self._pending = self._pending[: self._max_size], self._pending[self._max_size:]
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            metrics.observe("embed_batch_size", len(batch), buckets=(1, 2, 4, 8, 16, 32, 64))
+            try:
+                results = self._fn([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class LocalEmbeddings(Embeddings):
+    """sentence-transformers CPU 임베딩 (정규화 벡터). 모델은 첫 호출(또는 warm_up) 때 적재."""
+
+    def __init__(self, model_name: str, batch_size: int, batch_wait_sec: float) -> None:
+        if not HAS_SENTENCE_TRANSFORMERS:
+            raise RuntimeError(
+                "EMBED_PROVIDER=local 은 sentence-transformers 설치가 필요합니다 (requirements-local-models.txt)."
+            )
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._batcher = _Batcher(self._encode, batch_size, batch_wait_sec)
+
+    def _get_model(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    t0 = time.perf_counter()
+                    self._model = SentenceTransformer(self.model_name, device="cpu")
+                    logger.info(f"Local embedding model {self.model_name} loaded ({time.perf_counter() - t0:.1f}s)")
+        return self._model
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        model = self._get_model()
+        with tracing.span("embedding"), metrics.timer(
+            "llm_request_seconds", kind="embedding", model=self.model_name, outcome="ok"
+        ):
+            vectors = model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # 목록 요청은 이미 배치 — 모으지 않고 바로 encode
+        return self._encode(list(texts)) if texts else []
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._batcher.submit(text)
+
+
+def chat_endpoint() -> tuple[str, str, str]:
+    """생성에 실제로 쓰는 (base_url, model, api_key). 헬스 체크가 같은 서버를 확인하도록 공개."""
+    s = get_settings()
+    if _provider("LLM_PROVIDER", s.LLM_PROVIDER) == "local":
+        # 로컬 서버는 인증을 보지 않지만 SDK 가 키를 요구함
+        return s.LOCAL_LLM_BASE_URL.rstrip("/"), s.LOCAL_LLM_MODEL, s.OPENAI_API_KEY or "local"
+    return llm_gateway.base_url(), s.LLM_MODEL, s.OPENAI_API_KEY
+
+
+def chat_model(**kwargs) -> ChatOpenAI:
+    base_url, model, api_key = chat_endpoint()
+    return llm_gateway.chat_model(model=model, base_url=base_url, api_key=api_key, **kwargs)
+
+
+def embeddings_model() -> Embeddings:
+    s = get_settings()
+    if _provider("EMBED_PROVIDER", s.EMBED_PROVIDER) == "local":
+        return LocalEmbeddings(s.LOCAL_EMBED_MODEL, s.EMBED_BATCH_SIZE, s.EMBED_BATCH_WAIT_MS / 1000)
+    return llm_gateway.embeddings_model()
+
+
+def warm_up() -> dict[str, float]:
+    """
+    모델 적재·연결 + 1회 호출, 의도 분류 예시 임베딩. 단계별 소요(초) 반환.
+    LLM 은 로컬 서버일 때만 호출 (OpenAI 는 적재할 것이 없고 호출은 과금됨).
+    """
+    from app.services import intent_router
+    from app.services.graph_service import _get_embed_model
+
+    s = get_settings()
+    timings: dict[str, float] = {}
+    t0 = time.perf_counter()
+    _get_embed_model().embed_query("워밍업")
+    timings["embedding"] = round(time.perf_counter() - t0, 3)
+    t0 = time.perf_counter()
+    intent_router._examples_matrix()
+    timings["intent_examples"] = round(time.perf_counter() - t0, 3)
+    if s.LLM_PROVIDER == "local":
+        t0 = time.perf_counter()
+        chat_model(max_tokens=1).invoke("ping")
+        timings["llm"] = round(time.perf_counter() - t0, 3)
+    return timings
+
+
+def start_warm_up() -> None:
+    """앱 기동 시 호출. 기동을 막지 않도록 별도 스레드 (실패하면 첫 요청에서 다시 적재)."""
+    if not get_settings().MODEL_WARMUP:
+        return
+
+    def run() -> None:
+        try:
+            logger.info(f"Model warm-up done: {warm_up()}")
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+
+    threading.Thread(target=run, name="model_warm_up", daemon=True).start()
+
+
+def embed_company_names(batch_size: int = 256, only_missing: bool = True) -> int:
+    """
+    회사명 임베딩을 현재 EMBED_PROVIDER 로 계산해 EMBED_PROPERTY 에 기록하고 벡터 인덱스 생성.
+    Returns: 기록한 회사 수
+    """
+    from app.services.graph_service import _get_embed_model, ensure_vector_index, execute_write, stream_query
+
+    s = get_settings()
+    missing = f"AND c.`{s.EMBED_PROPERTY}` IS NULL" if only_missing else ""
+    rows = list(stream_query(_COMPANY_NAMES_QUERY.format(missing=missing)))
+    query = _WRITE_EMBEDDINGS_QUERY.format(prop=s.EMBED_PROPERTY)
+    model = _get_embed_model()
+    for lo in range(0, len(rows), batch_size):
+        batch = rows[lo:lo + batch_size]
+        vectors = model.embed_documents([r["name"] for r in batch])
+        if vectors and len(vectors[0]) != s.EMBED_DIM:
+            raise ValueError(f"임베딩 차원 {len(vectors[0])} 이 EMBED_DIM={s.EMBED_DIM} 과 다릅니다.")
+        execute_write([(query, {"rows": [{"key": r["key"], "vec": v} for r, v in zip(batch, vectors)]})])
+        logger.info(f"Company name embeddings written: {lo + len(batch):,}/{len(rows):,}")
+    ensure_vector_index()
+    return len(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    embed = sub.add_parser("embed-names", help="회사명 임베딩 기록 (EMBED_PROVIDER·EMBED_PROPERTY)")
+    embed.add_argument("--all", action="store_true", help="이미 있는 임베딩도 다시 계산")
+    embed.add_argument("--batch-size", type=int, default=256)
+    sub.add_parser("warm-up", help="모델 적재·1회 호출 소요 시간 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    s = get_settings()
+    if args.command == "embed-names":
+        t0 = time.perf_counter()
+        written = embed_company_names(args.batch_size, only_missing=not args.all)
+        print(f"{s.EMBED_PROVIDER} → {s.EMBED_PROPERTY}: {written:,} companies ({time.perf_counter() - t0:.1f}s)")
+    else:
+        print(f"llm={s.LLM_PROVIDER} embed={s.EMBED_PROVIDER}: {warm_up()}")
+
+
+if __name__ == "__main__":
+    main()
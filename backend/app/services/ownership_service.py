@@ -0,0 +1,222 @@
+"""
+지배구조 분석: 통합(간접 포함) 지분율과 지배 사슬(control chain).
+
+"이 회사를 최종적으로 누가 지배하나" 질문을 LLM 이 만든 다단계 Cypher 대신 인-프로세스 선형대수로 계산.
+- 지분 행렬: 인-프로세스 그래프 스냅샷(graph_snapshot)에서 희소 행렬 A (A[i, j] = i 가 보유한 j 지분, 0~1)
+  (주주, 회사) 쌍마다 최신 reportYear 값 사용. 한 회사 주주 지분 합이 100% 초과면 열을 100% 로 정규화
+- 통합 지분율: u = A[:, t] + A·u  (모든 경로의 지분율 곱의 합 = A(I − A)⁻¹ 의 t 열)
+  t 의 상위(조상) 노드만 잘라낸 부분 행렬에서 수렴할 때까지 반복 → 상호출자 순환도 처리
+- 지배 사슬: 회사마다 지분율이 임계값(기본 50%) 이상인 최대주주를 지배자로 보고 위로 따라감
+- 결과는 회사·파라미터별로 스냅샷에 캐시 (스냅샷 교체 시 함께 폐기)
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import breadth_first_order
+
+from app.core import get_settings
+from app.services import graph_snapshot
+from app.services.graph_snapshot import GraphSnapshot
+
+logger = logging.getLogger(__name__)
+
+OWNERSHIP_RESULT_CACHE_MAX = 512
+
+
+class OwnershipSnapshot:
+    """
+    그래프 스냅샷에서 만든 지분 행렬 (노드 인덱스는 그래프 스냅샷과 동일). 읽기 전용.
+    그래프 스냅샷이 교체되면 다음 요청에서 새로 만들어짐 → 결과 캐시도 함께 폐기.
+    """
+
+    def __init__(self, graph: GraphSnapshot) -> None:
+        n = len(graph)
+        # 자기 주식(주주 = 회사) 쌍은 지분 전파에서 제외
+        mask = graph.pair_src != graph.pair_dst
+        A = csr_matrix(
+            (graph.pair_latest[mask].astype(np.float64) / 100.0, (graph.pair_src[mask], graph.pair_dst[mask])),
+            shape=(n, n),
+        )
+        # 보고서 중복·오류로 한 회사 지분 합이 1 초과면 1 로 정규화 (반복 수렴 조건 유지)
+        col_sum = np.asarray(A.sum(axis=0)).ravel()
+        over = col_sum > 1.0
+        if over.any():
+            scale = np.ones(n)
+            scale[over] = 1.0 / col_sum[over]
+            A = csr_matrix(A.multiply(scale[np.newaxis, :]))
+        A.eliminate_zeros()
+        self.graph = graph
+        self.keys = graph.keys
+        self.labels = graph.labels
+        self.index = graph.index
+        self.A = A  # 행: 주주, 열: 회사
+        self.AT = A.T.tocsr()  # 행 j 의 열 = j 의 주주
+        self.loaded_at = graph.loaded_at
+        self._results: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._results_lock = threading.Lock()
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.A.nnz)
+
+    def holders_of(self, j: int) -> tuple[np.ndarray, np.ndarray]:
+        """(주주 인덱스, 지분 0~1)."""
+        lo, hi = self.AT.indptr[j], self.AT.indptr[j + 1]
+        return self.AT.indices[lo:hi], self.AT.data[lo:hi]
+
+    def cached(self, key: tuple) -> Optional[dict]:
+        with self._results_lock:
+            hit = self._results.get(key)
+            if hit is not None:
+                self._results.move_to_end(key)
+            return hit
+
+    def remember(self, key: tuple, result: dict) -> None:
+        with self._results_lock:
+            self._results[key] = result
+            while len(self._results) > OWNERSHIP_RESULT_CACHE_MAX:
+                self._results.popitem(last=False)
+
+
+_snapshot: Optional[OwnershipSnapshot] = None
+_build_lock = threading.Lock()
+
+
+def get_snapshot() -> OwnershipSnapshot:
+    """현재 그래프 스냅샷 기준 지분 행렬 (그래프 스냅샷이 없으면 적재, 바뀌었으면 재생성)."""
+    global _snapshot
+    graph = graph_snapshot.require_snapshot()
+    snap = _snapshot
+    if snap is not None and snap.graph is graph:
+        return snap
+    with _build_lock:
+        if _snapshot is None or _snapshot.graph is not graph:
+            _snapshot = OwnershipSnapshot(graph)
+        return _snapshot
+
+
+# ── 계산 ─────────────────────────────────────────────────────────────────────
+def integrated_ownership(snap: OwnershipSnapshot, t: int, max_iter: int, tol: float) -> dict[str, Any]:
+    """
+    회사 t 에 대한 모든 노드의 통합 지분율 u (0~1).
+    u = b + A·u, b = A[:, t]. t 의 조상 노드로 잘라낸 부분 행렬에서 반복 (비음수 단조 증가 → 상한 수렴).
+    """
+    ancestors = breadth_first_order(snap.AT, t, directed=True, return_predecessors=False)
+    sub = snap.A[ancestors][:, ancestors].tocsr()
+    local_t = int(np.flatnonzero(ancestors == t)[0])
+    b = sub[:, local_t].toarray().ravel()
+    u = b.copy()
+    converged = False
+    iterations = 0
+    for iterations in range(1, max_iter + 1):
+        nxt = b + sub @ u
+        delta = float(np.max(np.abs(nxt - u))) if len(u) else 0.0
+        u = nxt
+        if delta < tol:
+            converged = True
+            break
+    return {
+        "nodes": ancestors,
+        "direct": b,
+        "integrated": np.minimum(u, 1.0),
+        "self": float(min(u[local_t], 1.0)),
+        "iterations": iterations,
+        "converged": converged,
+    }
+
+
+def control_chain(snap: OwnershipSnapshot, t: int, threshold: float) -> dict[str, Any]:
+    """
+    t 에서 위로: 지분율 ≥ threshold(0~1) 인 최대주주를 지배자로 따라감.
+    지배자가 없으면 그 노드가 최종 지배자 (t 자신이면 분산 지배). 순환이면 중단.
+    """
+    chain = []
+    seen = {t}
+    current = t
+    cycle = False
+    while True:
+        holders, stakes = snap.holders_of(current)
+        if not len(holders):
+            break
+        best = int(np.argmax(stakes))
+        if stakes[best] < threshold:
+            break
+        controller = int(holders[best])
+        chain.append({
+            "id": snap.keys[controller],
+            "label": snap.labels[controller],
+            "controls": snap.keys[current],
+            "ratio": round(float(stakes[best]) * 100, 2),
+        })
+        if controller in seen:
+            cycle = True
+            break
+        seen.add(controller)
+        current = controller
+    return {"chain": chain, "cycle": cycle}
+
+
+def analyze(
+    node_key: str,
+    *,
+    control_threshold: Optional[float] = None,
+    min_ownership: float = 0.1,
+    limit: int = 50,
+) -> Optional[dict[str, Any]]:
+    """
+    회사의 통합 지분율 상위 주주 + 지배 사슬. 스냅샷에 없는 키면 None.
+
+    Args:
+        control_threshold: 지배 판정 지분율(%), 기본 설정값 OWNERSHIP_CONTROL_THRESHOLD_PCT
+        min_ownership: 결과에 포함할 최소 통합 지분율(%)
+    """
+    s = get_settings()
+    threshold = s.OWNERSHIP_CONTROL_THRESHOLD_PCT if control_threshold is None else control_threshold
+    snap = get_snapshot()
+    t = snap.index.get(node_key)
+    if t is None:
+        return None
+    cache_key = (t, threshold, min_ownership, limit)
+    cached = snap.cached(cache_key)
+    if cached is not None:
+        return cached
+
+    io = integrated_ownership(snap, t, s.OWNERSHIP_MAX_ITER, s.OWNERSHIP_TOLERANCE)
+    nodes, direct, integrated = io["nodes"], io["direct"], io["integrated"]
+    keep = np.flatnonzero((integrated * 100 >= min_ownership) & (nodes != t))
+    keep = keep[np.argsort(-integrated[keep], kind="stable")][:limit]
+    holder_counts = np.diff(snap.AT.indptr)
+    owners = [
+        {
+            "id": snap.keys[nodes[i]],
+            "label": snap.labels[nodes[i]],
+            "direct": round(float(direct[i]) * 100, 2),
+            "integrated": round(float(integrated[i]) * 100, 2),
+            # 이 노드를 보유한 주주가 없음 → 최종 소유자 (개인 등)
+            "ultimate": bool(holder_counts[nodes[i]] == 0),
+        }
+        for i in keep
+    ]
+    control = control_chain(snap, t, threshold / 100.0)
+    chain = control["chain"]
+    ultimate = chain[-1] if chain and not control["cycle"] else None
+
+    result = {
+        "company": {"id": node_key, "label": snap.labels[t]},
+        "control_threshold": threshold,
+        "owners": owners,
+        "control_chain": chain,
+        "ultimate_controller": {"id": ultimate["id"], "label": ultimate["label"]} if ultimate else None,
+        "cycle": control["cycle"],
+        "self_ownership": round(io["self"] * 100, 2),
+        "upstream_nodes": int(len(nodes) - 1),
+        "iterations": io["iterations"],
+        "converged": io["converged"],
+        "snapshot": {"nodes": len(snap.keys), "edges": snap.n_edges, "loaded_at": snap.loaded_at},
+    }
+    snap.remember(cache_key, result)
+    return result
@@ -0,0 +1,215 @@
+"""
+Neo4j 스키마 스냅샷 (Cypher 생성 프롬프트의 {schema}).
+
+Neo4jGraph.refresh_schema() 는 라벨·속성 인트로스펙션 쿼리(APOC)라 큰 DB 에서 느림 → 요청 경로에서 돌리지 않음.
+- 파일(SCHEMA_SNAPSHOT_PATH, JSON)에 구조화 스키마·스키마 문자열을 데이터 버전과 함께 저장. 임시 파일 + os.replace
+- attach(graph): 기동·재연결 시 메모리(없으면 파일) 스냅샷을 그래프에 바로 적용. 스냅샷이 아예 없을 때만 동기 인트로스펙션
+- 데이터 버전이 바뀌면(invalidate, 기동 시 check_in_background) 백그라운드 스레드에서 재생성
+- prompt_schema(): SCHEMA_COMPACT 면 프롬프트 도메인 지식에 나오는 라벨·관계·속성만 남긴 축약본 (토큰·LLM 지연 절감)
+"""
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_neo4j.chains.graph_qa.cypher import construct_schema
+
+from app.core import get_settings
+from app.core.node_keys import internal_properties
+from app.services.graph_snapshot import METRIC_PROPS
+
+logger = logging.getLogger(__name__)
+
+FORMAT = 1
+
+# 프롬프트 도메인 지식([노드]·[관계])에 나오는 것만 (분석 지표 METRIC_PROPS 포함). None = 해당 타입 속성 전체 (보수 항목은 "등" 으로만 언급)
+_DOMAIN_NODE_PROPS: dict[str, Optional[tuple[str, ...]]] = {
+    "Company": ("bizno", "crno", "companyName", "isActive", "closedDate") + METRIC_PROPS,
+    "LegalEntity": ("bizno", "crno", "companyName", "isActive", "closedDate") + METRIC_PROPS,
+    "Person": ("personId", "stockName", "shareholderType"),
+    "Stockholder": ("stockName", "shareholderType", "maxStockRatio") + METRIC_PROPS,
+    "MajorShareholder": ("stockName", "maxStockRatio"),
+}
+_DOMAIN_REL_PROPS: dict[str, Optional[tuple[str, ...]]] = {
+    "HOLDS_SHARES": ("stockRatio", "stockCount", "stockType", "baseDate", "reportYear"),
+    "HAS_COMPENSATION": None,
+}
+
+_VERSION_QUERY = "OPTIONAL MATCH (v:DataVersion {name: 'graph'}) RETURN v.version AS version"
+
+_snapshot: Optional[dict] = None
+_prompt_schema: Optional[str] = None
+_lock = threading.Lock()
+_refreshing = threading.Lock()
+
+
+def _path() -> Path:
+    return Path(get_settings().SCHEMA_SNAPSHOT_PATH)
+
+
+def _compact(structured: dict[str, Any]) -> dict[str, Any]:
+    internal = internal_properties()
+
+    def keep(props: list[dict], allowed: Optional[tuple[str, ...]]) -> list[dict]:
+        return [
+            p for p in props
+            if p["property"] not in internal and (allowed is None or p["property"] in allowed)
+        ]
+
+    node_props = {
+        label: keep(props, _DOMAIN_NODE_PROPS[label])
+        for label, props in structured.get("node_props", {}).items()
+        if label in _DOMAIN_NODE_PROPS
+    }
+    rel_props = {
+        rel: keep(props, _DOMAIN_REL_PROPS[rel])
+        for rel, props in structured.get("rel_props", {}).items()
+        if rel in _DOMAIN_REL_PROPS
+    }
+    relationships = [
+        r for r in structured.get("relationships", [])
+        if r["type"] in _DOMAIN_REL_PROPS and r["start"] in _DOMAIN_NODE_PROPS and r["end"] in _DOMAIN_NODE_PROPS
+    ]
+    return {"node_props": node_props, "rel_props": rel_props, "relationships": relationships}
+
+
+def _render(snapshot: dict) -> str:
+    if not get_settings().SCHEMA_COMPACT:
+        return snapshot["schema"]
+    return construct_schema(_compact(snapshot["structured"]), [], [], False)
+
+
+def _set(snapshot: dict) -> None:
+    global _snapshot, _prompt_schema
+    _snapshot, _prompt_schema = snapshot, _render(snapshot)
+
+
+def _load_file() -> Optional[dict]:
+    path = _path()
+    if not path.exists():
+        return None
+    try:
+        saved = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Schema snapshot {path} unreadable, ignoring: {e}")
+        return None
+    if saved.get("format") != FORMAT or "structured" not in saved or "schema" not in saved:
+        return None
+    return saved
+
+
+def _save(snapshot: dict) -> None:
+    path = _path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(snapshot, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as e:
+        # 읽기 전용 파일시스템 등: 메모리 스냅샷만으로 계속 동작
+        logger.warning(f"Schema snapshot {path} not saved: {e}")
+
+
+def _apply(graph, snapshot: dict) -> None:
+    graph.structured_schema = snapshot["structured"]
+    graph.schema = snapshot["schema"]
+
+
+def _read_version(graph) -> Optional[int]:
+    rows = graph.query(_VERSION_QUERY)
+    return rows[0]["version"] if rows else None
+
+
+def _introspect(graph) -> dict:
+    t0 = time.time()
+    version = _read_version(graph)
+    graph.refresh_schema()
+    snapshot = {
+        "format": FORMAT,
+        "dataVersion": version,
+        "createdAt": time.time(),
+        "structured": graph.structured_schema,
+        "schema": graph.schema,
+    }
+    logger.info(f"Schema snapshot rebuilt for data version {version} ({time.time() - t0:.1f}s)")
+    return snapshot
+
+
+def attach(graph) -> None:
+    """
+    새 Neo4jGraph(refresh_schema=False)에 스키마 적용 (graph_service._get_graph).
+    메모리 → 파일 순으로 찾고, 둘 다 없으면 그때만 인트로스펙션 후 저장.
+    """
+    with _lock:
+        snapshot = _snapshot or _load_file()
+        if snapshot is None:
+            snapshot = _introspect(graph)
+            _save(snapshot)
+        _set(snapshot)
+        _apply(graph, snapshot)
+
+
+def prompt_schema() -> Optional[str]:
+    """Cypher 생성 프롬프트용 스키마 문자열 (attach 전이면 None)."""
+    return _prompt_schema
+
+
+def full_schema() -> Optional[str]:
+    """축약 전 스키마 문자열 (토큰 절감량 계산용)."""
+    return _snapshot["schema"] if _snapshot else None
+
+
+def current() -> dict:
+    """스냅샷 메타 (상태 조회용)."""
+    snap = _snapshot or {}
+    return {
+        "dataVersion": snap.get("dataVersion"),
+        "createdAt": snap.get("createdAt"),
+        "compact": get_settings().SCHEMA_COMPACT,
+        "chars": len(_prompt_schema or ""),
+    }
+
+
+def refresh(force: bool = False) -> bool:
+    """
+    데이터 버전이 스냅샷과 다르면(force 면 항상) 인트로스펙션 후 교체·저장. 이미 재생성 중이면 건너뜀.
+    Returns: 재생성했으면 True.
+    """
+    from app.services.graph_service import _get_graph
+
+    if not _refreshing.acquire(blocking=False):
+        return False
+    try:
+        graph = _get_graph()
+        if not force and _snapshot is not None and _read_version(graph) == _snapshot.get("dataVersion"):
+            return False
+        snapshot = _introspect(graph)
+        with _lock:
+            _set(snapshot)
+        _save(snapshot)
+        return True
+    finally:
+        _refreshing.release()
+
+
+def _refresh_in_background() -> None:
+    def run() -> None:
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning(f"Schema snapshot refresh failed (keeping previous): {e}")
+
+    threading.Thread(target=run, name="schema_snapshot_refresh", daemon=True).start()
+
+
+def check_in_background() -> None:
+    """앱 기동 시: 꺼져 있던 동안 적재가 있었으면 스냅샷 재생성 (요청은 기존 스냅샷으로 처리)."""
+    _refresh_in_background()
+
+
+def invalidate(keys: Optional[frozenset]) -> None:
+    """데이터 버전 변경 시 (app.services.data_version). 바뀐 키와 무관하게 스키마를 다시 읽음."""
+    _refresh_in_background()
@@ -0,0 +1,257 @@
+"""
+지분율 시계열·변동 분석 (reportYear 기준).
+
+"X사 지분율 변동" 류 질문마다 LLM 이 (주주, 회사)별 관계를 collect·정렬하는 Cypher 를 새로 만드는 대신,
+그래프 스냅샷의 (쌍, 연도) 순 관계 배열을 그대로 시계열로 사용해 벡터 연산으로 비교.
+- 연도 Y 의 값: 해당 회사가 Y 년에 보고했으면 Y 년 값(없으면 0 = 지분 없음),
+  보고가 없으면 Y 이전 마지막 보고값 (as-of)
+- 같은 연도 보고가 여러 건이면 최대 지분율 (스냅샷 정렬 순서의 마지막)
+- 조회: (쌍 << 16 | 연도) 정렬 키에 searchsorted → 쌍 수만큼 한 번에 계산
+"""
+import re
+import threading
+from typing import Any, Optional
+
+import numpy as np
+
+from app.services import graph_snapshot, suggest_service
+from app.services.graph_snapshot import FLAG_COMPANY, GraphSnapshot
+
+DIRECTIONS = ("all", "up", "down")
+_YEAR_OFFSET = 2 ** 15  # int16 연도 → 0..65535
+
+# '지분율 변동', '지분율이 2021년보다 줄어든', '지분을 늘린' — 지분(율) 뒤 20자 안의 변동 표현 (문장 끝은 넘지 않음)
+_INTENT_RE = re.compile(r"지분\s*율?[^.?!\n]{0,20}?(?:변동|변화|증감|추이|늘|줄|증가|감소|상승|하락|올랐|오른|내린|내려|떨어)")
+_UP_RE = re.compile(r"증가|늘|상승|올랐|오른")
+_DOWN_RE = re.compile(r"감소|줄|하락|내린|내려|떨어")
+_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})(?!\d)")
+
+
+class StakeSeries:
+    """그래프 스냅샷에서 만든 시계열 조회 구조 (지분율 null 관계 제외). 읽기 전용."""
+
+    def __init__(self, graph: GraphSnapshot) -> None:
+        self.graph = graph
+        counts = np.diff(graph.rel_start)
+        pair_of_rel = np.repeat(np.arange(graph.n_pairs, dtype=np.int64), counts)
+        valid = ~np.isnan(graph.ratio) & (graph.year != 0)
+        self.pair_of_rel = pair_of_rel[valid].astype(np.int32)
+        self.year = graph.year[valid]
+        self.ratio = graph.ratio[valid]
+        year_off = self.year.astype(np.int64) + _YEAR_OFFSET
+        # 스냅샷 관계는 (주주, 회사, 연도) 순 = (쌍, 연도) 순이므로 이미 정렬됨
+        self.keys = (self.pair_of_rel.astype(np.int64) << 16) | year_off
+        company_of_rel = graph.pair_dst[self.pair_of_rel].astype(np.int64)
+        self.company_years = np.unique((company_of_rel << 16) | year_off)
+        self.years = sorted(int(y) for y in np.unique(self.year))
+        self._company_index: Optional[dict[str, int]] = None
+
+    def value_at(self, pairs: np.ndarray, year: int) -> np.ndarray:
+        """쌍별 연도 year 시점 지분율(%)."""
+        pairs = pairs.astype(np.int64)
+        y = year + _YEAR_OFFSET
+        idx = np.searchsorted(self.keys, (pairs << 16) | y, side="right") - 1
+        safe = np.maximum(idx, 0)
+        found = (idx >= 0) & (self.pair_of_rel[safe] == pairs)
+        value = np.where(found, self.ratio[safe], 0.0)
+        exact = found & (self.year[safe] == year)
+        target = (self.graph.pair_dst[pairs].astype(np.int64) << 16) | y
+        pos = np.searchsorted(self.company_years, target)
+        reported = pos < len(self.company_years)
+        reported[reported] = self.company_years[pos[reported]] == target[reported]
+        # 회사가 그 해에 보고했는데 이 주주가 없으면 지분 없음
+        return np.where(reported & ~exact, 0.0, value)
+
+    def series(self, pair: int) -> list[dict]:
+        lo = np.searchsorted(self.pair_of_rel, pair, side="left")
+        hi = np.searchsorted(self.pair_of_rel, pair, side="right")
+        out: dict[int, float] = {}
+        for y, r in zip(self.year[lo:hi].tolist(), self.ratio[lo:hi].tolist()):
+            out[y] = r  # 같은 연도 여러 건이면 마지막(최대)
+        return [{"year": y, "ratio": round(r, 2)} for y, r in out.items()]
+
+    def company_index(self) -> dict[str, int]:
+        """회사명 → 노드 인덱스 (벡터 검색 힌트 매칭용, 동명이면 첫 노드)."""
+        if self._company_index is None:
+            g = self.graph
+            index: dict[str, int] = {}
+            for i in np.flatnonzero(g.flags & FLAG_COMPANY).tolist():
+                index.setdefault(g.labels[i], i)
+            self._company_index = index
+        return self._company_index
+
+
+_series: Optional[StakeSeries] = None
+_build_lock = threading.Lock()
+
+
+def get_series(required: bool = True) -> Optional[StakeSeries]:
+    """현재 그래프 스냅샷 기준 시계열. required=False 면 스냅샷이 없을 때 적재하지 않고 None."""
+    global _series
+    graph = graph_snapshot.require_snapshot() if required else graph_snapshot.get_snapshot()
+    if graph is None:
+        return None
+    series = _series
+    if series is not None and series.graph is graph:
+        return series
+    with _build_lock:
+        if _series is None or _series.graph is not graph:
+            _series = StakeSeries(graph)
+        return _series
+
+
+def stake_changes(
+    node_key: Optional[str] = None,
+    *,
+    from_year: Optional[int] = None,
+    to_year: Optional[int] = None,
+    min_change: float = 0.01,
+    direction: str = "all",
+    limit: int = 50,
+    series: Optional[StakeSeries] = None,
+) -> Optional[dict[str, Any]]:
+    """
+    from_year → to_year 지분율 변동이 큰 (주주, 회사) 쌍.
+
+    Args:
+        node_key: 회사면 그 회사의 주주들, 주주면 그 주주의 보유 회사들, None 이면 전체
+        from_year/to_year: 생략 시 범위 내 첫/마지막 보고 연도
+        min_change: 최소 변동 폭(%p)
+        direction: all(절대값 큰 순) | up(증가) | down(감소)
+
+    Returns:
+        결과 dict, node_key 가 스냅샷에 없으면 None
+    """
+    series = series or get_series()
+    g = series.graph
+    if node_key is None:
+        pairs = np.arange(g.n_pairs)
+        scope = None
+    else:
+        i = g.index.get(node_key)
+        if i is None:
+            return None
+        pairs = np.union1d(np.asarray(g.in_pairs(i), dtype=np.int64), np.arange(g.out_indptr[i], g.out_indptr[i + 1]))
+        scope = {"id": node_key, "label": g.labels[i]}
+
+    in_scope = np.isin(series.pair_of_rel, pairs) if node_key is not None else slice(None)
+    scope_years = np.unique(series.year[in_scope])
+    if not len(scope_years):
+        return {"scope": scope, "from_year": from_year, "to_year": to_year, "years": [], "changes": [], "total": 0}
+    from_year = int(scope_years[0]) if from_year is None else from_year
+    to_year = int(scope_years[-1]) if to_year is None else to_year
+
+    before = series.value_at(pairs, from_year)
+    after = series.value_at(pairs, to_year)
+    diff = after - before
+    if direction == "up":
+        mask, order_key = diff >= min_change, -diff
+    elif direction == "down":
+        mask, order_key = diff <= -min_change, diff
+    else:
+        mask, order_key = np.abs(diff) >= min_change, -np.abs(diff)
+    hit = np.flatnonzero(mask)
+    hit = hit[np.argsort(order_key[hit], kind="stable")]
+
+    changes = []
+    for k in hit[:limit].tolist():
+        p = int(pairs[k])
+        holder, company = int(g.pair_src[p]), int(g.pair_dst[p])
+        changes.append({
+            "holder": {"id": g.keys[holder], "label": g.labels[holder]},
+            "company": {"id": g.keys[company], "label": g.labels[company]},
+            "from_ratio": round(float(before[k]), 2),
+            "to_ratio": round(float(after[k]), 2),
+            "change": round(float(diff[k]), 2),
+            "series": series.series(p),
+        })
+    return {
+        "scope": scope,
+        "from_year": from_year,
+        "to_year": to_year,
+        "years": [int(y) for y in scope_years],
+        "changes": changes,
+        "total": int(len(hit)),
+    }
+
+
+# ── 채팅 라우팅 ──────────────────────────────────────────────────────────────
+def is_stake_change_question(question: str) -> bool:
+    return bool(_INTENT_RE.search(question or ""))
+
+
+def _resolve_company(series: StakeSeries, question: str, hints: list[str]) -> Optional[str]:
+    """
+    질문에 들어 있는 회사명(긴 이름 우선, 자동완성 인덱스 contained_in — 회사 수만큼 훑지 않음)
+    → 없으면 벡터 검색 힌트 순서대로.
+    """
+    g = series.graph
+    index = suggest_service.get_index()
+    if index is not None:
+        for item in index.contained_in(question, node_type="company"):
+            if item["id"] in g.index:
+                return item["id"]
+    by_label = series.company_index()
+    for name in hints:
+        i = by_label.get(name)
+        if i is not None:
+            return g.keys[i]
+    return None
+
+
+def _format_ratio(r: float) -> str:
+    return f"{r:g}%"
+
+
+def answer_question(question: str, hints: list[str], limit: int = 10) -> Optional[dict[str, Any]]:
+    """
+    지분율 변동 질문이면 LLM Cypher 없이 스냅샷에서 답변 (ask_graph 응답 형태의 일부).
+    의도가 아니거나, 스냅샷이 없거나, 회사를 특정하지 못하면 None → 기존 LLM 경로.
+    """
+    if not is_stake_change_question(question):
+        return None
+    series = get_series(required=False)
+    if series is None:
+        return None
+    key = _resolve_company(series, question, hints)
+    if key is None:
+        return None
+    years = sorted(int(y) for y in _YEAR_RE.findall(question))
+    direction = "up" if _UP_RE.search(question) else ("down" if _DOWN_RE.search(question) else "all")
+    result = stake_changes(
+        key,
+        from_year=years[0] if years else None,
+        to_year=years[-1] if len(years) > 1 else None,
+        direction=direction,
+        limit=limit,
+        series=series,
+    )
+    if result is None:
+        return None
+
+    name = result["scope"]["label"]
+    period = f"{result['from_year']}년 → {result['to_year']}년"
+    if not result["changes"]:
+        answer = f"**{name}** 의 {period} 지분율 변동 내역이 없습니다. (보고 연도: {', '.join(map(str, result['years'])) or '없음'})"
+    else:
+        lines = [f"**{name}** 지분율 변동 ({period}, 변동 폭 큰 순 {len(result['changes'])}건 / 전체 {result['total']}건)"]
+        for c in result["changes"]:
+            # 대상 회사가 주주 쪽이면(법인 주주) 상대는 보유 회사 — 방향을 붙여 구분
+            if c["company"]["id"] == key:
+                other = f"주주 **{c['holder']['label']}**"
+            else:
+                other = f"보유 회사 **{c['company']['label']}**"
+            trend = ", ".join(f"{s['year']}년 {_format_ratio(s['ratio'])}" for s in c["series"])
+            lines.append(f"- {other}: {trend} ({c['change']:+.2f}%p)")
+        answer = "\n".join(lines)
+    raw = [
+        {
+            "주주명": c["holder"]["label"],
+            "회사명": c["company"]["label"],
+            "years": [s["year"] for s in c["series"]],
+            "ratios": [s["ratio"] for s in c["series"]],
+            "change": c["change"],
+        }
+        for c in result["changes"]
+    ]
+    return {"answer": answer, "raw": raw, "empty": not raw}
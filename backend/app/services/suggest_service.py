@@ -0,0 +1,384 @@
+"""
+자동완성(typeahead) 인덱스: 회사명·주주명 전체를 프로세스 메모리에 적재.
+
+키 입력마다 Neo4j 를 조회하지 않고 인-프로세스에서 1ms 미만으로 응답.
+- 매칭: 접두(prefix) / 중간(infix) / 한글 초성(ㅅㅅㅅㅁ → 삼성생명, 혼합 '삼ㅅ' 포함)
+- 순위: 완전일치 → 접두 → 단어 시작 → 중간, 같은 등급이면 짧은 이름 우선
+- 메모리: 이름은 sys.intern, postings 는 array('I') (엔트리 인덱스, 오름차순)
+- 적재: 기동 시 스트리밍 읽기(fetch_size 페이지) 후 원자적 교체. 데이터 버전 변경 시 바뀐 키만 재조회
+  (이름 변경·유형 변경·삭제 반영), 버전 없이 쓰는 CSV 임포트 대비로 주기적 전체 재적재(삭제 표시 정리 포함)
+"""
+import heapq
+import logging
+import sys
+import threading
+import time
+from array import array
+from typing import Optional
+
+from app.core import get_settings
+
+logger = logging.getLogger(__name__)
+
+TYPE_CODES = ("company", "person", "major", "institution")
+TYPE_SUB = {"company": "회사", "person": "개인주주", "major": "최대주주", "institution": "기관"}
+
+_HANGUL_FIRST, _HANGUL_LAST = 0xAC00, 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSEONG_SET = frozenset(_CHOSEONG)
+
+# 순위 등급 (작을수록 우선)
+_RANK_EXACT, _RANK_PREFIX, _RANK_WORD, _RANK_INFIX = 0, 1, 2, 3
+
+
+def _normalize(text: str) -> str:
+    """소문자 + 공백 제거. '(주)' 등은 이름의 일부로 유지."""
+    return "".join(text.lower().split())
+
+
+def _choseong(text: str) -> str:
+    """한글 음절 → 초성 자모. 그 외 문자는 그대로 (길이 보존 → 위치 대응)."""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_FIRST <= code <= _HANGUL_LAST:
+            out.append(_CHOSEONG[(code - _HANGUL_FIRST) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def _grams(text: str) -> set[str]:
+    """bigram 집합 (1글자면 unigram)."""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def node_type_of(labels: list, shareholder_type: Optional[str]) -> str:
+    """레이블/주주유형 → 시각화 노드 타입 (graph 엔드포인트와 동일 규칙)."""
+    if "Company" in labels:
+        return "company"
+    if "MajorShareholder" in labels:
+        return "major"
+    return "institution" if (shareholder_type or "PERSON").upper() != "PERSON" else "person"
+
+
+class SuggestIndex:
+    """
+    append-only 인덱스. 쓰기는 단일 스레드(로더), 읽기는 락 없이 수행.
+    쓰기 순서(엔트리 배열 → postings)로 읽기 측이 미완성 엔트리를 참조하지 않음.
+
+    postings 는 이름 길이 오름차순으로 정렬(finalize)되어 있어, 같은 등급 안에서는
+    앞에서부터 limit 개만 검증하면 최적 결과가 됨 → 후보가 많아도 스캔이 짧음.
+    """
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.labels: list[str] = []
+        self.types = array("B")
+        self.lengths = array("H")
+        self.norm: list[str] = []
+        self.cho: list[str] = []
+        self.alive = bytearray()
+        self.position: dict[str, int] = {}
+        # infix: 2-gram → 엔트리 / prefix: 앞 1·2글자 → 엔트리 (각각 음절·초성 버전)
+        self._grams: dict[str, array] = {}
+        self._cho_grams: dict[str, array] = {}
+        self._prefix: dict[str, array] = {}
+        self._cho_prefix: dict[str, array] = {}
+        self._dirty: set[tuple[int, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _post(self, table: dict[str, array], gram: str, idx: int) -> None:
+        table.setdefault(gram, array("I")).append(idx)
+        self._dirty.add((id(table), gram))
+
+    def add(self, key: str, label: str, node_type: str) -> None:
+        label = (label or "").strip()
+        if not label:
+            return
+        old = self.position.get(key)
+        if old is not None:
+            if self.labels[old] == label and TYPE_CODES[self.types[old]] == node_type:
+                return
+            self.alive[old] = 0
+        norm = _normalize(label)
+        cho = _choseong(norm)
+        idx = len(self.keys)
+        self.keys.append(sys.intern(key))
+        self.labels.append(sys.intern(label))
+        self.types.append(TYPE_CODES.index(node_type))
+        self.lengths.append(min(len(norm), 0xFFFF))
+        self.norm.append(norm)
+        self.cho.append(cho)
+        self.alive.append(1)
+        self.position[self.keys[idx]] = idx
+        for g in _grams(norm):
+            self._post(self._grams, g, idx)
+        for g in _grams(cho):
+            self._post(self._cho_grams, g, idx)
+        for n in (1, 2):
+            if len(norm) >= n:
+                self._post(self._prefix, norm[:n], idx)
+                self._post(self._cho_prefix, cho[:n], idx)
+
+    def finalize(self) -> None:
+        """변경된 postings 를 이름 길이 순으로 재정렬 (적재 배치 끝에 호출)."""
+        tables = {id(t): t for t in (self._grams, self._cho_grams, self._prefix, self._cho_prefix)}
+        lengths = self.lengths
+        for table_id, gram in self._dirty:
+            table = tables[table_id]
+            table[gram] = array("I", sorted(table[gram], key=lengths.__getitem__))
+        self._dirty.clear()
+
+    def remove(self, key: str) -> None:
+        idx = self.position.pop(key, None)
+        if idx is not None:
+            self.alive[idx] = 0
+
+    # ── 검색 ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _smallest(*lists: Optional[array]) -> array:
+        present = [p for p in lists if p is not None]
+        return min(present, key=len) if present else array("I")
+
+    def _prefix_candidates(self, q: str, q_cho: str, has_jamo: bool) -> array:
+        head = q[:2]
+        options = [self._cho_prefix.get(q_cho[:2])] if has_jamo else []
+        if not any(ch in _CHOSEONG_SET for ch in head):
+            options.append(self._prefix.get(head))
+        elif q[0] not in _CHOSEONG_SET:
+            options.append(self._prefix.get(q[0]))
+        return self._smallest(*options)
+
+    def _infix_candidates(self, q: str, q_cho: str, has_jamo: bool) -> array:
+        options = []
+        for i in range(len(q) - 1):
+            g = q[i:i + 2]
+            if not (has_jamo and any(ch in _CHOSEONG_SET for ch in g)):
+                options.append(self._grams.get(g, array("I")))
+            if has_jamo:
+                options.append(self._cho_grams.get(q_cho[i:i + 2], array("I")))
+        return self._smallest(*options)
+
+    def _match_pos(self, i: int, q: str, q_cho: str, has_jamo: bool, start: int = 0) -> int:
+        """start 이후 첫 일치 위치, 없으면 -1. 자모 포함 질의는 초성 위치 후보를 음절 단위로 재검증."""
+        if not has_jamo:
+            return self.norm[i].find(q, start)
+        name, cho = self.norm[i], self.cho[i]
+        pos = cho.find(q_cho, start)
+        while pos >= 0:
+            if all(qc in _CHOSEONG_SET or name[pos + k] == qc for k, qc in enumerate(q)):
+                return pos
+            pos = cho.find(q_cho, pos + 1)
+        return -1
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        node_type: Optional[str] = None,
+        infix_scan_cap: int = 500,
+    ) -> list[dict]:
+        q = _normalize(query)
+        if not q:
+            return []
+        has_jamo = any(ch in _CHOSEONG_SET for ch in q)
+        q_cho = _choseong(q)
+        type_code = TYPE_CODES.index(node_type) if node_type in TYPE_CODES else None
+        alive, types = self.alive, self.types
+
+        # 1) 접두 일치: 길이순 postings 앞에서부터 limit 개면 충분
+        hits: list[tuple[int, int, int]] = []
+        seen: set[int] = set()
+        for i in self._prefix_candidates(q, q_cho, has_jamo):
+            if not alive[i] or (type_code is not None and types[i] != type_code):
+                continue
+            if self._match_pos(i, q, q_cho, has_jamo) == 0:
+                rank = _RANK_EXACT if self.lengths[i] == len(q) else _RANK_PREFIX
+                hits.append((rank, self.lengths[i], i))
+                seen.add(i)
+                if len(hits) >= limit:
+                    break
+
+        # 2) 중간 일치 (2글자 이상): 단어 시작 > 일반 중간, 스캔 상한으로 지연 제한
+        if len(hits) < limit and len(q) >= 2:
+            infix: list[tuple[int, int, int]] = []
+            for scanned, i in enumerate(self._infix_candidates(q, q_cho, has_jamo)):
+                if scanned >= infix_scan_cap or len(infix) >= limit * 4:
+                    break
+                if i in seen or not alive[i] or (type_code is not None and types[i] != type_code):
+                    continue
+                pos = self._match_pos(i, q, q_cho, has_jamo, 1)
+                if pos > 0:
+                    rank = _RANK_WORD if self._word_start(i, pos) else _RANK_INFIX
+                    infix.append((rank, self.lengths[i], i))
+            hits.extend(heapq.nsmallest(limit - len(hits), infix))
+
+        out = []
+        for rank, _, i in sorted(hits):
+            node_t = TYPE_CODES[types[i]]
+            out.append({
+                "id": self.keys[i],
+                "type": node_t,
+                "label": self.labels[i],
+                "sub": TYPE_SUB[node_t],
+                "match": ("exact", "prefix", "word", "infix")[rank],
+            })
+        return out
+
+    def contained_in(self, text: str, node_type: Optional[str] = None, limit: int = 5) -> list[dict]:
+        """
+        text 안에 이름 전체가 들어 있는 엔트리 (search 의 역방향: 질문 → 언급된 회사).
+        위치마다 앞 2글자 postings 만 보고, 길이순 정렬이라 남은 글자 수를 넘는 이름에서 멈춤.
+        더 긴 일치에 포함된 짧은 일치('삼성' ⊂ '삼성생명')는 버리고 긴 이름부터 limit 개.
+        """
+        t = _normalize(text)
+        type_code = TYPE_CODES.index(node_type) if node_type in TYPE_CODES else None
+        alive, types, lengths = self.alive, self.types, self.lengths
+        spans: list[tuple[int, int, int]] = []
+        for p in range(len(t) - 1):
+            room = len(t) - p
+            for i in self._prefix.get(t[p:p + 2], ()):
+                if lengths[i] > room:
+                    break
+                if alive[i] and (type_code is None or types[i] == type_code) and t.startswith(self.norm[i], p):
+                    spans.append((p, p + lengths[i], i))
+        spans = [s for s in spans if not any(o[0] <= s[0] and s[1] <= o[1] and o[1] - o[0] > s[1] - s[0] for o in spans)]
+        out = []
+        for _, _, i in sorted(spans, key=lambda s: (s[0] - s[1], s[0]))[:limit]:
+            node_t = TYPE_CODES[types[i]]
+            out.append({"id": self.keys[i], "type": node_t, "label": self.labels[i], "sub": TYPE_SUB[node_t]})
+        return out
+
+    def _word_start(self, i: int, pos: int) -> bool:
+        # 정규화 시 공백이 제거되므로 원문 기준으로 단어 시작 여부 판정: '(주)' 뒤, 공백 뒤
+        label = self.labels[i].lower()
+        seen = 0
+        for j, ch in enumerate(label):
+            if ch.isspace():
+                continue
+            if seen == pos:
+                return label[j - 1].isspace() or label[j - 1] in ")(·,"
+            seen += 1
+        return False
+
+    def memory_stats(self) -> dict:
+        tables = (self._grams, self._cho_grams, self._prefix, self._cho_prefix)
+        return {
+            "entries": len(self.keys),
+            "alive": sum(self.alive),
+            "posting_keys": sum(len(t) for t in tables),
+            "postings_bytes": sum(p.itemsize * len(p) for t in tables for p in t.values()),
+        }
+
+
+# ── 적재 (Neo4j) ───────────────────────────────────────────────────────────
+_index: Optional[SuggestIndex] = None
+_loader_lock = threading.Lock()
+_stop_event = threading.Event()
+_loader_thread: Optional[threading.Thread] = None
+
+# 응답 id 는 nodeKey (app.core.node_keys)
+_NAMED_NODES_QUERY = """
+    MATCH (n)
+    WHERE (n:Company OR n:Stockholder) AND n.nodeKey IS NOT NULL
+    RETURN n.nodeKey AS key,
+           labels(n) AS labels,
+           coalesce(n.companyName, n.stockName) AS label,
+           n.shareholderType AS shareholderType
+"""
+
+
+def _load_into(index: SuggestIndex) -> int:
+    from app.services.graph_service import stream_query
+
+    page = get_settings().SUGGEST_FETCH_SIZE
+    added = 0
+    for row in stream_query(_NAMED_NODES_QUERY, {}, fetch_size=page):
+        index.add(row["key"], row.get("label") or "", node_type_of(row.get("labels") or [], row.get("shareholderType")))
+        added += 1
+    return added
+
+
+def rebuild() -> SuggestIndex:
+    """
+    전체 재적재 후 원자적 교체. 적재 중에는 기존 인덱스로 계속 응답.
+    (node id 워터마크 증분은 이름 변경·삭제를 놓치고 id 가 재사용되므로 쓰지 않음)
+    """
+    global _index
+    with _loader_lock:
+        t0 = time.perf_counter()
+        fresh = SuggestIndex()
+        _load_into(fresh)
+        fresh.finalize()
+        _index = fresh
+        logger.info(
+            "Suggest index built: %s (%.0f ms)", fresh.memory_stats(), (time.perf_counter() - t0) * 1000
+        )
+        return fresh
+
+
+_NODES_BY_KEYS_QUERY = """
+    UNWIND $keys AS k
+    OPTIONAL MATCH (c:Company {nodeKey: k})
+    OPTIONAL MATCH (s:Stockholder {nodeKey: k})
+    WITH k, coalesce(c, s) AS n
+    RETURN k AS key,
+           labels(n) AS labels,
+           coalesce(n.companyName, n.stockName) AS label,
+           n.shareholderType AS shareholderType
+"""
+
+
+def invalidate(keys: Optional[frozenset]) -> None:
+    """
+    데이터 버전 변경 시 (app.services.data_version). 바뀐 키만 다시 읽어 이름·유형 갱신(없어진 노드는 제거),
+    keys=None 이면 전체 재적재.
+    """
+    if keys is None:
+        rebuild()
+        return
+    if _index is None or not keys:
+        return
+    from app.services.graph_service import stream_query
+
+    with _loader_lock:
+        for row in stream_query(_NODES_BY_KEYS_QUERY, {"keys": sorted(keys)}, fetch_size=get_settings().SUGGEST_FETCH_SIZE):
+            if row.get("labels") is None:
+                _index.remove(row["key"])
+            else:
+                _index.add(row["key"], row.get("label") or "", node_type_of(row["labels"], row.get("shareholderType")))
+        _index.finalize()
+
+
+def _loader_loop(interval: float) -> None:
+    while not _stop_event.is_set():
+        try:
+            rebuild()
+        except Exception as e:
+            logger.warning(f"Suggest index refresh failed: {e}")
+        _stop_event.wait(interval if _index is not None else min(interval, 30.0))
+
+
+def start_background_loader() -> None:
+    """앱 기동 시 호출. 기동을 막지 않도록 별도 스레드에서 적재."""
+    global _loader_thread
+    if _loader_thread is not None and _loader_thread.is_alive():
+        return
+    _stop_event.clear()
+    _loader_thread = threading.Thread(
+        target=_loader_loop, args=(get_settings().SUGGEST_REFRESH_SEC,), name="suggest_loader", daemon=True
+    )
+    _loader_thread.start()
+
+
+def stop_background_loader() -> None:
+    _stop_event.set()
+
+
+def get_index() -> Optional[SuggestIndex]:
+    return _index
@@ -0,0 +1,157 @@
+"""
+LLM 프롬프트 토큰 예산 (ask_graph 의 Cypher 생성·답변 문장화 프롬프트).
+
+- count(text): tiktoken 으로 로컬 계산. 미설치이거나 인코딩 파일을 받을 수 없는 환경이면 보수적 근사
+  (ASCII 4자 = 1토큰, 그 외 1자 = 1토큰 — 한글은 실제보다 크게 잡힘)
+- compact_history(messages, budget): 최근 턴부터 채움. 직전 턴 답변은 _LAST_ANSWER_TOKENS,
+  그 전 턴 답변은 _OLD_ANSWER_TOKENS 까지만 남기고, 예산을 넘는 오래된 턴은 제외
+- project_rows(rows, cypher): 노드·맵 값은 Cypher 에서 참조한 속성과 이름 속성만, 적재 부산물·긴 목록은 제거
+- fit_rows(rows, budget, base): 프롬프트 나머지(base 토큰)와 합쳐 예산 안에 드는 앞쪽 행만 (최소 1행)
+"""
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any
+
+from app.core import get_settings
+from app.core.node_keys import internal_properties
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+
+    HAS_TIKTOKEN = True
+except ImportError:
+    HAS_TIKTOKEN = False
+
+_LAST_ANSWER_TOKENS = 200
+_OLD_ANSWER_TOKENS = 60
+_MAX_LIST_ITEMS = 20
+# 노드 값에서 참조 여부와 무관하게 남기는 식별 속성
+_NAME_PROPS = frozenset(("companyName", "stockName", "name", "bizno"))
+_PROPERTY_RE = re.compile(r"\.\s*`?([A-Za-z_]\w*)")
+
+_encoder: Any = None
+_encoder_failed = False
+
+
+def _get_encoder():
+    global _encoder, _encoder_failed
+    if _encoder is None and not _encoder_failed and HAS_TIKTOKEN:
+        try:
+            try:
+                _encoder = tiktoken.encoding_for_model(get_settings().LLM_MODEL)
+            except KeyError:
+                _encoder = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            # 인코딩 파일은 첫 사용 시 내려받음 — 오프라인이면 근사치로 계속
+            _encoder_failed = True
+            logger.warning(f"tiktoken encoding unavailable, using approximate token counts: {e}")
+    return _encoder
+
+
+def count(text: str) -> int:
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+@lru_cache(maxsize=8)
+def count_cached(text: str) -> int:
+    """요청마다 같은 긴 문자열(스키마) 용."""
+    return count(text)
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    if count(text) <= max_tokens:
+        return text
+    encoder = _get_encoder()
+    if encoder is not None:
+        return encoder.decode(encoder.encode(text, disallowed_special=())[:max_tokens]).rstrip() + "…"
+    # 근사: 모든 글자를 1토큰으로 보면 max_tokens 글자까지는 항상 예산 안
+    return text[:max_tokens].rstrip() + "…"
+
+
+def _turns(messages: list) -> list[tuple[str, str]]:
+    """[Human, AI, Human, AI, …] → [(질문, 답변), …] (짝이 안 맞는 마지막 메시지는 무시)."""
+    return [
+        (str(messages[i].content), str(messages[i + 1].content))
+        for i in range(0, len(messages) - 1, 2)
+    ]
+
+
+def compact_history(messages: list, budget: int) -> tuple[str, int, int]:
+    """
+    대화 이력 → 프롬프트용 텍스트.
+    Returns: (텍스트, 포함한 턴 수, 원문 대비 줄인 토큰 수)
+    """
+    turns = _turns(messages)
+    if not turns:
+        return "", 0, 0
+    verbatim = count("\n".join(f"Q: {q}\nA: {a}" for q, a in turns))
+    lines: list[str] = []
+    used = 0
+    for age, (question, answer) in enumerate(reversed(turns)):
+        answer = truncate(answer.strip(), _LAST_ANSWER_TOKENS if age == 0 else _OLD_ANSWER_TOKENS)
+        text = f"Q: {question}\nA: {answer}"
+        cost = count(text) + 1
+        if used + cost > budget:
+            break
+        lines.insert(0, text)
+        used += cost
+    text = "\n".join(lines)
+    return text, len(lines), max(0, verbatim - count(text))
+
+
+def _project_value(value: Any, referenced: set[str], internal: frozenset[str]) -> Any:
+    if isinstance(value, dict):
+        kept = {
+            k: _project_value(v, referenced, internal) for k, v in value.items()
+            if k not in internal and (k in referenced or k in _NAME_PROPS)
+        }
+        if kept:
+            return kept
+        # 참조·이름 속성이 하나도 없으면 스칼라 속성만
+        return {k: v for k, v in value.items() if k not in internal and not isinstance(v, (list, dict))}
+    if isinstance(value, list):
+        items = [_project_value(v, referenced, internal) for v in value[:_MAX_LIST_ITEMS]]
+        if len(value) > _MAX_LIST_ITEMS:
+            items.append(f"… 외 {len(value) - _MAX_LIST_ITEMS}개")
+        return items
+    return value
+
+
+def project_rows(rows: list[dict], cypher: str) -> list[dict]:
+    """결과 열은 그대로, 노드·맵 값 안의 속성만 Cypher 가 참조한 것(+ 이름 속성)으로 줄임. 적재·임베딩 부산물은 뺌."""
+    referenced = set(_PROPERTY_RE.findall(cypher or ""))
+    internal = internal_properties()
+    return [
+        {k: _project_value(v, referenced, internal) for k, v in row.items() if k not in internal}
+        for row in rows
+    ]
+
+
+def fit_rows(rows: list[dict], budget: int, base: int) -> list[dict]:
+    """base(행을 뺀 프롬프트 토큰) + 행들 ≤ budget 이 되는 앞쪽 행. 첫 행은 예산과 무관하게 포함."""
+    kept: list[dict] = []
+    used = base
+    for row in rows:
+        cost = count(str(row)) + 1
+        if kept and used + cost > budget:
+            break
+        kept.append(row)
+        used += cost
+    return kept
+
+
+def history_budget(base: int) -> int:
+    """Cypher 프롬프트에서 이력 몫: CHAT_HISTORY_TOKEN_BUDGET 과 전체 예산 잔여분 중 작은 쪽."""
+    s = get_settings()
+    return max(0, min(s.CHAT_HISTORY_TOKEN_BUDGET, s.LLM_CYPHER_PROMPT_BUDGET - base))
+
@@ -0,0 +1,656 @@
+#!/usr/bin/env python3
+"""
+/chat 파이프라인(GraphService.ask_graph) 종단 벤치마크: 질문 코퍼스(chat_questions.txt)를 녹화 응답으로 재생.
+
+- 재생(기본): Neo4j·OpenAI 없이 카세트(chat_cassette.json.gz)로 응답 (녹화 당시 소요 시간만큼 대기, --latency-scale 로 배율).
+  LLM 은 프롬프트, 임베딩은 텍스트, Neo4j 는 쿼리·파라미터가 녹화와 정확히 같아야 함 — 하나라도 카세트에 없으면
+  끝까지 돌려 목록을 보여 준 뒤 종료 코드 1 (프롬프트·쿼리를 바꾼 커밋은 다시 녹화해야 비교 가능).
+  생성 Cypher 는 실제 통제기(cypher_governor)를 거치고, 토큰 예산·라우팅·문장화도 실제 코드.
+  그래프 스냅샷·자동완성 인덱스도 카세트의 노드·지분 관계 행으로 만들어 지분율 변동 경로·추측 생성 판단이 실제와 같음
+- 녹화(--record): .env 의 Neo4j·LLM(LLM_PROVIDER·EMBED_PROVIDER)으로 코퍼스를 한 번 돌리며 LLM 응답·임베딩·
+  Neo4j 결과·스냅샷 적재 행과 각 호출의 소요 시간을 카세트에 저장 (스냅샷 행이 들어가므로 카세트 크기는 그래프 크기에 비례)
+- 가상 백엔드(--fixture, chat_fixture.py): Neo4j·LLM 대신 결정적 인-프로세스 대역. 저장소의 카세트는
+  --record --fixture 로 녹화한 것 (토큰 수는 tiktoken 유무와 무관하게 근사치로 고정). --record 없이 주면 카세트 없이 바로 측정
+- 보고: 단계별 지연 백분위(timings), 프롬프트·완성 토큰, 경로별 질문 수, 추측 생성 적중률·규칙 포맷터 비율·카세트 적중
+- 회귀 비교: --save 로 결과 저장 → 다른 커밋에서 --baseline 으로 비교, 임계값을 넘으면 종료 코드 1
+
+    cd backend && PYTHONPATH=. python benchmarks/bench_chat.py --repeat 3 --save /tmp/bench_base.json
+    git checkout <다른 커밋>
+    cd backend && PYTHONPATH=. python benchmarks/bench_chat.py --repeat 3 --baseline /tmp/bench_base.json
+    cd backend && PYTHONPATH=. python benchmarks/bench_chat.py --record --fixture     # 저장소 카세트 다시 녹화
+    cd backend && PYTHONPATH=. python benchmarks/bench_chat.py --record               # 실제 Neo4j·LLM 으로 녹화
+"""
+import argparse
+import base64
+import copy
+import gzip
+import hashlib
+import importlib
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import chat_fixture
+from chat_fixture import InProcessGraph
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CORPUS = HERE / "chat_questions.txt"
+DEFAULT_CASSETTE = HERE / "chat_cassette.json.gz"
+CASSETTE_FORMAT = 2
+
+# 재생은 외부 서비스가 필요 없지만 Settings 는 값을 요구함 (.env 가 있으면 그 값이 우선)
+_REPLAY_ENV = {"NEO4J_URI": "bolt://replay", "NEO4J_PASSWORD": "replay", "OPENAI_API_KEY": "replay"}
+
+_current_question = ""  # 녹화 항목·카세트 미스 보고의 기준 질문 (질문은 순서대로 하나씩 실행)
+
+
+def load_corpus(path: Path) -> list[list[str]]:
+    """빈 줄로 나뉜 대화 목록."""
+    conversations: list[list[str]] = [[]]
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            continue
+        if not line:
+            if conversations[-1]:
+                conversations.append([])
+            continue
+        conversations[-1].append(line)
+    return [c for c in conversations if c]
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _graph_key(query: str, params: Optional[dict]) -> str:
+    return _sha(" ".join(query.split()) + json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str))
+
+
+def _encode_vector(vec: list[float]) -> str:
+    return base64.b64encode(np.asarray(vec, dtype=np.float32).tobytes()).decode("ascii")
+
+
+def _decode_vector(text: str) -> list[float]:
+    return np.frombuffer(base64.b64decode(text), dtype=np.float32).tolist()
+
+
+def _prompt_text(messages: list) -> str:
+    return "\n".join(str(m.content) for m in messages)
+
+
+def _prompt_kind(prompt: str) -> str:
+    """프롬프트 첫 줄 = 종류 (Cypher 생성 / 답변 문장화 / 워밍업 등)."""
+    return next((line.strip() for line in prompt.splitlines() if line.strip()), "")
+
+
+class CassetteMiss(RuntimeError):
+    """재생 중 카세트에 없는 호출 (프롬프트·임베딩 텍스트·쿼리가 녹화와 다름)."""
+
+
+class Cassette:
+    """
+    녹화 응답 (chat: 목록, embed: 텍스트 → 벡터, graph: 쿼리·파라미터 해시 → 행,
+    snapshot: 그래프 스냅샷 적재 노드·관계 행) + 재생 적중·미스 집계.
+    """
+
+    def __init__(self, data: Optional[dict] = None) -> None:
+        data = data or {}
+        self.meta: dict = data.get("meta", {})
+        self.schema: Optional[dict] = data.get("schema")
+        self.snapshot: dict[str, list[dict]] = data.get("snapshot", {"nodes": [], "rels": []})
+        self.chat: list[dict] = data.get("chat", [])
+        self.embed: dict[str, dict] = data.get("embed", {})
+        self.graph: dict[str, dict] = data.get("graph", {})
+        self._chat_by_sha = {e["sha"]: e for e in self.chat}
+        self.hits: Counter = Counter()
+        self.misses: list[str] = []
+        self.completion_tokens = 0  # 녹화·재생한 LLM 응답의 완성 토큰 합
+
+    @classmethod
+    def load(cls, path: Path) -> "Cassette":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format") != CASSETTE_FORMAT:
+            raise SystemExit(f"카세트 형식이 다릅니다: {path} — --record 로 다시 녹화하세요.")
+        return cls(data)
+
+    def save(self, path: Path) -> None:
+        data = {
+            "format": CASSETTE_FORMAT,
+            "meta": self.meta,
+            "schema": self.schema,
+            "snapshot": self.snapshot,
+            "chat": self.chat,
+            "embed": self.embed,
+            "graph": self.graph,
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+
+    def add_chat(self, prompt: str, message: AIMessage, seconds: float) -> None:
+        entry = {
+            "question": _current_question,
+            "kind": _prompt_kind(prompt),
+            "sha": _sha(prompt),
+            "text": str(message.content),
+            "usage": dict(message.usage_metadata or {}),
+            "seconds": round(seconds, 4),
+        }
+        self.completion_tokens += entry["usage"].get("output_tokens", 0)
+        if entry["sha"] not in self._chat_by_sha:
+            self.chat.append(entry)
+            self._chat_by_sha[entry["sha"]] = entry
+
+    def miss(self, kind: str, detail: str) -> CassetteMiss:
+        """미스 기록 (kind: chat | embed | graph). 대체 응답 없이 호출 측이 반환된 예외를 raise."""
+        self.hits[f"{kind}:miss"] += 1
+        self.misses.append(f"{kind} [{_current_question}] {detail}")
+        return CassetteMiss(f"카세트에 없는 {kind} 호출입니다 (질문: {_current_question}) — {detail}")
+
+    def find_chat(self, prompt: str) -> dict:
+        """프롬프트가 정확히 같은 녹화. Raises: CassetteMiss."""
+        entry = self._chat_by_sha.get(_sha(prompt))
+        if entry is not None:
+            self.hits["chat:hit"] += 1
+            return entry
+        kind = _prompt_kind(prompt)
+        recorded = any(e["question"] == _current_question and e["kind"] == kind for e in self.chat)
+        raise self.miss("chat", f"{kind[:40]} — " + ("녹화와 프롬프트가 다름" if recorded else "녹화에 없는 호출"))
+
+
+def _sleep(seconds: float, scale: float) -> None:
+    if seconds > 0 and scale > 0:
+        time.sleep(seconds * scale)
+
+
+def _graph_service_module():
+    """app.services.graph_service 모듈 (패키지 속성 graph_service 는 GraphService 인스턴스라 싱글톤을 바꿀 수 없음)."""
+    return importlib.import_module("app.services.graph_service")
+
+
+def _use_tokenizer(mode: Optional[str]) -> None:
+    """녹화와 같은 토큰 계산 (tiktoken | approximate). 다르면 대화 이력 압축이 달라져 프롬프트도 달라짐."""
+    from app.services import token_budget
+
+    if mode == "approximate":
+        token_budget._encoder, token_budget._encoder_failed = None, True
+    elif mode == "tiktoken" and token_budget._get_encoder() is None:
+        raise SystemExit("카세트는 tiktoken 토큰 수로 녹화됐는데 이 환경에서는 인코딩을 쓸 수 없습니다.")
+
+
+def _tokenizer() -> str:
+    from app.services import token_budget
+
+    return "tiktoken" if token_budget._get_encoder() is not None else "approximate"
+
+
+def _attach_schema(graph, schema: dict, workdir: str) -> None:
+    """스키마를 임시 스냅샷 파일로 두고 실제 attach 경로로 적용 (인트로스펙션 없음)."""
+    from app.core import get_settings
+    from app.services import schema_snapshot
+
+    snapshot_path = Path(workdir) / "schema_snapshot.json"
+    snapshot_path.write_text(json.dumps({
+        "format": schema_snapshot.FORMAT,
+        "dataVersion": schema.get("dataVersion"),
+        "createdAt": time.time(),
+        "structured": schema["structured"],
+        "schema": schema["schema"],
+    }, ensure_ascii=False), encoding="utf-8")
+    get_settings().SCHEMA_SNAPSHOT_PATH = str(snapshot_path)
+    schema_snapshot.attach(graph)
+
+
+def _snapshot_rows() -> dict[str, list[dict]]:
+    """그래프 스냅샷 적재 쿼리 결과 (녹화·가상 백엔드). 재생은 카세트에 저장된 이 행을 씀."""
+    from app.services import graph_snapshot
+
+    graph_service = _graph_service_module()
+    return {
+        "nodes": list(graph_service.stream_query(graph_snapshot._SNAPSHOT_NODES_QUERY)),
+        "rels": list(graph_service.stream_query(graph_snapshot._SNAPSHOT_RELS_QUERY)),
+    }
+
+
+def _install_indexes(snapshot: dict[str, list[dict]]) -> None:
+    """
+    스냅샷 행 → 그래프 스냅샷·자동완성 인덱스 (백그라운드 로더 없이 바로 설치). 지분율 변동 경로와
+    추측 생성 판단(_should_speculate)이 이 둘을 보므로 녹화·재생이 같은 행으로 만듦.
+    """
+    from app.services import graph_snapshot, suggest_service
+
+    graph_snapshot._snapshot = graph_snapshot.build_snapshot(snapshot["nodes"], snapshot["rels"])
+    index = suggest_service.SuggestIndex()
+    for row in snapshot["nodes"]:
+        node_type = suggest_service.node_type_of(row.get("labels") or [], row.get("shareholderType"))
+        index.add(row["key"], row.get("label") or "", node_type)
+    index.finalize()
+    suggest_service._index = index
+
+
+# ── 녹화 ────────────────────────────────────────────────────────────────────
+class RecordingChatModel(BaseChatModel):
+    """실제 채팅 모델 호출을 그대로 하고 응답·소요 시간을 카세트에 추가."""
+
+    inner: Any
+    cassette: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        t0 = time.perf_counter()
+        message = self.inner.invoke(messages, stop=stop, **kwargs)
+        self.cassette.add_chat(_prompt_text(messages), message, time.perf_counter() - t0)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class RecordingEmbeddings(Embeddings):
+    """실제 임베딩 + 녹화. float32 로 왕복한 벡터를 돌려줘 녹화·재생의 벡터 검색 파라미터가 같게."""
+
+    def __init__(self, inner: Embeddings, cassette: Cassette) -> None:
+        self.inner = inner
+        self.cassette = cassette
+
+    def _record(self, texts: list[str], vectors: list[list[float]], seconds: float) -> list[list[float]]:
+        out = []
+        for text, vec in zip(texts, vectors):
+            encoded = _encode_vector(vec)
+            self.cassette.embed[text] = {"vec": encoded, "seconds": round(seconds / len(texts), 4)}
+            out.append(_decode_vector(encoded))
+        return out
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        t0 = time.perf_counter()
+        vectors = self.inner.embed_documents(texts)
+        return self._record(texts, vectors, time.perf_counter() - t0)
+
+    def embed_query(self, text: str) -> list[float]:
+        t0 = time.perf_counter()
+        vector = self.inner.embed_query(text)
+        return self._record([text], [vector], time.perf_counter() - t0)[0]
+
+
+class RecordingGraph:
+    """Neo4jGraph 프록시: query 결과·소요 시간 녹화, 나머지 속성은 원본."""
+
+    def __init__(self, inner, cassette: Cassette) -> None:
+        self._inner = inner
+        self._cassette = cassette
+
+    def __getattr__(self, name: str):
+        return getattr(self._inner, name)
+
+    def query(self, query: str, params: Optional[dict] = None) -> list[dict]:
+        t0 = time.perf_counter()
+        rows = self._inner.query(query, params=params or {})
+        self._cassette.graph[_graph_key(query, params)] = {"rows": rows, "seconds": round(time.perf_counter() - t0, 4)}
+        return rows
+
+
+def _install_recorders(cassette: Cassette) -> None:
+    """현재 그래프·임베딩·채팅 모델(실제 또는 가상 백엔드)을 녹화 래퍼로 감쌈. 스냅샷 행은 main 이 저장."""
+    from app.services import cypher_governor, model_provider, schema_snapshot
+
+    graph_service = _graph_service_module()
+    graph = graph_service._get_graph()
+    cassette.schema = {
+        "dataVersion": schema_snapshot.current()["dataVersion"],
+        "structured": graph.structured_schema,
+        "schema": graph.schema,
+    }
+    cassette.meta["tokenizer"] = _tokenizer()
+    embed_model = graph_service._get_embed_model()
+    graph_service._graph = RecordingGraph(graph, cassette)
+    graph_service._embed_model = RecordingEmbeddings(embed_model, cassette)
+    real_chat_model = model_provider.chat_model
+    model_provider.chat_model = lambda **kw: RecordingChatModel(inner=real_chat_model(**kw), cassette=cassette)
+
+    # 생성 Cypher 는 통제기가 드라이버로 직접 실행 → 통제기 결과를 같은 키로 녹화
+    execute = cypher_governor.CypherGovernor.execute
+
+    def recording_execute(self, query: str, params: Optional[dict] = None) -> list[dict]:
+        t0 = time.perf_counter()
+        rows = execute(self, query, params)
+        cassette.graph[_graph_key(query, params)] = {"rows": rows, "seconds": round(time.perf_counter() - t0, 4)}
+        return rows
+
+    cypher_governor.CypherGovernor.execute = recording_execute
+
+
+# ── 재생 ────────────────────────────────────────────────────────────────────
+class ReplayChatModel(BaseChatModel):
+    cassette: Any
+    latency_scale: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        entry = self.cassette.find_chat(_prompt_text(messages))
+        _sleep(entry["seconds"], self.latency_scale)
+        self.cassette.completion_tokens += (entry["usage"] or {}).get("output_tokens", 0)
+        message = AIMessage(content=entry["text"], usage_metadata=entry["usage"] or None)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+class ReplayEmbeddings(Embeddings):
+    def __init__(self, cassette: Cassette, latency_scale: float) -> None:
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+
+    def _vector(self, text: str) -> tuple[list[float], float]:
+        entry = self.cassette.embed.get(text)
+        if entry is None:
+            raise self.cassette.miss("embed", text[:60])
+        self.cassette.hits["embed:hit"] += 1
+        return _decode_vector(entry["vec"]), entry["seconds"]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        results = [self._vector(t) for t in texts]
+        _sleep(sum(seconds for _, seconds in results), self.latency_scale)
+        return [vec for vec, _ in results]
+
+    def embed_query(self, text: str) -> list[float]:
+        vec, seconds = self._vector(text)
+        _sleep(seconds, self.latency_scale)
+        return vec
+
+
+class ReplayGraph(InProcessGraph):
+    """Neo4jGraph 대역: 스키마는 카세트, query 는 녹화 행 (없으면 CassetteMiss)."""
+
+    def __init__(self, cassette: Cassette, latency_scale: float) -> None:
+        super().__init__(cassette.schema["structured"], cassette.schema["schema"])
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+
+    def query(self, query: str, params: Optional[dict] = None) -> list[dict]:
+        entry = self.cassette.graph.get(_graph_key(query, params))
+        if entry is None:
+            raise self.cassette.miss("graph", " ".join(query.split())[:60])
+        self.cassette.hits["graph:hit"] += 1
+        _sleep(entry["seconds"], self.latency_scale)
+        return copy.deepcopy(entry["rows"])
+
+
+def _install_replay(cassette: Cassette, latency_scale: float, workdir: str) -> None:
+    from app.services import model_provider
+
+    _use_tokenizer(cassette.meta.get("tokenizer"))
+    graph = ReplayGraph(cassette, latency_scale)
+    _attach_schema(graph, cassette.schema, workdir)
+    _install_indexes(cassette.snapshot)
+    graph_service = _graph_service_module()
+    graph_service._graph = graph
+    graph_service._embed_model = ReplayEmbeddings(cassette, latency_scale)
+    model_provider.chat_model = lambda **kw: ReplayChatModel(cassette=cassette, latency_scale=latency_scale)
+
+
+# ── 가상 백엔드 ─────────────────────────────────────────────────────────────
+def _install_fixture(workdir: str) -> None:
+    """chat_fixture 의 그래프·임베딩·채팅 모델을 싱글톤으로 설치. 토큰 수는 근사치로 고정 (카세트가 어디서나 재생되게)."""
+    from app.services import model_provider
+
+    _use_tokenizer("approximate")
+    graph = chat_fixture.FixtureGraph()
+    schema = {"dataVersion": chat_fixture.DATA_VERSION, "structured": graph.structured_schema, "schema": graph.schema}
+    _attach_schema(graph, schema, workdir)
+    graph_service = _graph_service_module()
+    graph_service._graph = graph
+    graph_service._embed_model = chat_fixture.FixtureEmbeddings()
+    model_provider.chat_model = lambda **kw: chat_fixture.FixtureChatModel(graph=graph)
+
+
+# ── 실행·집계 ───────────────────────────────────────────────────────────────
+def _percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _counter_values(name: str) -> dict[str, float]:
+    """metrics 카운터 name 의 레이블 값별 합 (레이블 1개 기준)."""
+    from app.core import metrics
+
+    out: dict[str, float] = defaultdict(float)
+    for c in metrics.snapshot()["counters"]:
+        if c["name"] == name:
+            out[next(iter(c["labels"].values()), "")] += c["value"]
+    return out
+
+
+def _delta(after: dict[str, float], before: dict[str, float]) -> dict[str, float]:
+    return {k: v - before.get(k, 0.0) for k, v in after.items() if v - before.get(k, 0.0)}
+
+
+def _rate(counts: dict[str, float], good: str) -> Optional[float]:
+    total = sum(counts.values())
+    return round(counts.get(good, 0.0) / total, 3) if total else None
+
+
+def run_corpus(conversations: list[list[str]], passes: int, warmup: int, cassette: Cassette) -> dict:
+    global _current_question
+    from app.services import token_budget
+    from app.services.graph_service import GraphService
+
+    stages: dict[str, list[float]] = defaultdict(list)
+    prompt: dict[str, list[int]] = defaultdict(list)
+    saved: dict[str, list[int]] = defaultdict(list)
+    routes: Counter = Counter()
+    errors = 0
+    spec_before = _counter_values("chat_speculation_total")
+    answer_before = _counter_values("chat_answer_total")
+    cache_before = token_budget.count_cached.cache_info()
+    completion_before = cassette.completion_tokens
+
+    for pass_no in range(warmup + passes):
+        measured = pass_no >= warmup
+        if pass_no == warmup:
+            spec_before = _counter_values("chat_speculation_total")
+            answer_before = _counter_values("chat_answer_total")
+            cache_before = token_budget.count_cached.cache_info()
+            completion_before = cassette.completion_tokens
+        for conversation in conversations:
+            GraphService.reset_chat()
+            for question in conversation:
+                _current_question = question
+                t0 = time.perf_counter()
+                result = GraphService.ask_graph(question)
+                elapsed = time.perf_counter() - t0
+                if not measured:
+                    continue
+                stages["total"].append(elapsed)
+                for stage, seconds in result.get("timings", {}).items():
+                    stages[stage].append(seconds)
+                for stage, usage in result.get("tokens", {}).items():
+                    prompt[stage].append(usage["prompt"])
+                    saved[stage].append(usage["saved"])
+                routes[result["route"]] += 1
+                errors += result["answer"].startswith("⚠️ 오류")
+
+    cache_after = token_budget.count_cached.cache_info()
+    speculation = _delta(_counter_values("chat_speculation_total"), spec_before)
+    answers = _delta(_counter_values("chat_answer_total"), answer_before)
+    cache_calls = (cache_after.hits - cache_before.hits) + (cache_after.misses - cache_before.misses)
+    questions = sum(routes.values())
+    return {
+        "questions": questions,
+        "errors": errors,
+        "stages": {
+            stage: {
+                "n": len(v),
+                "p50": round(_percentile(v, 50), 4),
+                "p95": round(_percentile(v, 95), 4),
+                "p99": round(_percentile(v, 99), 4),
+                "mean": round(statistics.fmean(v), 4),
+            }
+            for stage, v in sorted(stages.items())
+        },
+        "tokens": {
+            stage: {"calls": len(v), "prompt_mean": round(statistics.fmean(v), 1), "saved_mean": round(statistics.fmean(saved[stage]), 1)}
+            for stage, v in sorted(prompt.items())
+        },
+        "completion_tokens": cassette.completion_tokens - completion_before,
+        "routes": dict(routes.most_common()),
+        "rates": {
+            "speculation_hit": _rate(speculation, "hit"),
+            "answer_formatter": _rate(answers, "formatter"),
+            "schema_token_count_cache": round((cache_after.hits - cache_before.hits) / cache_calls, 3) if cache_calls else None,
+        },
+        "speculation": speculation,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=HERE, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() or None
+
+
+def print_report(result: dict) -> None:
+    meta = result["meta"]
+    print(f"commit={meta['commit']} backend={meta['backend']} questions={result['questions']} passes={meta['passes']} "
+          f"(warm-up {meta['warmup']}) latency_scale={meta['latency_scale']} errors={result['errors']}")
+    print(f"{'stage':<18}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for stage, st in result["stages"].items():
+        print(f"{stage:<18}{st['n']:>5}{st['p50'] * 1000:>10.1f}{st['p95'] * 1000:>10.1f}"
+              f"{st['p99'] * 1000:>10.1f}{st['mean'] * 1000:>10.1f}")
+    for stage, tk in result["tokens"].items():
+        print(f"tokens {stage}: {tk['calls']} calls, prompt mean {tk['prompt_mean']:,.0f}, saved mean {tk['saved_mean']:,.0f}")
+    print(f"completion tokens (recorded): {result['completion_tokens']:,} total, "
+          f"{result['completion_tokens'] / max(1, result['questions']):,.0f} per question")
+    print("routes: " + ", ".join(f"{r} {n}" for r, n in result["routes"].items()))
+    rates = ", ".join(f"{k} {v:.0%}" for k, v in result["rates"].items() if v is not None)
+    print(f"rates: {rates}  speculation {result['speculation']}")
+    if result.get("replay"):
+        print("replay: " + ", ".join(f"{k} {v}" for k, v in sorted(result["replay"].items())))
+
+
+def compare(result: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """기준 대비 회귀 목록: 지연(p50·p95)·프롬프트 토큰 증가, 적중률 하락 — 모두 threshold(비율) 초과분."""
+    regressions = []
+    for stage, st in result["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if base is None:
+            continue
+        for p in ("p50", "p95"):
+            if st[p] - base[p] > min_delta and st[p] > base[p] * (1 + threshold):
+                regressions.append(f"latency {stage} {p}: {base[p] * 1000:.1f} → {st[p] * 1000:.1f} ms")
+    for stage, tk in result["tokens"].items():
+        base = baseline.get("tokens", {}).get(stage)
+        if base and tk["prompt_mean"] > base["prompt_mean"] * (1 + threshold):
+            regressions.append(f"tokens {stage}: prompt mean {base['prompt_mean']:,.0f} → {tk['prompt_mean']:,.0f}")
+    for name, rate in result["rates"].items():
+        base = baseline.get("rates", {}).get(name)
+        if rate is not None and base is not None and rate < base - threshold:
+            regressions.append(f"rate {name}: {base:.0%} → {rate:.0%}")
+    return regressions
+
+
+def _exit_on_misses(cassette: Cassette) -> None:
+    print(f"cassette misses ({len(cassette.misses)}):")
+    for line in cassette.misses[:20]:
+        print(f"  - {line}")
+    sys.exit("카세트에 없는 호출이 있어 결과를 저장·비교하지 않습니다 — 프롬프트·쿼리를 바꿨다면 --record --fixture 로 다시 녹화하세요.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--cassette", type=Path, default=DEFAULT_CASSETTE)
+    parser.add_argument("--record", action="store_true", help="실제 Neo4j·LLM 으로 한 번 돌려 카세트 녹화")
+    parser.add_argument("--fixture", action="store_true", help="Neo4j·LLM 대신 가상 백엔드(chat_fixture) — --record 와 함께면 그것으로 녹화")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수 (재생)")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 반복 횟수 (싱글톤·템플릿 임베딩 준비)")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="녹화 소요 시간 배율 (0 = 대기 없이 코드 오버헤드만)")
+    parser.add_argument("--save", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=0.15, help="회귀 판정 비율 (기본 15%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="이보다 작은 지연 증가는 무시")
+    args = parser.parse_args()
+
+    conversations = load_corpus(args.corpus)
+    replay = not (args.record or args.fixture)
+    if replay and not args.cassette.exists():
+        raise SystemExit(f"카세트가 없습니다: {args.cassette} — 먼저 --record 로 녹화하세요.")
+    if replay or args.fixture:
+        for name, value in _REPLAY_ENV.items():
+            os.environ.setdefault(name, value)
+    cassette = Cassette.load(args.cassette) if replay else Cassette()
+    passes, warmup = (1, 0) if args.record else (args.repeat, args.warmup)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if replay:
+            _install_replay(cassette, args.latency_scale, workdir)
+        else:
+            if args.fixture:
+                _install_fixture(workdir)
+            snapshot = _snapshot_rows()
+            _install_indexes(snapshot)
+            if args.record:
+                cassette.snapshot = snapshot
+                _install_recorders(cassette)
+        try:
+            result = run_corpus(conversations, passes, warmup, cassette)
+        except CassetteMiss:
+            # 파이프라인이 오류 답변으로 감싸지 않는 호출(힌트 임베딩 등)의 미스 — 그 자리에서 중단
+            _exit_on_misses(cassette)
+
+    result["replay"] = dict(cassette.hits)
+    result["meta"] = {
+        "commit": _git_commit(),
+        "backend": "replay" if replay else ("fixture" if args.fixture else "live"),
+        "passes": passes,
+        "warmup": warmup,
+        "latency_scale": args.latency_scale if replay else 0,
+        "recorded_commit": cassette.meta.get("commit"),
+    }
+    if args.record:
+        cassette.meta.update({
+            "commit": result["meta"]["commit"],
+            "recordedAt": time.time(),
+            "corpus": args.corpus.name,
+            "backend": result["meta"]["backend"],
+        })
+        cassette.save(args.cassette)
+        print(f"cassette: {args.cassette} ({len(cassette.chat)} LLM, {len(cassette.embed)} embeddings, "
+              f"{len(cassette.graph)} queries, {len(cassette.snapshot['nodes'])} snapshot nodes)")
+
+    print_report(result)
+    if cassette.misses:
+        _exit_on_misses(cassette)
+    if args.save:
+        args.save.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.threshold, args.min_delta_ms / 1000)
+        print(f"baseline {baseline['meta'].get('commit')}: " + ("no regressions" if not regressions else "REGRESSIONS"))
+        for line in regressions:
+            print(f"  - {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+검색 지연 시간 벤치마크: 전문 검색(FULLTEXT, cjk) 경로 vs CONTAINS 폴백 경로.
+
+.env 의 Neo4j 에 직접 질의합니다 (앱 서버 불필요).
+
+    cd backend && PYTHONPATH=. python benchmarks/bench_search.py --repeat 30 삼성 국민 신한금융 미래에셋
+
+검색어마다 두 경로의 p50/p95/평균과 결과 행 수, 그리고 CONTAINS 결과 중 전문 검색이 놓친 이름 수(missed)를
+출력합니다. route 열은 /graph/nodes 가 실제로 고르는 경로 (_use_fulltext: 2글자 이상 한글 음절열만 전문 검색).
+LIMIT 없이 비교하려면 --limit 0 (missed 는 LIMIT 안에서만 의미가 있음).
+"""
+import argparse
+import statistics
+import time
+
+from app.api.v1.endpoints.graph import _FULLTEXT_QUERY_RE, FULLTEXT_MIN_QUERY_LEN
+from app.core.neo4j_indexes import detect_fulltext_indexes
+from app.core.sanitize import lucene_phrase
+from app.services.graph_service import _get_graph
+
+FULLTEXT_QUERY = """
+    CALL db.index.fulltext.queryNodes('company_name_fulltext', $search)
+    YIELD node
+    RETURN node.nodeKey AS id, node.companyName AS label
+    LIMIT $limit
+"""
+CONTAINS_QUERY = """
+    MATCH (c:Company)
+    WHERE c.companyName CONTAINS $search
+    RETURN c.nodeKey AS id, c.companyName AS label
+    LIMIT $limit
+"""
+
+
+def _measure(graph, query: str, params: dict, repeat: int) -> tuple[list[float], list[dict]]:
+    graph.query(query, params=params)  # 워밍업 (플랜 캐시)
+    samples = []
+    rows = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = graph.query(query, params=params)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return samples, rows
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("terms", nargs="*", default=["삼성", "국민", "신한금융", "미래에셋", "보험", "KB", "삼성 생명"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=15, help="0 = 제한 없음")
+    args = parser.parse_args()
+
+    graph = _get_graph()
+    online = detect_fulltext_indexes()
+    if not online.get("company_name_fulltext"):
+        print("⚠️  company_name_fulltext 인덱스가 ONLINE 이 아닙니다. 앱을 한 번 기동해 인덱스를 생성하세요.")
+        return
+
+    limit = args.limit or 1_000_000
+    p50 = {"fulltext": [], "contains": []}
+    print(f"{'term':<12} {'route':<9} {'path':<9} {'p50 ms':>8} {'p95 ms':>8} {'mean ms':>8} {'rows':>5} {'missed':>6}")
+    for term in args.terms:
+        route = "fulltext" if len(term) >= FULLTEXT_MIN_QUERY_LEN and _FULLTEXT_QUERY_RE.match(term) else "contains"
+        results = {}
+        for path, query, search in (
+            ("fulltext", FULLTEXT_QUERY, lucene_phrase(term)),
+            ("contains", CONTAINS_QUERY, term),
+        ):
+            samples, rows = _measure(graph, query, {"search": search, "limit": limit}, args.repeat)
+            results[path] = (samples, {r["label"] for r in rows})
+            p50[path].append(statistics.median(samples))
+        fulltext_names = results["fulltext"][1]
+        for path, (samples, names) in results.items():
+            missed = len(names - fulltext_names) if path == "contains" else ""
+            print(
+                f"{term:<12} {route:<9} {path:<9} {statistics.median(samples):>8.2f} "
+                f"{_pct(samples, 95):>8.2f} {statistics.fmean(samples):>8.2f} {len(names):>5} {missed:>6}"
+            )
+    if args.terms:
+        ft, ct = statistics.median(p50["fulltext"]), statistics.median(p50["contains"])
+        print(f"\n검색어별 p50 의 중앙값: fulltext {ft:.2f} ms, contains {ct:.2f} ms (contains / fulltext = {ct / ft:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
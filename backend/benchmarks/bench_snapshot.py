@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+인-프로세스 그래프 스냅샷(app.services.graph_snapshot) 메모리·조회 지연 측정.
+합성 지분 그래프로 측정하므로 Neo4j 불필요.
+
+    cd backend && PYTHONPATH=. python benchmarks/bench_snapshot.py --edges 1000000
+
+메모리: 배열 nbytes + 문자열(키·이름) + tracemalloc 피크(적재 중 임시 버퍼 포함).
+"""
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from app.services.graph_snapshot import build_snapshot
+
+
+def synthetic_rows(n_edges: int, seed: int = 7) -> tuple[list[dict], list[dict]]:
+    rng = random.Random(seed)
+    n_companies = max(10, n_edges // 8)
+    n_people = max(10, n_edges // 4)
+    nodes = [
+        {"key": f"c_{1000000000 + i}", "labels": ["Company", "Stockholder"] if i % 6 == 0 else ["Company"],
+         "label": f"회사{i:07d}", "bizno": str(1000000000 + i), "active": True,
+         "shareholderType": "CORPORATION" if i % 6 == 0 else None}
+        for i in range(n_companies)
+    ]
+    nodes += [
+        {"key": f"p_P{i:08d}", "labels": ["Stockholder"], "label": f"주주{i:07d}", "shareholderType": "PERSON"}
+        for i in range(n_people)
+    ]
+    holders = [n["key"] for n in nodes if "Stockholder" in n["labels"]]
+    rels = [
+        {
+            "src": rng.choice(holders),
+            "dst": f"c_{1000000000 + rng.randrange(n_companies)}",
+            "ratio": round(min(100.0, rng.expovariate(1 / 6)), 2),
+            "year": rng.choice((2021, 2022, 2023)),
+        }
+        for _ in range(n_edges)
+    ]
+    return nodes, rels
+
+
+def _time_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    nodes, rels = synthetic_rows(args.edges)
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    snap = build_snapshot(nodes, rels)
+    build_ms = (time.perf_counter() - t0) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = snap.memory_stats()
+    mb = 1024 * 1024
+    print(f"nodes={stats['nodes']:,} relationships={stats['relationships']:,} pairs={stats['pairs']:,}")
+    print(f"build: {build_ms:.0f} ms (tracemalloc peak {peak / mb:.1f} MB)")
+    print(f"arrays: {stats['array_bytes'] / mb:.1f} MB  strings: {stats['string_bytes'] / mb:.1f} MB  "
+          f"index: {stats['index_bytes'] / mb:.1f} MB")
+    print(f"edge arrays per 1M relationships: {stats['edge_bytes_per_million'] / mb:.1f} MB")
+
+    rng = random.Random(1)
+    companies = [i for i in range(len(snap)) if snap.keys[i].startswith("c_")]
+    sample = [rng.choice(companies) for _ in range(args.repeat)]
+    it = iter(sample * 2)
+    print(f"ego(2 hops, 120 nodes):   {_time_us(lambda: snap.ego(next(it), 2, 120), args.repeat):>8.1f} µs")
+    print(f"edges top-100 (first):    {_time_us(lambda: snap.top_pairs(100), args.repeat):>8.1f} µs")
+    last = snap.rank[5000]
+    after = (float(snap.pair_ratio[last]), snap.keys[snap.pair_src[last]], snap.keys[snap.pair_dst[last]])
+    print(f"edges top-100 (cursor):   {_time_us(lambda: snap.top_pairs(100, after=after), args.repeat):>8.1f} µs")
+    it = iter(sample * 2)
+    print(f"node neighbours (top 20): {_time_us(lambda: snap.neighbours(next(it), 20), args.repeat):>8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
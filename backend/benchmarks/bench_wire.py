@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+그래프 응답 포맷 비교: JSON vs 컬럼형 msgpack (app.core.wire), 각각 무압축/gzip/brotli.
+합성 그래프(/graph/edges, /graph/nodes 와 같은 필드)로 측정하므로 Neo4j 불필요.
+
+    cd backend && PYTHONPATH=. python benchmarks/bench_wire.py --nodes 3000 --edges 8000
+
+디코드 시간은 Python 기준 (json.loads vs msgpack 언팩 + 열 복원) — 브라우저 파싱 비용의 상대 비교용.
+"""
+import argparse
+import gzip
+import json
+import random
+import statistics
+import time
+
+from app.core import wire
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+def synthetic_payload(n_nodes: int, n_edges: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    n_companies = n_nodes // 3
+    nodes = []
+    for i in range(n_companies):
+        nodes.append({
+            "id": f"c_{1000000000 + i}",
+            "type": "company",
+            "label": f"회사{i:05d}",
+            "bizno": str(1000000000 + i),
+            "active": rng.random() > 0.05,
+            "sub": "회사",
+        })
+    for i in range(n_nodes - n_companies):
+        inst = rng.random() < 0.2
+        nodes.append({
+            "id": f"p_P{i:07d}",
+            "type": "institution" if inst else "person",
+            "label": f"주주{i:05d}",
+            "shareholderType": "INSTITUTION" if inst else "PERSON",
+            "sub": "기관" if inst else "개인주주",
+        })
+    holders = [n["id"] for n in nodes[n_companies:]] + [n["id"] for n in nodes[: n_companies // 4]]
+    companies = [n["id"] for n in nodes[:n_companies]]
+    edges = []
+    for _ in range(n_edges):
+        ratio = round(min(100.0, rng.expovariate(1 / 6)), 1)
+        edges.append({
+            "from": rng.choice(holders),
+            "to": rng.choice(companies),
+            "type": "HOLDS_SHARES",
+            "ratio": ratio,
+            "count": 1 + int(rng.random() < 0.1),
+            "label": f"{ratio:.1f}%",
+        })
+    return {"nodes": nodes, "edges": edges, "total": len(edges), "next_cursor": None}
+
+
+def _time_ms(fn, repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=3000)
+    parser.add_argument("--edges", type=int, default=8000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    if not wire.HAS_MSGPACK:
+        print("⚠️  msgpack 미설치: pip install msgpack")
+        return
+
+    payload = synthetic_payload(args.nodes, args.edges)
+    as_json = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    as_msgpack = wire.pack(payload)
+
+    print(f"nodes={args.nodes} edges={args.edges}")
+    print(f"{'format':<10} {'raw KB':>9} {'gzip KB':>9} {'br KB':>9} {'encode ms':>10} {'decode ms':>10}")
+    rows = (
+        ("json", as_json,
+         lambda: json.dumps(payload, ensure_ascii=False).encode("utf-8"), lambda: json.loads(as_json)),
+        ("msgpack", as_msgpack, lambda: wire.pack(payload), lambda: wire.unpack(as_msgpack)),
+    )
+    for name, data, encode, decode in rows:
+        gz = len(gzip.compress(data, 6))
+        br = f"{len(brotli.compress(data, quality=5)) / 1024:>9.1f}" if HAS_BROTLI else f"{'-':>9}"
+        print(
+            f"{name:<10} {len(data) / 1024:>9.1f} {gz / 1024:>9.1f} {br} "
+            f"{_time_ms(encode, args.repeat):>10.2f} {_time_ms(decode, args.repeat):>10.2f}"
+        )
+
+    decoded = wire.unpack(as_msgpack)
+    assert [n["id"] for n in decoded["nodes"]] == [n["id"] for n in payload["nodes"]]
+    assert all(abs(a["ratio"] - b["ratio"]) < 1e-4 for a, b in zip(decoded["edges"], payload["edges"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,763 @@
+"""
+bench_chat 용 결정적 인-프로세스 백엔드 (Neo4j·LLM 대역, 가상 데이터).
+
+- 데이터: 금융회사 18곳과 주주들의 2021~2023년 지분(HOLDS_SHARES)·임원 보수(HAS_COMPENSATION).
+  회사명은 코퍼스 질문에 맞췄고 지분율·보수·개인 주주는 모두 가상 값
+- FixtureGraph: 템플릿 Cypher(intent_router.TEMPLATES)·회사명 벡터 검색·스냅샷 적재 쿼리는 데이터에서 계산,
+  FixtureChatModel 이 만든 Cypher 는 만들 때 함께 등록한 결과 행으로 응답 (그 밖의 쿼리는 빈 결과)
+- FixtureEmbeddings: 글자 2-gram 해시 + 언급된 회사 차원 (회사명·계열 약칭이 들어 있는 문장은 그 회사 이름 벡터와 가까움)
+- FixtureChatModel: Cypher 생성 프롬프트면 질문 유형별 고정 Cypher, 답변 문장화 프롬프트면 고정 문장.
+  회사는 질문 → 벡터 힌트 → 대화 이력 순으로 정함. 토큰 사용량·대기 시간(출력 토큰 비례)도 결정적
+
+bench_chat.py --record --fixture 가 이 백엔드로 저장소의 chat_cassette.json.gz 를 녹화함.
+"""
+import copy
+import hashlib
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_neo4j.chains.graph_qa.cypher import construct_schema
+
+from app.core.node_keys import company_key, person_key, synthetic_key
+from app.services import graph_snapshot, intent_router, schema_snapshot, token_budget
+
+DATA_VERSION = 1
+YEARS = (2021, 2022, 2023)
+
+# 대기 시간 모델(초): LLM 은 고정 + 출력 토큰 비례, 임베딩·쿼리는 고정
+CHAT_BASE_SEC = 0.12
+CHAT_SEC_PER_TOKEN = 0.002
+EMBED_SEC = 0.02
+QUERY_SEC = 0.003
+
+# (사업자번호, 회사명, 폐업일) — 폐업일이 있으면 isActive=false, 폐업 연도 이후 보고 없음
+COMPANIES = (
+    ("1048100001", "삼성생명", None),
+    ("1048100002", "삼성화재", None),
+    ("1048100003", "삼성전자", None),
+    ("1048100004", "한화생명", None),
+    ("1048100005", "한화손해보험", None),
+    ("1048100006", "KB금융지주", None),
+    ("1048100007", "KB국민은행", None),
+    ("1048100008", "교보생명", None),
+    ("1048100009", "메리츠금융지주", None),
+    ("1048100010", "메리츠화재", None),
+    ("1048100011", "메리츠증권", None),
+    ("1048100012", "신한금융지주", None),
+    ("1048100013", "신한은행", None),
+    ("1048100014", "신한카드", None),
+    ("1048100015", "미래에셋증권", None),
+    ("1048100016", "미래에셋생명", None),
+    ("1048100017", "동양생명", "2022-06-30"),
+    ("1048100018", "한빛상호저축은행", "2021-12-31"),
+)
+PERSONS = ("김민준", "이서연", "박지훈", "최수아", "정우진", "강하은", "윤도현", "임지우", "조은비", "한유진", "서준호")
+INSTITUTIONS = ("국민연금공단", "가나자산운용", "다온투자조합")
+# 계열 약칭 → 회사 (질문의 '메리츠 계열'·'신한 지주' 같은 표현)
+GROUPS = {
+    "KB금융": ("KB금융지주", "KB국민은행"),
+    "메리츠": ("메리츠금융지주", "메리츠화재", "메리츠증권"),
+    "신한": ("신한금융지주", "신한은행", "신한카드"),
+    "미래에셋": ("미래에셋증권", "미래에셋생명"),
+}
+
+# (주주, 회사, 2021·2022·2023 지분율 %) — None 은 그해 보고에 없음
+HOLDINGS = (
+    ("김민준", "삼성생명", 20.76, 20.76, 20.76),
+    ("이서연", "삼성생명", 8.5, 7.9, 6.2),
+    ("삼성화재", "삼성생명", 3.0, 3.0, 3.0),
+    ("국민연금공단", "삼성생명", 5.2, 5.8, 4.1),
+    ("박지훈", "삼성생명", 3.1, 3.1, 3.4),
+    ("삼성생명", "삼성화재", 15.0, 15.0, 15.0),
+    ("국민연금공단", "삼성화재", 7.1, 6.9, 7.4),
+    ("최수아", "삼성화재", 2.0, 2.1, 2.1),
+    ("강하은", "삼성화재", 0.8, 0.8, None),
+    ("삼성생명", "삼성전자", 8.5, 8.5, 8.51),
+    ("삼성화재", "삼성전자", 1.5, 1.5, 1.5),
+    ("국민연금공단", "삼성전자", 7.9, 7.3, 6.8),
+    ("김민준", "삼성전자", 1.6, 1.6, 1.6),
+    ("정우진", "한화생명", 43.2, 43.2, 43.2),
+    ("국민연금공단", "한화생명", 3.5, 4.4, 5.1),
+    ("가나자산운용", "한화생명", 2.0, 2.8, 3.3),
+    ("강하은", "한화생명", 1.2, 1.0, 0.9),
+    ("한화생명", "한화손해보험", 51.4, 51.4, 63.3),
+    ("국민연금공단", "한화손해보험", 4.0, 4.2, 3.9),
+    ("국민연금공단", "KB금융지주", 9.9, 8.7, 8.3),
+    ("다온투자조합", "KB금융지주", 6.0, 6.1, 6.0),
+    ("미래에셋증권", "KB금융지주", None, 1.2, 1.4),
+    ("윤도현", "KB금융지주", 0.5, 0.6, 0.6),
+    ("KB금융지주", "KB국민은행", 100.0, 100.0, 100.0),
+    ("임지우", "교보생명", 33.8, 33.8, 33.8),
+    ("다온투자조합", "교보생명", 24.0, 24.0, 24.0),
+    ("가나자산운용", "교보생명", 5.3, 9.1, 9.1),
+    ("미래에셋증권", "교보생명", 4.0, 4.0, 4.0),
+    ("조은비", "메리츠금융지주", 47.0, 47.0, 49.0),
+    ("국민연금공단", "메리츠금융지주", 6.0, 5.5, 6.3),
+    ("메리츠금융지주", "메리츠화재", 60.0, 60.0, 100.0),
+    ("국민연금공단", "메리츠화재", 4.5, 4.8, None),
+    ("메리츠금융지주", "메리츠증권", 53.0, 100.0, 100.0),
+    ("국민연금공단", "신한금융지주", 8.2, 8.0, 7.9),
+    ("다온투자조합", "신한금융지주", 5.1, 5.1, 5.5),
+    ("한유진", "신한금융지주", 0.1, 0.1, 0.1),
+    ("신한금융지주", "신한은행", 100.0, 100.0, 100.0),
+    ("신한금융지주", "신한카드", 100.0, 100.0, 100.0),
+    ("서준호", "미래에셋증권", 18.9, 18.9, 18.9),
+    ("미래에셋생명", "미래에셋증권", 2.5, 2.5, 2.5),
+    ("국민연금공단", "미래에셋증권", 5.9, 6.2, 5.4),
+    ("미래에셋증권", "미래에셋생명", 29.9, 29.9, 30.1),
+    ("가나자산운용", "동양생명", 12.0, 12.0, None),
+    ("박지훈", "동양생명", 8.0, 8.0, None),
+    ("최수아", "동양생명", 3.0, 3.0, None),
+    ("다온투자조합", "동양생명", 5.0, 5.0, None),
+    ("강하은", "한빛상호저축은행", 60.0, None, None),
+    ("윤도현", "한빛상호저축은행", 40.0, None, None),
+)
+
+_COMP_GROUPS = ("registeredExec", "outsideDirector", "auditor")
+_VECTOR_MIN_SCORE = 0.75  # graph_service.find_similar_companies 의 score 조건
+_DIM = 256
+_ENTITY_DIMS = 64  # 회사별 전용 차원 (회사 수 ≤ 64)
+_ENTITY_WEIGHT = 6.0
+
+
+def _one_line(query: str) -> str:
+    return " ".join(query.split())
+
+
+_COMPANY_INDEX = {name: i for i, (_, name, _) in enumerate(COMPANIES)}
+
+
+def mentioned_companies(text: str) -> list[str]:
+    """
+    text 에 이름이 들어 있는 회사 (앞에 나온 순). 계열 약칭('메리츠')은 그 계열 회사명이 하나도 없을 때만 계열 회사 전부.
+    """
+    found: list[tuple[int, str]] = []
+    rest = text
+    for name in sorted(_COMPANY_INDEX, key=len, reverse=True):
+        pos = rest.find(name)
+        if pos >= 0:
+            found.append((pos, name))
+            rest = rest.replace(name, " " * len(name))
+    named = {name for _, name in found}
+    for alias, names in GROUPS.items():
+        pos = rest.find(alias)
+        if pos >= 0 and not named.intersection(names):
+            found.extend((pos, name) for name in names)
+    return [name for _, name in sorted(found, key=lambda f: f[0])]
+
+
+def embed_text(text: str) -> list[float]:
+    v = np.zeros(_DIM, dtype=np.float64)
+    t = "".join((text or "").lower().split())
+    for i in range(len(t) - 1):
+        v[int(hashlib.sha1(t[i:i + 2].encode("utf-8")).hexdigest()[:8], 16) % (_DIM - _ENTITY_DIMS)] += 1.0
+    for name in mentioned_companies(text or ""):
+        v[_DIM - _ENTITY_DIMS + _COMPANY_INDEX[name]] += _ENTITY_WEIGHT
+    norm = np.linalg.norm(v)
+    return (v / norm if norm else v).tolist()
+
+
+def _structured_schema() -> dict:
+    def props(*names: tuple[str, str]) -> list[dict]:
+        return [{"property": p, "type": t} for p, t in names]
+
+    company = props(
+        ("bizno", "STRING"), ("crno", "STRING"), ("companyName", "STRING"), ("isActive", "BOOLEAN"),
+        ("closedDate", "DATE"), ("nodeKey", "STRING"),
+        ("pagerank", "FLOAT"), ("betweenness", "FLOAT"), ("communityId", "INTEGER"), ("sccId", "INTEGER"),
+    )
+    stockholder = props(
+        ("stockName", "STRING"), ("shareholderType", "STRING"), ("maxStockRatio", "FLOAT"), ("nodeKey", "STRING"),
+        ("pagerank", "FLOAT"), ("betweenness", "FLOAT"), ("communityId", "INTEGER"), ("sccId", "INTEGER"),
+    )
+    compensation = props(("fiscalYear", "INTEGER")) + props(*(
+        (f"{g}{m}", "INTEGER") for g in _COMP_GROUPS for m in ("Count", "TotalComp", "AvgComp")
+    ))
+    return {
+        "node_props": {
+            "Company": company,
+            "LegalEntity": company,
+            "Person": props(("personId", "STRING"), ("stockName", "STRING"), ("shareholderType", "STRING")),
+            "Stockholder": stockholder,
+            "MajorShareholder": props(("stockName", "STRING"), ("maxStockRatio", "FLOAT")),
+            "DataVersion": props(("name", "STRING"), ("version", "INTEGER")),
+        },
+        "rel_props": {
+            "HOLDS_SHARES": props(
+                ("stockRatio", "FLOAT"), ("stockCount", "INTEGER"), ("stockType", "STRING"),
+                ("baseDate", "DATE"), ("reportYear", "INTEGER"),
+            ),
+            "HAS_COMPENSATION": compensation,
+        },
+        "relationships": [
+            {"start": "Stockholder", "type": "HOLDS_SHARES", "end": "Company"},
+            {"start": "Person", "type": "HOLDS_SHARES", "end": "Company"},
+            {"start": "Company", "type": "HOLDS_SHARES", "end": "Company"},
+            {"start": "Company", "type": "HAS_COMPENSATION", "end": "Company"},
+        ],
+        "metadata": {"constraint": [], "index": []},
+    }
+
+
+# ── Neo4jGraph 대역 공통 ────────────────────────────────────────────────────
+class _Tx:
+    """CypherGovernor 가 쓰는 트랜잭션 API 중 run(EXPLAIN·본 실행)만."""
+
+    def __init__(self, graph: "InProcessGraph") -> None:
+        self._graph = graph
+
+    def run(self, query: str, params: Optional[dict] = None):
+        if query.startswith("EXPLAIN "):
+            return SimpleNamespace(consume=lambda: SimpleNamespace(query_type="r", plan=None))
+        return [SimpleNamespace(data=lambda row=row: row) for row in self._graph.query(query, params)]
+
+
+class _Session:
+    def __init__(self, graph: "InProcessGraph") -> None:
+        self._graph = graph
+
+    def __enter__(self) -> "_Session":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def run(self, query: str, params: Optional[dict] = None):
+        return _Tx(self._graph).run(query, params)
+
+    def execute_read(self, work, *args):
+        return work(_Tx(self._graph), *args)
+
+
+class InProcessGraph:
+    """
+    Neo4jGraph 대역 공통: 스키마 속성 + 통제기(CypherGovernor)·stream_query 가 쓰는 최소 드라이버
+    (세션 run·execute_read 가 모두 query 로). 하위 클래스는 query 만 구현.
+    """
+
+    def __init__(self, structured_schema: dict, schema: str) -> None:
+        self.structured_schema = structured_schema
+        self.schema = schema
+        self._database = None
+        self._driver = SimpleNamespace(session=lambda **kwargs: _Session(self))
+
+    @property
+    def get_schema(self) -> str:
+        return self.schema
+
+    @property
+    def get_structured_schema(self) -> dict:
+        return self.structured_schema
+
+    def refresh_schema(self) -> None:
+        pass
+
+    def query(self, query: str, params: Optional[dict] = None) -> list[dict]:
+        raise NotImplementedError
+
+
+# ── 가상 그래프 ─────────────────────────────────────────────────────────────
+class FixtureGraph(InProcessGraph):
+    """가상 데이터 위의 Neo4jGraph 대역. 생성 Cypher 결과는 register 로 등록한 행."""
+
+    def __init__(self) -> None:
+        structured = _structured_schema()
+        super().__init__(structured, construct_schema(structured, [], [], False))
+        self.holders = self._build_holders()
+        # (주주, 회사, 연도, 지분율) — 보고 없는 연도 제외
+        self.holdings = [
+            {"holder": h, "company": c, "year": y, "ratio": r}
+            for h, c, *ratios in HOLDINGS
+            for y, r in zip(YEARS, ratios)
+            if r is not None
+        ]
+        self.compensation = self._build_compensation()
+        self.node_rows, self.rel_rows = self._snapshot_rows()
+        self._name_vectors = np.asarray([embed_text(name) for _, name, _ in COMPANIES], dtype=np.float64)
+        self._templates = {_one_line(t.cypher): t.name for t in intent_router.TEMPLATES}
+        self._generated: dict[str, list[dict]] = {}
+
+    @staticmethod
+    def _build_holders() -> dict[str, dict]:
+        holders: dict[str, dict] = {}
+        for bizno, name, _ in COMPANIES:
+            holders[name] = {"key": company_key(bizno), "type": "CORPORATION", "company": True}
+        for i, name in enumerate(PERSONS, 1):
+            holders[name] = {"key": person_key(f"P{i:04d}"), "type": "PERSON", "company": False}
+        for name in INSTITUTIONS:
+            holders[name] = {"key": synthetic_key("stockholder", name, "INSTITUTION"), "type": "INSTITUTION", "company": False}
+        return holders
+
+    @staticmethod
+    def _build_compensation() -> dict[tuple[str, int], dict]:
+        """(회사, 연도) → 보수 항목 (만원). 회사 순번으로 정한 값에 연 4% 증가, 일부 회사는 2023년 특별 인상."""
+        out = {}
+        for i, (_, name, closed) in enumerate(COMPANIES):
+            for year in YEARS:
+                if closed and year > int(closed[:4]):
+                    continue
+                growth = 1 + 0.04 * (year - YEARS[0]) + (0.15 if i % 5 == 0 and year == YEARS[-1] else 0.0)
+                row = {"fiscalYear": year}
+                for g, count, avg in (
+                    ("registeredExec", 3 + i % 4, 30000 + (i * 3571) % 40000),
+                    ("outsideDirector", 3 + i % 3, 4000 + (i * 733) % 3000),
+                    ("auditor", 1 + i % 3, 3000 + (i * 419) % 2000),
+                ):
+                    total = round(count * avg * growth)
+                    row.update({f"{g}Count": count, f"{g}TotalComp": total, f"{g}AvgComp": round(total / count)})
+                out[(name, year)] = row
+        return out
+
+    def _snapshot_rows(self) -> tuple[list[dict], list[dict]]:
+        """graph_snapshot 적재 쿼리 결과 형태의 노드·관계 행."""
+        held_max: dict[str, float] = {}
+        for h in self.holdings:
+            held_max[h["holder"]] = max(held_max.get(h["holder"], 0.0), h["ratio"])
+        holding_names = set(held_max)
+        nodes = []
+        for bizno, name, closed in COMPANIES:
+            labels = ["Company", "LegalEntity"] + (["Stockholder"] if name in holding_names else [])
+            if held_max.get(name, 0.0) >= 5.0:
+                labels.append("MajorShareholder")
+            nodes.append({
+                "key": company_key(bizno), "labels": labels, "label": name,
+                "shareholderType": "CORPORATION" if name in holding_names else None,
+                "bizno": bizno, "active": closed is None,
+            })
+        for name, info in self.holders.items():
+            if info["company"]:
+                continue
+            labels = (["Person"] if info["type"] == "PERSON" else []) + ["Stockholder"]
+            if held_max.get(name, 0.0) >= 5.0:
+                labels.append("MajorShareholder")
+            nodes.append({"key": info["key"], "labels": labels, "label": name, "shareholderType": info["type"]})
+        rels = [
+            {"src": self.holders[h["holder"]]["key"], "dst": self.holders[h["company"]]["key"],
+             "ratio": h["ratio"], "year": h["year"]}
+            for h in self.holdings
+        ]
+        return nodes, rels
+
+    def register(self, cypher: str, rows: list[dict]) -> None:
+        """FixtureChatModel 이 만든 Cypher 의 결과 행 (통제기를 거쳐 query 로 실행될 때 돌려줌)."""
+        self._generated[_one_line(cypher)] = rows
+
+    def query(self, query: str, params: Optional[dict] = None) -> list[dict]:
+        time.sleep(QUERY_SEC)
+        params = params or {}
+        text = _one_line(query)
+        if text in self._generated:
+            return copy.deepcopy(self._generated[text])
+        template = self._templates.get(text)
+        if template is not None:
+            return getattr(self, f"_template_{template}")(params)
+        if "db.index.vector.queryNodes" in text:
+            return self._vector_search(params["vec"], params["k"])
+        if text == _one_line(graph_snapshot._SNAPSHOT_NODES_QUERY):
+            return copy.deepcopy(self.node_rows)
+        if text == _one_line(graph_snapshot._SNAPSHOT_RELS_QUERY):
+            return copy.deepcopy(self.rel_rows)
+        if text == _one_line(schema_snapshot._VERSION_QUERY):
+            return [{"version": DATA_VERSION}]
+        return []
+
+    def _vector_search(self, vec: list[float], k: int) -> list[dict]:
+        v = np.asarray(vec, dtype=np.float64)
+        v /= np.linalg.norm(v) + 1e-12
+        # Neo4j 코사인 점수는 (1 + cos) / 2
+        scores = (1.0 + self._name_vectors @ v) / 2.0
+        order = sorted(range(len(COMPANIES)), key=lambda i: (-scores[i], i))
+        return [
+            {"name": COMPANIES[i][1], "score": round(float(scores[i]), 4)}
+            for i in order[:k]
+            if scores[i] > _VECTOR_MIN_SCORE
+        ]
+
+    # ── 템플릿 Cypher (intent_router.TEMPLATES 와 같은 결과) ────────────────
+    def _latest(self, rows: list[dict]) -> list[dict]:
+        """(주주, 회사)별 max(지분율)·max(연도)."""
+        grouped: dict[tuple[str, str], dict] = {}
+        for h in rows:
+            g = grouped.setdefault((h["holder"], h["company"]), {"주주명": h["holder"], "회사명": h["company"], "지분율": 0.0, "연도": 0})
+            g["지분율"] = max(g["지분율"], h["ratio"])
+            g["연도"] = max(g["연도"], h["year"])
+        return list(grouped.values())
+
+    def _filter(self, params: dict, **match: str) -> list[dict]:
+        return [
+            h for h in self.holdings
+            if h["ratio"] >= params["ratio"]
+            and (params.get("year") is None or h["year"] == params["year"])
+            and all(value is None or value in h[field] for field, value in match.items())
+        ]
+
+    def _template_major_shareholders(self, p: dict) -> list[dict]:
+        rows = self._latest(self._filter(p, company=p["company"]))
+        return sorted(rows, key=lambda r: (-r["지분율"], r["회사명"]))[: p["limit"]]
+
+    def _template_company_shareholders(self, p: dict) -> list[dict]:
+        rows = self._latest(self._filter(p, company=p["company"]))
+        return sorted(rows, key=lambda r: (-r["지분율"], r["주주명"]))[: p["limit"]]
+
+    def _template_holder_portfolio(self, p: dict) -> list[dict]:
+        rows = self._latest(self._filter(p, holder=p["holder"]))
+        return sorted(rows, key=lambda r: (-r["지분율"], r["회사명"]))[: p["limit"]]
+
+    def _template_multi_company_investors(self, p: dict) -> list[dict]:
+        companies: dict[str, set] = {}
+        for h in self.holdings:
+            companies.setdefault(h["holder"], set()).add(h["company"])
+        rows = [{"주주명": name, "투자회사수": len(c)} for name, c in companies.items() if len(c) >= p["min"]]
+        return sorted(rows, key=lambda r: (-r["투자회사수"], r["주주명"]))[: p["limit"]]
+
+    def _template_corporate_holders(self, p: dict) -> list[dict]:
+        holders: dict[str, list[str]] = {}
+        for h in self.holdings:
+            if self.holders[h["holder"]]["type"] == "CORPORATION":
+                names = holders.setdefault(h["company"], [])
+                if h["holder"] not in names:
+                    names.append(h["holder"])
+        rows = [{"회사명": c, "법인주주수": len(names), "법인주주": names[:5]} for c, names in holders.items()]
+        return sorted(rows, key=lambda r: (-r["법인주주수"], r["회사명"]))[: p["limit"]]
+
+    def _template_executive_compensation(self, p: dict) -> list[dict]:
+        year = p["year"] or max(y for _, y in self.compensation)
+        rows = []
+        for (company, y), comp in self.compensation.items():
+            if y != year:
+                continue
+            if p["measure"] == "count":
+                value = float(comp[f"{p['group']}Count"])
+            elif p["measure"] == "total":
+                value = float(comp[f"{p['group']}TotalComp"])
+            else:
+                value = float(comp[f"{p['group']}AvgComp"])
+            rows.append({"회사명": company, "회계연도": year, "항목": p["label"], "값": round(value, 1), "단위": p["unit"]})
+        return sorted(rows, key=lambda r: r["값"] if p["asc"] else -r["값"])[: p["limit"]]
+
+    # ── 생성 Cypher 결과 계산 (FixtureChatModel 용) ─────────────────────────
+    def latest_holders(self, company: str, year: Optional[int] = None, types: tuple[str, ...] = ()) -> list[dict]:
+        rows = [
+            h for h in self.holdings
+            if h["company"] == company and (year is None or h["year"] == year)
+            and (not types or self.holders[h["holder"]]["type"] in types)
+        ]
+        return sorted(self._latest(rows), key=lambda r: (-r["지분율"], r["주주명"]))
+
+    def mutual_pairs(self) -> list[tuple[str, str, float, float]]:
+        latest = {(r["주주명"], r["회사명"]): r["지분율"] for r in self._latest(self.holdings)}
+        return sorted(
+            (a, b, ratio, latest[(b, a)])
+            for (a, b), ratio in latest.items()
+            if a < b and (b, a) in latest
+        )
+
+
+# ── 임베딩 ──────────────────────────────────────────────────────────────────
+class FixtureEmbeddings(Embeddings):
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        time.sleep(EMBED_SEC)
+        return [embed_text(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        time.sleep(EMBED_SEC)
+        return embed_text(text)
+
+
+# ── LLM ─────────────────────────────────────────────────────────────────────
+_CYPHER_QUESTION_RE = re.compile(r"\n질문: (.*)\n\nCypher:\s*$", re.DOTALL)
+_QA_QUESTION_RE = re.compile(r"\n질문: (.*?)\n\nDB 결과:\n(.*?)\n\n\[답변 규칙\]", re.DOTALL)
+_HINTS_RE = re.compile(r"\n\[DB 내 유사 회사명: ([^\]]*)\]")
+_HISTORY_RE = re.compile(r"## 이전 대화[^\n]*\n(.*?)\n\n질문: ", re.DOTALL)
+_YEAR_RE = re.compile(r"(?<!\d)((?:19|20)\d{2})\s*년")
+_HOLDER_COLS = "coalesce(s.stockName, s.companyName)"
+
+
+def _quote(name: str) -> str:
+    return "'" + name.replace("'", "\\'") + "'"
+
+
+class _CypherContext:
+    """생성 대상: 질문(힌트 줄 제외)·회사(질문 → 힌트 → 대화 이력 마지막 답변 순)."""
+
+    def __init__(self, graph: FixtureGraph, prompt: str) -> None:
+        m = _CYPHER_QUESTION_RE.search(prompt)
+        enhanced = m.group(1) if m else ""
+        hints = _HINTS_RE.search(enhanced)
+        self.graph = graph
+        self.question = _HINTS_RE.sub("", enhanced).strip()
+        self.hints = [h.strip() for h in hints.group(1).split(",") if h.strip()] if hints else []
+        history = _HISTORY_RE.search(prompt)
+        self.history = history.group(1) if history else ""
+        self.companies = (
+            mentioned_companies(self.question)
+            or [h for h in self.hints if h in _COMPANY_INDEX]
+            or self._history_companies()
+        )
+
+    def _history_companies(self) -> list[str]:
+        turns = self.history.split("\nQ: ")
+        for turn in reversed(turns):
+            found = mentioned_companies(turn)
+            if found:
+                return found
+        return []
+
+    @property
+    def company(self) -> Optional[str]:
+        return self.companies[0] if self.companies else None
+
+    @property
+    def year(self) -> Optional[int]:
+        m = _YEAR_RE.search(self.question)
+        return int(m.group(1)) if m else None
+
+
+def _holders_by_type(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    company = ctx.company or ""
+    cypher = f"""MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+WHERE c.companyName CONTAINS {_quote(company)} AND s.shareholderType IN ['CORPORATION', 'INSTITUTION']
+WITH s, c, max(r.stockRatio) AS ratio
+RETURN {_HOLDER_COLS} AS 주주명, c.companyName AS 회사명, ratio AS 지분율
+ORDER BY 지분율 DESC
+LIMIT 10"""
+    rows = ctx.graph.latest_holders(company, types=("CORPORATION", "INSTITUTION"))
+    return cypher, [{"주주명": r["주주명"], "회사명": r["회사명"], "지분율": r["지분율"]} for r in rows[:10]]
+
+
+def _holders_in_year(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    company, year = ctx.company or "", ctx.year
+    cypher = f"""MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+WHERE c.companyName CONTAINS {_quote(company)} AND r.reportYear = {year}
+RETURN {_HOLDER_COLS} AS 주주명, c.companyName AS 회사명, max(r.stockRatio) AS 지분율, r.reportYear AS 연도
+ORDER BY 지분율 DESC
+LIMIT 10"""
+    return cypher, ctx.graph.latest_holders(company, year=year)[:10]
+
+
+def _person_count(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    company = ctx.company or ""
+    cypher = f"""MATCH (s:Stockholder)-[:HOLDS_SHARES]->(c:Company)
+WHERE c.companyName CONTAINS {_quote(company)} AND s.shareholderType = 'PERSON'
+RETURN count(DISTINCT s) AS 개인주주수"""
+    return cypher, [{"개인주주수": len(ctx.graph.latest_holders(company, types=("PERSON",)))}]
+
+
+def _corporate_average(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    company = ctx.company or ""
+    cypher = f"""MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+WHERE c.companyName CONTAINS {_quote(company)} AND s.shareholderType IN ['CORPORATION', 'INSTITUTION']
+WITH s, max(r.stockRatio) AS ratio
+RETURN round(avg(ratio), 2) AS 평균지분율"""
+    rows = ctx.graph.latest_holders(company, types=("CORPORATION", "INSTITUTION"))
+    avg = round(sum(r["지분율"] for r in rows) / len(rows), 2) if rows else None
+    return cypher, [{"평균지분율": avg}]
+
+
+def _group_top_holders(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    names = ", ".join(_quote(c) for c in ctx.companies)
+    cypher = f"""MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+WHERE c.companyName IN [{names}]
+WITH c, s, max(r.stockRatio) AS ratio ORDER BY ratio DESC
+WITH c, collect({{name: {_HOLDER_COLS}, ratio: ratio}})[0] AS top
+RETURN c.companyName AS 회사명, top.name AS 주주명, top.ratio AS 지분율
+ORDER BY 지분율 DESC"""
+    rows = []
+    for company in ctx.companies:
+        holders = ctx.graph.latest_holders(company)
+        if holders:
+            rows.append({"회사명": company, "주주명": holders[0]["주주명"], "지분율": holders[0]["지분율"]})
+    return cypher, sorted(rows, key=lambda r: -r["지분율"])
+
+
+def _subsidiaries(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    parent = next((c for c in ctx.companies if c.endswith("지주")), ctx.company or "")
+    cypher = f"""MATCH (p:Company)-[r:HOLDS_SHARES]->(c:Company)
+WHERE p.companyName CONTAINS {_quote(parent)} AND r.stockRatio > 50.0
+WITH c, max(r.stockRatio) AS ratio
+RETURN c.companyName AS 자회사, ratio AS 지분율
+ORDER BY 지분율 DESC, 자회사
+LIMIT 10"""
+    rows = [r for r in ctx.graph._latest(ctx.graph.holdings) if r["주주명"] == parent and r["지분율"] > 50.0]
+    rows = sorted(({"자회사": r["회사명"], "지분율": r["지분율"]} for r in rows), key=lambda r: (-r["지분율"], r["자회사"]))
+    return cypher, rows[:10]
+
+
+def _companies_with_major_holders(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    m = re.search(r"(\d+(?:\.\d+)?)\s*%.*?(\d+)\s*명", ctx.question)
+    ratio, minimum = (float(m.group(1)), int(m.group(2))) if m else (5.0, 2)
+    cypher = f"""MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(c:Company)
+WHERE r.stockRatio >= {ratio}
+WITH c, count(DISTINCT s) AS holders
+WHERE holders >= {minimum}
+RETURN c.companyName AS 회사명, holders AS 주주수
+ORDER BY 주주수 DESC, 회사명
+LIMIT 10"""
+    counts: dict[str, set] = {}
+    for h in ctx.graph.holdings:
+        if h["ratio"] >= ratio:
+            counts.setdefault(h["company"], set()).add(h["holder"])
+    rows = [{"회사명": c, "주주수": len(s)} for c, s in counts.items() if len(s) >= minimum]
+    return cypher, sorted(rows, key=lambda r: (-r["주주수"], r["회사명"]))[:10]
+
+
+def _mutual_holdings(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    cypher = """MATCH (a:Company)-[r1:HOLDS_SHARES]->(b:Company)-[r2:HOLDS_SHARES]->(a)
+WHERE a.companyName < b.companyName
+RETURN a.companyName AS 회사A, b.companyName AS 회사B, max(r1.stockRatio) AS A의B지분율, max(r2.stockRatio) AS B의A지분율
+ORDER BY 회사A
+LIMIT 10"""
+    rows = [{"회사A": a, "회사B": b, "A의B지분율": ab, "B의A지분율": ba} for a, b, ab, ba in ctx.graph.mutual_pairs()]
+    return cypher, rows
+
+
+def _closed_most_holders(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    cypher = """MATCH (s:Stockholder)-[:HOLDS_SHARES]->(c:Company)
+WHERE c.isActive = false
+RETURN c.companyName AS 회사명, c.closedDate AS 폐업일, count(DISTINCT s) AS 주주수
+ORDER BY 주주수 DESC
+LIMIT 1"""
+    rows = [
+        {"회사명": name, "폐업일": closed, "주주수": len({h["holder"] for h in ctx.graph.holdings if h["company"] == name})}
+        for _, name, closed in COMPANIES
+        if closed
+    ]
+    return cypher, sorted(rows, key=lambda r: -r["주주수"])[:1]
+
+
+def _employee_salary(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    # 스키마에 직원 급여가 없음 → 빈 결과 (답변 문장화 LLM 경로)
+    cypher = f"""MATCH (c:Company)-[r:HAS_COMPENSATION]->(c)
+WHERE r.fiscalYear = {ctx.year or YEARS[-1]} AND r.employeeAvgSalary IS NOT NULL
+RETURN c.companyName AS 회사명, r.employeeAvgSalary AS 직원평균급여
+ORDER BY 직원평균급여 DESC
+LIMIT 1"""
+    return cypher, []
+
+
+def _holders_per_year(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    cypher = """MATCH (s:Stockholder)-[r:HOLDS_SHARES]->(:Company)
+RETURN r.reportYear AS 연도, count(DISTINCT s) AS 주주수
+ORDER BY 연도"""
+    rows = [
+        {"연도": y, "주주수": len({h["holder"] for h in ctx.graph.holdings if h["year"] == y})}
+        for y in YEARS
+    ]
+    return cypher, rows
+
+
+def _compensation_growth(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    cypher = """MATCH (c:Company)-[cur:HAS_COMPENSATION]->(c), (c)-[prev:HAS_COMPENSATION]->(c)
+WHERE prev.fiscalYear = cur.fiscalYear - 1
+RETURN c.companyName AS 회사명, cur.fiscalYear AS 연도,
+       cur.registeredExecTotalComp AS 보수총액, cur.registeredExecTotalComp - prev.registeredExecTotalComp AS 증가금액
+ORDER BY 증가금액 DESC
+LIMIT 1"""
+    comp = ctx.graph.compensation
+    rows = [
+        {"회사명": c, "연도": y, "보수총액": row["registeredExecTotalComp"],
+         "증가금액": row["registeredExecTotalComp"] - comp[(c, y - 1)]["registeredExecTotalComp"]}
+        for (c, y), row in comp.items()
+        if (c, y - 1) in comp
+    ]
+    return cypher, sorted(rows, key=lambda r: (-r["증가금액"], r["회사명"]))[:1]
+
+
+def _stake_trend(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    company = ctx.company or ""
+    cypher = f"""MATCH (c:Company)<-[r:HOLDS_SHARES]-(s:Stockholder)
+WHERE c.companyName CONTAINS {_quote(company)}
+WITH s, c, r ORDER BY r.reportYear ASC, r.baseDate ASC
+WITH s, c, collect(r.reportYear) AS years, collect(r.stockRatio) AS ratios
+WHERE size(years) > 1 AND any(i IN range(0, size(ratios)-2) WHERE ratios[i] <> ratios[i+1])
+RETURN {_HOLDER_COLS} AS 주주명, c.companyName AS 회사명, years, ratios
+ORDER BY years[0] ASC
+LIMIT 10"""
+    series: dict[str, list[tuple[int, float]]] = {}
+    for h in ctx.graph.holdings:
+        if h["company"] == company:
+            series.setdefault(h["holder"], []).append((h["year"], h["ratio"]))
+    rows = [
+        {"주주명": holder, "회사명": company, "years": [y for y, _ in points], "ratios": [r for _, r in points]}
+        for holder, points in sorted(series.items())
+        if len(points) > 1 and len({r for _, r in points}) > 1
+    ]
+    return cypher, rows[:10]
+
+
+def _company_list(ctx: _CypherContext) -> tuple[str, list[dict]]:
+    cypher = """MATCH (c:Company)
+WHERE c.isActive
+RETURN c.companyName AS 회사명
+ORDER BY 회사명
+LIMIT 10"""
+    return cypher, [{"회사명": name} for _, name, closed in sorted(COMPANIES, key=lambda c: c[1]) if not closed][:10]
+
+
+# 질문 표현 → Cypher·결과 (위에서부터 첫 일치, 없으면 회사 목록)
+_CYPHER_RULES: tuple[tuple[re.Pattern, Callable[[_CypherContext], tuple[str, list[dict]]]], ...] = (
+    (re.compile(r"법인\s*주주만"), _holders_by_type),
+    (re.compile(r"\d{4}\s*년\s*기준"), _holders_in_year),
+    (re.compile(r"개인\s*주주\s*수"), _person_count),
+    (re.compile(r"법인들?의?\s*평균\s*지분율"), _corporate_average),
+    (re.compile(r"계열.*최대\s*지분율"), _group_top_holders),
+    (re.compile(r"자회사"), _subsidiaries),
+    (re.compile(r"%\s*이상\s*주주가\s*\d+\s*명"), _companies_with_major_holders),
+    (re.compile(r"상호\s*출자"), _mutual_holdings),
+    (re.compile(r"대표\s*주주"), _group_top_holders),
+    (re.compile(r"폐업"), _closed_most_holders),
+    (re.compile(r"직원.*급여"), _employee_salary),
+    (re.compile(r"연도별\s*주주\s*수"), _holders_per_year),
+    (re.compile(r"보수.*(?:늘어난|증가)"), _compensation_growth),
+    (re.compile(r"지분율?\s*(?:추이|변동|변화)"), _stake_trend),
+)
+
+
+def _qa_answer(prompt: str) -> str:
+    m = _QA_QUESTION_RE.search(prompt)
+    question = _HINTS_RE.sub("", m.group(1)).strip() if m else ""
+    context = m.group(2).strip() if m else ""
+    if context in ("", "[]"):
+        return (
+            f"'{question}' 에 해당하는 데이터가 DB 에 없습니다. 보고 연도·회사명을 바꿔 다시 질문해 보세요."
+            if question else "해당하는 데이터가 없습니다."
+        )
+    names = mentioned_companies(context)
+    subject = f"**{names[0]}** 등 " if names else ""
+    return f"{subject}조회 결과를 기준으로 답변드립니다. 핵심 수치는 위 DB 결과와 같습니다."
+
+
+class FixtureChatModel(BaseChatModel):
+    """Cypher 생성 → 규칙별 고정 Cypher (결과 행을 graph 에 등록), 답변 문장화 → 고정 문장, 그 밖 → 'OK'."""
+
+    graph: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return "fixture"
+
+    def _respond(self, prompt: str) -> str:
+        if prompt.startswith("당신은 Neo4j Cypher 작성자입니다."):
+            ctx = _CypherContext(self.graph, prompt)
+            rule = next((fn for rx, fn in _CYPHER_RULES if rx.search(ctx.question)), _company_list)
+            cypher, rows = rule(ctx)
+            self.graph.register(cypher, rows)
+            return cypher
+        if prompt.startswith("당신은 주주 네트워크 분석 전문가입니다."):
+            return _qa_answer(prompt)
+        return "OK"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        text = self._respond(prompt)
+        prompt_tokens, output_tokens = token_budget.count(prompt), token_budget.count(text)
+        time.sleep(CHAT_BASE_SEC + CHAT_SEC_PER_TOKEN * output_tokens)
+        usage = {"input_tokens": prompt_tokens, "output_tokens": output_tokens, "total_tokens": prompt_tokens + output_tokens}
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text, usage_metadata=usage))])
@@ -280,13 +280,23 @@ function formatEdgeLabel(edges) {
 }
 const NODE_RADIUS = { company: 22, person: 16, major: 20, institution: 18 };
 
-/** 노드 크기 (연결 수·지분율 반영). */
+/** 화면 노드 중 최대 PageRank (분석 배치 지표, 없으면 0). 그래프 데이터가 바뀔 때만 다시 계산 (graphDataVersion). */
+function maxVisiblePagerank() {
+  if (window._pagerankVersion !== graphDataVersion) {
+    window._pagerankVersion = graphDataVersion;
+    window._maxPagerank = NODES.reduce((m, n) => Math.max(m, Number(n.pagerank) || 0), 0);
+  }
+  return window._maxPagerank;
+}
+
+/** 노드 크기 (중요도 또는 연결 수·지분율 반영). 분석 배치 PageRank 가 있으면 연결 수 대신 사용. */
 function calculateNodeSize(node, edges, selectedNodeId, connectedNodeIds) {
   const baseRadius = NODE_RADIUS[node.type] || 18;
   const baseSize = baseRadius * 2;
   const nodeEdges = edges.filter((e) => e.from === node.id || e.to === node.id);
   const degree = nodeEdges.length;
-  if (!window._avgDegree || !window._maxDegree) {
+  if (window._degreeVersion !== graphDataVersion) {
+    window._degreeVersion = graphDataVersion;
     const allDegrees = NODES.map(
       (n) => EDGES.filter((e) => e.from === n.id || e.to === n.id).length,
     );
@@ -304,6 +314,12 @@ function calculateNodeSize(node, edges, selectedNodeId, connectedNodeIds) {
   else if (degree < avgDegree * 0.5 && degree > 0) degreeFactor = 0.9;
   else if (degree === 0) degreeFactor = 0.85;
 
+  const maxPagerank = maxVisiblePagerank();
+  if (node.pagerank != null && maxPagerank > 0) {
+    // 화면 내 최대값 대비 상대 중요도 (제곱근으로 완만하게): 0.85 ~ 1.35
+    degreeFactor = 0.85 + 0.5 * Math.sqrt((Number(node.pagerank) || 0) / maxPagerank);
+  }
+
   let ratioFactor = 1.0;
   if (nodeEdges.length > 0) {
     const maxRatio = Math.max(...nodeEdges.map((e) => Number(e.ratio || 0)));
@@ -390,6 +406,12 @@ function getThemeColor(name) {
 ═══════════════════════════════════════════ */
 let NODES = [];
 let EDGES = [];
+// NODES·EDGES 를 새로 받거나 바꿀 때마다 올림 → 노드 크기 계산 캐시(최대 PageRank, 연결 수 통계)의 키
+let graphDataVersion = 0;
+
+function markGraphDataChanged() {
+  graphDataVersion += 1;
+}
 let positions = {};
 let selectedNode = null;
 let activeFilters = new Set(GRAPH_CONFIG.nodeTypes);
@@ -398,6 +420,7 @@ let chatContext = null;
 let nodeDetailCache = {};
 let isEgoMode = false;
 let egoCenterId = null;
+let egoServerLayout = false; // 지배구조 맵이 서버 계층 레이아웃 좌표를 쓰는지 (false면 Vis.js hierarchical)
 const GOVERNANCE_MAP_VIEW = { HEATMAP: "heatmap", EGO: "ego" };
 let egoMapViewMode = GOVERNANCE_MAP_VIEW.EGO;
 
@@ -459,6 +482,7 @@ async function apiCall(endpoint, options = {}) {
 function exitEgoMode() {
   isEgoMode = false;
   egoCenterId = null;
+  egoServerLayout = false;
   const banner = document.getElementById(GOV_MAP_IDS.banner);
   if (banner) banner.classList.add("util-hidden");
   document.getElementById(GOV_MAP_IDS.wrap)?.classList.add("util-hidden");
@@ -487,12 +511,12 @@ function exitEgoMode() {
   });
 }
 
-/** 서버 레이아웃 API. 0~1 좌표 → 뷰포트 픽셀. ratio → 시각적 거리. */
-async function fetchServerLayout(nodes, edges, viewportW, viewportH) {
-  const pad = LAYOUT_CONFIG.force.padding;
+/** 서버 레이아웃 API. 0~1 좌표 → 뷰포트 픽셀. ratio → 시각적 거리. options: { engine, useComponents, padding } */
+async function fetchServerLayout(nodes, edges, viewportW, viewportH, options = {}) {
+  const pad = options.padding ?? LAYOUT_CONFIG.force.padding;
   const innerW = Math.max(1, viewportW - 2 * pad);
   const innerH = Math.max(1, viewportH - 2 * pad);
-  const engine = GRAPH_CONFIG.layoutEngine || "networkx";
+  const engine = options.engine || GRAPH_CONFIG.layoutEngine || "networkx";
   const body = {
     nodes: nodes.map((n) => ({ id: n.id, type: n.type, label: n.label })),
     edges: edges.map((e) => ({
@@ -503,7 +527,7 @@ async function fetchServerLayout(nodes, edges, viewportW, viewportH) {
     width: 1,
     height: 1,
     padding: 0.05,
-    use_components: true,
+    use_components: options.useComponents ?? true,
     engine: engine,
   };
   const res = await apiCall("/api/v1/graph/layout", {
@@ -555,6 +579,7 @@ async function loadEgoGraph(nodeId) {
     
     NODES = res.nodes;
     EDGES = res.edges;
+    markGraphDataChanged();
     activeFilters = new Set(GRAPH_CONFIG.nodeTypes);
     positions = {};
     egoMapViewMode = GOV_MAP_CONFIG.heatmapEnabled ? GOVERNANCE_MAP_VIEW.HEATMAP : GOVERNANCE_MAP_VIEW.EGO;
@@ -566,7 +591,22 @@ async function loadEgoGraph(nodeId) {
       isEgoMode = false;
       return;
     }
-    // 지배구조 맵: Vis.js hierarchical 레이아웃 사용 (positions 미사용)
+    // 지배구조 맵: 서버 계층 레이아웃(순환·교차 감소 처리) 우선, 실패 시 Vis.js hierarchical
+    egoServerLayout = false;
+    try {
+      const { width: vpW, height: vpH } = getGraphViewport();
+      const serverPos = await fetchServerLayout(NODES, EDGES, vpW, vpH, {
+        engine: "hierarchical",
+        useComponents: false,
+        padding: LAYOUT_CONFIG.ego.padding,
+      });
+      if (serverPos && Object.keys(serverPos).length > 0) {
+        positions = serverPos;
+        egoServerLayout = true;
+      }
+    } catch (e) {
+      console.warn("Server hierarchical layout failed, using Vis.js hierarchical:", e);
+    }
     updateStatus(UI_STRINGS.govMap.statusEgoLoaded, true);
     hideGraphLoading();
     selectedNode = NODES.find((n) => n.id === res.ego_id) || null;
@@ -619,6 +659,7 @@ async function loadEgoGraph(nodeId) {
   } catch (e) {
     isEgoMode = false;
     egoCenterId = null;
+    egoServerLayout = false;
     const banner = document.getElementById(GOV_MAP_IDS.banner);
     if (banner) banner.classList.add("util-hidden");
     updateStatus(ERROR_MESSAGES.EGO_GRAPH_LOAD_FAILED_STATUS, false, ERROR_CODES.NEO4J_CONNECTION_FAILED);
@@ -689,11 +730,52 @@ function heatmapColorForRatio(ratio) {
   return `rgb(${r},${g},${b})`;
 }
 
-/** 가중치 엣지 히트맵 렌더 (동일 영역에서 Ego 그래프와 전환 가능). */
-function renderWeightedEdgeHeatmap(egoId, nodes, edges) {
+/** 서버 히트맵 응답(CSR: indptr/indices/data, 주주 행 × 회사 열) → 렌더용 축 + 행 값 조회. */
+function heatmapAxesFromCsr(res) {
+  const { indptr, indices, data } = res;
+  const nCols = res.cols.keys.length;
+  return {
+    rowIds: res.rows.keys,
+    rowLabels: res.rows.labels,
+    colIds: res.cols.keys,
+    colLabels: res.cols.labels,
+    rowValues: (i) => {
+      const row = new Array(nCols).fill(0);
+      for (let p = indptr[i]; p < indptr[i + 1]; p++) row[indices[p]] = data[p];
+      return row;
+    },
+  };
+}
+
+/** 로컬(ego 노드/엣지) 정방 행렬 → 렌더용 축 (서버 히트맵 실패 시 폴백). */
+function heatmapAxesFromLocal(nodes, edges) {
+  const { nodeIds, labels, matrix } = buildWeightedEdgeMatrix(nodes, edges);
+  return {
+    rowIds: nodeIds,
+    rowLabels: labels,
+    colIds: nodeIds,
+    colLabels: labels,
+    rowValues: (i) => matrix[i],
+  };
+}
+
+/** 가중치 엣지 히트맵 렌더 (동일 영역에서 Ego 그래프와 전환 가능). 서버 CSR(블록 정렬) 우선, 실패 시 로컬 계산. */
+async function renderWeightedEdgeHeatmap(egoId, nodes, edges) {
   const wrap = document.getElementById(GOV_MAP_IDS.wrap);
   if (!wrap) return;
-  const { nodeIds, labels, matrix } = buildWeightedEdgeMatrix(nodes, edges);
+  let axes = null;
+  try {
+    const res = await apiCall(
+      `/api/v1/graph/heatmap?node_id=${encodeURIComponent(egoId)}&max_hops=${EGO_GRAPH_CONFIG.MAX_HOPS}&max_nodes=${EGO_GRAPH_CONFIG.MAX_NODES}`,
+    );
+    if (res && res.indptr && res.rows && res.cols) axes = heatmapAxesFromCsr(res);
+  } catch (e) {
+    console.warn("Server heatmap failed, building locally:", e);
+  }
+  // 응답 대기 중 다른 노드/뷰로 전환됐으면 렌더하지 않음
+  if (!isEgoMode || egoCenterId !== egoId || egoMapViewMode !== GOVERNANCE_MAP_VIEW.HEATMAP) return;
+  if (!axes) axes = heatmapAxesFromLocal(nodes, edges);
+  const { rowIds, rowLabels, colIds, colLabels, rowValues } = axes;
 
   const { title: heatmapTitle, sub: heatmapSub, ariaLabel: heatmapAria } = UI_STRINGS.heatmap;
   let html = `
@@ -705,21 +787,22 @@ function renderWeightedEdgeHeatmap(egoId, nodes, edges) {
       <table class="heatmap-table" role="grid" aria-label="${heatmapAria}">
         <thead>
           <tr><th class="heatmap-corner"></th>`;
-  nodeIds.forEach((id, j) => {
-    const short = String(labels[j]).slice(0, 12);
+  colIds.forEach((id, j) => {
+    const short = String(colLabels[j]).slice(0, 12);
     const isEgo = id === egoId;
-    html += `<th class="heatmap-th ${isEgo ? "heatmap-ego" : ""}" title="${esc(labels[j])}">${esc(short)}</th>`;
+    html += `<th class="heatmap-th ${isEgo ? "heatmap-ego" : ""}" title="${esc(colLabels[j])}">${esc(short)}</th>`;
   });
   html += `</tr></thead><tbody>`;
 
-  nodeIds.forEach((id, i) => {
+  rowIds.forEach((id, i) => {
     const isEgo = id === egoId;
-    html += `<tr><td class="heatmap-row-label ${isEgo ? "heatmap-ego" : ""}" title="${esc(labels[i])}">${esc(String(labels[i]).slice(0, 14))}</td>`;
-    nodeIds.forEach((idJ, j) => {
-      const v = matrix[i][j];
+    const values = rowValues(i);
+    html += `<tr><td class="heatmap-row-label ${isEgo ? "heatmap-ego" : ""}" title="${esc(rowLabels[i])}">${esc(String(rowLabels[i]).slice(0, 14))}</td>`;
+    colIds.forEach((idJ, j) => {
+      const v = values[j];
       const color = heatmapColorForRatio(v);
       const text = v > 0 ? (v % 1 === 0 ? String(v) : v.toFixed(1)) : "";
-      const cellTitle = `${String(labels[i]).replace(/"/g, "&quot;")} → ${String(labels[j]).replace(/"/g, "&quot;")}: ${text}%`;
+      const cellTitle = `${String(rowLabels[i]).replace(/"/g, "&quot;")} → ${String(colLabels[j]).replace(/"/g, "&quot;")}: ${text}%`;
       html += `<td class="heatmap-cell" style="background:${color}" title="${cellTitle}">${text}</td>`;
     });
     html += `</tr>`;
@@ -890,6 +973,7 @@ async function loadGraph() {
 
     // 빈 응답 처리 강화
     EDGES = (edgesRes?.edges || []).filter((e) => e && e.from && e.to);
+    markGraphDataChanged();
 
     // 엣지가 참조하는 모든 노드 ID 수집
     const requiredNodeIds = new Set();
@@ -924,6 +1008,7 @@ async function loadGraph() {
 
     // 빈 응답 처리 강화
     NODES = (nodesRes?.nodes || []).filter((n) => n && n.id);
+    markGraphDataChanged();
 
     // 엣지가 참조하는 노드가 모두 로드되었는지 확인
     const loadedNodeIds = new Set(NODES.map((n) => n.id));
@@ -949,6 +1034,7 @@ async function loadGraph() {
           (n) => n && n.id,
         );
         NODES.push(...missingNodes);
+        markGraphDataChanged();
         // 개발 환경에서만 로그
         const isDevelopment =
           window.location.hostname === "localhost" ||
@@ -967,6 +1053,7 @@ async function loadGraph() {
     EDGES = EDGES.filter(
       (e) => finalNodeIds.has(e.from) && finalNodeIds.has(e.to),
     );
+    markGraphDataChanged();
 
     // 프로덕션에서는 숨김
     const isDevelopment =
@@ -1533,6 +1620,15 @@ function computeHierarchicalLayout(egoId) {
   const minNodeSpacing = LAYOUT_CONFIG.ego.minNodeSpacing;
   const width = W - 2 * padding;
 
+  // 인접 리스트 1회 구성 → BFS O(V+E) (노드마다 EDGES 전체 순회 금지)
+  const outAdj = new Map();
+  const inAdj = new Map();
+  EDGES.forEach((e) => {
+    if (!outAdj.has(e.from)) outAdj.set(e.from, []);
+    if (!inAdj.has(e.to)) inAdj.set(e.to, []);
+    outAdj.get(e.from).push(e.to);
+    inAdj.get(e.to).push(e.from);
+  });
   const layerBy = {};
   layerBy[egoId] = 0;
   const queue = [egoId];
@@ -1540,16 +1636,18 @@ function computeHierarchicalLayout(egoId) {
   while (head < queue.length) {
     const cur = queue[head++];
     const curLayer = layerBy[cur];
-    EDGES.forEach((e) => {
-      if (e.from === cur && !(e.to in layerBy)) {
-        layerBy[e.to] = curLayer + 1;
-        queue.push(e.to);
+    for (const to of outAdj.get(cur) || []) {
+      if (!(to in layerBy)) {
+        layerBy[to] = curLayer + 1;
+        queue.push(to);
       }
-      if (e.to === cur && !(e.from in layerBy)) {
-        layerBy[e.from] = curLayer - 1;
-        queue.push(e.from);
+    }
+    for (const from of inAdj.get(cur) || []) {
+      if (!(from in layerBy)) {
+        layerBy[from] = curLayer - 1;
+        queue.push(from);
       }
-    });
+    }
   }
   const layerToIds = {};
   nodes.forEach((n) => {
@@ -2249,7 +2347,7 @@ function renderGraphWithVisJs() {
   //  UX 패턴 - 노드 상태에 따른 시각적 차별화 (focused/dimmed 효과)
   const visNodes = visibleNodes.map((n) => {
     const p = positions[n.id] || { x: vpW / 2, y: vpH / 2 };
-    const useFixedPosition = !isEgoMode && positions[n.id];
+    const useFixedPosition = (!isEgoMode || egoServerLayout) && positions[n.id];
     const color = getNodeColor(n);
     const isSelected = nodeIdsEqual(selectedNodeId, n.id);
     //  전역 변수 connectedNodeIds 사용 (설정 시 String으로 저장 — 타입 불일치 방지)
@@ -2315,7 +2413,7 @@ function renderGraphWithVisJs() {
     const nodeOption = {
       id: n.id,
       label: labelText,
-      // ego 모드(지배구조 맵)에서는 x,y 생략 → Vis.js hierarchical이 위치 계산
+      // ego 모드(지배구조 맵)에서 서버 좌표가 없으면 x,y 생략 → Vis.js hierarchical이 위치 계산
       ...(useFixedPosition ? { x: p.x, y: p.y } : {}),
       // 타 서비스 패턴 - physics 활성화 시 동적 위치 관리 (안정화 후 고정)
       // fixed 속성 제거: 초기 안정화 전에는 동적, 안정화 후에는 physics: false로 고정
@@ -2476,7 +2574,7 @@ function renderGraphWithVisJs() {
       tooltipDelay: 100, // 툴팁 지연 감소
       hover: true, // 호버 효과 활성화
     },
-    layout: isEgoMode
+    layout: isEgoMode && !egoServerLayout
       ? { hierarchical: LAYOUT_CONFIG.ego.hierarchical }
       : { improvedLayout: false },
     //  animation은 top-level 옵션이 아님 (moveTo/fit/focus 메서드의 파라미터로만 사용)
@@ -3653,14 +3751,21 @@ const SEARCH_SUGGESTION_LIMIT = 10;
 const SEARCH_API_LIMIT = 15;
 
 //  서버 검색 단일 진입점 — 홈/지배구조 맵(ego) 공통, 확장성·유지보수
+//  자동완성 인덱스(/graph/suggest, 인메모리·초성 지원) 우선, 준비 전(503)·실패 시 Neo4j 검색으로 폴백
 function searchViaApi(q) {
   searchResultsFromApi = true;
   showSearchLoading();
   apiCall(
-    `/api/v1/graph/nodes?search=${encodeURIComponent(q)}&limit=${SEARCH_API_LIMIT}`,
+    `/api/v1/graph/suggest?q=${encodeURIComponent(q)}&limit=${SEARCH_SUGGESTION_LIMIT}`,
   )
-    .then((res) => {
-      const nodes = (res?.nodes || []).slice(0, SEARCH_SUGGESTION_LIMIT);
+    .then((res) => res?.results || [])
+    .catch(() =>
+      apiCall(
+        `/api/v1/graph/nodes?search=${encodeURIComponent(q)}&limit=${SEARCH_API_LIMIT}`,
+      ).then((res) => res?.nodes || []),
+    )
+    .then((found) => {
+      const nodes = found.slice(0, SEARCH_SUGGESTION_LIMIT);
       searchResults = nodes;
       if (nodes.length === 0) {
         showSearchNoResults();